@@ -0,0 +1,15 @@
+"""Export: package_corpus_export_v2 for a synthetic corpus."""
+
+from opencontractserver.tasks.export_tasks_v2 import package_corpus_export_v2
+from opencontractserver.users.models import UserExport
+
+
+def test_package_corpus_export_v2(bench, bench_user, synthetic_corpus, scale):
+    def new_export():
+        return (UserExport.objects.create(backend_lock=True, creator=bench_user).id,)
+
+    bench.extra["documents"] = scale["documents"]
+    bench(package_corpus_export_v2, corpus_pk=synthetic_corpus.id, setup=new_export)
+
+    export = UserExport.objects.filter(creator=bench_user).latest("id")
+    assert export.finished is not None and export.file
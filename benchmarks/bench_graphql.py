@@ -0,0 +1,273 @@
+"""
+Document viewer: the GraphQL queries the frontend runs when a document is
+opened in a corpus (GET_DOCUMENT_KNOWLEDGE_AND_ANNOTATIONS) and when the
+selected analysis changes (GET_DOCUMENT_ANNOTATIONS_ONLY), copied from
+frontend/src/graphql/queries.ts.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from graphene.test import Client
+from graphql_relay import to_global_id
+
+from config.graphql.schema import schema
+from opencontractserver.documents.models import DocumentPath
+
+DOCUMENT_KNOWLEDGE_AND_ANNOTATIONS = """
+  query GetDocumentKnowledgeAndAnnotations(
+    $documentId: String!
+    $corpusId: ID!
+    $analysisId: ID
+  ) {
+    document(id: $documentId) {
+      id
+      title
+      fileType
+      creator {
+        id
+        email
+      }
+      created
+      mdSummaryFile
+      pdfFile
+      pdfFileHash
+      txtExtractFile
+      pawlsParseFile
+      myPermissions
+      allNotes(corpusId: $corpusId) {
+        id
+        title
+        content
+        created
+        creator {
+          id
+          email
+        }
+      }
+      allDocRelationships(corpusId: $corpusId) {
+        id
+        relationshipType
+        sourceDocument {
+          id
+          title
+          fileType
+        }
+        targetDocument {
+          id
+          title
+          fileType
+        }
+        created
+      }
+
+      allStructuralAnnotations {
+        id
+        page
+        parent {
+          id
+        }
+        annotationLabel {
+          id
+          text
+          color
+          icon
+          description
+          labelType
+        }
+        annotationType
+        rawText
+        json
+        myPermissions
+        structural
+      }
+      allAnnotations(corpusId: $corpusId, analysisId: $analysisId) {
+        id
+        page
+        analysis {
+          id
+        }
+        annotationLabel {
+          id
+          text
+          color
+          icon
+          description
+          labelType
+        }
+        userFeedback {
+          edges {
+            node {
+              id
+              approved
+              rejected
+            }
+          }
+          totalCount
+        }
+        annotationType
+        rawText
+        json
+        myPermissions
+        structural
+      }
+      allRelationships(corpusId: $corpusId, analysisId: $analysisId) {
+        id
+        structural
+        relationshipLabel {
+          id
+          text
+          color
+          icon
+          description
+        }
+        sourceAnnotations {
+          edges {
+            node {
+              id
+            }
+          }
+        }
+        targetAnnotations {
+          edges {
+            node {
+              id
+            }
+          }
+        }
+      }
+    }
+    corpus(id: $corpusId) {
+      id
+      myPermissions
+      labelSet {
+        id
+        allAnnotationLabels {
+          id
+          text
+          color
+          icon
+          description
+          labelType
+        }
+      }
+    }
+  }
+"""
+
+DOCUMENT_ANNOTATIONS_ONLY = """
+  query GetDocumentAnnotationsOnly(
+    $documentId: String!
+    $corpusId: ID!
+    $analysisId: ID
+  ) {
+    document(id: $documentId) {
+      id
+      allStructuralAnnotations {
+        id
+        page
+        parent {
+          id
+        }
+        annotationLabel {
+          id
+          text
+          color
+          icon
+          description
+          labelType
+        }
+        annotationType
+        rawText
+        json
+        myPermissions
+        structural
+      }
+      allAnnotations(corpusId: $corpusId, analysisId: $analysisId) {
+        id
+        page
+        analysis {
+          id
+        }
+        annotationLabel {
+          id
+          text
+          color
+          icon
+          description
+          labelType
+        }
+        userFeedback {
+          edges {
+            node {
+              id
+              approved
+              rejected
+            }
+          }
+          totalCount
+        }
+        annotationType
+        rawText
+        json
+        myPermissions
+        structural
+      }
+      allRelationships(corpusId: $corpusId, analysisId: $analysisId) {
+        id
+        structural
+        relationshipLabel {
+          id
+          text
+          color
+          icon
+          description
+        }
+        sourceAnnotations {
+          edges {
+            node {
+              id
+            }
+          }
+        }
+        targetAnnotations {
+          edges {
+            node {
+              id
+            }
+          }
+        }
+      }
+    }
+  }
+"""
+
+QUERIES = {
+    "knowledge_and_annotations": DOCUMENT_KNOWLEDGE_AND_ANNOTATIONS,
+    "annotations_only": DOCUMENT_ANNOTATIONS_ONLY,
+}
+
+
+@pytest.mark.parametrize("query_name", list(QUERIES))
+def test_document_viewer_query(bench, bench_user, synthetic_corpus, query_name):
+    document_id = (
+        DocumentPath.objects.filter(corpus=synthetic_corpus)
+        .order_by("id")
+        .values_list("document_id", flat=True)
+        .first()
+    )
+    client = Client(schema)
+    variables = {
+        "documentId": to_global_id("DocumentType", document_id),
+        "corpusId": to_global_id("CorpusType", synthetic_corpus.id),
+    }
+
+    result = bench(
+        client.execute,
+        QUERIES[query_name],
+        variables=variables,
+        context_value=SimpleNamespace(user=bench_user),
+    )
+
+    assert "errors" not in result, result.get("errors")
+    assert result["data"]["document"]["allAnnotations"]
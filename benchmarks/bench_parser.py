@@ -0,0 +1,34 @@
+"""Ingestion: BaseParser.save_parsed_data for one synthetic document."""
+
+import itertools
+
+import pytest
+
+from .fakes import HASH_EMBEDDER_PATH, SyntheticParser
+from .synthetic import analyze_tables, create_corpus, create_source_document
+
+
+@pytest.mark.parametrize("in_corpus", [False, True], ids=["standalone", "corpus"])
+def test_save_parsed_data(bench, bench_user, scale, in_corpus):
+    parser = SyntheticParser()
+    corpus_id = None
+    if in_corpus:
+        corpus_id = create_corpus(bench_user, "Ingestion", HASH_EMBEDDER_PATH).id
+    indices = itertools.count()
+
+    def parse_new_document():
+        index = next(indices)
+        document = create_source_document(bench_user, index)
+        parsed = parser.parse_document(
+            bench_user.id,
+            document.id,
+            seed=index,
+            pages=scale["pages"],
+            annotations_per_page=scale["annotations_per_page"],
+            relationships=scale["relationships"],
+        )
+        analyze_tables()
+        return bench_user.id, document.id, parsed
+
+    bench.extra["annotations"] = scale["pages"] * scale["annotations_per_page"]
+    bench(parser.save_parsed_data, setup=parse_new_document, corpus_id=corpus_id)
@@ -0,0 +1,124 @@
+"""
+Redaction: the PDFRedactor post-processor over a synthetic multi-document
+export, against rasterizing every page of every document one after another
+(how exports were redacted before redaction went page-level).
+
+Only every REDACTED_PAGE_STRIDE-th page carries redaction spans. Besides
+wall time, each result's "extra" holds the peak RSS of this process and the
+largest peak RSS of its child processes (poppler).
+"""
+
+import io
+import resource
+import shutil
+import zipfile
+
+import pytest
+from pdfredact import build_text_redacted_pdf, redact_pdf_to_images
+
+from opencontractserver.pipeline.post_processors.pdf_redactor import PDFRedactor
+from opencontractserver.task_profiling.signals import _peak_rss_kb, _reset_peak_rss
+from opencontractserver.utils.pdf_redaction import (
+    REDACTION_DPI,
+    group_redactions_by_page,
+)
+
+from .synthetic import build_parsed_document, build_text_pdf
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("pdftoppm") is None, reason="poppler is required to rasterize pages"
+)
+
+REDACTED_PAGE_STRIDE = 3
+
+
+@pytest.fixture(scope="module")
+def redaction_export(scale):
+    """Export ZIP and data.json contents for scale["documents"] synthetic PDFs."""
+    annotated_docs = {}
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for index in range(scale["documents"]):
+            parsed = build_parsed_document(
+                seed=index,
+                pages=scale["pages"],
+                annotations_per_page=scale["annotations_per_page"],
+                relationships=0,
+            )
+            parsed["labelled_text"] = [
+                annotation
+                for annotation in parsed["labelled_text"]
+                if annotation["page"] % REDACTED_PAGE_STRIDE == 0
+            ]
+            filename = f"synthetic_{index}.pdf"
+            zf.writestr(filename, build_text_pdf(parsed["pawls_file_content"]))
+            annotated_docs[filename] = parsed
+    export_data = {
+        "annotated_docs": annotated_docs,
+        "corpus": {},
+        "label_set": {},
+        "doc_labels": {},
+        "text_labels": {},
+    }
+    return zip_buffer.getvalue(), export_data
+
+
+def _record_memory(bench, func, *args, **kwargs):
+    _reset_peak_rss()
+    result = bench(func, *args, **kwargs)
+    bench.extra["peak_rss_kb"] = _peak_rss_kb()
+    bench.extra["children_peak_rss_kb"] = resource.getrusage(
+        resource.RUSAGE_CHILDREN
+    ).ru_maxrss
+    return result
+
+
+def _redact_whole_documents(zip_bytes: bytes, export_data: dict) -> bytes:
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as input_zip, zipfile.ZipFile(
+        output, "w", compression=zipfile.ZIP_DEFLATED
+    ) as output_zip:
+        for filename in input_zip.namelist():
+            doc_data = export_data["annotated_docs"][filename]
+            pawls_pages = doc_data["pawls_file_content"]
+            page_redactions = group_redactions_by_page(
+                doc_data["labelled_text"], len(pawls_pages)
+            )
+            images = redact_pdf_to_images(
+                pdf_bytes=input_zip.read(filename),
+                pawls_pages=pawls_pages,
+                page_annotations=page_redactions,
+                dpi=REDACTION_DPI,
+            )
+            redacted = io.BytesIO()
+            build_text_redacted_pdf(
+                output_pdf=redacted,
+                redacted_images=images,
+                pawls_pages=pawls_pages,
+                page_redactions=page_redactions,
+                dpi=REDACTION_DPI,
+                hide_text=True,
+            )
+            output_zip.writestr(filename, redacted.getvalue())
+    return output.getvalue()
+
+
+def test_redact_whole_documents_serially(bench, redaction_export, scale):
+    zip_bytes, export_data = redaction_export
+    bench.extra["documents"] = scale["documents"]
+    _record_memory(bench, _redact_whole_documents, zip_bytes, export_data)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_pdf_redactor_page_level(bench, redaction_export, scale, max_workers):
+    zip_bytes, export_data = redaction_export
+    bench.extra["documents"] = scale["documents"]
+    redactor = PDFRedactor()
+    output, _ = _record_memory(
+        bench,
+        redactor.process_export,
+        zip_bytes,
+        export_data,
+        max_workers=max_workers,
+    )
+    assert output != zip_bytes
@@ -0,0 +1,63 @@
+"""
+Pipeline component resolution: the lookups ingest_doc, the embedding helpers
+and the pipeline component queries make, warm and from a cold registry.
+"""
+
+import pytest
+
+from opencontractserver.pipeline.registry import get_registry, reset_registry
+from opencontractserver.pipeline.utils import (
+    get_all_parsers,
+    get_component_by_name,
+    get_components_by_mimetype,
+    get_default_embedder,
+)
+
+from .fakes import HASH_EMBEDDER_PATH
+
+LOOKUPS = 1000
+
+
+def _resolve_many(resolve, *args):
+    for _ in range(LOOKUPS):
+        result = resolve(*args)
+    return result
+
+
+@pytest.mark.parametrize("lookup", ["class_path", "script_name", "outside_package"])
+def test_get_component_by_name(bench, db, lookup):
+    parser = get_registry().parsers[0]
+    names = {
+        "class_path": parser.class_name,
+        "script_name": parser.component_class.__module__.rsplit(".", 1)[-1],
+        "outside_package": HASH_EMBEDDER_PATH,
+    }
+
+    bench.extra["lookups"] = LOOKUPS
+    assert bench(_resolve_many, get_component_by_name, names[lookup]) is not None
+
+
+def test_get_default_embedder(bench, db):
+    bench.extra["lookups"] = LOOKUPS
+    assert bench(_resolve_many, get_default_embedder).__name__ == "HashEmbedder"
+
+
+def test_get_components_by_mimetype(bench, db):
+    bench.extra["lookups"] = LOOKUPS
+    components = bench(
+        _resolve_many, get_components_by_mimetype, "application/pdf", True
+    )
+    assert components["parsers"]
+
+
+def _cold_registry() -> tuple:
+    reset_registry()
+    return ()
+
+
+def test_cold_discovery(bench, db):
+    """
+    The scan paid once per process by the first lookup. Component modules
+    stay imported between rounds, so this excludes their import time.
+    """
+    assert bench(get_all_parsers, setup=_cold_registry)
@@ -0,0 +1,42 @@
+"""Vector search: CoreAnnotationVectorStore.search over a synthetic corpus."""
+
+import pytest
+
+from opencontractserver.annotations.models import Annotation
+from opencontractserver.documents.models import DocumentPath
+from opencontractserver.llms.vector_stores.core_vector_stores import (
+    CoreAnnotationVectorStore,
+    VectorSearchQuery,
+)
+
+from .fakes import HASH_EMBEDDER_PATH
+
+QUERY = "termination notice and limitation of liability"
+
+
+@pytest.mark.parametrize("scope", ["corpus", "document"])
+def test_search(bench, bench_user, synthetic_corpus, scope):
+    document_id = None
+    if scope == "document":
+        document_id = (
+            DocumentPath.objects.filter(corpus=synthetic_corpus)
+            .order_by("id")
+            .values_list("document_id", flat=True)
+            .first()
+        )
+    store = CoreAnnotationVectorStore(
+        user_id=bench_user.id,
+        corpus_id=synthetic_corpus.id,
+        document_id=document_id,
+        embedder_path=HASH_EMBEDDER_PATH,
+        embed_dim=384,
+    )
+
+    bench.extra["annotations"] = Annotation.objects.filter(
+        corpus=synthetic_corpus
+    ).count()
+    results = bench(
+        store.search, VectorSearchQuery(query_text=QUERY, similarity_top_k=10)
+    )
+
+    assert len(results) == 10
@@ -0,0 +1,88 @@
+"""
+Compare two benchmark result files, e.g. from the base and head of a branch.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold PCT]
+
+Prints the median wall time and SQL query count of every benchmark in both
+files and exits with status 1 when a benchmark's median got more than
+--threshold percent slower (default 10) or it runs more queries.
+"""
+
+import argparse
+import json
+import sys
+
+
+def _load(path: str) -> dict:
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[list, bool]:
+    """Return table rows for benchmarks present in both reports and whether any regressed."""
+    baseline_by_name = {result["name"]: result for result in baseline["benchmarks"]}
+    rows = []
+    regressed = False
+    for result in candidate["benchmarks"]:
+        before = baseline_by_name.get(result["name"])
+        if before is None:
+            continue
+        before_ms = before["wall_ms"]["median"]
+        after_ms = result["wall_ms"]["median"]
+        change = (after_ms - before_ms) / before_ms * 100 if before_ms else 0.0
+        slower = change > threshold
+        more_queries = result["queries"] > before["queries"]
+        regressed = regressed or slower or more_queries
+        rows.append(
+            (
+                result["name"],
+                before_ms,
+                after_ms,
+                change,
+                before["queries"],
+                result["queries"],
+                "REGRESSED" if slower or more_queries else "",
+            )
+        )
+    return rows, regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Allowed median slowdown in percent (default: 10)",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = _load(args.baseline)
+    candidate = _load(args.candidate)
+    if baseline["scale"] != candidate["scale"]:
+        print(
+            f"warning: scales differ ({baseline['scale']['name']} vs "
+            f"{candidate['scale']['name']})",
+            file=sys.stderr,
+        )
+
+    rows, regressed = compare(baseline, candidate, args.threshold)
+    width = max([len("benchmark")] + [len(row[0]) for row in rows])
+    print(
+        f"{'benchmark':<{width}} {'base ms':>10} {'head ms':>10} {'change':>8} "
+        f"{'base q':>7} {'head q':>7}"
+    )
+    for name, before_ms, after_ms, change, before_q, after_q, flag in rows:
+        print(
+            f"{name:<{width}} {before_ms:>10.1f} {after_ms:>10.1f} {change:>+7.1f}% "
+            f"{before_q:>7} {after_q:>7}  {flag}"
+        )
+    print(f"\n{baseline['commit'][:12]} -> {candidate['commit'][:12]}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
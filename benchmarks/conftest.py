@@ -0,0 +1,219 @@
+"""
+pytest plugin for the offline benchmark suite.
+
+Benchmarks live in bench_*.py files and are only collected when this
+directory is passed to pytest explicitly, so the regular test run skips
+them. Run them from the repository root against the local Postgres:
+
+    pytest benchmarks/ --bench-scale=medium --bench-json=after.json
+    python -m benchmarks.compare before.json after.json
+
+Each benchmark runs once to warm up, then --bench-rounds timed rounds. The
+JSON results hold the commit, the scale, and for every benchmark its wall
+time statistics and the SQL queries it ran per round.
+"""
+
+import json
+import platform
+import re
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+
+from opencontractserver.shared.db_utils import QueryTimer
+
+from .fakes import HASH_EMBEDDER_PATH
+from .synthetic import build_synthetic_corpus, parse_scale
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+
+_results_key = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--bench-scale",
+        default="small",
+        help='Synthetic data scale: small, medium or large, optionally with overrides, e.g. "small,documents=50"',
+    )
+    group.addoption(
+        "--bench-rounds",
+        type=int,
+        default=5,
+        help="Timed rounds per benchmark (default: 5)",
+    )
+    group.addoption(
+        "--bench-json",
+        help="Results file (default: benchmarks/results/<commit>-<scale>.json)",
+    )
+
+
+def pytest_configure(config):
+    config.stash[_results_key] = {"postgres": None, "benchmarks": []}
+
+
+def _benchmarks_requested(config) -> bool:
+    """Whether benchmarks/ or a file in it was given on the command line."""
+    for arg in config.args:
+        path = (config.invocation_params.dir / arg.split("::")[0]).resolve()
+        if path == BENCHMARKS_DIR or BENCHMARKS_DIR in path.parents:
+            return True
+    return False
+
+
+def pytest_collect_file(file_path, parent):
+    if (
+        file_path.suffix == ".py"
+        and file_path.name.startswith("bench_")
+        and _benchmarks_requested(parent.config)
+        # pytest itself collects files given on the command line
+        and not parent.session.isinitpath(file_path)
+    ):
+        return pytest.Module.from_parent(parent, path=file_path)
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def pytest_sessionfinish(session, exitstatus):
+    results = session.config.stash.get(_results_key, None)
+    if not results or not results["benchmarks"]:
+        return
+
+    scale = parse_scale(session.config.getoption("bench_scale"))
+    commit = _git("rev-parse", "HEAD")
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+
+    path = session.config.getoption("bench_json")
+    if not path:
+        scale_slug = re.sub(r"[^A-Za-z0-9]+", "_", scale["name"])
+        path = (
+            BENCHMARKS_DIR / "results" / f"{commit[:12] or 'unknown'}-{scale_slug}.json"
+        )
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "postgres": results["postgres"],
+        "scale": scale,
+        "rounds": session.config.getoption("bench_rounds"),
+        "benchmarks": sorted(results["benchmarks"], key=lambda result: result["name"]),
+    }
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    session.config.get_terminal_writer().line(f"Benchmark results written to {path}")
+
+
+class Benchmark:
+    """
+    Times a callable over several rounds, counting the SQL it runs.
+
+    ``setup``, when given, runs untimed before every round and its return
+    value (a tuple) is passed to the callable as leading positional args.
+    Anything put in ``extra`` is stored with the result.
+    """
+
+    def __init__(self, name: str, rounds: int, results: dict):
+        self.name = name
+        self.rounds = rounds
+        self.extra = {}
+        self._results = results
+
+    def __call__(self, func, *args, setup=None, **kwargs):
+        wall_ms, queries, db_ms = [], [], []
+        result = None
+        for round_number in range(self.rounds + 1):
+            call_args = (*setup(), *args) if setup else args
+            timer = QueryTimer()
+            with connection.execute_wrapper(timer):
+                start = time.perf_counter()
+                result = func(*call_args, **kwargs)
+                elapsed = time.perf_counter() - start
+            if round_number == 0:
+                continue  # warm-up
+            wall_ms.append(elapsed * 1000)
+            queries.append(timer.queries)
+            db_ms.append(timer.seconds * 1000)
+
+        self._results["postgres"] = connection.pg_version
+        self._results["benchmarks"].append(
+            {
+                "name": self.name,
+                "rounds": self.rounds,
+                "wall_ms": {
+                    "min": round(min(wall_ms), 3),
+                    "median": round(statistics.median(wall_ms), 3),
+                    "mean": round(statistics.mean(wall_ms), 3),
+                    "max": round(max(wall_ms), 3),
+                    "stddev": round(statistics.pstdev(wall_ms), 3),
+                },
+                "queries": round(statistics.median(queries)),
+                "db_ms": round(statistics.median(db_ms), 3),
+                "extra": self.extra,
+            }
+        )
+        return result
+
+
+@pytest.fixture
+def bench(request):
+    """Benchmark a callable; see Benchmark."""
+    rounds = request.config.getoption("bench_rounds")
+    if rounds < 1:
+        raise pytest.UsageError("--bench-rounds must be at least 1")
+    name = f"{Path(request.node.fspath).stem}::{request.node.name}"
+    return Benchmark(name, rounds, request.config.stash[_results_key])
+
+
+@pytest.fixture(scope="session")
+def scale(request) -> dict:
+    try:
+        return parse_scale(request.config.getoption("bench_scale"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+
+@pytest.fixture(autouse=True)
+def offline_embedder(settings):
+    """Route every embedding through HashEmbedder instead of the microservice."""
+    settings.DEFAULT_EMBEDDER = HASH_EMBEDDER_PATH
+    settings.PREFERRED_EMBEDDERS = {
+        mimetype: HASH_EMBEDDER_PATH for mimetype in settings.PREFERRED_EMBEDDERS
+    }
+    settings.DEFAULT_EMBEDDERS_BY_FILETYPE = {
+        mimetype: HASH_EMBEDDER_PATH
+        for mimetype in settings.DEFAULT_EMBEDDERS_BY_FILETYPE
+    }
+
+
+@pytest.fixture
+def bench_user(db):
+    return get_user_model().objects.create_user(
+        username="benchmark", password="benchmark"
+    )
+
+
+@pytest.fixture
+def synthetic_corpus(bench_user, scale):
+    return build_synthetic_corpus(bench_user, scale, HASH_EMBEDDER_PATH)
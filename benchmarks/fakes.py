@@ -0,0 +1,58 @@
+"""
+Offline stand-ins for the pipeline components the benchmarks exercise.
+
+HashEmbedder turns text into a deterministic 384-dimensional bag-of-words
+vector, so vector search works without the embeddings microservice and
+returns the same ranking on every run. SyntheticParser "parses" a document
+into the synthetic data built by benchmarks.synthetic.
+"""
+
+import hashlib
+import math
+from typing import Optional
+
+from opencontractserver.pipeline.base.embedder import BaseEmbedder
+from opencontractserver.pipeline.base.file_types import FileTypeEnum
+from opencontractserver.pipeline.base.parser import BaseParser
+from opencontractserver.types.dicts import OpenContractDocExport
+
+from .synthetic import build_parsed_document
+
+HASH_EMBEDDER_PATH = "benchmarks.fakes.HashEmbedder"
+
+
+class HashEmbedder(BaseEmbedder):
+    title = "Hash Embedder"
+    description = "Deterministic bag-of-words embeddings for offline benchmarks."
+    author = "OpenContracts"
+    vector_size = 384
+    supported_file_types = [FileTypeEnum.PDF, FileTypeEnum.TXT, FileTypeEnum.DOCX]
+
+    def _embed_text_impl(self, text: str, **all_kwargs) -> Optional[list[float]]:
+        vector = [0.0] * self.vector_size
+        for word in text.lower().split():
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.vector_size
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+
+        norm = math.sqrt(sum(value * value for value in vector))
+        if not norm:
+            return None
+        return [value / norm for value in vector]
+
+
+class SyntheticParser(BaseParser):
+    title = "Synthetic Parser"
+    description = "Returns generated PAWLS tokens, annotations and relationships."
+    author = "OpenContracts"
+    supported_file_types = [FileTypeEnum.PDF]
+
+    def _parse_document_impl(
+        self, user_id: int, doc_id: int, **all_kwargs
+    ) -> Optional[OpenContractDocExport]:
+        return build_parsed_document(
+            seed=all_kwargs.get("seed", doc_id),
+            pages=all_kwargs.get("pages", 1),
+            annotations_per_page=all_kwargs.get("annotations_per_page", 1),
+            relationships=all_kwargs.get("relationships", 0),
+        )
@@ -0,0 +1,285 @@
+"""
+Deterministic synthetic documents and corpora for the benchmarks.
+
+Sizes come from a scale: one of the named SCALES, optionally followed by
+key=value overrides, e.g. "medium" or "small,documents=50,pages=2".
+"""
+
+import io
+import random
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.utils import timezone
+
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.documents.models import Document
+from opencontractserver.types.dicts import (
+    OpenContractDocExport,
+    OpenContractsAnnotationPythonType,
+    OpenContractsRelationshipPythonType,
+    PawlsPagePythonType,
+)
+from opencontractserver.types.enums import PermissionTypes
+from opencontractserver.utils.permissioning import set_permissions_for_obj_to_user
+
+SCALES = {
+    "small": {
+        "documents": 5,
+        "pages": 3,
+        "annotations_per_page": 10,
+        "relationships": 5,
+    },
+    "medium": {
+        "documents": 20,
+        "pages": 5,
+        "annotations_per_page": 20,
+        "relationships": 20,
+    },
+    "large": {
+        "documents": 50,
+        "pages": 10,
+        "annotations_per_page": 40,
+        "relationships": 50,
+    },
+}
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+LINES_PER_PAGE = 40
+WORDS_PER_LINE = 12
+WORDS_PER_ANNOTATION = 8
+
+WORDS = (
+    "agreement party parties shall herein thereof pursuant notwithstanding "
+    "indemnify indemnification liability limitation termination term renewal "
+    "confidential information disclosure obligation obligations warranty "
+    "warranties representation covenant breach remedy remedies assignment "
+    "governing law jurisdiction arbitration dispute notice payment fees invoice "
+    "license licensor licensee intellectual property ownership audit insurance "
+    "force majeure severability waiver amendment counterpart effective date "
+    "supplier customer services deliverables acceptance schedule exhibit"
+).split()
+
+SECTION_LABEL = "Section"
+CLAUSE_LABEL = "Clause"
+RELATIONSHIP_LABEL = "References"
+
+# Smallest valid one-page PDF; exports copy the bytes, nothing renders them.
+MINIMAL_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj <</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj <</Type/Pages/Count 1/Kids[3 0 R]>>endobj\n"
+    b"3 0 obj <</Type/Page/Parent 2 0 R/Resources<<>>/MediaBox[0 0 612 792]>>endobj\n"
+    b"xref\n0 4\n0000000000 65535 f\n0000000009 00000 n\n0000000056 00000 n\n"
+    b"0000000115 00000 n\ntrailer <</Size 4/Root 1 0 R>>\nstartxref\n204\n%%EOF\n"
+)
+
+
+def parse_scale(spec: str) -> dict:
+    """Resolve a scale spec like "medium,documents=50" into a dict of sizes."""
+    name, *overrides = [part.strip() for part in spec.split(",") if part.strip()]
+    if name not in SCALES:
+        raise ValueError(f"Unknown benchmark scale {name!r}; use one of {list(SCALES)}")
+
+    scale = {"name": spec, **SCALES[name]}
+    for override in overrides:
+        key, _, value = override.partition("=")
+        if key not in SCALES[name]:
+            raise ValueError(f"Unknown benchmark scale parameter {key!r}")
+        scale[key] = int(value)
+    return scale
+
+
+def _build_page(rng: random.Random, index: int) -> PawlsPagePythonType:
+    line_height = PAGE_HEIGHT / (LINES_PER_PAGE + 2)
+    word_width = PAGE_WIDTH / (WORDS_PER_LINE + 2)
+    tokens = [
+        {
+            "x": (column + 1) * word_width,
+            "y": (line + 1) * line_height,
+            "width": word_width * 0.8,
+            "height": line_height * 0.8,
+            "text": rng.choice(WORDS),
+        }
+        for line in range(LINES_PER_PAGE)
+        for column in range(WORDS_PER_LINE)
+    ]
+    return {
+        "page": {"width": PAGE_WIDTH, "height": PAGE_HEIGHT, "index": index},
+        "tokens": tokens,
+    }
+
+
+def _build_annotation(
+    page: PawlsPagePythonType,
+    first_token: int,
+    annotation_id: str,
+    label: str,
+    parent_id: str | None,
+) -> OpenContractsAnnotationPythonType:
+    page_index = page["page"]["index"]
+    token_indices = range(first_token, first_token + WORDS_PER_ANNOTATION)
+    tokens = [page["tokens"][i] for i in token_indices]
+    raw_text = " ".join(token["text"] for token in tokens)
+    return {
+        "id": annotation_id,
+        "annotationLabel": label,
+        "rawText": raw_text,
+        "page": page_index,
+        "annotation_json": {
+            page_index: {
+                "bounds": {
+                    "top": min(token["y"] for token in tokens),
+                    "bottom": max(token["y"] + token["height"] for token in tokens),
+                    "left": min(token["x"] for token in tokens),
+                    "right": max(token["x"] + token["width"] for token in tokens),
+                },
+                "tokensJsons": [
+                    {"pageIndex": page_index, "tokenIndex": i} for i in token_indices
+                ],
+                "rawText": raw_text,
+            }
+        },
+        "parent_id": parent_id,
+        "annotation_type": None,
+        "structural": label == SECTION_LABEL,
+    }
+
+
+def build_parsed_document(
+    seed: int, pages: int, annotations_per_page: int, relationships: int
+) -> OpenContractDocExport:
+    """
+    Build parser output for a synthetic document: PAWLS tokens for every page,
+    one structural section annotation per page parenting the page's clause
+    annotations, and relationships between consecutive clauses.
+    """
+    rng = random.Random(seed)
+    token_count = LINES_PER_PAGE * WORDS_PER_LINE
+    pawls_pages = [_build_page(rng, index) for index in range(pages)]
+
+    annotations = []
+    clause_ids = []
+    for page in pawls_pages:
+        page_index = page["page"]["index"]
+        section_id = f"p{page_index}-section"
+        annotations.append(_build_annotation(page, 0, section_id, SECTION_LABEL, None))
+        for i in range(1, annotations_per_page):
+            clause_id = f"p{page_index}-clause{i}"
+            first_token = rng.randrange(token_count - WORDS_PER_ANNOTATION)
+            annotations.append(
+                _build_annotation(
+                    page, first_token, clause_id, CLAUSE_LABEL, section_id
+                )
+            )
+            clause_ids.append(clause_id)
+
+    relationship_data: list[OpenContractsRelationshipPythonType] = [
+        {
+            "id": f"rel{i}",
+            "relationshipLabel": RELATIONSHIP_LABEL,
+            "source_annotation_ids": [clause_ids[i]],
+            "target_annotation_ids": [clause_ids[i + 1]],
+            "structural": False,
+        }
+        for i in range(min(relationships, len(clause_ids) - 1))
+    ]
+
+    content = "\n".join(
+        " ".join(token["text"] for token in page["tokens"]) for page in pawls_pages
+    )
+    return {
+        "title": f"Synthetic document {seed}",
+        "content": content,
+        "description": "Generated for benchmarks",
+        "pawls_file_content": pawls_pages,
+        "page_count": pages,
+        "doc_labels": [],
+        "labelled_text": annotations,
+        "relationships": relationship_data,
+    }
+
+
+def build_text_pdf(pawls_pages: list[PawlsPagePythonType]) -> bytes:
+    """Render the tokens of PAWLS pages into a PDF with a real text layer."""
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    for page in pawls_pages:
+        pdf.setFont("Helvetica", 10)
+        for token in page["tokens"]:
+            # PAWLS y grows downwards from the top of the page
+            pdf.drawString(
+                token["x"], PAGE_HEIGHT - token["y"] - token["height"], token["text"]
+            )
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def create_source_document(user, index: int):
+    """Create an unparsed PDF document the way an upload leaves it, minus the ingest tasks."""
+    document = Document.objects.create(
+        title=f"Synthetic document {index}",
+        description="Generated for benchmarks",
+        creator=user,
+        file_type="application/pdf",
+        pdf_file=ContentFile(MINIMAL_PDF, name=f"synthetic_{index}.pdf"),
+        pdf_file_hash=f"synthetic-{user.pk}-{index}",
+        # Marks processing as started so the ingest chain is not queued
+        processing_started=timezone.now(),
+        backend_lock=False,
+    )
+    set_permissions_for_obj_to_user(user, document, [PermissionTypes.ALL])
+    return document
+
+
+def create_corpus(user, title: str, embedder_path: str):
+    corpus = Corpus.objects.create(
+        title=title,
+        description="Generated for benchmarks",
+        creator=user,
+        preferred_embedder=embedder_path,
+    )
+    set_permissions_for_obj_to_user(user, corpus, [PermissionTypes.ALL])
+    return corpus
+
+
+def analyze_tables() -> None:
+    """
+    Refresh planner statistics. The benchmarks build their data inside the
+    test transaction, and without this Postgres plans against the empty
+    tables it last analyzed, which makes inserts get slower with every row.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def build_synthetic_corpus(user, scale: dict, embedder_path: str):
+    """
+    Create a corpus of scale["documents"] documents, each ingested through
+    SyntheticParser.save_parsed_data like a real parse would be.
+    """
+    from .fakes import SyntheticParser
+
+    corpus = create_corpus(user, f"Synthetic corpus ({scale['name']})", embedder_path)
+    parser = SyntheticParser()
+    for index in range(scale["documents"]):
+        document = create_source_document(user, index)
+        parsed = parser.parse_document(
+            user.id,
+            document.id,
+            seed=index,
+            pages=scale["pages"],
+            annotations_per_page=scale["annotations_per_page"],
+            relationships=scale["relationships"],
+        )
+        parser.save_parsed_data(user.id, document.id, parsed, corpus_id=corpus.id)
+        analyze_tables()
+
+    # save_parsed_data parses into the corpus' own copy of each document
+    for corpus_copy in Document.objects.filter(path_records__corpus=corpus):
+        set_permissions_for_obj_to_user(user, corpus_copy, [PermissionTypes.ALL])
+    return corpus
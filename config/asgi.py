@@ -32,6 +32,9 @@ from config.websocket.consumers.corpus_conversation import (  # noqa: E402
 from config.websocket.consumers.document_conversation import (  # noqa: E402
     DocumentQueryConsumer,
 )
+from config.websocket.consumers.notification_updates import (  # noqa: E402
+    NotificationUpdatesConsumer,
+)
 from config.websocket.consumers.standalone_document_conversation import (  # noqa: E402
     StandaloneDocumentQueryConsumer,
 )
@@ -82,11 +85,18 @@ thread_updates_pattern = re_path(
     ThreadUpdatesConsumer.as_asgi(),
 )
 
+# Notification updates for the connected user (no parameters)
+notification_updates_pattern = re_path(
+    r"ws/notification-updates/$",
+    NotificationUpdatesConsumer.as_asgi(),
+)
+
 websocket_urlpatterns = [
     # NEW: Unified agent consumer (preferred for new integrations)
     unified_agent_query_pattern,
     # NEW: Thread updates consumer for agent mention streaming
     thread_updates_pattern,
+    notification_updates_pattern,
     # Legacy routes (kept for backwards compatibility)
     document_query_pattern,
     corpus_query_pattern,
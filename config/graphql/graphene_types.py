@@ -26,7 +26,11 @@ from opencontractserver.annotations.models import (
     NoteRevision,
     Relationship,
 )
-from opencontractserver.conversations.models import ChatMessage, Conversation
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    MessageStateChoices,
+)
 from opencontractserver.corpuses.models import (
     Corpus,
     CorpusAction,
@@ -633,6 +637,17 @@ class PageAwareAnnotationType(graphene.ObjectType):
     page_annotations = graphene.List(AnnotationType)
 
 
+class AnnotationKeysetPageType(graphene.ObjectType):
+    """One keyset page of annotations ordered by (page, id)."""
+
+    annotations = graphene.List(AnnotationType)
+    next_cursor = graphene.String(
+        description="Opaque cursor to pass as `after` for the next page; null on the last page"
+    )
+    has_next_page = graphene.Boolean()
+    page_size = graphene.Int(description="Effective (server-clamped) page size")
+
+
 class AnnotationLabelType(AnnotatePermissionsForReadMixin, DjangoObjectType):
     class Meta:
         model = AnnotationLabel
@@ -1627,6 +1642,9 @@ class CorpusEngagementMetricsType(graphene.ObjectType):
     avg_messages_per_thread = graphene.Float(
         description="Average number of messages per thread"
     )
+    total_annotations = graphene.Int(
+        description="Total number of non-structural annotations in this corpus"
+    )
 
     # Metadata
     last_updated = graphene.DateTime(
@@ -2137,6 +2155,12 @@ class MessageType(AnnotatePermissionsForReadMixin, DjangoObjectType):
         description="Current user's vote on this message: 'UPVOTE', 'DOWNVOTE', or null"
     )
 
+    def resolve_content(self, info):
+        """Include streamed deltas that have not been compacted yet."""
+        if self.state == MessageStateChoices.IN_PROGRESS:
+            return self.get_streamed_content()
+        return self.content
+
     def resolve_msg_type(self, info):
         """Convert msg_type to string for GraphQL enum compatibility."""
         if self.msg_type:
@@ -2826,6 +2850,12 @@ class LeaderboardType(graphene.ObjectType):
     current_user_rank = graphene.Int(
         description="Current user's rank in this leaderboard (null if not ranked)"
     )
+    computed_at = graphene.DateTime(
+        description="When the leaderboard was last computed"
+    )
+    is_stale = graphene.Boolean(
+        description="True if the leaderboard is older than its refresh interval"
+    )
 
 
 class BadgeDistributionType(graphene.ObjectType):
@@ -2869,3 +2899,11 @@ class CommunityStatsType(graphene.ObjectType):
     active_users_this_month = graphene.Int(
         description="Users who posted in last 30 days"
     )
+
+    # Snapshot metadata
+    computed_at = graphene.DateTime(
+        description="When the statistics were last computed"
+    )
+    is_stale = graphene.Boolean(
+        description="True if the statistics are older than their refresh interval"
+    )
@@ -0,0 +1,170 @@
+"""
+Per-resolver SQL and latency profiling for the GraphQL API.
+
+ResolverProfilingMiddleware samples GRAPHQL_PROFILING_SAMPLE_RATE of GraphQL
+operations. For every resolver of a sampled operation it records the number
+of SQL queries, the time spent in SQL and the wall time, aggregated per
+resolver path (the response path without list indices, e.g.
+"corpuses.edges.node.documents"). Top-level fields are always recorded,
+nested fields only when they ran SQL, since plain attribute lookups would
+only add noise.
+
+Aggregates live in a bounded in-process store (one per worker process) that
+keeps the GRAPHQL_PROFILING_MAX_PATHS most recently seen paths. Staff can
+read and reset it through ResolverProfileView; with GRAPHQL_PROFILING_LOG
+every sampled resolver call is also logged as a JSON line.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import QuerySet
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from opencontractserver.shared.db_utils import QueryTimer
+
+logger = logging.getLogger(__name__)
+
+SAMPLED_ATTR = "_resolver_profiling_sampled"
+
+
+class ResolverProfileStore:
+    """Thread-safe aggregates per resolver path, bounded to max_paths entries."""
+
+    def __init__(self, max_paths: int):
+        self.max_paths = max_paths
+        self._stats: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, path: str, queries: int, sql_ms: float, wall_ms: float) -> None:
+        with self._lock:
+            stats = self._stats.get(path)
+            if stats is None:
+                stats = self._stats[path] = {
+                    "calls": 0,
+                    "queries": 0,
+                    "sql_ms": 0.0,
+                    "wall_ms": 0.0,
+                    "max_queries": 0,
+                    "max_wall_ms": 0.0,
+                }
+                while len(self._stats) > self.max_paths:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(path)
+
+            stats["calls"] += 1
+            stats["queries"] += queries
+            stats["sql_ms"] += sql_ms
+            stats["wall_ms"] += wall_ms
+            stats["max_queries"] = max(stats["max_queries"], queries)
+            stats["max_wall_ms"] = max(stats["max_wall_ms"], wall_ms)
+
+    def snapshot(self) -> list[dict]:
+        """Aggregates per path, the paths running the most SQL first."""
+        with self._lock:
+            rows = [
+                {
+                    "path": path,
+                    **stats,
+                    "sql_ms": round(stats["sql_ms"], 3),
+                    "wall_ms": round(stats["wall_ms"], 3),
+                    "max_wall_ms": round(stats["max_wall_ms"], 3),
+                    "avg_queries": round(stats["queries"] / stats["calls"], 2),
+                }
+                for path, stats in self._stats.items()
+            ]
+        return sorted(rows, key=lambda row: (-row["queries"], -row["wall_ms"]))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+resolver_profile_store = ResolverProfileStore(settings.GRAPHQL_PROFILING_MAX_PATHS)
+
+
+class ResolverProfilingMiddleware:
+    """
+    Graphene middleware recording SQL and wall time per resolver path for a
+    sample of operations. Unsampled operations cost one attribute lookup per
+    resolver.
+    """
+
+    def __init__(self, store: ResolverProfileStore = None):
+        self.store = store or resolver_profile_store
+
+    def _is_sampled(self, context) -> bool:
+        sampled = getattr(context, SAMPLED_ATTR, None)
+        if sampled is None:
+            sampled = random.random() < settings.GRAPHQL_PROFILING_SAMPLE_RATE
+            setattr(context, SAMPLED_ATTR, sampled)
+        return sampled
+
+    def resolve(self, next, root, info, **kwargs):
+        if not self._is_sampled(info.context):
+            return next(root, info, **kwargs)
+
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            result = next(root, info, **kwargs)
+            # graphql-core iterates list results after the resolver returns;
+            # evaluate querysets here so their SQL is counted for this path.
+            if isinstance(result, QuerySet):
+                result._fetch_all()
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        if root is None or timer.queries:
+            path = ".".join(
+                str(key) for key in info.path.as_list() if not isinstance(key, int)
+            )
+            sql_ms = timer.seconds * 1000
+            self.store.record(path, timer.queries, sql_ms, wall_ms)
+            if settings.GRAPHQL_PROFILING_LOG:
+                logger.info(
+                    json.dumps(
+                        {
+                            "event": "graphql_resolver_profile",
+                            "operation": getattr(info.operation.name, "value", None),
+                            "path": path,
+                            "queries": timer.queries,
+                            "sql_ms": round(sql_ms, 3),
+                            "wall_ms": round(wall_ms, 3),
+                        }
+                    )
+                )
+        return result
+
+
+class ResolverProfileView(APIView):
+    """
+    Staff-only view of this worker's resolver profile.
+
+    GET returns the aggregates (the paths running the most SQL first), DELETE
+    clears them.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "sample_rate": settings.GRAPHQL_PROFILING_SAMPLE_RATE,
+                "max_paths": resolver_profile_store.max_paths,
+                "resolvers": resolver_profile_store.snapshot(),
+            }
+        )
+
+    def delete(self, request):
+        resolver_profile_store.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
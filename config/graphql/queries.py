@@ -42,6 +42,7 @@ from config.graphql.graphene_types import (
     AgentConfigurationType,
     AnalysisType,
     AnalyzerType,
+    AnnotationKeysetPageType,
     AnnotationLabelType,
     AnnotationType,
     AssignmentType,
@@ -97,8 +98,13 @@ from opencontractserver.annotations.models import (
     Note,
     Relationship,
 )
+from opencontractserver.annotations.streaming import (
+    InvalidCursorError,
+    bulk_annotations_queryset,
+    keyset_paginate_annotations,
+)
 from opencontractserver.badges.criteria_registry import BadgeCriteriaRegistry
-from opencontractserver.badges.models import Badge, UserBadge
+from opencontractserver.badges.models import Badge
 from opencontractserver.conversations.models import (
     ChatMessage,
     Conversation,
@@ -120,6 +126,17 @@ from opencontractserver.utils.permissioning import user_has_permission_for_obj
 logger = logging.getLogger(__name__)
 
 
+def _parse_analysis_pks(for_analysis_ids: Optional[str]) -> list[int]:
+    """Turn a comma-separated string of Analysis global ids into django pks."""
+    if not for_analysis_ids:
+        return []
+    return [
+        int(from_global_id(value)[1])
+        for value in for_analysis_ids.split(",")
+        if len(value) > 0
+    ]
+
+
 class MetadataCompletionStatusType(graphene.ObjectType):
     """Type for metadata completion status information."""
 
@@ -489,47 +506,21 @@ class Query(graphene.ObjectType):
 
         corpus_django_pk = from_global_id(corpus_id)[1]
 
-        # Get the base queryset using visible_to_user
-        queryset = Annotation.objects.visible_to_user(info.context.user).order_by(
-            "page"
-        )
-
-        # Now build query to stuff they want to see (filter to annotations in this corpus or with NO corpus FK, which
-        # travel with document.
-        q_objects = Q(corpus_id=corpus_django_pk) | Q(corpus_id__isnull=True)
-
-        # If for_analysis_ids is passed in, only show annotations from those analyses, otherwise only show human
-        # annotations.
-        for_analysis_ids = kwargs.get("for_analysis_ids", None)
-        if for_analysis_ids is not None and len(for_analysis_ids) > 0:
-            logger.info(
-                f"resolve_bulk_doc_annotations - Split ids: {for_analysis_ids.split(',')}"
-            )
-            analysis_pks = [
-                int(from_global_id(value)[1])
-                for value in list(
-                    filter(lambda raw_id: len(raw_id) > 0, for_analysis_ids.split(","))
-                )
-            ]
-            logger.info(f"resolve_bulk_doc_annotations - Analysis pks: {analysis_pks}")
-            q_objects.add(Q(analysis_id__in=analysis_pks), Q.AND)
-        # else:
-        #     q_objects.add(Q(analysis__isnull=True), Q.AND)
-
-        label_type = kwargs.get("label_type", None)
-        if label_type is not None:
-            q_objects.add(Q(annotation_label__label_type=label_type), Q.AND)
+        # If for_analysis_ids is passed in, only show annotations from those analyses, otherwise show everything
+        # visible (annotations in this corpus or with NO corpus FK, which travel with document).
+        analysis_pks = _parse_analysis_pks(kwargs.get("for_analysis_ids", None))
+        logger.info(f"resolve_bulk_doc_annotations - Analysis pks: {analysis_pks}")
 
         document_id = kwargs.get("document_id", None)
-        if document_id is not None:
-            doc_pk = from_global_id(document_id)[1]
-            q_objects.add(Q(document_id=doc_pk), Q.AND)
-
-        logger.info(f"Filter queryset {queryset} bulk annotations: {q_objects}")
-
-        final_queryset = queryset.filter(q_objects).order_by(
-            "created", "page"
-        )  # Existing filter/order
+        doc_pk = from_global_id(document_id)[1] if document_id is not None else None
+
+        final_queryset = bulk_annotations_queryset(
+            info.context.user,
+            corpus_django_pk,
+            document_pk=doc_pk,
+            analysis_pks=analysis_pks,
+            label_type=kwargs.get("label_type", None),
+        ).order_by("created", "page")
         final_queryset = final_queryset.select_related(
             "annotation_label",
             "creator",
@@ -541,6 +532,59 @@ class Query(graphene.ObjectType):
         )
         return final_queryset
 
+    bulk_doc_annotations_in_corpus_page = graphene.Field(
+        AnnotationKeysetPageType,
+        corpus_id=graphene.ID(required=True),
+        document_id=graphene.ID(required=True),
+        for_analysis_ids=graphene.String(required=False),
+        label_type=graphene.Argument(label_type_enum),
+        first=graphene.Int(
+            required=False,
+            description="Requested page size; clamped to BULK_ANNOTATION_PAGE_SIZE_MAX",
+        ),
+        after=graphene.String(
+            required=False, description="Cursor returned as nextCursor by a prior page"
+        ),
+    )
+
+    @graphql_ratelimit_dynamic(get_rate=get_user_tier_rate("READ_MEDIUM"))
+    def resolve_bulk_doc_annotations_in_corpus_page(
+        self, info, corpus_id, document_id, first=None, after=None, **kwargs
+    ):
+        """
+        Keyset-paginated variant of bulk_doc_annotations_in_corpus, ordered by
+        (page, id). Each page costs one bounded query no matter how deep the
+        client has paged.
+        """
+        queryset = bulk_annotations_queryset(
+            info.context.user,
+            from_global_id(corpus_id)[1],
+            document_pk=from_global_id(document_id)[1],
+            analysis_pks=_parse_analysis_pks(kwargs.get("for_analysis_ids", None)),
+            label_type=kwargs.get("label_type", None),
+        ).select_related(
+            "annotation_label",
+            "creator",
+            "document",
+            "corpus",
+            "analysis",
+            "analysis__analyzer",
+        )
+
+        try:
+            annotations, next_cursor, page_size = keyset_paginate_annotations(
+                queryset, first=first, after=after
+            )
+        except InvalidCursorError as e:
+            raise GraphQLError(str(e))
+
+        return AnnotationKeysetPageType(
+            annotations=annotations,
+            next_cursor=next_cursor,
+            has_next_page=next_cursor is not None,
+            page_size=page_size,
+        )
+
     page_annotations = graphene.Field(
         PageAwareAnnotationType,
         current_page=graphene.Int(required=False),
@@ -2841,6 +2885,11 @@ class Query(graphene.ObjectType):
         """
         Get leaderboard for a specific metric and scope.
 
+        Served from a precomputed LeaderboardSnapshot (see
+        opencontractserver/tasks/leaderboard_tasks.py). Global leaderboards
+        rank public activity, corpus leaderboards rank all activity in the
+        corpus, and only users with public profiles are ranked.
+
         Issue: #613 - Create leaderboard and community stats dashboard
         Epic: #572 - Social Features Epic
 
@@ -2848,26 +2897,25 @@ class Query(graphene.ObjectType):
             metric: The metric to rank by (BADGES, MESSAGES, THREADS, ANNOTATIONS, REPUTATION)
             scope: Time period (ALL_TIME, MONTHLY, WEEKLY)
             corpus_id: Optional corpus ID for corpus-specific leaderboards
-            limit: Maximum number of entries to return (default 25)
+            limit: Maximum number of entries to return (default 25, at most
+                LEADERBOARD_SNAPSHOT_SIZE)
 
         Returns:
-            LeaderboardType with ranked entries
+            LeaderboardType with ranked entries and snapshot freshness
         """
-        from datetime import datetime, timedelta
-
         from django.contrib.auth import get_user_model
-        from django.db.models import Count, Q
+        from django.contrib.auth.models import AnonymousUser
 
-        from opencontractserver.annotations.models import Annotation
+        from opencontractserver.tasks.leaderboard_tasks import (
+            get_leaderboard_snapshot,
+            is_snapshot_stale,
+        )
 
         User = get_user_model()
 
-        # Calculate date cutoff based on scope
-        cutoff_date = None
-        if scope == "weekly":
-            cutoff_date = datetime.now() - timedelta(days=7)
-        elif scope == "monthly":
-            cutoff_date = datetime.now() - timedelta(days=30)
+        # Graphene passes enum members; snapshots are keyed by their values
+        metric = getattr(metric, "value", metric)
+        scope = getattr(scope, "value", scope)
 
         # Get corpus if specified
         corpus_django_pk = None
@@ -2875,166 +2923,42 @@ class Query(graphene.ObjectType):
             try:
                 _, corpus_django_pk = from_global_id(corpus_id)
                 # Verify user has access to this corpus
-                Corpus.objects.visible_to_user(info.context.user).get(
-                    id=corpus_django_pk
+                corpus_django_pk = (
+                    Corpus.objects.visible_to_user(info.context.user)
+                    .get(id=corpus_django_pk)
+                    .id
                 )
             except Corpus.DoesNotExist:
                 raise GraphQLError("Corpus not found or access denied")
 
-        # Get visible users (respect privacy settings)
-        users = User.objects.visible_to_user(info.context.user).filter(is_active=True)
-
-        # Build query based on metric
-        entries = []
-        current_user = info.context.user
-
-        if metric == "badges":
-            # Count badges per user (UserBadge imported at top level)
-            badge_query = UserBadge.objects.filter(user__in=users)
-            if cutoff_date:
-                badge_query = badge_query.filter(awarded_at__gte=cutoff_date)
-            if corpus_django_pk:
-                badge_query = badge_query.filter(
-                    Q(corpus_id=corpus_django_pk) | Q(corpus__isnull=True)
-                )
-
-            user_badge_counts = (
-                badge_query.values("user")
-                .annotate(count=Count("id"))
-                .order_by("-count")[:limit]
-            )
-
-            for idx, item in enumerate(user_badge_counts, start=1):
-                user = User.objects.get(id=item["user"])
-                entries.append(
-                    LeaderboardEntryType(
-                        user=user,
-                        rank=idx,
-                        score=item["count"],
-                        badge_count=item["count"],
-                    )
-                )
-
-        elif metric == "messages":
-            # Count messages per user
-            # Filter by visible conversations since ChatMessage doesn't inherit conversation visibility
-            visible_conversations = Conversation.objects.visible_to_user(
-                info.context.user
-            )
-
-            message_query = ChatMessage.objects.filter(
-                creator__in=users,
-                msg_type=MessageTypeChoices.HUMAN,
-                conversation__in=visible_conversations,
-            )
-
-            if cutoff_date:
-                message_query = message_query.filter(created__gte=cutoff_date)
-            if corpus_django_pk:
-                message_query = message_query.filter(
-                    conversation__chat_with_corpus_id=corpus_django_pk
-                )
-
-            user_message_counts = (
-                message_query.values("creator")
-                .annotate(count=Count("id"))
-                .order_by("-count")[:limit]
-            )
-
-            for idx, item in enumerate(user_message_counts, start=1):
-                user = User.objects.get(id=item["creator"])
-                entries.append(
-                    LeaderboardEntryType(
-                        user=user,
-                        rank=idx,
-                        score=item["count"],
-                        message_count=item["count"],
-                    )
-                )
-
-        elif metric == "threads":
-            # Count threads created per user
-            thread_query = Conversation.objects.filter(
-                creator__in=users, conversation_type="thread"
-            ).visible_to_user(info.context.user)
-
-            if cutoff_date:
-                thread_query = thread_query.filter(created__gte=cutoff_date)
-            if corpus_django_pk:
-                thread_query = thread_query.filter(chat_with_corpus_id=corpus_django_pk)
-
-            user_thread_counts = (
-                thread_query.values("creator")
-                .annotate(count=Count("id"))
-                .order_by("-count")[:limit]
-            )
-
-            for idx, item in enumerate(user_thread_counts, start=1):
-                user = User.objects.get(id=item["creator"])
-                entries.append(
-                    LeaderboardEntryType(
-                        user=user,
-                        rank=idx,
-                        score=item["count"],
-                        thread_count=item["count"],
-                    )
-                )
-
-        elif metric == "annotations":
-            # Count annotations created per user
-            annotation_query = Annotation.objects.filter(
-                creator__in=users
-            ).visible_to_user(info.context.user)
-
-            if cutoff_date:
-                annotation_query = annotation_query.filter(created__gte=cutoff_date)
-            if corpus_django_pk:
-                annotation_query = annotation_query.filter(
-                    document__corpus__id=corpus_django_pk
-                )
+        snapshot = get_leaderboard_snapshot(metric, scope, corpus_django_pk)
 
-            user_annotation_counts = (
-                annotation_query.values("creator")
-                .annotate(count=Count("id"))
-                .order_by("-count")[:limit]
+        # Drop users whose profiles went private since the snapshot was taken
+        users = User.objects.visible_to_user(AnonymousUser()).in_bulk(
+            [user_id for user_id, _ in snapshot.entries]
+        )
+        ranked = [
+            (users[user_id], score)
+            for user_id, score in snapshot.entries
+            if user_id in users
+        ][:limit]
+
+        detail_field = {
+            "badges": "badge_count",
+            "messages": "message_count",
+            "threads": "thread_count",
+            "annotations": "annotation_count",
+            "reputation": "reputation",
+        }[metric]
+        entries = [
+            LeaderboardEntryType(
+                user=user, rank=rank, score=score, **{detail_field: score}
             )
-
-            for idx, item in enumerate(user_annotation_counts, start=1):
-                user = User.objects.get(id=item["creator"])
-                entries.append(
-                    LeaderboardEntryType(
-                        user=user,
-                        rank=idx,
-                        score=item["count"],
-                        annotation_count=item["count"],
-                    )
-                )
-
-        elif metric == "reputation":
-            # Get reputation scores
-            from opencontractserver.conversations.models import UserReputation
-
-            rep_query = UserReputation.objects.filter(user__in=users)
-            if corpus_django_pk:
-                rep_query = rep_query.filter(corpus_id=corpus_django_pk)
-            else:
-                rep_query = rep_query.filter(corpus__isnull=True)
-
-            top_reps = rep_query.select_related("user").order_by("-reputation_score")[
-                :limit
-            ]
-
-            for idx, rep in enumerate(top_reps, start=1):
-                entries.append(
-                    LeaderboardEntryType(
-                        user=rep.user,
-                        rank=idx,
-                        score=rep.reputation_score,
-                        reputation=rep.reputation_score,
-                    )
-                )
+            for rank, (user, score) in enumerate(ranked, start=1)
+        ]
 
         # Find current user's rank
+        current_user = info.context.user
         current_user_rank = None
         if current_user and current_user.is_authenticated:
             for entry in entries:
@@ -3049,12 +2973,17 @@ class Query(graphene.ObjectType):
             total_users=len(entries),
             entries=entries,
             current_user_rank=current_user_rank,
+            computed_at=snapshot.computed_at,
+            is_stale=is_snapshot_stale(snapshot.computed_at),
         )
 
     def resolve_community_stats(self, info, corpus_id=None):
         """
         Get overall community engagement statistics.
 
+        Served from a precomputed CommunityStatsSnapshot, under the same rules
+        as the leaderboard.
+
         Issue: #613 - Create leaderboard and community stats dashboard
         Epic: #572 - Social Features Epic
 
@@ -3062,18 +2991,12 @@ class Query(graphene.ObjectType):
             corpus_id: Optional corpus ID for corpus-specific stats
 
         Returns:
-            CommunityStatsType with engagement metrics
+            CommunityStatsType with engagement metrics and snapshot freshness
         """
-        from datetime import datetime, timedelta
-
-        from django.contrib.auth import get_user_model
-        from django.db.models import Count, Q
-
-        from opencontractserver.annotations.models import Annotation
-
-        # UserBadge is imported at top level
-
-        User = get_user_model()
+        from opencontractserver.tasks.leaderboard_tasks import (
+            get_community_stats_snapshot,
+            is_snapshot_stale,
+        )
 
         # Get corpus if specified
         corpus_django_pk = None
@@ -3081,106 +3004,43 @@ class Query(graphene.ObjectType):
             try:
                 _, corpus_django_pk = from_global_id(corpus_id)
                 # Verify user has access to this corpus
-                Corpus.objects.visible_to_user(info.context.user).get(
-                    id=corpus_django_pk
+                corpus_django_pk = (
+                    Corpus.objects.visible_to_user(info.context.user)
+                    .get(id=corpus_django_pk)
+                    .id
                 )
             except Corpus.DoesNotExist:
                 raise GraphQLError("Corpus not found or access denied")
 
-        # Calculate date cutoffs
-        week_ago = datetime.now() - timedelta(days=7)
-        month_ago = datetime.now() - timedelta(days=30)
+        snapshot = get_community_stats_snapshot(corpus_django_pk)
+        stats = snapshot.stats
 
-        # Get visible users
-        users = User.objects.visible_to_user(info.context.user).filter(is_active=True)
-        total_users = users.count()
-
-        # Total messages
-        # Filter by visible conversations since ChatMessage doesn't inherit conversation visibility
-        visible_conversations_stats = Conversation.objects.visible_to_user(
-            info.context.user
-        )
-        message_query = ChatMessage.objects.filter(
-            msg_type=MessageTypeChoices.HUMAN,
-            conversation__in=visible_conversations_stats,
+        badges = Badge.objects.in_bulk(
+            [badge_id for badge_id, _, _ in stats["badge_distribution"]]
         )
-        if corpus_django_pk:
-            message_query = message_query.filter(
-                conversation__chat_with_corpus_id=corpus_django_pk
-            )
-        total_messages = message_query.count()
-        messages_this_week = message_query.filter(created__gte=week_ago).count()
-        messages_this_month = message_query.filter(created__gte=month_ago).count()
-
-        # Active users (users who posted messages)
-        active_users_week = (
-            message_query.filter(created__gte=week_ago)
-            .values("creator")
-            .distinct()
-            .count()
-        )
-        active_users_month = (
-            message_query.filter(created__gte=month_ago)
-            .values("creator")
-            .distinct()
-            .count()
-        )
-
-        # Total threads
-        thread_query = Conversation.objects.filter(
-            conversation_type="thread"
-        ).visible_to_user(info.context.user)
-        if corpus_django_pk:
-            thread_query = thread_query.filter(chat_with_corpus_id=corpus_django_pk)
-        total_threads = thread_query.count()
-
-        # Total annotations
-        annotation_query = Annotation.objects.visible_to_user(info.context.user)
-        if corpus_django_pk:
-            annotation_query = annotation_query.filter(
-                document__corpus__id=corpus_django_pk
-            )
-        total_annotations = annotation_query.count()
-
-        # Total badges awarded
-        badge_query = UserBadge.objects.all()
-        if corpus_django_pk:
-            badge_query = badge_query.filter(
-                Q(corpus_id=corpus_django_pk) | Q(corpus__isnull=True)
-            )
-        total_badges_awarded = badge_query.count()
-
-        # Badge distribution
-        badge_distribution = []
-        badge_stats = (
-            badge_query.values("badge")
-            .annotate(
-                award_count=Count("id"), unique_recipients=Count("user", distinct=True)
-            )
-            .order_by("-award_count")[:10]
-        )
-
-        for stat in badge_stats:
-            badge = Badge.objects.get(id=stat["badge"])
-            badge_distribution.append(
-                BadgeDistributionType(
-                    badge=badge,
-                    award_count=stat["award_count"],
-                    unique_recipients=stat["unique_recipients"],
-                )
+        badge_distribution = [
+            BadgeDistributionType(
+                badge=badges[badge_id],
+                award_count=award_count,
+                unique_recipients=unique_recipients,
             )
+            for badge_id, award_count, unique_recipients in stats["badge_distribution"]
+            if badge_id in badges
+        ]
 
         return CommunityStatsType(
-            total_users=total_users,
-            total_messages=total_messages,
-            total_threads=total_threads,
-            total_annotations=total_annotations,
-            total_badges_awarded=total_badges_awarded,
+            total_users=stats["total_users"],
+            total_messages=stats["total_messages"],
+            total_threads=stats["total_threads"],
+            total_annotations=stats["total_annotations"],
+            total_badges_awarded=stats["total_badges_awarded"],
             badge_distribution=badge_distribution,
-            messages_this_week=messages_this_week,
-            messages_this_month=messages_this_month,
-            active_users_this_week=active_users_week,
-            active_users_this_month=active_users_month,
+            messages_this_week=stats["messages_this_week"],
+            messages_this_month=stats["messages_this_month"],
+            active_users_this_week=stats["active_users_this_week"],
+            active_users_this_month=stats["active_users_this_month"],
+            computed_at=snapshot.computed_at,
+            is_stale=is_snapshot_stale(snapshot.computed_at),
         )
 
     # DEBUG FIELD ########################################
@@ -156,6 +156,7 @@ LOCAL_APPS = [
     "opencontractserver.badges",
     "opencontractserver.notifications",
     "opencontractserver.agents",
+    "opencontractserver.task_profiling",
 ]
 
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -192,6 +193,23 @@ ALLOWED_DOCUMENT_MIMETYPES = [
     "application/txt",
 ]
 
+# BULK ANNOTATION ACCESS
+# ------------------------------------------------------------------------------
+# Page sizes for the keyset-paginated bulkDocAnnotationsInCorpusPage query. The
+# max is enforced server-side regardless of what the client requests.
+BULK_ANNOTATION_PAGE_SIZE_DEFAULT = env.int(
+    "BULK_ANNOTATION_PAGE_SIZE_DEFAULT", default=250
+)
+BULK_ANNOTATION_PAGE_SIZE_MAX = env.int("BULK_ANNOTATION_PAGE_SIZE_MAX", default=1000)
+# Rows fetched per server-side cursor round trip by the NDJSON annotation stream.
+ANNOTATION_STREAM_CHUNK_SIZE = env.int("ANNOTATION_STREAM_CHUNK_SIZE", default=2000)
+
+# CORPUS FOLDER TREE
+# ------------------------------------------------------------------------------
+# Seconds a corpus folder tree (with document counts) stays in the Django cache.
+# Folder and DocumentPath changes invalidate the entry eagerly; this is a backstop.
+FOLDER_TREE_CACHE_TIMEOUT = env.int("FOLDER_TREE_CACHE_TIMEOUT", default=3600)
+
 # AUTHENTICATION
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#authentication-backends
@@ -611,6 +629,16 @@ if USE_API_KEY_AUTH:
 if ALLOW_GRAPHQL_DEBUG:
     GRAPHENE_MIDDLEWARE.append("graphene_django.debug.DjangoDebugMiddleware")
 
+# Per-resolver SQL/latency profiling of a sample of GraphQL operations, readable
+# by staff at /api/graphql-profile/ (see config/graphql/profiling.py). Each worker
+# keeps aggregates for its GRAPHQL_PROFILING_MAX_PATHS most recent resolver paths;
+# GRAPHQL_PROFILING_LOG also logs every sampled resolver call as a JSON line.
+GRAPHQL_PROFILING_SAMPLE_RATE = env.float("GRAPHQL_PROFILING_SAMPLE_RATE", default=0.01)
+GRAPHQL_PROFILING_MAX_PATHS = env.int("GRAPHQL_PROFILING_MAX_PATHS", default=500)
+GRAPHQL_PROFILING_LOG = env.bool("GRAPHQL_PROFILING_LOG", default=False)
+if GRAPHQL_PROFILING_SAMPLE_RATE > 0:
+    GRAPHENE_MIDDLEWARE.append("config.graphql.profiling.ResolverProfilingMiddleware")
+
 # Configure Graphene with the constructed middleware list
 GRAPHENE = {
     "SCHEMA": "config.graphql.schema.schema",
@@ -965,6 +993,115 @@ LLM_CLIENT_MODEL = env.str("LLM_CLIENT_MODEL", default="gpt-4o-mini")
 LLM_CLIENT_TEMPERATURE = env.float("LLM_CLIENT_TEMPERATURE", default=0.7)
 LLM_CLIENT_MAX_TOKENS = env.int("LLM_CLIENT_MAX_TOKENS", default=None)
 
+# Agent Stream Persistence
+# ------------------------------------------------------------------------------
+# In-progress LLM messages whose last streamed chunk is older than this many
+# seconds are treated as orphaned by a crashed worker and get their partial
+# answer reassembled by the recover_interrupted_agent_messages task.
+AGENT_STREAM_RECOVERY_STALE_SECONDS = env.int(
+    "AGENT_STREAM_RECOVERY_STALE_SECONDS", default=900
+)
+
+# Agent Stream Broadcasting
+# ------------------------------------------------------------------------------
+# Streamed tokens are coalesced before being sent over the channel layer or a
+# WebSocket: a batch goes out once its first token is this many milliseconds
+# old, or as soon as it holds AGENT_STREAM_BROADCAST_MAX_BYTES of text.
+AGENT_STREAM_BROADCAST_WINDOW_MS = env.int(
+    "AGENT_STREAM_BROADCAST_WINDOW_MS", default=50
+)
+AGENT_STREAM_BROADCAST_MAX_BYTES = env.int(
+    "AGENT_STREAM_BROADCAST_MAX_BYTES", default=1024
+)
+
+# Notification Outbox
+# ------------------------------------------------------------------------------
+# Signals record notification events in an outbox; drain_notification_outbox
+# fans them out in batches of NOTIFICATION_OUTBOX_BATCH_SIZE events. An event
+# that keeps failing is given up after NOTIFICATION_OUTBOX_MAX_ATTEMPTS, and
+# processed events are purged after NOTIFICATION_OUTBOX_RETENTION_DAYS.
+NOTIFICATION_OUTBOX_BATCH_SIZE = env.int("NOTIFICATION_OUTBOX_BATCH_SIZE", default=200)
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = env.int(
+    "NOTIFICATION_OUTBOX_MAX_ATTEMPTS", default=5
+)
+NOTIFICATION_OUTBOX_RETENTION_DAYS = env.int(
+    "NOTIFICATION_OUTBOX_RETENTION_DAYS", default=7
+)
+
+# Leaderboard Snapshots
+# ------------------------------------------------------------------------------
+# Leaderboards and community stats are served from snapshots. Each leaderboard
+# keeps its top LEADERBOARD_SNAPSHOT_SIZE users; snapshots older than
+# LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS are reported as stale and refreshed in
+# the background when read (and by refresh_community_snapshots, if scheduled).
+LEADERBOARD_SNAPSHOT_SIZE = env.int("LEADERBOARD_SNAPSHOT_SIZE", default=100)
+LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS = env.int(
+    "LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS", default=900
+)
+# refresh_community_snapshots deletes corpus snapshots not read for this many days
+LEADERBOARD_SNAPSHOT_RETENTION_DAYS = env.int(
+    "LEADERBOARD_SNAPSHOT_RETENTION_DAYS", default=7
+)
+
+# Task Profiling
+# ------------------------------------------------------------------------------
+# A TASK_PROFILING_SAMPLE_RATE share of Celery task invocations is profiled (wall
+# and CPU time, SQL, storage bytes, peak RSS) into a TaskProfile table capped to
+# the TASK_PROFILE_MAX_ROWS most recent rows; summarize it with
+# `manage.py task_profile_percentiles`. TASK_PROFILING_LOG also logs each
+# profile as a JSON line.
+TASK_PROFILING_ENABLED = env.bool("TASK_PROFILING_ENABLED", default=True)
+TASK_PROFILING_SAMPLE_RATE = env.float("TASK_PROFILING_SAMPLE_RATE", default=1.0)
+TASK_PROFILE_MAX_ROWS = env.int("TASK_PROFILE_MAX_ROWS", default=10000)
+TASK_PROFILING_LOG = env.bool("TASK_PROFILING_LOG", default=False)
+
+# Agent Conversation History
+# ------------------------------------------------------------------------------
+# Agents receive the last AGENT_HISTORY_MAX_TURNS turns verbatim (trimmed further
+# to fit AGENT_HISTORY_TOKEN_BUDGET); older turns are folded into a rolling
+# summary stored on the Conversation, refreshed in the background.
+AGENT_HISTORY_MAX_TURNS = env.int("AGENT_HISTORY_MAX_TURNS", default=10)
+AGENT_HISTORY_TOKEN_BUDGET = env.int("AGENT_HISTORY_TOKEN_BUDGET", default=6000)
+# Max messages folded into the summary per LLM call when catching up.
+AGENT_HISTORY_SUMMARY_BATCH_SIZE = env.int(
+    "AGENT_HISTORY_SUMMARY_BATCH_SIZE", default=40
+)
+
+# Corpus Agent Document Fan-out
+# ------------------------------------------------------------------------------
+# Maximum number of document sub-agents a corpus agent runs at the same time when
+# answering ask_document / ask_documents tool calls.
+CORPUS_AGENT_MAX_CONCURRENT_DOCUMENT_QUERIES = env.int(
+    "CORPUS_AGENT_MAX_CONCURRENT_DOCUMENT_QUERIES", default=4
+)
+
+# LLM Tools
+# ------------------------------------------------------------------------------
+# Memory budget (per worker process) for the LRU cache of document plain-text
+# extracts shared by the LLM document tools.
+LLM_DOCUMENT_TEXT_CACHE_MAX_BYTES = env.int(
+    "LLM_DOCUMENT_TEXT_CACHE_MAX_BYTES", default=64 * 1024 * 1024
+)
+# Tokenizer used for context budgeting: "bpe" (tiktoken, offline), "approximate"
+# or a dotted path to an opencontractserver.llms.token_counting.BaseTokenizer.
+LLM_TOKENIZER = env.str("LLM_TOKENIZER", default="bpe")
+LLM_TOKENIZER_ENCODING = env.str("LLM_TOKENIZER_ENCODING", default="o200k_base")
+# Directory holding <encoding>.tiktoken rank files; never downloaded at runtime.
+LLM_TOKENIZER_BPE_DIR = env.str("LLM_TOKENIZER_BPE_DIR", default="/models/tiktoken")
+# Max memoized (document, version, span) token counts per worker process.
+LLM_TOKEN_COUNT_CACHE_SIZE = env.int("LLM_TOKEN_COUNT_CACHE_SIZE", default=10_000)
+
+# Data Extraction
+# ------------------------------------------------------------------------------
+# Model used for extracts whose fieldset doesn't set extraction_model.
+EXTRACT_DEFAULT_MODEL = env.str("EXTRACT_DEFAULT_MODEL", default="gpt-4o-mini")
+# For fieldsets with batch_extraction enabled, the most columns requested from
+# the model in a single structured call.
+EXTRACT_BATCH_MAX_COLUMNS = env.int("EXTRACT_BATCH_MAX_COLUMNS", default=20)
+# Reuse stored results for datacells whose document content, column definition
+# and model match an earlier successful extraction.
+EXTRACT_RESULT_CACHE_ENABLED = env.bool("EXTRACT_RESULT_CACHE_ENABLED", default=True)
+
 # Rate Limiting Configuration
 # ------------------------------------------------------------------------------
 # Import rate limiting settings
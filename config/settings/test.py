@@ -2,6 +2,10 @@
 With these settings, tests run faster.
 """
 
+import atexit
+import shutil
+import tempfile
+
 from .base import *  # noqa
 from .base import env
 
@@ -62,6 +66,14 @@ CELERY_BROKER_URL = "memory://"
 CELERY_RESULT_BACKEND = "cache"
 CELERY_CACHE_BACKEND = "memory"
 
+# Profiling writes a row per eager task; tests that measure it enable it.
+TASK_PROFILING_ENABLED = False
+
+# Sampled GraphQL operations evaluate querysets early and wrap every query,
+# which would randomly change query counts; the profiling tests sample with
+# their own middleware instance.
+GRAPHQL_PROFILING_SAMPLE_RATE = 0
+
 # Need these values for testing (even though they are not used)
 # https://django-storages.readthedocs.io/en/latest/#installation
 INSTALLED_APPS += ["storages"]  # noqa F405
@@ -85,6 +97,13 @@ AWS_S3_REGION_NAME = env("AWS_S3_REGION_NAME", default=None)
 AWS_S3_CUSTOM_DOMAIN = env("AWS_S3_CUSTOM_DOMAIN", default=None)
 aws_s3_domain = AWS_S3_CUSTOM_DOMAIN or f"{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com"
 
+# MEDIA
+# ------------------------------------------------------------------------------
+# Uploads, including content-addressed blobs, go to a throwaway directory
+# instead of the source tree.
+MEDIA_ROOT = tempfile.mkdtemp(prefix="opencontracts-test-media-")
+atexit.register(shutil.rmtree, MEDIA_ROOT, ignore_errors=True)
+
 # Test redis setup
 CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
 
@@ -9,7 +9,9 @@ from django.views import defaults as default_views
 from django.views.decorators.csrf import csrf_exempt
 from graphene_django.views import GraphQLView
 
+from config.graphql.profiling import ResolverProfileView
 from opencontractserver.analyzer.views import AnalysisCallbackView
+from opencontractserver.annotations.views import DocumentAnnotationStreamView
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,16 @@ urlpatterns = [
     path("", home_redirect, name="home_redirect"),  # Root URL redirect to port 3000
     path(settings.ADMIN_URL, admin.site.urls),
     path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=settings.DEBUG))),
+    path(
+        "api/graphql-profile/",
+        ResolverProfileView.as_view(),
+        name="graphql_resolver_profile",
+    ),
+    path(
+        "api/documents/<int:document_id>/annotations.ndjson",
+        DocumentAnnotationStreamView.as_view(),
+        name="document_annotation_stream",
+    ),
     *(
         []
         if not settings.USE_ANALYZER
@@ -0,0 +1,105 @@
+"""
+NotificationUpdatesConsumer
+
+WebSocket consumer that pushes new notifications to the connected user.
+Notifications are delivered by the drain_notification_outbox Celery task
+after it writes them, so clients can update their inbox and unread badge
+without polling.
+
+Every authenticated user subscribes to their own group; there are no query
+parameters.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+logger = logging.getLogger(__name__)
+
+
+def get_notification_channel_group(user_id: int) -> str:
+    """Get the channel group name for a user's notifications."""
+    return f"notifications_{user_id}"
+
+
+class NotificationUpdatesConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket consumer for subscribing to the current user's notifications.
+
+    This consumer is read-only - it only relays notifications written by
+    Celery tasks.
+    """
+
+    room_group_name: str | None = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.consumer_id = uuid.uuid4()
+
+    async def connect(self) -> None:
+        """Authenticate and subscribe to the user's notification group."""
+        user = self.scope.get("user")
+        if not user or not user.is_authenticated:
+            logger.warning(
+                f"[NotificationUpdates {self.consumer_id}] Unauthenticated connection rejected"
+            )
+            await self.close(code=4001)
+            return
+
+        self.room_group_name = get_notification_channel_group(user.pk)
+        await self.channel_layer.group_add(self.room_group_name, self.channel_name)
+        await self.accept()
+        logger.info(
+            f"[NotificationUpdates {self.consumer_id}] Subscribed to {self.room_group_name}"
+        )
+
+        await self.send(text_data=json.dumps({"type": "CONNECTED"}))
+
+    async def disconnect(self, close_code: int) -> None:
+        """Leave the notification group on disconnect."""
+        if self.room_group_name:
+            await self.channel_layer.group_discard(
+                self.room_group_name, self.channel_name
+            )
+
+    async def receive(self, text_data: str) -> None:
+        """Answer keep-alive pings; everything else is ignored."""
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            logger.warning(
+                f"[NotificationUpdates {self.consumer_id}] Invalid JSON received"
+            )
+            return
+
+        if data.get("type") == "ping":
+            await self.send(text_data=json.dumps({"type": "pong"}))
+
+    # -------------------------------------------------------------------------
+    #  Channel layer message handlers (from Celery tasks)
+    # -------------------------------------------------------------------------
+
+    async def notification_created(self, event: dict) -> None:
+        """
+        Relay a new notification.
+
+        Delivery is at-least-once, so clients should de-duplicate on ``id``.
+        """
+        await self.send(
+            text_data=json.dumps(
+                {
+                    "type": "NOTIFICATION_CREATED",
+                    "id": event.get("id"),
+                    "notification_type": event.get("notification_type"),
+                    "message_id": event.get("message_id"),
+                    "conversation_id": event.get("conversation_id"),
+                    "actor_id": event.get("actor_id"),
+                    "created_at": event.get("created_at"),
+                    "data": event.get("data"),
+                }
+            )
+        )
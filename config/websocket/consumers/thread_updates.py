@@ -198,13 +198,21 @@ class ThreadUpdatesConsumer(AsyncWebsocketConsumer):
         )
 
     async def agent_stream_token(self, event: dict) -> None:
-        """Handle streaming token from agent."""
+        """
+        Handle streamed content from agent.
+
+        Tokens arrive coalesced: ``token`` holds the concatenated text of
+        ``token_count`` model tokens, and ``seq`` increases by one per batch
+        of a message so clients can detect gaps.
+        """
         await self.send(
             text_data=json.dumps(
                 {
                     "type": "AGENT_STREAM_TOKEN",
                     "message_id": event.get("message_id"),
                     "token": event.get("token"),
+                    "seq": event.get("seq"),
+                    "token_count": event.get("token_count", 1),
                 }
             )
         )
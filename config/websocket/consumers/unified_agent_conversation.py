@@ -36,6 +36,7 @@ from django.conf import settings
 from graphql_relay import from_global_id
 
 from opencontractserver.agents.models import AgentConfiguration
+from opencontractserver.conversations.coalescing import StreamCoalescer
 from opencontractserver.conversations.models import MessageType
 from opencontractserver.corpuses.models import Corpus
 from opencontractserver.documents.models import Document
@@ -81,6 +82,9 @@ class UnifiedAgentConsumer(AsyncWebsocketConsumer):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.consumer_id = uuid.uuid4()
+        # Batches ASYNC_CONTENT tokens of the message being streamed.
+        self._content_coalescer: StreamCoalescer | None = None
+        self._content_message_id: int | None = None
         logger.debug(f"[UnifiedAgent {self.consumer_id}] __init__ called.")
 
     # -------------------------------------------------------------------------
@@ -480,6 +484,7 @@ class UnifiedAgentConsumer(AsyncWebsocketConsumer):
         try:
             async for event in self.agent.stream(user_query):
                 await self._handle_agent_event(event)
+            await self._flush_content()
 
             logger.debug(f"[Session {self.session_id}] Streaming complete.")
 
@@ -488,11 +493,40 @@ class UnifiedAgentConsumer(AsyncWebsocketConsumer):
                 f"[Session {self.session_id}] Error during streaming: {e}",
                 exc_info=True,
             )
+            await self._flush_content()
             await self.send_standard_message(
                 msg_type="SYNC_CONTENT",
                 data={"error": f"Error during processing: {e}"},
             )
 
+    async def _send_content_batch(self, text: str, seq: int, token_count: int) -> None:
+        await self.send_standard_message(
+            msg_type="ASYNC_CONTENT",
+            content=text,
+            data={
+                "message_id": self._content_message_id,
+                "seq": seq,
+                "token_count": token_count,
+            },
+        )
+
+    async def _queue_content(self, message_id: int | None, content: str) -> None:
+        """Coalesce streamed content into batched ASYNC_CONTENT messages."""
+        if self._content_coalescer is not None and message_id != (
+            self._content_message_id
+        ):
+            await self._flush_content()
+        if self._content_coalescer is None:
+            self._content_message_id = message_id
+            self._content_coalescer = StreamCoalescer(self._send_content_batch)
+        await self._content_coalescer.add(content)
+
+    async def _flush_content(self) -> None:
+        """Send any buffered content; call before every non-content message."""
+        coalescer, self._content_coalescer = self._content_coalescer, None
+        if coalescer is not None:
+            await coalescer.close()
+
     async def _handle_agent_event(self, event: Any) -> None:
         """Handle a single agent event and send appropriate WebSocket message."""
 
@@ -507,6 +541,14 @@ class UnifiedAgentConsumer(AsyncWebsocketConsumer):
             )
             self._sent_start = True
 
+        if isinstance(event, ContentEvent):
+            if event.content:
+                await self._queue_content(event.llm_message_id, event.content)
+            return
+
+        # Buffered content always reaches the client before the next event.
+        await self._flush_content()
+
         # Handle event types
         if isinstance(event, ThoughtEvent):
             await self.send_standard_message(
@@ -515,14 +557,6 @@ class UnifiedAgentConsumer(AsyncWebsocketConsumer):
                 data={"message_id": event.llm_message_id, **event.metadata},
             )
 
-        elif isinstance(event, ContentEvent):
-            if event.content:
-                await self.send_standard_message(
-                    msg_type="ASYNC_CONTENT",
-                    content=event.content,
-                    data={"message_id": event.llm_message_id},
-                )
-
         elif isinstance(event, SourceEvent):
             if event.sources:
                 await self.send_standard_message(
@@ -663,8 +697,10 @@ class UnifiedAgentConsumer(AsyncWebsocketConsumer):
                 llm_msg_id, approved, stream=True
             ):
                 await self._handle_agent_event(event)
+            await self._flush_content()
 
         except Exception as e:
+            await self._flush_content()
             logger.error(
                 f"[Session {self.session_id}] Approval resume error: {e}",
                 exc_info=True,
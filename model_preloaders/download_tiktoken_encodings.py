@@ -0,0 +1,26 @@
+"""
+Download tiktoken BPE rank files so token counting works offline.
+
+Files are written to /models/tiktoken/<encoding>.tiktoken, the default
+LLM_TOKENIZER_BPE_DIR.
+"""
+
+import os
+
+from tiktoken.load import read_file
+
+# Directory to save the rank files (absolute path)
+bpe_dir = "/models/tiktoken"
+
+ENCODINGS = {
+    "cl100k_base": "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+    "o200k_base": "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+}
+
+os.makedirs(bpe_dir, exist_ok=True)
+
+for name, url in ENCODINGS.items():
+    path = os.path.join(bpe_dir, f"{name}.tiktoken")
+    with open(path, "wb") as f:
+        f.write(read_file(url))
+    print(f"tiktoken encoding '{name}' has been downloaded and saved to '{path}'.")
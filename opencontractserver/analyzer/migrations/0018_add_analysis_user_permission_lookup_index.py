@@ -0,0 +1,19 @@
+# Generated by Django 4.2.24 on 2026-10-18 21:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyzer", "0017_merge_20251013_0333"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="analysisuserobjectpermission",
+            index=models.Index(
+                fields=["content_object", "user"], name="analyzer_an_content_806db5_idx"
+            ),
+        ),
+    ]
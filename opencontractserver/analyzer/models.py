@@ -262,6 +262,13 @@ class AnalysisUserObjectPermission(UserObjectPermissionBase):
     )
     # enabled = False
 
+    class Meta(UserObjectPermissionBase.Meta):
+        # Serves the correlated EXISTS (content_object = outer.id AND user = ?)
+        # used by visible_to_user.
+        indexes = [
+            django.db.models.Index(fields=["content_object", "user"]),
+        ]
+
 
 # Model for Django Guardian permissions.
 class AnalysisGroupObjectPermission(GroupObjectPermissionBase):
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.24 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("annotations", "0050_add_structural_set_structural_flag_constraints"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="annotation",
+            index=models.Index(
+                fields=["document", "page", "id"], name="annotations_documen_d4b44e_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.24 on 2026-10-19 01:41
+
+from django.db import migrations
+import functools
+import opencontractserver.shared.fields
+import opencontractserver.shared.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("annotations", "0051_add_annotation_document_page_id_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="structuralannotationset",
+            name="pawls_parse_file",
+            field=opencontractserver.shared.fields.BlobFileField(
+                blank=True,
+                help_text="PAWLS JSON parse data for this content",
+                max_length=1024,
+                null=True,
+                upload_to=functools.partial(
+                    opencontractserver.shared.utils.calc_oc_file_path,
+                    *(),
+                    **{"sub_folder": "pawls_layers_files"}
+                ),
+            ),
+        ),
+        migrations.AlterField(
+            model_name="structuralannotationset",
+            name="txt_extract_file",
+            field=opencontractserver.shared.fields.BlobFileField(
+                blank=True,
+                help_text="Plain text extraction for this content",
+                max_length=1024,
+                null=True,
+                upload_to=functools.partial(
+                    opencontractserver.shared.utils.calc_oc_file_path,
+                    *(),
+                    **{"sub_folder": "txt_layers_files"}
+                ),
+            ),
+        ),
+    ]
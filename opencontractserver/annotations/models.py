@@ -28,7 +28,7 @@ from opencontractserver.shared.defaults import (
     jsonfield_default_value,
     jsonfield_empty_array,
 )
-from opencontractserver.shared.fields import NullableJSONField
+from opencontractserver.shared.fields import BlobFileField, NullableJSONField
 
 # Import your new managers
 from opencontractserver.shared.Managers import (
@@ -542,7 +542,7 @@ class StructuralAnnotationSet(BaseOCModel):
     )
 
     # PAWLS data for PDFs (shared across all documents with this content)
-    pawls_parse_file = django.db.models.FileField(
+    pawls_parse_file = BlobFileField(
         upload_to=functools.partial(calc_oc_file_path, sub_folder="pawls_layers_files"),
         null=True,
         blank=True,
@@ -551,7 +551,7 @@ class StructuralAnnotationSet(BaseOCModel):
     )
 
     # Text extract for text-based documents
-    txt_extract_file = django.db.models.FileField(
+    txt_extract_file = BlobFileField(
         upload_to=functools.partial(calc_oc_file_path, sub_folder="txt_layers_files"),
         null=True,
         blank=True,
@@ -880,6 +880,8 @@ class Annotation(BaseOCModel, HasEmbeddingMixin):
             django.db.models.Index(fields=["corpus", "creator"]),
             django.db.models.Index(fields=["document", "corpus"]),
             django.db.models.Index(fields=["document", "corpus", "creator"]),
+            # Supports keyset pagination / streaming ordered by (page, id)
+            django.db.models.Index(fields=["document", "page", "id"]),
             django.db.models.Index(fields=["analysis"]),
             django.db.models.Index(fields=["created_by_analysis"]),
             django.db.models.Index(fields=["created_by_extract"]),
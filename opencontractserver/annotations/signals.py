@@ -34,12 +34,18 @@ def process_annot_on_create_atomic(sender, instance, created, **kwargs):
     If the annotation is structural, also ensures it has embeddings for all corpuses
     its document belongs to.
 
+    Skipped for instances flagged with ``_skip_embedding`` (e.g. forked copies whose
+    embeddings are copied from the source annotation).
+
     Args:
         sender: The model class.
         instance: The annotation being saved.
         created (bool): True if a new record was created.
         **kwargs: Additional keyword arguments.
     """
+    if getattr(instance, "_skip_embedding", False) is True:
+        return
+
     # When a new annotation is created *AND* no embeddings are present at creation,
     # hit the embeddings microservice. Since embeddings can be an array, need to test for None
     if created and instance.embedding is None:
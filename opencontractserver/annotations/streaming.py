@@ -0,0 +1,189 @@
+"""
+Bounded access to the "bulk" annotation set of a document in a corpus.
+
+``resolve_bulk_doc_annotations_in_corpus`` historically returned every visible
+annotation for a document as one list. For heavily-parsed documents that can be
+hundreds of megabytes of JSON. The helpers here provide two bounded alternatives
+that share the exact same filtering rules:
+
+* keyset (a.k.a. seek) pagination ordered by ``(page, id)`` with opaque cursors
+  and a server-enforced page size, used by the GraphQL
+  ``bulkDocAnnotationsInCorpusPage`` field.
+* an NDJSON generator built on ``QuerySet.iterator(chunk_size=...)`` used by
+  the streaming REST endpoint in ``opencontractserver.annotations.views``.
+"""
+
+import base64
+import binascii
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+
+from opencontractserver.annotations.models import Annotation
+
+logger = logging.getLogger(__name__)
+
+CURSOR_PREFIX = "annotation-keyset"
+
+# Columns serialized for each NDJSON line. Kept flat (``values()``) so the
+# stream never instantiates model objects or follows lazy relations.
+NDJSON_ANNOTATION_FIELDS = (
+    "id",
+    "page",
+    "raw_text",
+    "json",
+    "bounding_box",
+    "annotation_type",
+    "structural",
+    "document_id",
+    "corpus_id",
+    "analysis_id",
+    "annotation_label_id",
+    "annotation_label__text",
+    "annotation_label__label_type",
+    "parent_id",
+    "creator_id",
+    "created",
+    "modified",
+)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client-supplied keyset cursor cannot be decoded."""
+
+
+def build_bulk_annotation_filter(
+    corpus_pk,
+    document_pk=None,
+    analysis_pks: Optional[Iterable[int]] = None,
+    label_type: Optional[str] = None,
+) -> Q:
+    """
+    Build the filter used by every "bulk annotations for a doc in a corpus" path.
+
+    Annotations in the corpus, or with NO corpus FK (which travel with the
+    document), optionally narrowed to a set of analyses, a label type and a
+    single document.
+    """
+    q_objects = Q(corpus_id=corpus_pk) | Q(corpus_id__isnull=True)
+
+    analysis_pks = list(analysis_pks or [])
+    if analysis_pks:
+        q_objects.add(Q(analysis_id__in=analysis_pks), Q.AND)
+
+    if label_type is not None:
+        q_objects.add(Q(annotation_label__label_type=label_type), Q.AND)
+
+    if document_pk is not None:
+        q_objects.add(Q(document_id=document_pk), Q.AND)
+
+    return q_objects
+
+
+def bulk_annotations_queryset(
+    user,
+    corpus_pk,
+    document_pk=None,
+    analysis_pks: Optional[Iterable[int]] = None,
+    label_type: Optional[str] = None,
+) -> QuerySet:
+    """
+    Visible annotations for the bulk filter, unordered and without joins, so
+    callers can pick ordering / ``select_related`` / ``values`` as they need.
+    """
+    return Annotation.objects.visible_to_user(user).filter(
+        build_bulk_annotation_filter(
+            corpus_pk,
+            document_pk=document_pk,
+            analysis_pks=analysis_pks,
+            label_type=label_type,
+        )
+    )
+
+
+def get_page_size(requested: Optional[int]) -> int:
+    """
+    Clamp a client-requested page size to ``[1, BULK_ANNOTATION_PAGE_SIZE_MAX]``.
+    Missing or non-positive values fall back to the configured default.
+    """
+    max_size = settings.BULK_ANNOTATION_PAGE_SIZE_MAX
+    if requested is None or requested <= 0:
+        return min(settings.BULK_ANNOTATION_PAGE_SIZE_DEFAULT, max_size)
+    return min(requested, max_size)
+
+
+def encode_annotation_cursor(page: int, pk: int) -> str:
+    """Encode an opaque cursor pointing *after* the annotation ``(page, pk)``."""
+    raw = f"{CURSOR_PREFIX}:{page}:{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_annotation_cursor(cursor: str) -> tuple[int, int]:
+    """Decode a cursor created by :func:`encode_annotation_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode()
+        prefix, page, pk = raw.split(":")
+        if prefix != CURSOR_PREFIX:
+            raise ValueError(prefix)
+        return int(page), int(pk)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid annotation cursor: {cursor}") from e
+
+
+def keyset_paginate_annotations(
+    queryset: QuerySet, first: Optional[int] = None, after: Optional[str] = None
+) -> tuple[list[Annotation], Optional[str], int]:
+    """
+    Return one page of ``queryset`` ordered by ``(page, id)``.
+
+    Uses a seek predicate rather than OFFSET so each page costs the same no
+    matter how deep the client has scrolled. One extra row is fetched to know
+    whether another page exists.
+
+    Returns:
+        (annotations, next_cursor or None, effective page size)
+    """
+    page_size = get_page_size(first)
+
+    if after:
+        last_page, last_pk = decode_annotation_cursor(after)
+        queryset = queryset.filter(
+            Q(page__gt=last_page) | Q(page=last_page, id__gt=last_pk)
+        )
+
+    rows = list(queryset.order_by("page", "id")[: page_size + 1])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if has_next and rows:
+        next_cursor = encode_annotation_cursor(rows[-1].page, rows[-1].id)
+
+    return rows, next_cursor, page_size
+
+
+def iter_annotations_ndjson(
+    queryset: QuerySet, chunk_size: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Yield one JSON document per annotation, newline terminated.
+
+    Rows are pulled with ``iterator(chunk_size=...)`` so that memory stays flat
+    regardless of how many annotations the document carries.
+    """
+    chunk_size = chunk_size or settings.ANNOTATION_STREAM_CHUNK_SIZE
+    rows = (
+        queryset.order_by("page", "id")
+        .values(*NDJSON_ANNOTATION_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    count = 0
+    for row in rows:
+        count += 1
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+    logger.debug(f"iter_annotations_ndjson - streamed {count} annotations")
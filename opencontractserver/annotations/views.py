@@ -0,0 +1,76 @@
+import logging
+
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from opencontractserver.annotations.streaming import (
+    bulk_annotations_queryset,
+    iter_annotations_ndjson,
+)
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.documents.models import Document
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentAnnotationStreamView(APIView):
+    """
+    Stream every visible annotation of a document in a corpus as NDJSON
+    (one JSON object per line, ordered by page then id).
+
+    Query params:
+        corpus_id (required): corpus pk.
+        analysis_ids: comma-separated analysis pks to restrict to.
+        label_type: restrict to annotations whose label has this label_type.
+    """
+
+    def get(self, request, document_id):
+
+        corpus_id = request.query_params.get("corpus_id")
+        if corpus_id is None or not corpus_id.isdigit():
+            return Response(
+                {"message": "A numeric corpus_id query parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            analysis_pks = [
+                int(value)
+                for value in request.query_params.get("analysis_ids", "").split(",")
+                if value
+            ]
+        except ValueError:
+            return Response(
+                {"message": "analysis_ids must be a comma-separated list of ids."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = request.user
+        if (
+            not Document.objects.visible_to_user(user).filter(id=document_id).exists()
+            or not Corpus.objects.visible_to_user(user).filter(id=corpus_id).exists()
+        ):
+            # Same response for "missing" and "not allowed" to avoid leaking ids.
+            return Response(
+                {"message": "Document or corpus not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        queryset = bulk_annotations_queryset(
+            user,
+            int(corpus_id),
+            document_pk=document_id,
+            analysis_pks=analysis_pks,
+            label_type=request.query_params.get("label_type"),
+        )
+
+        logger.info(
+            f"Streaming annotations for document {document_id} in corpus {corpus_id}"
+        )
+        response = StreamingHttpResponse(
+            iter_annotations_ndjson(queryset), content_type="application/x-ndjson"
+        )
+        response["X-Accel-Buffering"] = "no"
+        return response
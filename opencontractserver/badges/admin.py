@@ -1,6 +1,12 @@
 from django.contrib import admin
 
-from opencontractserver.badges.models import Badge, UserBadge
+from opencontractserver.badges.models import (
+    Badge,
+    CommunityStatsSnapshot,
+    LeaderboardSnapshot,
+    PendingBadgeCheck,
+    UserBadge,
+)
 
 
 @admin.register(Badge)
@@ -60,3 +66,24 @@ class UserBadgeAdmin(admin.ModelAdmin):
     search_fields = ("user__username", "badge__name")
     readonly_fields = ("awarded_at",)
     autocomplete_fields = ("user", "badge", "awarded_by", "corpus")
+
+
+@admin.register(PendingBadgeCheck)
+class PendingBadgeCheckAdmin(admin.ModelAdmin):
+    list_display = ("user", "corpus", "criteria_type", "marked_at")
+    list_filter = ("criteria_type",)
+    search_fields = ("user__username",)
+    readonly_fields = ("marked_at",)
+
+
+@admin.register(LeaderboardSnapshot)
+class LeaderboardSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("key", "metric", "scope", "corpus", "computed_at")
+    list_filter = ("metric", "scope")
+    readonly_fields = ("computed_at",)
+
+
+@admin.register(CommunityStatsSnapshot)
+class CommunityStatsSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("key", "corpus", "computed_at")
+    readonly_fields = ("computed_at",)
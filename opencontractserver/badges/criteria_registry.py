@@ -7,6 +7,8 @@ configuration fields, and validation rules. The registry is used for:
 - Multi-layer validation of criteria configurations
 - Scope enforcement (global vs corpus badges)
 - Type safety for criteria evaluation
+- Set-based evaluation: each type's evaluator answers "which of these users
+  meet this criteria config?" in a constant number of queries
 
 Example usage:
     from opencontractserver.badges.criteria_registry import BadgeCriteriaRegistry
@@ -24,9 +26,13 @@ Example usage:
     corpus_types = BadgeCriteriaRegistry.for_scope("corpus")
 """
 
+from collections.abc import Callable, Collection
 from dataclasses import dataclass
 from typing import Any, Optional
 
+# (user_ids, corpus_id or None for global, criteria_config) -> qualifying user_ids
+CriteriaEvaluator = Callable[[Collection[int], Optional[int], dict], set[int]]
+
 
 @dataclass
 class CriteriaField:
@@ -66,6 +72,7 @@ class CriteriaTypeDefinition:
         scope: Where this criteria can be used ("global", "corpus", "both")
         fields: List of configuration fields required for this criteria
         implemented: Whether the evaluation logic is implemented
+        evaluator: Returns the subset of the given users meeting a config
     """
 
     type_id: str
@@ -74,6 +81,7 @@ class CriteriaTypeDefinition:
     scope: str  # "global", "corpus", "both"
     fields: list[CriteriaField]
     implemented: bool = True
+    evaluator: Optional[CriteriaEvaluator] = None
 
 
 class BadgeCriteriaRegistry:
@@ -276,6 +284,135 @@ class BadgeCriteriaRegistry:
 
         return True, None
 
+    @classmethod
+    def qualifying_users(
+        cls,
+        criteria_config: dict,
+        user_ids: Collection[int],
+        corpus_id: Optional[int] = None,
+    ) -> set[int]:
+        """
+        Get the users among *user_ids* that meet a (validated) criteria config.
+
+        Args:
+            criteria_config: The badge's criteria configuration
+            user_ids: Candidate users
+            corpus_id: Corpus for corpus badges, None for global badges
+
+        Returns:
+            Set of qualifying user IDs (empty for types without an evaluator)
+        """
+        criteria_def = cls.get(criteria_config.get("type"))
+        if not user_ids or criteria_def is None or criteria_def.evaluator is None:
+            return set()
+        return criteria_def.evaluator(user_ids, corpus_id, criteria_config)
+
+
+# Set-based evaluators. Model imports are deferred so the registry can be
+# imported before apps are ready.
+
+
+def _users_with_message_count(
+    user_ids: Collection[int], corpus_id: Optional[int], minimum: int
+) -> set[int]:
+    from django.db.models import Count
+
+    from opencontractserver.conversations.models import ChatMessage
+
+    messages = ChatMessage.objects.filter(creator_id__in=user_ids)
+    if corpus_id:
+        messages = messages.filter(conversation__chat_with_corpus_id=corpus_id)
+    return set(
+        messages.values("creator_id")
+        .annotate(message_count=Count("id"))
+        .filter(message_count__gte=minimum)
+        .values_list("creator_id", flat=True)
+    )
+
+
+def evaluate_first_post(
+    user_ids: Collection[int], corpus_id: Optional[int], config: dict
+) -> set[int]:
+    return _users_with_message_count(user_ids, corpus_id, 1)
+
+
+def evaluate_message_count(
+    user_ids: Collection[int], corpus_id: Optional[int], config: dict
+) -> set[int]:
+    return _users_with_message_count(user_ids, corpus_id, int(config["value"]))
+
+
+def evaluate_reputation_threshold(
+    user_ids: Collection[int], corpus_id: Optional[int], config: dict
+) -> set[int]:
+    from opencontractserver.conversations.models import UserReputation
+
+    minimum = int(config["value"])
+    reputations = UserReputation.objects.filter(user_id__in=user_ids)
+    if corpus_id:
+        reputations = reputations.filter(corpus_id=corpus_id)
+    else:
+        reputations = reputations.filter(corpus__isnull=True)
+
+    qualifying = set(
+        reputations.filter(reputation_score__gte=minimum).values_list(
+            "user_id", flat=True
+        )
+    )
+    if minimum <= 0:
+        # No reputation record means a score of 0
+        qualifying |= set(user_ids) - set(reputations.values_list("user_id", flat=True))
+    return qualifying
+
+
+def evaluate_message_upvotes(
+    user_ids: Collection[int], corpus_id: Optional[int], config: dict
+) -> set[int]:
+    from django.db.models import Count, Q
+
+    from opencontractserver.conversations.models import ChatMessage, VoteType
+
+    messages = ChatMessage.objects.filter(creator_id__in=user_ids)
+    if corpus_id:
+        messages = messages.filter(conversation__chat_with_corpus_id=corpus_id)
+    return set(
+        messages.annotate(
+            upvotes=Count("votes", filter=Q(votes__vote_type=VoteType.UPVOTE))
+        )
+        .filter(upvotes__gte=int(config["value"]))
+        .values_list("creator_id", flat=True)
+        .distinct()
+    )
+
+
+def evaluate_corpus_contribution(
+    user_ids: Collection[int], corpus_id: Optional[int], config: dict
+) -> set[int]:
+    from collections import Counter
+
+    from django.db.models import Count
+
+    from opencontractserver.annotations.models import Annotation
+    from opencontractserver.corpuses.models import Corpus
+
+    if not corpus_id:
+        return set()
+    corpus = Corpus.objects.filter(id=corpus_id).first()
+    if corpus is None:
+        return set()
+
+    # Documents (DocumentPath-based source of truth) plus annotations
+    contributions = Counter()
+    for queryset in (
+        corpus.get_documents().filter(creator_id__in=user_ids),
+        Annotation.objects.filter(creator_id__in=user_ids, corpus_id=corpus_id),
+    ):
+        for row in queryset.values("creator_id").annotate(n=Count("id")):
+            contributions[row["creator_id"]] += row["n"]
+
+    minimum = int(config["value"])
+    return {user_id for user_id, count in contributions.items() if count >= minimum}
+
 
 # Register all available criteria types
 # These definitions drive both frontend UI and backend validation
@@ -288,6 +425,7 @@ BadgeCriteriaRegistry.register(
         scope="both",
         fields=[],  # No configuration needed
         implemented=True,
+        evaluator=evaluate_first_post,
     )
 )
 
@@ -309,6 +447,7 @@ BadgeCriteriaRegistry.register(
             )
         ],
         implemented=True,
+        evaluator=evaluate_message_count,
     )
 )
 
@@ -330,6 +469,7 @@ BadgeCriteriaRegistry.register(
             )
         ],
         implemented=True,
+        evaluator=evaluate_corpus_contribution,
     )
 )
 
@@ -351,6 +491,7 @@ BadgeCriteriaRegistry.register(
             )
         ],
         implemented=True,
+        evaluator=evaluate_reputation_threshold,
     )
 )
 
@@ -372,5 +513,6 @@ BadgeCriteriaRegistry.register(
             )
         ],
         implemented=True,
+        evaluator=evaluate_message_upvotes,
     )
 )
@@ -0,0 +1,183 @@
+"""
+Management command measuring per-request cost of the community page queries.
+
+Usage:
+    python manage.py benchmark_leaderboard_queries [--users N [N ...]]
+        [--messages-per-user N] [--requests N] [--json]
+
+For each community size, users with public profiles post messages in a public
+thread. The leaderboard and communityStats GraphQL queries are then executed
+against their snapshots, and the aggregation those snapshots replace is run
+alongside for comparison. Both are reported as queries and median latency per
+request. All data is created inside a transaction that is rolled back, so the
+command is safe to run against a real database.
+"""
+
+import json
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from config.graphql.schema import schema
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    ConversationTypeChoices,
+)
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.tasks.leaderboard_tasks import (
+    compute_community_stats,
+    compute_leaderboard,
+    refresh_community_snapshots,
+)
+
+User = get_user_model()
+
+COMMUNITY_PAGE_QUERY = """
+    query {
+        leaderboard(metric: MESSAGES, scope: WEEKLY, limit: 25) {
+            computedAt
+            entries {
+                rank
+                score
+                user {
+                    username
+                }
+            }
+        }
+        communityStats {
+            totalUsers
+            totalMessages
+            activeUsersThisWeek
+            computedAt
+        }
+    }
+"""
+
+
+def _measure(request, request_count: int) -> dict:
+    timings = []
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(request_count):
+            start = time.perf_counter()
+            request()
+            timings.append(time.perf_counter() - start)
+    return {
+        "queries_per_request": len(ctx.captured_queries) / request_count,
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request queries of the leaderboard and community stats"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000],
+            help="Community sizes to measure (default: 10 100 1000)",
+        )
+        parser.add_argument(
+            "--messages-per-user",
+            type=int,
+            default=5,
+            help="Messages posted by each user (default: 5)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20,
+            help="Requests measured per community size (default: 20)",
+        )
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def _populate(self, user_count: int, messages_per_user: int):
+        run_id = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create(
+            User(username=f"leaderboard-bench-{run_id}-{i}", is_profile_public=True)
+            for i in range(user_count)
+        )
+        corpus = Corpus.objects.create(
+            title=f"Leaderboard benchmark {run_id}", creator=users[0], is_public=True
+        )
+        thread = Conversation.objects.create(
+            title="Leaderboard benchmark",
+            conversation_type=ConversationTypeChoices.THREAD,
+            chat_with_corpus=corpus,
+            creator=users[0],
+            is_public=True,
+        )
+        ChatMessage.objects.bulk_create(
+            ChatMessage(
+                conversation=thread,
+                msg_type="HUMAN",
+                content=f"Message {i}",
+                creator=user,
+            )
+            for user in users
+            for i in range(messages_per_user)
+        )
+        return users[0]
+
+    def _run(self, user_count: int, messages_per_user: int, request_count: int):
+        viewer = self._populate(user_count, messages_per_user)
+        context = SimpleNamespace(user=viewer)
+
+        def snapshot_request():
+            result = schema.execute(COMMUNITY_PAGE_QUERY, context_value=context)
+            if result.errors:
+                raise CommandError(str(result.errors))
+
+        # What every request used to aggregate before snapshots.
+        def recompute_request():
+            compute_leaderboard("messages", "weekly")
+            compute_community_stats()
+
+        refresh_community_snapshots()
+        return {
+            "snapshot": _measure(snapshot_request, request_count),
+            "recompute": _measure(recompute_request, request_count),
+        }
+
+    def handle(self, *args, **options):
+        if (
+            options["requests"] < 1
+            or options["messages_per_user"] < 1
+            or min(options["users"]) < 1
+        ):
+            raise CommandError(
+                "--users, --messages-per-user and --requests must be positive"
+            )
+
+        results = []
+        for user_count in options["users"]:
+            with transaction.atomic():
+                measured = self._run(
+                    user_count, options["messages_per_user"], options["requests"]
+                )
+                transaction.set_rollback(True)
+            results.append({"users": user_count, **measured})
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'users':>8} {'snapshot q':>11} {'snapshot ms':>12} "
+            f"{'recompute q':>12} {'recompute ms':>13}   (per request)"
+        )
+        for row in results:
+            snapshot, recompute = row["snapshot"], row["recompute"]
+            self.stdout.write(
+                f"{row['users']:>8} {snapshot['queries_per_request']:>11} "
+                f"{snapshot['median_ms']:>12} {recompute['queries_per_request']:>12} "
+                f"{recompute['median_ms']:>13}"
+            )
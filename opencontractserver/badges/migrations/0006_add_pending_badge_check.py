@@ -0,0 +1,85 @@
+# Generated by Django 4.2.24 on 2026-10-18 23:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("corpuses", "0026_remove_corpusdocumentfolder"),
+        ("badges", "0005_install_default_badges"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingBadgeCheck",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "criteria_type",
+                    models.CharField(
+                        help_text="Badge criteria type to re-evaluate (see BadgeCriteriaRegistry)",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "marked_at",
+                    models.DateTimeField(help_text="When the check was last requested"),
+                ),
+                (
+                    "corpus",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Corpus the change happened in (null = global badges)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_badge_checks",
+                        to="corpuses.corpus",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="User whose badge progress changed",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_badge_checks",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["marked_at"], name="badges_pend_marked__be2767_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pendingbadgecheck",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("corpus__isnull", True)),
+                fields=("user", "criteria_type"),
+                name="unique_pending_badge_check_global",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="pendingbadgecheck",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("corpus__isnull", False)),
+                fields=("user", "corpus", "criteria_type"),
+                name="unique_pending_badge_check_corpus",
+            ),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 4.2.24 on 2026-10-19 00:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("corpuses", "0027_add_corpus_engagement_buckets"),
+        ("badges", "0006_add_pending_badge_check"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="metric:scope:corpus id (or 'global'), see snapshot_key()",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                ("metric", models.CharField(max_length=32)),
+                ("scope", models.CharField(max_length=32)),
+                (
+                    "entries",
+                    models.JSONField(
+                        default=list, help_text="[user id, score] pairs in rank order"
+                    ),
+                ),
+                (
+                    "computed_at",
+                    models.DateTimeField(help_text="When the entries were computed"),
+                ),
+                (
+                    "corpus",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Corpus the leaderboard is scoped to (null = global)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_snapshots",
+                        to="corpuses.corpus",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="CommunityStatsSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Corpus id, or 'global'", max_length=64, unique=True
+                    ),
+                ),
+                (
+                    "stats",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Totals, time-window counts and the top badge distribution",
+                    ),
+                ),
+                (
+                    "computed_at",
+                    models.DateTimeField(help_text="When the statistics were computed"),
+                ),
+                (
+                    "corpus",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Corpus the statistics are scoped to (null = global)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="community_stats_snapshots",
+                        to="corpuses.corpus",
+                    ),
+                ),
+            ],
+        ),
+    ]
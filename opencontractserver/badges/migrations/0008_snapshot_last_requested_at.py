@@ -0,0 +1,32 @@
+# Generated by Django 4.2.24 on 2026-10-19 02:25
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badges", "0007_add_leaderboard_snapshots"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="communitystatssnapshot",
+            name="last_requested_at",
+            field=models.DateTimeField(
+                db_index=True,
+                default=django.utils.timezone.now,
+                help_text="Roughly when the statistics were last read",
+            ),
+        ),
+        migrations.AddField(
+            model_name="leaderboardsnapshot",
+            name="last_requested_at",
+            field=models.DateTimeField(
+                db_index=True,
+                default=django.utils.timezone.now,
+                help_text="Roughly when the leaderboard was last read",
+            ),
+        ),
+    ]
@@ -1,6 +1,9 @@
+from typing import Optional
+
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 
 from opencontractserver.corpuses.models import Corpus
 from opencontractserver.shared.defaults import jsonfield_default_value
@@ -260,3 +263,191 @@ class UserBadge(models.Model):
 
     def __str__(self):
         return f"{self.badge.name} → {self.user.username} ({self.awarded_at.date()})"
+
+
+class PendingBadgeCheck(models.Model):
+    """
+    Marks that a user's progress towards badges of one criteria type may have
+    changed (in a corpus, or globally when corpus is NULL).
+
+    Signals record these marks and queue a delayed
+    evaluate_pending_badge_checks run, which evaluates every marked user once,
+    however many events marked them.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="pending_badge_checks",
+        help_text="User whose badge progress changed",
+    )
+
+    corpus = models.ForeignKey(
+        Corpus,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="pending_badge_checks",
+        help_text="Corpus the change happened in (null = global badges)",
+    )
+
+    criteria_type = models.CharField(
+        max_length=64,
+        help_text="Badge criteria type to re-evaluate (see BadgeCriteriaRegistry)",
+    )
+
+    marked_at = models.DateTimeField(
+        help_text="When the check was last requested",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "criteria_type"],
+                condition=models.Q(corpus__isnull=True),
+                name="unique_pending_badge_check_global",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "corpus", "criteria_type"],
+                condition=models.Q(corpus__isnull=False),
+                name="unique_pending_badge_check_corpus",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["marked_at"]),
+        ]
+
+    @classmethod
+    def mark(
+        cls,
+        user_id: int,
+        criteria_types: list[str],
+        corpus_id: Optional[int] = None,
+    ) -> None:
+        """
+        Request re-evaluation of the user's badges of the given criteria types.
+
+        Re-marking an already pending check only bumps its marked_at, so
+        bursts of events collapse into one row per (user, corpus, type).
+        """
+        now = timezone.now()
+        pending = cls.objects.filter(
+            user_id=user_id, corpus_id=corpus_id, criteria_type__in=criteria_types
+        )
+        if pending.update(marked_at=now) < len(criteria_types):
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        user_id=user_id,
+                        corpus_id=corpus_id,
+                        criteria_type=criteria_type,
+                        marked_at=now,
+                    )
+                    for criteria_type in criteria_types
+                ],
+                ignore_conflicts=True,
+            )
+
+    def __str__(self):
+        scope = f"corpus {self.corpus_id}" if self.corpus_id else "global"
+        return f"{self.criteria_type} check for user {self.user_id} ({scope})"
+
+
+class LeaderboardSnapshot(models.Model):
+    """
+    Precomputed top entries of one leaderboard (metric, scope and corpus).
+
+    The leaderboard query reads these instead of aggregating activity on every
+    request; refresh_community_snapshots recomputes them periodically while
+    they keep being requested. Snapshots are shared by all viewers, so they
+    only count public activity: public conversations and annotations
+    globally, public threads and annotations within a corpus (readers must
+    also have access to the corpus). Only users with public profiles are
+    ranked.
+    """
+
+    key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="metric:scope:corpus id (or 'global'), see snapshot_key()",
+    )
+
+    metric = models.CharField(max_length=32)
+
+    scope = models.CharField(max_length=32)
+
+    corpus = models.ForeignKey(
+        Corpus,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="leaderboard_snapshots",
+        help_text="Corpus the leaderboard is scoped to (null = global)",
+    )
+
+    entries = models.JSONField(
+        default=list,
+        help_text="[user id, score] pairs in rank order",
+    )
+
+    computed_at = models.DateTimeField(
+        help_text="When the entries were computed",
+    )
+
+    last_requested_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        help_text="Roughly when the leaderboard was last read",
+    )
+
+    @staticmethod
+    def snapshot_key(metric: str, scope: str, corpus_id: Optional[int]) -> str:
+        return f"{metric}:{scope}:{corpus_id or 'global'}"
+
+    def __str__(self):
+        return f"Leaderboard snapshot {self.key}"
+
+
+class CommunityStatsSnapshot(models.Model):
+    """
+    Precomputed community statistics, globally or for one corpus.
+
+    Computed under the same rules as LeaderboardSnapshot.
+    """
+
+    key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="Corpus id, or 'global'",
+    )
+
+    corpus = models.ForeignKey(
+        Corpus,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="community_stats_snapshots",
+        help_text="Corpus the statistics are scoped to (null = global)",
+    )
+
+    stats = models.JSONField(
+        default=dict,
+        help_text="Totals, time-window counts and the top badge distribution",
+    )
+
+    computed_at = models.DateTimeField(
+        help_text="When the statistics were computed",
+    )
+
+    last_requested_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        help_text="Roughly when the statistics were last read",
+    )
+
+    @staticmethod
+    def snapshot_key(corpus_id: Optional[int]) -> str:
+        return str(corpus_id or "global")
+
+    def __str__(self):
+        return f"Community stats snapshot {self.key}"
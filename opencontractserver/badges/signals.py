@@ -1,24 +1,68 @@
 """
 Signal handlers for the badges app.
 
-These handlers automatically trigger badge checks when relevant user actions occur.
+These handlers mark users for badge checks when relevant user actions occur.
+Marks are stored as PendingBadgeCheck rows and evaluated in bulk by
+evaluate_pending_badge_checks, which the first mark queues to run
+PENDING_BADGE_CHECK_DELAY_SECONDS later. A burst of events (e.g. an import
+creating many annotations) thus costs one evaluation per user rather than one
+Celery task per event.
 This file is imported in apps.py ready() method to ensure signals are connected.
 """
 
 import logging
 
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from opencontractserver.badges.models import PendingBadgeCheck
+
 logger = logging.getLogger(__name__)
 
 
+# Criteria types (see BadgeCriteriaType) affected by each kind of event
+MESSAGE_CRITERIA = ["first_post", "message_count"]
+VOTE_CRITERIA = ["reputation_threshold", "message_upvotes"]
+ANNOTATION_CRITERIA = ["corpus_contribution"]
+
+
+def _schedule_evaluation() -> None:
+    """
+    Queue a delayed evaluation of the pending checks once the current
+    transaction commits, unless one is already queued.
+    """
+    from opencontractserver.tasks.badge_tasks import (
+        PENDING_BADGE_CHECK_DELAY_SECONDS,
+        PENDING_BADGE_CHECK_LOCK_KEY,
+        PENDING_BADGE_CHECK_LOCK_SECONDS,
+        evaluate_pending_badge_checks,
+    )
+
+    def _enqueue():
+        if not cache.add(
+            PENDING_BADGE_CHECK_LOCK_KEY, True, PENDING_BADGE_CHECK_LOCK_SECONDS
+        ):
+            return
+        try:
+            evaluate_pending_badge_checks.apply_async(
+                countdown=PENDING_BADGE_CHECK_DELAY_SECONDS
+            )
+        except Exception as e:
+            # The checks stay pending; the next mark tries again.
+            cache.delete(PENDING_BADGE_CHECK_LOCK_KEY)
+            logger.error(f"Failed to queue badge evaluation: {e}")
+
+    transaction.on_commit(_enqueue)
+
+
 @receiver(post_save, sender="conversations.ChatMessage")
 def check_message_badges(sender, instance, created, **kwargs):
     """
-    Check message-related badges when a new message is created.
+    Mark message-related badges for re-evaluation when a new message is created.
 
-    Triggers checks for:
+    Marks checks for:
     - first_post: User's first message
     - message_count: User reaches N messages
 
@@ -37,43 +81,73 @@ def check_message_badges(sender, instance, created, **kwargs):
 
     message = instance
 
-    # Import here to avoid circular dependencies
-    from opencontractserver.tasks.badge_tasks import check_auto_badges
+    # Global badges
+    PendingBadgeCheck.mark(message.creator_id, MESSAGE_CRITERIA)
 
-    user_id = message.creator.id
+    # Corpus-specific badges if message is in a corpus conversation
+    corpus_id = message.conversation.chat_with_corpus_id
+    if corpus_id:
+        PendingBadgeCheck.mark(message.creator_id, MESSAGE_CRITERIA, corpus_id)
+    _schedule_evaluation()
 
-    # Check global badges
-    check_auto_badges.delay(user_id=user_id)
     logger.debug(
-        f"Triggered global badge checks for user {message.creator.username} "
+        f"Marked message badge checks for user {message.creator_id} "
         f"after creating message {message.id}"
     )
 
-    # Check corpus-specific badges if message is in a corpus conversation
-    if message.conversation and message.conversation.chat_with_corpus:
-        corpus_id = message.conversation.chat_with_corpus.id
-        check_auto_badges.delay(user_id=user_id, corpus_id=corpus_id)
-        logger.debug(
-            f"Triggered corpus badge checks for user {message.creator.username} "
-            f"in corpus {message.conversation.chat_with_corpus.title}"
+
+@receiver(post_save, sender="conversations.MessageVote")
+def check_vote_badges(sender, instance, **kwargs):
+    """
+    Mark the voted message's author for reputation and upvote badge checks.
+
+    Args:
+        sender: The MessageVote model class
+        instance: The MessageVote instance that was saved
+        **kwargs: Additional keyword arguments
+    """
+    if hasattr(instance, "_skip_signals"):
+        return
+
+    from opencontractserver.conversations.models import ChatMessage
+
+    message = (
+        ChatMessage.objects.filter(pk=instance.message_id)
+        .values("creator_id", "conversation__chat_with_corpus_id")
+        .first()
+    )
+    if message is None:
+        return
+
+    PendingBadgeCheck.mark(message["creator_id"], VOTE_CRITERIA)
+    if message["conversation__chat_with_corpus_id"]:
+        PendingBadgeCheck.mark(
+            message["creator_id"],
+            VOTE_CRITERIA,
+            message["conversation__chat_with_corpus_id"],
         )
+    _schedule_evaluation()
 
 
 @receiver(post_save, sender="annotations.Annotation")
 def check_annotation_badges(sender, instance, created, **kwargs):
     """
-    Check annotation-related badges when a new annotation is created.
+    Mark annotation-related badges for re-evaluation when a new annotation is
+    created.
 
-    Triggers checks for:
+    Marks checks for:
     - corpus_contribution: User contributes documents/annotations to corpus
 
+    Structural annotations are created by parsers, not users, and never count
+    towards badges, so they are skipped without touching the database.
+
     Args:
         sender: The Annotation model class
         instance: The Annotation instance that was saved
         created: Boolean indicating if this is a new instance
         **kwargs: Additional keyword arguments
     """
-    if not created:
+    if not created or instance.structural:
         return
 
     # Skip signal during tests/fixtures if needed
@@ -82,18 +156,15 @@ def check_annotation_badges(sender, instance, created, **kwargs):
 
     annotation = instance
 
-    # Import here to avoid circular dependencies
-    from opencontractserver.tasks.badge_tasks import check_auto_badges
-
-    user_id = annotation.creator.id
-
-    # Check corpus-specific badges if annotation has corpus
-    if annotation.corpus:
-        corpus_id = annotation.corpus.id
-        check_auto_badges.delay(user_id=user_id, corpus_id=corpus_id)
+    # Only corpus-specific badges depend on annotations
+    if annotation.corpus_id:
+        PendingBadgeCheck.mark(
+            annotation.creator_id, ANNOTATION_CRITERIA, annotation.corpus_id
+        )
+        _schedule_evaluation()
         logger.debug(
-            f"Triggered corpus badge checks for user {annotation.creator.username} "
-            f"after creating annotation in corpus {annotation.corpus.title}"
+            f"Marked corpus badge checks for user {annotation.creator_id} "
+            f"after creating annotation in corpus {annotation.corpus_id}"
         )
 
 
@@ -109,5 +180,5 @@ def check_annotation_badges(sender, instance, created, **kwargs):
 # def check_document_contribution_badges(sender, instance, action, **kwargs):
 #     if action == "post_add":
 #         # Determine which user added the documents
-#         # Trigger check_auto_badges for corpus_contribution
+#         # Mark corpus_contribution checks via PendingBadgeCheck.mark
 #         pass
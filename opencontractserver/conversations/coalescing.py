@@ -0,0 +1,118 @@
+"""
+Coalescing of streamed agent tokens before they are sent to clients.
+
+Agents yield one ContentEvent per model token. Forwarding each one separately
+costs one channel-layer ``group_send`` (a Redis publish per watching group) or
+one WebSocket frame per token. StreamCoalescer buffers tokens and hands them
+on as a single batch once the buffer is ``window_ms`` old or holds
+``max_bytes`` of text, whichever comes first. Batches carry increasing
+sequence numbers so clients can detect gaps or reordering.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Receives (text, seq, token_count) for every flushed batch.
+FlushCallback = Callable[[str, int, int], Awaitable[None]]
+
+
+class StreamCoalescer:
+    """
+    Buffers streamed tokens and flushes them in ordered batches.
+
+    Call ``flush()`` before sending any other event for the same stream (tool
+    calls, completion, errors) so clients see everything in order, and
+    ``close()`` when the stream ends.
+    """
+
+    def __init__(
+        self,
+        on_flush: FlushCallback,
+        window_ms: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            on_flush: Coroutine function called with (text, seq, token_count).
+            window_ms: Max time a token waits in the buffer; defaults to
+                settings.AGENT_STREAM_BROADCAST_WINDOW_MS.
+            max_bytes: Buffer size (UTF-8) that triggers an immediate flush;
+                defaults to settings.AGENT_STREAM_BROADCAST_MAX_BYTES.
+        """
+        self.on_flush = on_flush
+        self.window = (
+            window_ms
+            if window_ms is not None
+            else settings.AGENT_STREAM_BROADCAST_WINDOW_MS
+        ) / 1000
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else settings.AGENT_STREAM_BROADCAST_MAX_BYTES
+        )
+
+        self.seq = 0
+        self.tokens_in = 0
+        self._buffer: list[str] = []
+        self._buffer_bytes = 0
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def add(self, token: str) -> None:
+        """Buffer a token, flushing if the byte threshold is reached."""
+        if not token:
+            return
+        self._buffer.append(token)
+        self._buffer_bytes += len(token.encode("utf-8"))
+        self.tokens_in += 1
+
+        if self._buffer_bytes >= self.max_bytes:
+            await self.flush()
+        elif self._timer is None:
+            if self.window <= 0:
+                await self.flush()
+            else:
+                self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Send the buffered tokens (if any) as one batch."""
+        self._cancel_timer()
+        await self._flush()
+
+    async def close(self) -> None:
+        """Flush what is left; the coalescer should not be used afterwards."""
+        await self.flush()
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            if not self._buffer:
+                return
+            text = "".join(self._buffer)
+            token_count = len(self._buffer)
+            self._buffer = []
+            self._buffer_bytes = 0
+            self.seq += 1
+            await self.on_flush(text, self.seq, token_count)
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.window)
+        except asyncio.CancelledError:
+            return
+        # Clear the handle before flushing so flush() doesn't cancel this task.
+        self._timer = None
+        try:
+            await self._flush()
+        except Exception:
+            logger.exception("Failed to flush coalesced stream tokens")
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            if self._timer is not asyncio.current_task():
+                self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,148 @@
+"""
+Management command measuring vote latency against the author's message count.
+
+Usage:
+    python manage.py benchmark_vote_latency [--messages N [N ...]] [--votes N]
+        [--json]
+
+For each message count, an author with that many thread messages is created
+and votes are cast, changed and removed on them. Each operation is timed
+including its signal handlers. The from-scratch recount that used to run on
+every vote is timed alongside for comparison. All data is created inside a
+transaction that is rolled back, so the command is safe to run against a
+real database.
+"""
+
+import json
+import statistics
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    ConversationTypeChoices,
+    MessageVote,
+    VoteType,
+)
+from opencontractserver.conversations.signals import (
+    recalculate_message_vote_counts,
+    update_user_reputation,
+)
+from opencontractserver.corpuses.models import Corpus
+
+User = get_user_model()
+
+
+def _summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark vote create/change/delete latency against author message count"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--messages",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000, 10000],
+            help="Author message counts to measure (default: 10 100 1000 10000)",
+        )
+        parser.add_argument(
+            "--votes",
+            type=int,
+            default=50,
+            help="Votes cast per message count (default: 50)",
+        )
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def _measure(self, message_count: int, vote_count: int) -> dict:
+        run_id = uuid.uuid4().hex[:8]
+        author = User.objects.create_user(username=f"vote-bench-author-{run_id}")
+        corpus = Corpus.objects.create(title=f"Vote benchmark {run_id}", creator=author)
+        thread = Conversation.objects.create(
+            title="Vote benchmark",
+            conversation_type=ConversationTypeChoices.THREAD,
+            chat_with_corpus=corpus,
+            creator=author,
+        )
+        messages = ChatMessage.objects.bulk_create(
+            ChatMessage(
+                conversation=thread,
+                msg_type="HUMAN",
+                content=f"Message {i}",
+                creator=author,
+            )
+            for i in range(message_count)
+        )
+        voters = [
+            User.objects.create_user(username=f"vote-bench-voter-{run_id}-{i}")
+            for i in range(vote_count)
+        ]
+
+        timings = {"create": [], "change": [], "delete": [], "full_recount": []}
+        votes = []
+        for i, voter in enumerate(voters):
+            message = messages[i % message_count]
+            start = time.perf_counter()
+            votes.append(
+                MessageVote.objects.create(
+                    message=message, vote_type=VoteType.UPVOTE, creator=voter
+                )
+            )
+            timings["create"].append(time.perf_counter() - start)
+
+            # What every vote used to cost before counters became incremental.
+            start = time.perf_counter()
+            recalculate_message_vote_counts(message)
+            update_user_reputation(author)
+            update_user_reputation(author, corpus)
+            timings["full_recount"].append(time.perf_counter() - start)
+
+        for vote in votes:
+            vote.vote_type = VoteType.DOWNVOTE
+            start = time.perf_counter()
+            vote.save()
+            timings["change"].append(time.perf_counter() - start)
+
+        for vote in votes:
+            start = time.perf_counter()
+            vote.delete()
+            timings["delete"].append(time.perf_counter() - start)
+
+        return {name: _summarize(samples) for name, samples in timings.items()}
+
+    def handle(self, *args, **options):
+        if options["votes"] < 1 or min(options["messages"]) < 1:
+            raise CommandError("--messages and --votes must be positive")
+
+        results = []
+        for message_count in options["messages"]:
+            with transaction.atomic():
+                timings = self._measure(message_count, options["votes"])
+                transaction.set_rollback(True)
+            results.append({"messages": message_count, **timings})
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'messages':>10} {'create':>10} {'change':>10} {'delete':>10} "
+            f"{'recount':>10}   (median ms, {options['votes']} votes)"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['messages']:>10} {row['create']['median_ms']:>10} "
+                f"{row['change']['median_ms']:>10} {row['delete']['median_ms']:>10} "
+                f"{row['full_recount']['median_ms']:>10}"
+            )
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.24 on 2026-10-18 22:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("conversations", "0012_update_chat_field_constraint_for_threads"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChatMessageStreamChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "sequence",
+                    models.PositiveIntegerField(
+                        help_text="Position of this delta within the message stream"
+                    ),
+                ),
+                (
+                    "content",
+                    models.TextField(
+                        help_text="Text appended to the message since the previous chunk"
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "message",
+                    models.ForeignKey(
+                        help_text="The in-progress message this delta belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stream_chunks",
+                        to="conversations.chatmessage",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="chatmessagestreamchunk",
+            constraint=models.UniqueConstraint(
+                fields=("message", "sequence"),
+                name="unique_stream_chunk_sequence_per_message",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.24 on 2026-10-18 22:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("conversations", "0013_add_chat_message_stream_chunk"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conversation",
+            name="history_summary",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="Rolling summary of older turns, sent to agents instead of the raw messages",
+            ),
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="history_summary_through",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Newest message already folded into history_summary",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="conversations.chatmessage",
+            ),
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="history_summary_updated_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When history_summary was last refreshed",
+                null=True,
+            ),
+        ),
+    ]
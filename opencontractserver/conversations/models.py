@@ -404,6 +404,27 @@ class Conversation(BaseOCModel, HasEmbeddingMixin):
         null=True,
     )
 
+    # Rolling summary of turns that fell out of the agent's verbatim history
+    # window (see llms/agents/conversation_history.py)
+    history_summary = models.TextField(
+        blank=True,
+        default="",
+        help_text="Rolling summary of older turns, sent to agents instead of the raw messages",
+    )
+    history_summary_through = models.ForeignKey(
+        "ChatMessage",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+        help_text="Newest message already folded into history_summary",
+    )
+    history_summary_updated_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When history_summary was last refreshed",
+    )
+
     # Managers
     objects = ConversationManager()  # Default manager with vector search support
     all_objects = models.Manager()  # Access all objects including soft-deleted
@@ -842,9 +863,57 @@ class ChatMessage(BaseOCModel, HasEmbeddingMixin):
         """
         return {"message_id": self.pk}
 
+    def get_streamed_content(self) -> str:
+        """
+        Content including any not-yet-compacted stream chunks.
+
+        While an agent is streaming, deltas are appended to
+        ChatMessageStreamChunk rather than rewriting ``content``; this stitches
+        them back together for readers that need the partial answer.
+        """
+        chunks = self.stream_chunks.order_by("sequence").values_list(
+            "content", flat=True
+        )
+        return self.content + "".join(chunks)
+
     # (compatibility alias added below, outside the class body)
 
 
+class ChatMessageStreamChunk(models.Model):
+    """
+    Append-only content delta written while an agent response is streaming.
+
+    Chunks are compacted into ChatMessage.content (and deleted) when the
+    message completes, errors or is cancelled. Chunks left behind by a crashed
+    worker are reassembled by recover_interrupted_stream_messages().
+    """
+
+    message = models.ForeignKey(
+        ChatMessage,
+        on_delete=models.CASCADE,
+        related_name="stream_chunks",
+        help_text="The in-progress message this delta belongs to",
+    )
+    sequence = models.PositiveIntegerField(
+        help_text="Position of this delta within the message stream",
+    )
+    content = models.TextField(
+        help_text="Text appended to the message since the previous chunk",
+    )
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["message", "sequence"],
+                name="unique_stream_chunk_sequence_per_message",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"ChatMessageStreamChunk {self.sequence} of message {self.message_id}"
+
+
 class ChatMessageUserObjectPermission(UserObjectPermissionBase):
     """
     Permissions for ChatMessage objects at the user level.
@@ -3,40 +3,126 @@ Signal handlers for the conversations app.
 
 Handles automatic updates of denormalized vote counts and user reputation
 when votes are created, updated, or deleted.
+
+Each vote change is applied as a delta with atomic F() increments, so the
+cost of a vote no longer grows with the number of messages (and votes) the
+message author has. The from-scratch recalculations below are kept for
+repairs; reconcile_vote_counters runs them set-wise to fix any drift.
 """
 
-from django.db.models.signals import post_delete, post_save
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from opencontractserver.conversations.models import (
+    ChatMessage,
     MessageVote,
     UserReputation,
     VoteType,
 )
 
 
+def _vote_deltas(vote_type, sign: int) -> tuple[int, int]:
+    """(upvote delta, downvote delta) for adding (+1) or removing (-1) a vote."""
+    if vote_type == VoteType.UPVOTE:
+        return sign, 0
+    if vote_type == VoteType.DOWNVOTE:
+        return 0, sign
+    return 0, 0
+
+
+def apply_vote_delta(message_id: int, upvotes: int, downvotes: int) -> None:
+    """
+    Atomically adjust a message's vote counts and its author's reputation.
+
+    Args:
+        message_id: The message that was voted on
+        upvotes: Change in upvotes (-1, 0 or 1)
+        downvotes: Change in downvotes (-1, 0 or 1)
+    """
+    if not upvotes and not downvotes:
+        return
+
+    ChatMessage.all_objects.filter(pk=message_id).update(
+        upvote_count=F("upvote_count") + upvotes,
+        downvote_count=F("downvote_count") + downvotes,
+    )
+
+    # Like update_user_reputation, reputation only counts live messages.
+    message = (
+        ChatMessage.objects.filter(pk=message_id)
+        .values("creator_id", "conversation__chat_with_corpus_id")
+        .first()
+    )
+    if message is None:
+        return
+
+    # Global reputation, plus corpus-specific reputation if in a corpus
+    corpus_ids = [None]
+    if message["conversation__chat_with_corpus_id"]:
+        corpus_ids.append(message["conversation__chat_with_corpus_id"])
+
+    for corpus_id in corpus_ids:
+        reputation, _ = UserReputation.objects.get_or_create(
+            user_id=message["creator_id"],
+            corpus_id=corpus_id,
+            defaults={"creator_id": message["creator_id"]},
+        )
+        # update() skips auto_now, so stamp last_calculated_at explicitly.
+        UserReputation.objects.filter(pk=reputation.pk).update(
+            reputation_score=F("reputation_score") + upvotes - downvotes,
+            total_upvotes_received=F("total_upvotes_received") + upvotes,
+            total_downvotes_received=F("total_downvotes_received") + downvotes,
+            last_calculated_at=timezone.now(),
+        )
+
+
+@receiver(pre_save, sender=MessageVote)
+def remember_previous_vote_type(sender, instance, **kwargs):
+    """
+    Record the stored vote type of an existing vote so post_save can apply
+    the difference when a vote is changed.
+    """
+    instance._previous_vote_type = None
+    if instance.pk:
+        instance._previous_vote_type = (
+            MessageVote.objects.filter(pk=instance.pk)
+            .values_list("vote_type", flat=True)
+            .first()
+        )
+
+
 @receiver(post_save, sender=MessageVote)
 def update_vote_counts_on_save(sender, instance, created, **kwargs):
     """
-    Update denormalized vote counts on ChatMessage when a vote is created or changed.
-    Always recalculate from scratch to ensure accuracy and avoid signal loops.
+    Apply the change in vote counts and reputation when a vote is created or
+    changed.
     """
-    recalculate_message_vote_counts(instance.message)
+    previous = getattr(instance, "_previous_vote_type", None)
+    if previous == instance.vote_type:
+        return
+
+    added_up, added_down = _vote_deltas(instance.vote_type, 1)
+    removed_up, removed_down = _vote_deltas(previous, -1)
+    apply_vote_delta(
+        instance.message_id, added_up + removed_up, added_down + removed_down
+    )
+    instance._previous_vote_type = instance.vote_type
 
 
 @receiver(post_delete, sender=MessageVote)
 def update_vote_counts_on_delete(sender, instance, **kwargs):
     """
-    Update denormalized vote counts on ChatMessage when a vote is deleted.
-    Recalculate from scratch to ensure accuracy.
+    Remove a deleted vote from the message's counts and its author's reputation.
     """
-    recalculate_message_vote_counts(instance.message)
+    apply_vote_delta(instance.message_id, *_vote_deltas(instance.vote_type, -1))
 
 
 def recalculate_message_vote_counts(message):
     """
     Recalculate vote counts for a message from scratch.
-    Used when a vote is changed to ensure accuracy.
+    Used to repair counts that have drifted from the votes table.
     """
     from django.db.models import Count, Q
 
@@ -50,42 +136,11 @@ def recalculate_message_vote_counts(message):
     message.save(update_fields=["upvote_count", "downvote_count"])
 
 
-@receiver(post_save, sender=MessageVote)
-def update_reputation_on_vote_change(sender, instance, created, **kwargs):
-    """
-    Trigger reputation recalculation when a vote is created or changed.
-    This can be made asynchronous with Celery for better performance.
-    """
-    message = instance.message
-    message_author = message.creator
-
-    # Update global reputation
-    update_user_reputation(message_author, corpus=None)
-
-    # Update corpus-specific reputation if message is in a corpus
-    if message.conversation.chat_with_corpus:
-        update_user_reputation(message_author, message.conversation.chat_with_corpus)
-
-
-@receiver(post_delete, sender=MessageVote)
-def update_reputation_on_vote_delete(sender, instance, **kwargs):
-    """
-    Trigger reputation recalculation when a vote is deleted.
-    """
-    message = instance.message
-    message_author = message.creator
-
-    # Update global reputation
-    update_user_reputation(message_author, corpus=None)
-
-    # Update corpus-specific reputation if message is in a corpus
-    if message.conversation.chat_with_corpus:
-        update_user_reputation(message_author, message.conversation.chat_with_corpus)
-
-
 def update_user_reputation(user, corpus=None):
     """
-    Calculate and update user reputation based on votes received.
+    Calculate and update user reputation from scratch based on votes received.
+
+    Votes keep reputation up to date incrementally; this is for repairs.
 
     Args:
         user: The user whose reputation to update
@@ -93,8 +148,6 @@ def update_user_reputation(user, corpus=None):
     """
     from django.db.models import Count, Q
 
-    from opencontractserver.conversations.models import ChatMessage
-
     # Get all messages by this user in the relevant scope
     messages_query = ChatMessage.objects.filter(creator=user)
 
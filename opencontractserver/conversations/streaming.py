@@ -0,0 +1,102 @@
+"""
+Persistence helpers for streamed agent responses.
+
+While an agent streams, content deltas are appended to ChatMessageStreamChunk
+instead of rewriting ChatMessage.content on every update. The chunks are
+compacted into the message when it is finalised; this module handles the
+cases where that never happened (e.g. the worker died mid-stream).
+"""
+
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    ChatMessageStreamChunk,
+    MessageStateChoices,
+    MessageTypeChoices,
+)
+
+logger = logging.getLogger(__name__)
+
+INTERRUPTED_STREAM_ERROR = "Response interrupted before completion"
+
+
+def recover_interrupted_stream_messages(
+    stale_after_seconds: Optional[int] = None,
+) -> int:
+    """
+    Finalise in-progress LLM messages abandoned mid-stream.
+
+    A message counts as abandoned when it is still IN_PROGRESS, was created
+    more than ``stale_after_seconds`` ago and has received no stream chunk
+    within that window. Its chunks are reassembled into ``content`` (keeping the
+    partial answer) and it is marked ERROR. Chunks left on messages that were
+    already finalised are deleted.
+
+    Args:
+        stale_after_seconds: Inactivity window, defaults to
+            settings.AGENT_STREAM_RECOVERY_STALE_SECONDS.
+
+    Returns:
+        Number of messages recovered.
+    """
+    if stale_after_seconds is None:
+        stale_after_seconds = settings.AGENT_STREAM_RECOVERY_STALE_SECONDS
+    cutoff = timezone.now() - timedelta(seconds=stale_after_seconds)
+
+    # Finalisation saves the message before dropping its chunks, so a crash in
+    # between only leaves harmless leftovers behind.
+    ChatMessageStreamChunk.objects.exclude(
+        message__state=MessageStateChoices.IN_PROGRESS
+    ).delete()
+
+    recent_chunks = ChatMessageStreamChunk.objects.filter(
+        message=OuterRef("pk"), created__gte=cutoff
+    )
+    stale_ids = list(
+        ChatMessage.all_objects.filter(
+            state=MessageStateChoices.IN_PROGRESS,
+            msg_type=MessageTypeChoices.LLM,
+            created__lt=cutoff,
+        )
+        .exclude(Exists(recent_chunks))
+        .values_list("id", flat=True)
+    )
+
+    recovered = 0
+    for message_id in stale_ids:
+        with transaction.atomic():
+            message = (
+                ChatMessage.all_objects.select_for_update()
+                .filter(id=message_id, state=MessageStateChoices.IN_PROGRESS)
+                .first()
+            )
+            if message is None:
+                # Finalised by its worker since we listed it.
+                continue
+
+            partial = message.get_streamed_content()
+            message.content = partial or INTERRUPTED_STREAM_ERROR
+            message.state = MessageStateChoices.ERROR
+            data = message.data or {}
+            data["state"] = MessageStateChoices.ERROR.value
+            data["error"] = INTERRUPTED_STREAM_ERROR
+            data["recovered_at"] = timezone.now().isoformat()
+            message.data = data
+            message.save(update_fields=["content", "state", "data", "modified"])
+            message.stream_chunks.all().delete()
+            recovered += 1
+
+        logger.info(
+            f"Recovered interrupted stream for message {message_id} "
+            f"({len(partial)} chars of partial content)"
+        )
+
+    return recovered
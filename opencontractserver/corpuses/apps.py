@@ -10,7 +10,7 @@ class CorpusesConfig(AppConfig):
 
     def ready(self):
         try:
-            pass
+            import opencontractserver.corpuses.engagement_signals  # noqa F401
 
         except ImportError:
             pass
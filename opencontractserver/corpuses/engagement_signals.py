@@ -0,0 +1,307 @@
+"""
+Signal handlers that keep CorpusEngagementBucket counters current.
+
+Every thread, message, vote and annotation event in a corpus adds a delta to
+the bucket of the (corpus, day, user) the object was counted in, using atomic
+increments. Objects are always counted in the bucket of the day they were
+created on, so deleting or restoring one later adjusts that same bucket.
+
+What counts mirrors the from-scratch calculation in
+update_corpus_engagement_metrics: live threads in the corpus, live messages
+in live threads, upvotes on thread messages, and non-structural annotations.
+Writes that bypass signals (queryset.update(), raw SQL) are repaired by
+rebuilding the buckets with update_corpus_engagement_metrics.
+
+Epic: #565 - Corpus Engagement Metrics & Analytics
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    ConversationTypeChoices,
+    MessageVote,
+    VoteType,
+)
+from opencontractserver.corpuses.models import Corpus, CorpusEngagementBucket
+
+THREAD_STATE_FIELDS = {"deleted_at", "is_locked"}
+
+
+def _day(value):
+    return timezone.localdate(value) if value else timezone.localdate()
+
+
+def _is_corpus_thread(conversation) -> bool:
+    return bool(
+        conversation.chat_with_corpus_id
+        and conversation.conversation_type == ConversationTypeChoices.THREAD
+    )
+
+
+def _thread_state(live: bool, locked: bool) -> tuple[int, int]:
+    """(threads, locked_threads) a thread contributes to its bucket."""
+    return int(live), int(live and locked)
+
+
+def _deleting_bucket_owner(origin) -> bool:
+    """
+    Whether a deletion cascades from a corpus or user, whose buckets are being
+    deleted too; recreating them mid-cascade would violate their foreign keys.
+    """
+    model = getattr(origin, "model", type(origin))
+    return model is Corpus or model is get_user_model()
+
+
+def _corpus_thread_of_message(message) -> dict | None:
+    """The corpus and liveness of a message's thread, or None if not a corpus thread."""
+    return (
+        Conversation.all_objects.filter(
+            pk=message.conversation_id,
+            chat_with_corpus__isnull=False,
+            conversation_type=ConversationTypeChoices.THREAD,
+        )
+        .values("chat_with_corpus_id", "deleted_at")
+        .first()
+    )
+
+
+def _add_thread_messages(conversation, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) a thread's live messages from the buckets."""
+    per_bucket = (
+        ChatMessage.all_objects.filter(
+            conversation_id=conversation.pk, deleted_at__isnull=True
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "creator_id")
+        .annotate(count=Count("id"))
+    )
+    for row in per_bucket:
+        CorpusEngagementBucket.add(
+            conversation.chat_with_corpus_id,
+            row["day"],
+            row["creator_id"],
+            messages=sign * row["count"],
+        )
+
+
+# --------------------------------------------------------------------------- #
+# Threads
+# --------------------------------------------------------------------------- #
+
+
+@receiver(pre_save, sender=Conversation)
+def remember_thread_state(sender, instance, update_fields=None, **kwargs):
+    """
+    Record the stored liveness and lock state of an existing corpus thread so
+    post_save can apply the difference.
+    """
+    instance._engagement_previous_state = None
+    if not instance.pk or not _is_corpus_thread(instance):
+        return
+    if update_fields is not None and not THREAD_STATE_FIELDS & set(update_fields):
+        instance._engagement_previous_state = (
+            instance.deleted_at is None,
+            instance.is_locked,
+        )
+        return
+
+    stored = (
+        Conversation.all_objects.filter(pk=instance.pk)
+        .values_list("deleted_at", "is_locked")
+        .first()
+    )
+    if stored:
+        instance._engagement_previous_state = (stored[0] is None, stored[1])
+
+
+@receiver(post_save, sender=Conversation)
+def count_thread_on_save(sender, instance, created, **kwargs):
+    """Count a new corpus thread, or apply a change in its deleted/locked state."""
+    if not _is_corpus_thread(instance):
+        return
+
+    live, locked = instance.deleted_at is None, instance.is_locked
+    previous = getattr(instance, "_engagement_previous_state", None)
+    if created or previous is None:
+        previous = (False, False)
+
+    threads, locked_threads = _thread_state(live, locked)
+    previous_threads, previous_locked = _thread_state(*previous)
+    CorpusEngagementBucket.add(
+        instance.chat_with_corpus_id,
+        _day(instance.created_at),
+        instance.creator_id,
+        threads=threads - previous_threads,
+        locked_threads=locked_threads - previous_locked,
+    )
+
+    # Messages in a deleted thread stop counting, and count again on restore.
+    if not created and live != previous[0]:
+        _add_thread_messages(instance, 1 if live else -1)
+
+    instance._engagement_previous_state = (live, locked)
+
+
+@receiver(post_delete, sender=Conversation)
+def uncount_thread_on_delete(sender, instance, origin=None, **kwargs):
+    """Remove a deleted corpus thread; its messages are removed as they cascade."""
+    if not _is_corpus_thread(instance) or _deleting_bucket_owner(origin):
+        return
+
+    threads, locked_threads = _thread_state(
+        instance.deleted_at is None, instance.is_locked
+    )
+    CorpusEngagementBucket.add(
+        instance.chat_with_corpus_id,
+        _day(instance.created_at),
+        instance.creator_id,
+        threads=-threads,
+        locked_threads=-locked_threads,
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Messages
+# --------------------------------------------------------------------------- #
+
+
+@receiver(pre_save, sender=ChatMessage)
+def remember_message_state(sender, instance, update_fields=None, **kwargs):
+    """Record whether an existing message was live before it is saved."""
+    instance._engagement_was_live = None
+    if not instance.pk:
+        return
+    if update_fields is not None and "deleted_at" not in update_fields:
+        instance._engagement_was_live = instance.deleted_at is None
+        return
+
+    stored = (
+        ChatMessage.all_objects.filter(pk=instance.pk)
+        .values_list("deleted_at", flat=True)
+        .first()
+    )
+    instance._engagement_was_live = stored is None
+
+
+def _add_message(message, sign: int) -> None:
+    thread = _corpus_thread_of_message(message)
+    # Messages in deleted threads are already uncounted
+    if thread is None or thread["deleted_at"] is not None:
+        return
+    CorpusEngagementBucket.add(
+        thread["chat_with_corpus_id"],
+        _day(message.created_at),
+        message.creator_id,
+        messages=sign,
+    )
+
+
+@receiver(post_save, sender=ChatMessage)
+def count_message_on_save(sender, instance, created, **kwargs):
+    """Count a new message in a corpus thread, or a soft delete/restore of one."""
+    live = instance.deleted_at is None
+    was_live = False if created else getattr(instance, "_engagement_was_live", None)
+    if was_live is None or was_live == live:
+        return
+
+    _add_message(instance, 1 if live else -1)
+    instance._engagement_was_live = live
+
+
+@receiver(post_delete, sender=ChatMessage)
+def uncount_message_on_delete(sender, instance, origin=None, **kwargs):
+    """Remove a deleted live message from its bucket."""
+    if instance.deleted_at is None and not _deleting_bucket_owner(origin):
+        _add_message(instance, -1)
+
+
+# --------------------------------------------------------------------------- #
+# Votes
+# --------------------------------------------------------------------------- #
+
+
+@receiver(pre_save, sender=MessageVote)
+def remember_vote_state(sender, instance, **kwargs):
+    """Record whether an existing vote was an upvote before it is saved."""
+    instance._engagement_was_upvote = False
+    if instance.pk:
+        instance._engagement_was_upvote = MessageVote.objects.filter(
+            pk=instance.pk, vote_type=VoteType.UPVOTE
+        ).exists()
+
+
+def _add_upvote(vote, sign: int) -> None:
+    thread = (
+        ChatMessage.all_objects.filter(
+            pk=vote.message_id,
+            conversation__chat_with_corpus__isnull=False,
+            conversation__conversation_type=ConversationTypeChoices.THREAD,
+        )
+        .values("conversation__chat_with_corpus_id")
+        .first()
+    )
+    if thread is None:
+        return
+    CorpusEngagementBucket.add(
+        thread["conversation__chat_with_corpus_id"],
+        _day(vote.created_at),
+        vote.creator_id,
+        upvotes=sign,
+    )
+
+
+@receiver(post_save, sender=MessageVote)
+def count_upvote_on_save(sender, instance, created, **kwargs):
+    """Count an upvote on a corpus thread message, or a change to or from one."""
+    is_upvote = instance.vote_type == VoteType.UPVOTE
+    was_upvote = getattr(instance, "_engagement_was_upvote", False)
+    if is_upvote != was_upvote:
+        _add_upvote(instance, 1 if is_upvote else -1)
+    instance._engagement_was_upvote = is_upvote
+
+
+@receiver(post_delete, sender=MessageVote)
+def uncount_upvote_on_delete(sender, instance, origin=None, **kwargs):
+    """Remove a deleted upvote from its bucket."""
+    if instance.vote_type == VoteType.UPVOTE and not _deleting_bucket_owner(origin):
+        _add_upvote(instance, -1)
+
+
+# --------------------------------------------------------------------------- #
+# Annotations
+# --------------------------------------------------------------------------- #
+
+
+@receiver(post_save, sender="annotations.Annotation")
+def count_annotation_on_create(sender, instance, created, **kwargs):
+    """Count a new non-structural annotation in a corpus."""
+    if created and instance.corpus_id and not instance.structural:
+        CorpusEngagementBucket.add(
+            instance.corpus_id,
+            _day(instance.created),
+            instance.creator_id,
+            annotations=1,
+        )
+
+
+@receiver(post_delete, sender="annotations.Annotation")
+def uncount_annotation_on_delete(sender, instance, origin=None, **kwargs):
+    """Remove a deleted non-structural annotation from its bucket."""
+    if (
+        instance.corpus_id
+        and not instance.structural
+        and not _deleting_bucket_owner(origin)
+    ):
+        CorpusEngagementBucket.add(
+            instance.corpus_id,
+            _day(instance.created),
+            instance.creator_id,
+            annotations=-1,
+        )
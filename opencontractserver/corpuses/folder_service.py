@@ -39,7 +39,8 @@ import logging
 from typing import TYPE_CHECKING
 
 from django.conf import settings
-from django.db import transaction
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.db.models import Q, QuerySet
 
 from opencontractserver.types.enums import PermissionTypes
@@ -58,6 +59,60 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+FOLDER_TREE_CACHE_KEY = "corpus-folder-tree:{corpus_id}"
+
+# One statement for the whole tree: a recursive CTE walks the folders from the
+# roots down, carrying the materialized path and the id chain of ancestors, and
+# direct / descendant document counts are aggregated from DocumentPath in the
+# same query. Table names are filled in from model _meta.
+FOLDER_TREE_SQL = """
+WITH RECURSIVE
+doc_counts AS (
+    SELECT folder_id, COUNT(*) AS n
+    FROM {path_table}
+    WHERE corpus_id = %(corpus_id)s
+      AND folder_id IS NOT NULL
+      AND is_current
+      AND NOT is_deleted
+    GROUP BY folder_id
+),
+tree AS (
+    SELECT f.id, f.parent_id, f.name, f.name::text AS path, ARRAY[f.id] AS ancestry
+    FROM {folder_table} f
+    WHERE f.corpus_id = %(corpus_id)s
+      AND (
+        f.parent_id IS NULL
+        OR NOT EXISTS (
+            SELECT 1 FROM {folder_table} p
+            WHERE p.id = f.parent_id AND p.corpus_id = %(corpus_id)s
+        )
+      )
+    UNION ALL
+    SELECT c.id, c.parent_id, c.name, t.path || '/' || c.name, t.ancestry || c.id
+    FROM {folder_table} c
+    JOIN tree t ON c.parent_id = t.id
+    WHERE c.corpus_id = %(corpus_id)s
+),
+descendant_counts AS (
+    SELECT a.ancestor_id, SUM(dc.n) AS n
+    FROM tree d
+    CROSS JOIN LATERAL unnest(d.ancestry) AS a(ancestor_id)
+    JOIN doc_counts dc ON dc.folder_id = d.id
+    GROUP BY a.ancestor_id
+)
+SELECT
+    t.id,
+    t.parent_id,
+    t.name,
+    t.path,
+    COALESCE(dc.n, 0) AS document_count,
+    COALESCE(ds.n, 0) AS descendant_document_count
+FROM tree t
+LEFT JOIN doc_counts dc ON dc.folder_id = t.id
+LEFT JOIN descendant_counts ds ON ds.ancestor_id = t.id
+ORDER BY t.name, t.id
+"""
+
 
 class DocumentFolderService:
     """
@@ -356,7 +411,8 @@ class DocumentFolderService:
         """
         Get full folder tree for corpus as nested dictionary structure.
 
-        Optimized to use a single query and build tree in Python.
+        Built from a single recursive CTE (see FOLDER_TREE_SQL) and cached per
+        corpus; folder and DocumentPath changes invalidate the cached tree.
 
         Args:
             user: Requesting user
@@ -368,29 +424,73 @@ class DocumentFolderService:
                 {
                     "id": 1,
                     "name": "Contracts",
-                    "path": "/Contracts",
+                    "path": "Contracts",
                     "documentCount": 5,
+                    "descendantDocumentCount": 12,
                     "children": [...]
                 }
             ]
         """
-        folders = cls.get_visible_folders(user, corpus_id)
+        from opencontractserver.corpuses.models import Corpus
+
+        # Permission check always runs; only the tree itself is cached.
+        try:
+            corpus = Corpus.objects.get(id=corpus_id)
+        except Corpus.DoesNotExist:
+            return []
+
+        if not cls.check_corpus_read_permission(user, corpus):
+            return []
 
-        # Build lookup dict
+        cache_key = FOLDER_TREE_CACHE_KEY.format(corpus_id=corpus.id)
+        tree = cache.get(cache_key)
+        if tree is None:
+            tree = cls._build_folder_tree(corpus.id)
+            cache.set(cache_key, tree, settings.FOLDER_TREE_CACHE_TIMEOUT)
+
+        return tree
+
+    @classmethod
+    def _build_folder_tree(cls, corpus_id: int) -> list[dict]:
+        """
+        Build the nested folder tree for a corpus from a single SQL statement.
+
+        No permission checks - callers must have checked corpus read access.
+        """
+        from opencontractserver.corpuses.models import CorpusFolder
+        from opencontractserver.documents.models import DocumentPath
+
+        sql = FOLDER_TREE_SQL.format(
+            folder_table=CorpusFolder._meta.db_table,
+            path_table=DocumentPath._meta.db_table,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {"corpus_id": corpus_id})
+            rows = cursor.fetchall()
+
+        # Build lookup dict (rows are already ordered by name)
         folder_dict: dict[int, dict] = {}
-        for folder in folders:
-            folder_dict[folder.id] = {
-                "id": folder.id,
-                "name": folder.name,
-                "path": folder.get_path(),
-                "documentCount": folder.get_document_count(),
-                "parentId": folder.parent_id,
+        for (
+            folder_id,
+            parent_id,
+            name,
+            path,
+            document_count,
+            descendant_document_count,
+        ) in rows:
+            folder_dict[folder_id] = {
+                "id": folder_id,
+                "name": name,
+                "path": path,
+                "documentCount": document_count,
+                "descendantDocumentCount": int(descendant_document_count),
+                "parentId": parent_id,
                 "children": [],
             }
 
         # Build tree structure
         roots: list[dict] = []
-        for folder_id, folder_data in folder_dict.items():
+        for folder_data in folder_dict.values():
             parent_id = folder_data.get("parentId")
             if parent_id and parent_id in folder_dict:
                 folder_dict[parent_id]["children"].append(folder_data)
@@ -399,6 +499,18 @@ class DocumentFolderService:
 
         return roots
 
+    @classmethod
+    def invalidate_folder_tree_cache(cls, corpus_id: int) -> None:
+        """
+        Drop the cached folder tree for a corpus.
+
+        Deletes now and again once the surrounding transaction commits, so a
+        tree rebuilt by a concurrent request from pre-commit data doesn't stick.
+        """
+        cache_key = FOLDER_TREE_CACHE_KEY.format(corpus_id=corpus_id)
+        cache.delete(cache_key)
+        transaction.on_commit(lambda: cache.delete(cache_key))
+
     # =========================================================================
     # DOCUMENT-IN-FOLDER READ OPERATIONS
     # =========================================================================
@@ -838,6 +950,7 @@ class DocumentFolderService:
             # Delete folder
             folder_id = folder.id
             folder.delete()
+            cls.invalidate_folder_tree_cache(folder.corpus_id)
 
             logger.info(f"Deleted folder {folder_id} by user {user.id}")
             return True, ""
@@ -895,6 +1008,7 @@ class DocumentFolderService:
                 is_current=True,
                 is_deleted=False,
             ).update(folder=folder)
+            cls.invalidate_folder_tree_cache(corpus.id)
 
             logger.info(
                 f"Moved document {document.id} to folder {folder.id if folder else 'root'} "
@@ -953,6 +1067,7 @@ class DocumentFolderService:
                 is_current=True,
                 is_deleted=False,
             ).update(folder=folder)
+            cls.invalidate_folder_tree_cache(corpus.id)
 
             logger.info(
                 f"Bulk moved {len(document_ids)} documents to folder "
@@ -1518,7 +1633,10 @@ class DocumentFolderService:
         """
         Add multiple existing documents to a corpus.
 
-        This is a bulk operation that creates corpus-isolated copies of each document.
+        This is a bulk operation that creates corpus-isolated copies of each document
+        via Corpus.add_documents(), in a single transaction. If the batch fails,
+        the documents are added one at a time instead, so one bad document only
+        fails itself and is reported in the error message.
 
         Args:
             user: User performing the operation
@@ -1543,11 +1661,44 @@ class DocumentFolderService:
             )
 
         # Get accessible documents (owned or public)
-        documents = Document.objects.filter(
-            Q(pk__in=document_ids) & (Q(creator=user) | Q(is_public=True))
+        documents = list(
+            Document.objects.filter(
+                Q(pk__in=document_ids) & (Q(creator=user) | Q(is_public=True))
+            )
+        )
+
+        try:
+            # One bulk call: hash dedupe and path conflicts are resolved per batch
+            results = corpus.add_documents(documents, user=user, folder=folder)
+        except Exception as e:
+            logger.warning(
+                f"Bulk add to corpus {corpus.id} failed ({e}); "
+                "adding the documents one at a time"
+            )
+            return cls._add_documents_to_corpus_one_by_one(
+                user, documents, corpus, folder
+            )
+
+        added_ids = []
+        for corpus_doc, _status, _path in results:
+            # Set permissions on the corpus-isolated copy
+            set_permissions_for_obj_to_user(user, corpus_doc, [PermissionTypes.CRUD])
+            added_ids.append(corpus_doc.id)
+
+        logger.info(
+            f"Added {len(added_ids)} documents to corpus {corpus.id} by user {user.id}"
         )
+        return len(added_ids), added_ids, ""
 
-        added_count = 0
+    @classmethod
+    def _add_documents_to_corpus_one_by_one(
+        cls,
+        user: User,
+        documents: list[Document],
+        corpus: Corpus,
+        folder: CorpusFolder | None = None,
+    ) -> tuple[int, list[int], str]:
+        """add_documents_to_corpus() with a separate add per document."""
         added_ids = []
         errors = []
 
@@ -1559,13 +1710,12 @@ class DocumentFolderService:
                 folder=folder,
             )
             if corpus_doc:
-                added_count += 1
                 added_ids.append(corpus_doc.id)
             elif error:
                 errors.append(f"Doc {doc.id}: {error}")
 
         error_msg = "; ".join(errors) if errors else ""
-        return added_count, added_ids, error_msg
+        return len(added_ids), added_ids, error_msg
 
     @classmethod
     def remove_document_from_corpus(
@@ -0,0 +1,126 @@
+# Generated by Django 4.2.24 on 2026-10-18 23:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("corpuses", "0026_remove_corpusdocumentfolder"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="corpusengagementmetrics",
+            name="total_annotations",
+            field=models.IntegerField(
+                default=0,
+                help_text="Total number of non-structural annotations in this corpus",
+            ),
+        ),
+        migrations.CreateModel(
+            name="CorpusEngagementBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "day",
+                    models.DateField(
+                        help_text="Day the counted objects were created on"
+                    ),
+                ),
+                (
+                    "threads",
+                    models.IntegerField(default=0, help_text="Live threads started"),
+                ),
+                (
+                    "locked_threads",
+                    models.IntegerField(
+                        default=0, help_text="Live threads started that are now locked"
+                    ),
+                ),
+                (
+                    "messages",
+                    models.IntegerField(
+                        default=0, help_text="Live messages posted in live threads"
+                    ),
+                ),
+                (
+                    "upvotes",
+                    models.IntegerField(
+                        default=0, help_text="Upvotes cast on thread messages"
+                    ),
+                ),
+                (
+                    "annotations",
+                    models.IntegerField(
+                        default=0, help_text="Non-structural annotations created"
+                    ),
+                ),
+                (
+                    "needs_rollup",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Changed since the corpus metrics were last derived",
+                    ),
+                ),
+                (
+                    "modified",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the counters last changed",
+                    ),
+                ),
+                (
+                    "corpus",
+                    models.ForeignKey(
+                        help_text="The corpus this activity happened in",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="engagement_buckets",
+                        to="corpuses.corpus",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="User who created the counted objects",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="corpus_engagement_buckets",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Corpus Engagement Bucket",
+                "verbose_name_plural": "Corpus Engagement Buckets",
+                "indexes": [
+                    models.Index(
+                        fields=["corpus", "day"], name="corpuses_co_corpus__d6c174_idx"
+                    ),
+                    models.Index(
+                        condition=models.Q(("needs_rollup", True)),
+                        fields=["corpus"],
+                        name="engagement_bucket_pending",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="corpusengagementbucket",
+            constraint=models.UniqueConstraint(
+                fields=("corpus", "day", "user"),
+                name="unique_engagement_bucket_per_corpus_day_user",
+            ),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated manually to seed the engagement buckets added in 0027
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+
+COUNTERS = ("threads", "locked_threads", "messages", "upvotes", "annotations")
+
+BATCH_SIZE = 1000
+
+
+def backfill_engagement_buckets(apps, schema_editor):  # pragma: no cover
+    """
+    Count the existing threads, messages, upvotes and annotations of every
+    corpus into CorpusEngagementBucket rows, the way the engagement signals
+    would have. Without this the incremental rollup would derive metrics
+    from buckets that only hold activity since the deploy.
+
+    Every bucket is flagged for rollup, so the next
+    update_all_corpus_engagement_metrics run rederives the metrics of each
+    corpus with activity.
+    """
+    Annotation = apps.get_model("annotations", "Annotation")
+    ChatMessage = apps.get_model("conversations", "ChatMessage")
+    Conversation = apps.get_model("conversations", "Conversation")
+    MessageVote = apps.get_model("conversations", "MessageVote")
+    CorpusEngagementBucket = apps.get_model("corpuses", "CorpusEngagementBucket")
+
+    per_corpus_day_and_user = [
+        Conversation.objects.filter(
+            chat_with_corpus__isnull=False,
+            conversation_type="thread",
+            deleted_at__isnull=True,
+        )
+        .annotate(day=TruncDate("created_at"), bucket_corpus=F("chat_with_corpus_id"))
+        .values("bucket_corpus", "day", "creator_id")
+        .annotate(
+            threads=Count("id"), locked_threads=Count("id", filter=Q(is_locked=True))
+        ),
+        ChatMessage.objects.filter(
+            conversation__chat_with_corpus__isnull=False,
+            conversation__conversation_type="thread",
+            deleted_at__isnull=True,
+            conversation__deleted_at__isnull=True,
+        )
+        .annotate(
+            day=TruncDate("created_at"),
+            bucket_corpus=F("conversation__chat_with_corpus_id"),
+        )
+        .values("bucket_corpus", "day", "creator_id")
+        .annotate(messages=Count("id")),
+        MessageVote.objects.filter(
+            message__conversation__chat_with_corpus__isnull=False,
+            message__conversation__conversation_type="thread",
+            vote_type="upvote",
+        )
+        .annotate(
+            day=TruncDate("created_at"),
+            bucket_corpus=F("message__conversation__chat_with_corpus_id"),
+        )
+        .values("bucket_corpus", "day", "creator_id")
+        .annotate(upvotes=Count("id")),
+        Annotation.objects.filter(corpus__isnull=False, structural=False)
+        .annotate(day=TruncDate("created"), bucket_corpus=F("corpus_id"))
+        .values("bucket_corpus", "day", "creator_id")
+        .annotate(annotations=Count("id")),
+    ]
+
+    counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for queryset in per_corpus_day_and_user:
+        for row in queryset.order_by().iterator():
+            key = (row.pop("bucket_corpus"), row.pop("day"), row.pop("creator_id"))
+            counters[key].update(row)
+
+    # Buckets the signals may have written already are replaced by the full count
+    CorpusEngagementBucket.objects.all().delete()
+    CorpusEngagementBucket.objects.bulk_create(
+        (
+            CorpusEngagementBucket(
+                corpus_id=corpus_id,
+                day=day,
+                user_id=user_id,
+                needs_rollup=True,
+                **values,
+            )
+            for (corpus_id, day, user_id), values in counters.items()
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("annotations", "0052_structural_set_blob_file_fields"),
+        ("conversations", "0014_add_conversation_history_summary"),
+        ("corpuses", "0027_add_corpus_engagement_buckets"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_engagement_buckets, migrations.RunPython.noop),
+    ]
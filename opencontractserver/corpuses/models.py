@@ -2,6 +2,7 @@ import difflib
 import hashlib
 import logging
 import uuid
+from collections import defaultdict
 from typing import Optional
 
 import django
@@ -342,6 +343,56 @@ class Corpus(TreeNode):
     # Document Management - Issue #654                                     #
     # --------------------------------------------------------------------- #
 
+    @staticmethod
+    def _default_document_path(document) -> str:
+        """Build the default corpus path for a document from its title."""
+        if document.title:
+            safe_title = "".join(
+                c if c.isalnum() or c in "-_." else "_" for c in document.title[:100]
+            )
+            return f"/documents/{safe_title or f'doc_{document.pk}'}"
+        return f"/documents/doc_{document.pk}"
+
+    def _create_corpus_copy(self, document, user, **doc_kwargs):
+        """
+        Create the corpus-isolated copy of ``document`` with a new version tree,
+        sharing file blobs and the structural annotation set with the source.
+        """
+        from opencontractserver.documents.models import Document
+
+        corpus_copy = Document.objects.create(
+            title=doc_kwargs.get("title", document.title),
+            description=doc_kwargs.get("description", document.description),
+            file_type=doc_kwargs.get("file_type", document.file_type),
+            pdf_file=document.pdf_file,  # Share file blob (Rule I3)
+            pdf_file_hash=document.pdf_file_hash,
+            # Share parsing artifacts (file blobs, not duplicated)
+            pawls_parse_file=document.pawls_parse_file,
+            txt_extract_file=document.txt_extract_file,
+            icon=document.icon,
+            md_summary_file=document.md_summary_file,
+            page_count=document.page_count,
+            is_public=document.is_public,  # Inherit public status
+            version_tree_id=uuid.uuid4(),  # NEW isolated version tree
+            is_current=True,
+            parent=None,  # Root of NEW content tree
+            source_document=document,  # Provenance tracking (Rule I2)
+            # Share structural annotations
+            structural_annotation_set_id=document.structural_annotation_set_id,
+            creator=user,
+            **{
+                k: v
+                for k, v in doc_kwargs.items()
+                if k not in ["title", "description", "file_type"]
+            },
+        )
+
+        logger.info(
+            f"Created corpus-isolated copy {corpus_copy.pk} from doc {document.pk} "
+            f"in corpus {self.pk} (structural_set={document.structural_annotation_set_id})"
+        )
+        return corpus_copy
+
     def add_document(
         self,
         document=None,
@@ -394,18 +445,11 @@ class Corpus(TreeNode):
                 "Use import_content() for content-based imports."
             )
 
-        from opencontractserver.documents.models import Document, DocumentPath
+        from opencontractserver.documents.models import DocumentPath
 
         # Generate path if not provided
         if not path:
-            if document.title:
-                safe_title = "".join(
-                    c if c.isalnum() or c in "-_." else "_"
-                    for c in document.title[:100]
-                )
-                path = f"/documents/{safe_title or f'doc_{document.pk}'}"
-            else:
-                path = f"/documents/doc_{document.pk}"
+            path = self._default_document_path(document)
 
         with transaction.atomic():
             # Check if this content already exists in THIS corpus (by hash)
@@ -435,37 +479,7 @@ class Corpus(TreeNode):
                 return existing_doc, "already_exists", corpus_doc_with_hash
 
             # Create corpus-isolated copy with new version tree
-            tree_id = uuid.uuid4()
-            corpus_copy = Document.objects.create(
-                title=doc_kwargs.get("title", document.title),
-                description=doc_kwargs.get("description", document.description),
-                file_type=doc_kwargs.get("file_type", document.file_type),
-                pdf_file=document.pdf_file,  # Share file blob (Rule I3)
-                pdf_file_hash=document.pdf_file_hash,
-                # Share parsing artifacts (file blobs, not duplicated)
-                pawls_parse_file=document.pawls_parse_file,
-                txt_extract_file=document.txt_extract_file,
-                icon=document.icon,
-                md_summary_file=document.md_summary_file,
-                page_count=document.page_count,
-                is_public=document.is_public,  # Inherit public status
-                version_tree_id=tree_id,  # NEW isolated version tree
-                is_current=True,
-                parent=None,  # Root of NEW content tree
-                source_document=document,  # Provenance tracking (Rule I2)
-                structural_annotation_set=document.structural_annotation_set,  # Share structural annotations
-                creator=user,
-                **{
-                    k: v
-                    for k, v in doc_kwargs.items()
-                    if k not in ["title", "description", "file_type"]
-                },
-            )
-
-            logger.info(
-                f"Created corpus-isolated copy {corpus_copy.pk} from doc {document.pk} "
-                f"in corpus {self.pk} (structural_set={document.structural_annotation_set_id})"
-            )
+            corpus_copy = self._create_corpus_copy(document, user, **doc_kwargs)
 
             # Check if path is occupied
             occupied_path = DocumentPath.objects.filter(
@@ -509,6 +523,146 @@ class Corpus(TreeNode):
 
             return corpus_copy, "added", new_path
 
+    def add_documents(self, documents, user=None, folder=None):
+        """
+        Bulk version of add_document() for a batch of source documents.
+
+        Same semantics as calling add_document() for each document in order
+        (corpus isolation, hash dedupe within this corpus, path versioning), but
+        dedupe and path-conflict lookups are one IN query each, the batch is
+        played through in memory and DocumentPath / M2M rows are bulk inserted.
+        Replacing a path takes its document out of hash dedupe for the rest of
+        the batch, exactly as it would between single adds.
+
+        Args:
+            documents: Iterable of source Documents to copy into the corpus
+            user: The user performing the operation (required)
+            folder: Optional CorpusFolder to place the documents in
+
+        Returns:
+            List of (document, status, document_path) tuples in input order, with
+            the same meaning as add_document()'s return value.
+
+        Raises:
+            ValueError: If user is not provided
+        """
+        if not user:
+            raise ValueError("User is required for document operations (audit trail)")
+
+        from opencontractserver.documents.models import DocumentPath
+
+        documents = list(documents)
+        if not documents:
+            return []
+
+        paths = [self._default_document_path(document) for document in documents]
+        results: list = [None] * len(documents)
+
+        with transaction.atomic():
+            current = DocumentPath.objects.filter(
+                corpus=self, is_current=True, is_deleted=False
+            ).select_related("document")
+
+            # Current paths the batch writes to, and current documents sharing
+            # content with it - one query each. NULL hashes never dedupe.
+            current_by_path = {
+                path_record.path: path_record
+                for path_record in current.filter(path__in=set(paths))
+            }
+            hashes = {
+                doc.pdf_file_hash for doc in documents if doc.pdf_file_hash is not None
+            }
+            current_by_hash = defaultdict(list)
+            if hashes:
+                by_pk = {record.pk: record for record in current_by_path.values()}
+                for path_record in current.filter(
+                    document__pdf_file_hash__in=hashes
+                ).order_by("pk"):
+                    path_record = by_pk.get(path_record.pk, path_record)
+                    current_by_hash[path_record.document.pdf_file_hash].append(
+                        path_record
+                    )
+
+            # Play the batch through in order. Documents are still created one
+            # by one so slugs are generated and creation signals fire.
+            superseded = []  # pks of existing paths replaced by the batch
+            added = []  # (corpus_copy, path_record) in input order
+            depth = {}  # id(new path_record) -> versions written before it
+            for index, (document, path) in enumerate(zip(documents, paths)):
+                content_hash = document.pdf_file_hash
+                if content_hash is not None and current_by_hash[content_hash]:
+                    path_record = current_by_hash[content_hash][0]
+                    results[index] = (
+                        path_record.document,
+                        "already_exists",
+                        path_record,
+                    )
+                    continue
+
+                corpus_copy = self._create_corpus_copy(document, user)
+                parent = current_by_path.get(path)
+                path_record = DocumentPath(
+                    document=corpus_copy,
+                    corpus=self,
+                    folder=folder,
+                    path=path,
+                    version_number=parent.version_number + 1 if parent else 1,
+                    parent=parent,
+                    is_current=True,
+                    is_deleted=False,
+                    creator=user,
+                )
+                if parent is not None:
+                    parent.is_current = False
+                    parent_hash = parent.document.pdf_file_hash
+                    if (
+                        parent_hash is not None
+                        and parent in current_by_hash[parent_hash]
+                    ):
+                        current_by_hash[parent_hash].remove(parent)
+                    if parent.pk is None:
+                        depth[id(path_record)] = depth[id(parent)] + 1
+                    else:
+                        superseded.append(parent.pk)
+                depth.setdefault(id(path_record), 0)
+
+                current_by_path[path] = path_record
+                if content_hash is not None:
+                    current_by_hash[content_hash].append(path_record)
+                added.append((corpus_copy, path_record))
+                results[index] = (corpus_copy, "added", path_record)
+
+            if superseded:
+                DocumentPath.objects.filter(pk__in=superseded).update(is_current=False)
+
+            # A path's n-th new version goes into round n, so every parent
+            # already has a pk when its child is inserted.
+            rounds: list[list] = []
+            for _, path_record in added:
+                round_index = depth[id(path_record)]
+                if round_index == len(rounds):
+                    rounds.append([])
+                rounds[round_index].append(path_record)
+            for round_records in rounds:
+                DocumentPath.objects.bulk_create(round_records)
+
+            # Maintain M2M relationship for backwards compatibility (single insert)
+            self.documents.add(*(corpus_copy for corpus_copy, _ in added))
+
+        if added:
+            from opencontractserver.corpuses.folder_service import (
+                DocumentFolderService,
+            )
+
+            # bulk_create skips the post_save signals that normally do this.
+            DocumentFolderService.invalidate_folder_tree_cache(self.pk)
+
+        logger.info(
+            f"Bulk added {len(added)} corpus-isolated docs to corpus {self.pk} "
+            f"({len(documents) - len(added)} already present)"
+        )
+        return results
+
     def import_content(
         self,
         content: bytes,
@@ -1008,6 +1162,10 @@ class CorpusEngagementMetrics(django.db.models.Model):
         default=0.0,
         help_text="Average number of messages per thread",
     )
+    total_annotations = django.db.models.IntegerField(
+        default=0,
+        help_text="Total number of non-structural annotations in this corpus",
+    )
 
     # Metadata
     last_updated = django.db.models.DateTimeField(
@@ -1026,6 +1184,110 @@ class CorpusEngagementMetrics(django.db.models.Model):
         return f"Engagement Metrics for {self.corpus.title}"
 
 
+class CorpusEngagementBucket(django.db.models.Model):
+    """
+    Live engagement created in a corpus by one user on one day.
+
+    Signal handlers keep these counters current with atomic increments as
+    threads, messages, votes and annotations are created, deleted or restored
+    (see opencontractserver/corpuses/engagement_signals.py). Each counter
+    holds the number of objects created on ``day`` by ``user`` that still
+    count towards the corpus metrics, so removing an object decrements the
+    bucket it was counted in. CorpusEngagementMetrics is derived from the
+    buckets of corpora that have buckets flagged ``needs_rollup``.
+
+    Epic: #565 - Corpus Engagement Metrics & Analytics
+    """
+
+    corpus = django.db.models.ForeignKey(
+        "corpuses.Corpus",
+        on_delete=django.db.models.CASCADE,
+        related_name="engagement_buckets",
+        help_text="The corpus this activity happened in",
+    )
+    day = django.db.models.DateField(
+        help_text="Day the counted objects were created on",
+    )
+    user = django.db.models.ForeignKey(
+        get_user_model(),
+        on_delete=django.db.models.CASCADE,
+        related_name="corpus_engagement_buckets",
+        help_text="User who created the counted objects",
+    )
+
+    threads = django.db.models.IntegerField(default=0, help_text="Live threads started")
+    locked_threads = django.db.models.IntegerField(
+        default=0, help_text="Live threads started that are now locked"
+    )
+    messages = django.db.models.IntegerField(
+        default=0, help_text="Live messages posted in live threads"
+    )
+    upvotes = django.db.models.IntegerField(
+        default=0, help_text="Upvotes cast on thread messages"
+    )
+    annotations = django.db.models.IntegerField(
+        default=0, help_text="Non-structural annotations created"
+    )
+
+    needs_rollup = django.db.models.BooleanField(
+        default=True,
+        help_text="Changed since the corpus metrics were last derived",
+    )
+    modified = django.db.models.DateTimeField(
+        default=timezone.now,
+        help_text="When the counters last changed",
+    )
+
+    COUNTERS = ("threads", "locked_threads", "messages", "upvotes", "annotations")
+
+    class Meta:
+        verbose_name = "Corpus Engagement Bucket"
+        verbose_name_plural = "Corpus Engagement Buckets"
+        constraints = [
+            django.db.models.UniqueConstraint(
+                fields=["corpus", "day", "user"],
+                name="unique_engagement_bucket_per_corpus_day_user",
+            ),
+        ]
+        indexes = [
+            django.db.models.Index(fields=["corpus", "day"]),
+            django.db.models.Index(
+                fields=["corpus"],
+                condition=django.db.models.Q(needs_rollup=True),
+                name="engagement_bucket_pending",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Engagement of user {self.user_id} in corpus {self.corpus_id} on {self.day}"
+
+    @classmethod
+    def add(cls, corpus_id: int, day, user_id: int, **deltas: int) -> None:
+        """
+        Atomically add ``deltas`` (counter name -> change) to a bucket,
+        creating it on first use, and flag it for the next rollup.
+        """
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        bucket = cls.objects.filter(corpus_id=corpus_id, day=day, user_id=user_id)
+        changes = {
+            name: django.db.models.F(name) + delta for name, delta in deltas.items()
+        }
+        if bucket.update(needs_rollup=True, modified=timezone.now(), **changes):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    corpus_id=corpus_id, day=day, user_id=user_id, **deltas
+                )
+        except django.db.IntegrityError:
+            # Created concurrently; apply the deltas to that row instead.
+            bucket.update(needs_rollup=True, modified=timezone.now(), **changes)
+
+
 # --------------------------------------------------------------------------- #
 # Corpus Folder Structure
 # --------------------------------------------------------------------------- #
@@ -11,10 +11,14 @@ class DocumentsConfig(AppConfig):
     def ready(self):
         try:
             import opencontractserver.documents.signals  # noqa F401
+            from opencontractserver.documents.blob_storage import (
+                connect_blob_reference_signals,
+            )
             from opencontractserver.documents.models import Document
             from opencontractserver.documents.signals import (
                 DOC_CREATE_UID,
                 connect_corpus_document_signals,
+                connect_folder_tree_cache_signals,
                 process_doc_on_create_atomic,
             )
 
@@ -29,6 +33,12 @@ class DocumentsConfig(AppConfig):
             # Connect the m2m_changed signal for when documents are added to corpuses
             connect_corpus_document_signals()
 
+            # Keep the cached corpus folder trees in sync with folder / path changes
+            connect_folder_tree_cache_signals()
+
+            # Keep FileBlob reference counts in sync with the rows pointing at them
+            connect_blob_reference_signals()
+
             # STORAGE WARMING ##########################################################################################
             # Pre-warm the storage backend to avoid ~400ms cold start on first file URL access
             # Run synchronously to ensure the main process gets warmed
@@ -0,0 +1,280 @@
+"""
+Content-addressed storage for document files.
+
+BlobFileField values (Document.pdf_file, txt_extract_file and
+pawls_parse_file, and the StructuralAnnotationSet files) are stored as
+FileBlobs under uploadfiles/blobs/, keyed by the SHA-256 of their content,
+which for PDFs is the document's pdf_file_hash. Saving bytes that are
+already stored only points the field at the existing blob, and copying a
+field from one row to another is a plain pointer copy.
+
+Signals keep FileBlob.ref_count in step with the rows referencing each
+blob. Queryset updates and bulk operations bypass them, so
+collect_garbage() recounts the references before it deletes anything.
+Files saved before blobs existed keep their old paths and are never
+collected.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from opencontractserver.shared.fields import BlobFileField
+
+logger = logging.getLogger(__name__)
+
+BLOB_PREFIX = "uploadfiles/blobs/"
+
+RECOUNT_BATCH_SIZE = 500
+
+BLOB_REFERENCE_SIGNAL_UID = "blob_reference_counting"
+
+
+def hash_content(content) -> tuple[str, int]:
+    """Return the SHA-256 hex digest and size of a file-like object."""
+    if not isinstance(content, File):
+        content = File(content)
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks():
+        if isinstance(chunk, str):
+            # Storage backends write text content as UTF-8
+            chunk = chunk.encode("utf-8")
+        digest.update(chunk)
+        size += len(chunk)
+    content.seek(0)
+    return digest.hexdigest(), size
+
+
+def blob_name(content_hash: str, filename: str, storage=None) -> str:
+    """
+    Storage path of a blob. The original file name is kept as the last path
+    component so downloads and exports still get a meaningful name.
+    """
+    storage = storage or default_storage
+    basename = storage.get_valid_name(os.path.basename(filename or "")) or "blob"
+    return f"{BLOB_PREFIX}{content_hash[:2]}/{content_hash}/{basename}"
+
+
+def store_blob(storage, name: str, content) -> str:
+    """
+    Store content as a blob and return its storage name. Content that is
+    already stored is not written again; the existing blob's name is
+    returned, whatever file name it was first stored under.
+    """
+    from opencontractserver.documents.models import FileBlob
+
+    content_hash, size = hash_content(content)
+
+    with transaction.atomic():
+        blob, created = FileBlob.objects.select_for_update().get_or_create(
+            content_hash=content_hash,
+            defaults={"name": blob_name(content_hash, name, storage), "size": size},
+        )
+        if not created:
+            FileBlob.objects.filter(pk=blob.pk).update(modified=timezone.now())
+
+        # The row lock serializes writers, so the file either exists in full
+        # or is written once here (it can be missing after a rolled back store)
+        if not storage.exists(blob.name):
+            saved_name = storage.save(blob.name, content)
+            if saved_name != blob.name:
+                blob.name = saved_name
+                blob.save(update_fields=["name"])
+
+    return blob.name
+
+
+def is_blob_name(name) -> bool:
+    return bool(name) and name.startswith(BLOB_PREFIX)
+
+
+@functools.cache
+def get_blob_fields() -> dict:
+    """Map every model with BlobFileFields to the attnames of those fields."""
+    blob_fields = {}
+    for model in apps.get_models():
+        attnames = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if isinstance(field, BlobFileField)
+        ]
+        if attnames:
+            blob_fields[model] = attnames
+    return blob_fields
+
+
+def adjust_blob_references(names, delta: int) -> None:
+    """Add delta to the ref_count of the blobs with the given names."""
+    from opencontractserver.documents.models import FileBlob
+
+    for name, count in Counter(name for name in names if is_blob_name(name)).items():
+        FileBlob.objects.filter(name=name).update(
+            ref_count=Greatest(F("ref_count") + delta * count, 0),
+            modified=timezone.now(),
+        )
+
+
+def _field_names(instance, attnames) -> dict:
+    return {attname: getattr(instance, attname).name or "" for attname in attnames}
+
+
+def remember_blob_references(sender, instance, raw=False, update_fields=None, **kwargs):
+    """pre_save: note which blobs the row referenced before this save."""
+    attnames = [
+        attname
+        for attname in get_blob_fields().get(sender, [])
+        if update_fields is None or attname in update_fields
+    ]
+    previous = {}
+    if attnames and not instance._state.adding and instance.pk is not None:
+        previous = (
+            sender._base_manager.filter(pk=instance.pk).values(*attnames).first() or {}
+        )
+    instance._blob_references_before = (attnames, previous)
+
+
+def update_blob_references(sender, instance, **kwargs):
+    """post_save: move references from blobs the row no longer points at."""
+    attnames, previous = getattr(instance, "_blob_references_before", ([], {}))
+    added, removed = [], []
+    for attname, name in _field_names(instance, attnames).items():
+        old_name = previous.get(attname) or ""
+        if old_name != name:
+            added.append(name)
+            removed.append(old_name)
+    adjust_blob_references(added, 1)
+    adjust_blob_references(removed, -1)
+    instance._blob_references_before = ([], {})
+
+
+def release_blob_references(sender, instance, **kwargs):
+    """post_delete: drop the deleted row's references."""
+    attnames = get_blob_fields().get(sender, [])
+    adjust_blob_references(_field_names(instance, attnames).values(), -1)
+
+
+def connect_blob_reference_signals() -> None:
+    for model in get_blob_fields():
+        pre_save.connect(
+            remember_blob_references,
+            sender=model,
+            dispatch_uid=f"{BLOB_REFERENCE_SIGNAL_UID}_pre_save",
+        )
+        post_save.connect(
+            update_blob_references,
+            sender=model,
+            dispatch_uid=f"{BLOB_REFERENCE_SIGNAL_UID}_post_save",
+        )
+        post_delete.connect(
+            release_blob_references,
+            sender=model,
+            dispatch_uid=f"{BLOB_REFERENCE_SIGNAL_UID}_post_delete",
+        )
+
+
+def count_blob_references() -> Counter:
+    """Count the rows referencing each blob, straight from the database."""
+    counts = Counter()
+    for model, attnames in get_blob_fields().items():
+        for attname in attnames:
+            rows = (
+                model._base_manager.filter(**{f"{attname}__startswith": BLOB_PREFIX})
+                .values(attname)
+                .annotate(references=Count("pk"))
+                .order_by()
+            )
+            for row in rows:
+                counts[row[attname]] += row["references"]
+    return counts
+
+
+def is_blob_referenced(name: str) -> bool:
+    for model, attnames in get_blob_fields().items():
+        condition = Q()
+        for attname in attnames:
+            condition |= Q(**{attname: name})
+        if model._base_manager.filter(condition).exists():
+            return True
+    return False
+
+
+def recount_blob_references(counts: Counter = None) -> int:
+    """Correct every blob's ref_count; returns how many were wrong."""
+    from opencontractserver.documents.models import FileBlob
+
+    if counts is None:
+        counts = count_blob_references()
+
+    corrected = 0
+    stale = []
+    for blob in FileBlob.objects.only("id", "name", "ref_count").iterator(
+        chunk_size=RECOUNT_BATCH_SIZE
+    ):
+        if blob.ref_count != counts.get(blob.name, 0):
+            blob.ref_count = counts.get(blob.name, 0)
+            stale.append(blob)
+        if len(stale) >= RECOUNT_BATCH_SIZE:
+            FileBlob.objects.bulk_update(stale, ["ref_count"])
+            corrected += len(stale)
+            stale = []
+    if stale:
+        FileBlob.objects.bulk_update(stale, ["ref_count"])
+        corrected += len(stale)
+    return corrected
+
+
+def collect_garbage(
+    min_age: timedelta = timedelta(hours=24), dry_run: bool = False
+) -> tuple[int, int]:
+    """
+    Delete blobs no row references that have not been touched for min_age.
+
+    The grace period covers blobs that were just stored for a row that is
+    not saved yet. Returns the number of blobs deleted (or, with dry_run,
+    that would be) and the bytes they held.
+    """
+    from opencontractserver.documents.models import FileBlob
+
+    counts = count_blob_references()
+    if not dry_run:
+        corrected = recount_blob_references(counts)
+        if corrected:
+            logger.info(f"Corrected the reference count of {corrected} blobs")
+
+    cutoff = timezone.now() - min_age
+    candidates = (
+        FileBlob.objects.filter(modified__lt=cutoff)
+        .exclude(name__in=list(counts))
+        .values_list("id", flat=True)
+    )
+
+    deleted = freed = 0
+    for blob_id in list(candidates):
+        with transaction.atomic():
+            # skip_locked: a blob being stored right now is not garbage
+            blob = (
+                FileBlob.objects.select_for_update(skip_locked=True)
+                .filter(pk=blob_id, modified__lt=cutoff)
+                .first()
+            )
+            if blob is None or is_blob_referenced(blob.name):
+                continue
+            if not dry_run:
+                default_storage.delete(blob.name)
+                blob.delete()
+        deleted += 1
+        freed += blob.size
+    return deleted, freed
@@ -0,0 +1,122 @@
+"""
+Management command comparing the exact (BPE) and approximate token counters.
+
+Usage:
+    python manage.py benchmark_tokenizers [--document-id ID ...] [--limit N]
+        [--repeat N] [--json]
+
+Without --document-id, the plain-text extracts of up to --limit documents are
+used; with no documents at all, a synthetic contract-like text is measured.
+"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from opencontractserver.documents.models import Document
+from opencontractserver.llms.token_counting import get_tokenizer
+
+SYNTHETIC_CLAUSE = (
+    "12.3(b) Notwithstanding Section 4.1(a)(ii), the Licensee shall, within "
+    "thirty (30) days of the Effective Date, pay to the Licensor USD $1,250,000.00 "
+    '(the "Upfront Fee"), subject to withholding under 26 U.S.C. § 1442.\n'
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark exact vs approximate token counting over document texts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--document-id",
+            type=int,
+            nargs="+",
+            help="Documents whose txt_extract_file to measure",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Max documents to sample when no IDs are given (default: 20)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Timing repetitions per tokenizer; the best run is kept (default: 3)",
+        )
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def _load_texts(self, document_ids, limit) -> list[str]:
+        documents = Document.objects.exclude(txt_extract_file="").exclude(
+            txt_extract_file__isnull=True
+        )
+        if document_ids:
+            documents = documents.filter(id__in=document_ids)
+        else:
+            documents = documents.order_by("-id")[:limit]
+
+        texts = []
+        for document in documents:
+            with document.txt_extract_file.open("rb") as txt_file:
+                texts.append(txt_file.read().decode("utf-8", errors="replace"))
+        return texts
+
+    def handle(self, *args, **options):
+        texts = self._load_texts(options["document_id"], options["limit"])
+        if options["document_id"] and not texts:
+            raise CommandError("None of the given documents has a text extract")
+        if not texts:
+            texts = [SYNTHETIC_CLAUSE * 2_000]
+
+        chars = sum(len(text) for text in texts)
+        results = {"documents": len(texts), "characters": chars}
+
+        for label, tokenizer in (
+            ("exact", get_tokenizer()),
+            ("approximate", get_tokenizer(approximate=True)),
+        ):
+            best = float("inf")
+            for _ in range(max(1, options["repeat"])):
+                started = time.perf_counter()
+                tokens = sum(tokenizer.count(text) for text in texts)
+                best = min(best, time.perf_counter() - started)
+            results[label] = {
+                "tokenizer": tokenizer.name,
+                "tokens": tokens,
+                "seconds": best,
+                "mb_per_second": (chars / 1_000_000) / best if best else None,
+            }
+
+        exact_tokens = results["exact"]["tokens"]
+        results["approximate"]["error_pct"] = (
+            100 * (results["approximate"]["tokens"] - exact_tokens) / exact_tokens
+            if exact_tokens
+            else None
+        )
+        results["speedup"] = (
+            results["exact"]["seconds"] / results["approximate"]["seconds"]
+            if results["approximate"]["seconds"]
+            else None
+        )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{results['documents']} texts, {results['characters']:,} characters"
+        )
+        for label in ("exact", "approximate"):
+            row = results[label]
+            self.stdout.write(
+                f"  {label:<12} {row['tokenizer']:<12} {row['tokens']:>12,} tokens "
+                f"{row['seconds'] * 1000:>10.1f} ms"
+            )
+        if results["approximate"]["error_pct"] is not None:
+            self.stdout.write(
+                f"  approximate error vs exact: {results['approximate']['error_pct']:+.1f}%"
+            )
+        if results["speedup"] is not None:
+            self.stdout.write(f"  approximate speedup: {results['speedup']:.0f}x")
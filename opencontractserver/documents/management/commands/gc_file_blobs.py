@@ -0,0 +1,48 @@
+"""
+Management command deleting content-addressed file blobs nothing references.
+
+Usage:
+    python manage.py gc_file_blobs [--min-age-hours N] [--dry-run]
+
+Reference counts are recomputed from the database first, so counts that
+drifted through queryset updates or bulk operations are corrected too.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from opencontractserver.documents.blob_storage import collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Delete stored file blobs that no document or structural set references"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age-hours",
+            type=float,
+            default=24,
+            help="Only delete blobs untouched for this many hours (default: 24)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be deleted without changing anything",
+        )
+
+    def handle(self, *args, **options):
+        if options["min_age_hours"] < 0:
+            raise CommandError("--min-age-hours cannot be negative")
+
+        deleted, freed = collect_garbage(
+            min_age=timedelta(hours=options["min_age_hours"]),
+            dry_run=options["dry_run"],
+        )
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {deleted} unreferenced blobs ({freed / 1024 / 1024:.1f} MB)"
+            )
+        )
@@ -0,0 +1,98 @@
+# Generated by Django 4.2.24 on 2026-10-19 01:41
+
+from django.db import migrations, models
+import django.utils.timezone
+import functools
+import opencontractserver.shared.fields
+import opencontractserver.shared.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0026_add_structural_annotation_set"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="SHA-256 hash of the blob content",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Path of the blob in storage",
+                        max_length=1024,
+                        unique=True,
+                    ),
+                ),
+                ("size", models.BigIntegerField(default=0)),
+                ("ref_count", models.PositiveIntegerField(db_index=True, default=0)),
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "modified",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="pawls_parse_file",
+            field=opencontractserver.shared.fields.BlobFileField(
+                blank=True,
+                max_length=1024,
+                null=True,
+                upload_to=functools.partial(
+                    opencontractserver.shared.utils.calc_oc_file_path,
+                    *(),
+                    **{"sub_folder": "pawls_layers_files"}
+                ),
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="pdf_file",
+            field=opencontractserver.shared.fields.BlobFileField(
+                blank=True,
+                max_length=1024,
+                null=True,
+                upload_to=functools.partial(
+                    opencontractserver.shared.utils.calc_oc_file_path,
+                    *(),
+                    **{"sub_folder": "pdf_files"}
+                ),
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="txt_extract_file",
+            field=opencontractserver.shared.fields.BlobFileField(
+                blank=True,
+                max_length=1024,
+                null=True,
+                upload_to=functools.partial(
+                    opencontractserver.shared.utils.calc_oc_file_path,
+                    *(),
+                    **{"sub_folder": "txt_layers_files"}
+                ),
+            ),
+        ),
+    ]
@@ -13,7 +13,7 @@ from pgvector.django import VectorField
 from tree_queries.models import TreeNode
 
 from opencontractserver.shared.defaults import jsonfield_default_value
-from opencontractserver.shared.fields import NullableJSONField
+from opencontractserver.shared.fields import BlobFileField, NullableJSONField
 from opencontractserver.shared.Managers import DocumentManager
 from opencontractserver.shared.mixins import HasEmbeddingMixin
 from opencontractserver.shared.Models import BaseOCModel
@@ -55,13 +55,13 @@ class Document(TreeNode, BaseOCModel, HasEmbeddingMixin):
         blank=True,
         upload_to=functools.partial(calc_oc_file_path, sub_folder="pdf_icons"),
     )
-    pdf_file = django.db.models.FileField(
+    pdf_file = BlobFileField(
         max_length=1024,
         blank=True,
         null=True,
         upload_to=functools.partial(calc_oc_file_path, sub_folder="pdf_files"),
     )
-    txt_extract_file = django.db.models.FileField(
+    txt_extract_file = BlobFileField(
         max_length=1024,
         blank=True,
         upload_to=functools.partial(calc_oc_file_path, sub_folder="txt_layers_files"),
@@ -78,7 +78,7 @@ class Document(TreeNode, BaseOCModel, HasEmbeddingMixin):
         null=False,
         blank=True,
     )
-    pawls_parse_file = django.db.models.FileField(
+    pawls_parse_file = BlobFileField(
         max_length=1024,
         blank=True,
         upload_to=functools.partial(calc_oc_file_path, sub_folder="pawls_layers_files"),
@@ -690,3 +690,33 @@ class DocumentSummaryRevision(django.db.models.Model):
         return (
             f"DocumentSummaryRevision(document_id={self.document_id}, v={self.version})"
         )
+
+
+# -------------------- FileBlob -------------------- #
+
+
+class FileBlob(django.db.models.Model):
+    """
+    A file in storage named by the SHA-256 of its content. Every BlobFileField
+    holding the same bytes points at the same blob; ref_count is the number
+    of field values referencing it and unreferenced blobs are removed by the
+    gc_file_blobs management command.
+    """
+
+    content_hash = django.db.models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="SHA-256 hash of the blob content",
+    )
+    name = django.db.models.CharField(
+        max_length=1024, unique=True, help_text="Path of the blob in storage"
+    )
+    size = django.db.models.BigIntegerField(default=0)
+    ref_count = django.db.models.PositiveIntegerField(default=0, db_index=True)
+    created = django.db.models.DateTimeField(default=timezone.now)
+    # Bumped whenever the blob is stored again or its references change, so
+    # garbage collection can leave recently touched blobs alone
+    modified = django.db.models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"FileBlob({self.content_hash[:12]}, refs={self.ref_count})"
@@ -5,7 +5,7 @@ from django.apps import apps
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Exists, OuterRef
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.utils import timezone
 
 from config.telemetry import record_event
@@ -80,6 +80,9 @@ def process_doc_on_corpus_add(sender, instance, action, pk_set, **kwargs):
     2. Calculate embeddings for all structural annotations of the document using
        the corpus's preferred embedder.
 
+    Skipped when the corpus instance is flagged with ``_skip_embedding`` (e.g. while
+    fork_corpus adds documents whose embeddings it copies from the source).
+
     Args:
         sender: The through model class for the m2m relationship.
         instance: The instance of the model that sent the signal (Corpus).
@@ -91,6 +94,9 @@ def process_doc_on_corpus_add(sender, instance, action, pk_set, **kwargs):
     if action != "post_add" or not pk_set:
         return
 
+    if getattr(instance, "_skip_embedding", False) is True:
+        return
+
     from opencontractserver.annotations.models import Annotation
 
     # Get the preferred embedder for the corpus
@@ -160,3 +166,31 @@ def connect_corpus_document_signals():
         sender=Corpus.documents.through,
         dispatch_uid="process_doc_on_corpus_add",
     )
+
+
+def invalidate_folder_tree_on_change(sender, instance, **kwargs):
+    """
+    Drop the cached corpus folder tree when a CorpusFolder or DocumentPath row
+    is saved or deleted, since either can change names, paths or counts.
+    """
+    from opencontractserver.corpuses.folder_service import DocumentFolderService
+
+    if instance.corpus_id:
+        DocumentFolderService.invalidate_folder_tree_cache(instance.corpus_id)
+
+
+def connect_folder_tree_cache_signals():
+    """
+    Connect post_save / post_delete for CorpusFolder and DocumentPath to the
+    folder tree cache invalidation handler.
+    Called during Django app initialization.
+    """
+    CorpusFolder = apps.get_model("corpuses", "CorpusFolder")
+    DocumentPath = apps.get_model("documents", "DocumentPath")
+    for model in (CorpusFolder, DocumentPath):
+        for signal, action in ((post_save, "save"), (post_delete, "delete")):
+            signal.connect(
+                invalidate_folder_tree_on_change,
+                sender=model,
+                dispatch_uid=f"invalidate_folder_tree_on_{model.__name__}_{action}",
+            )
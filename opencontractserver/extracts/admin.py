@@ -1,7 +1,13 @@
 from django.contrib import admin
 from guardian.admin import GuardedModelAdmin
 
-from opencontractserver.extracts.models import Column, Datacell, Extract, Fieldset
+from opencontractserver.extracts.models import (
+    Column,
+    Datacell,
+    DatacellResultCache,
+    Extract,
+    Fieldset,
+)
 
 
 @admin.register(Fieldset)
@@ -22,3 +28,8 @@ class ExtractAdmin(GuardedModelAdmin):
 @admin.register(Datacell)
 class DatacellAdmin(GuardedModelAdmin):
     list_display = ["id", "extract", "column"]
+
+
+@admin.register(DatacellResultCache)
+class DatacellResultCacheAdmin(admin.ModelAdmin):
+    list_display = ["id", "model", "document_hash", "hit_count", "created"]
@@ -0,0 +1,138 @@
+"""
+Management command to invalidate cached datacell extraction results.
+
+Usage:
+    python manage.py invalidate_datacell_cache --all
+    python manage.py invalidate_datacell_cache [--document-id ID ...]
+        [--column-id ID ...] [--fieldset-id ID] [--model NAME]
+        [--older-than-days N] [--dry-run]
+    python manage.py invalidate_datacell_cache --stats [--reset-stats]
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from opencontractserver.documents.models import Document
+from opencontractserver.extracts.models import Column
+from opencontractserver.extracts.result_cache import (
+    get_cache_stats,
+    invalidate,
+    matching_entries,
+    reset_cache_stats,
+)
+
+
+class Command(BaseCommand):
+    help = "Invalidate cached datacell extraction results and report hit rates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--document-id",
+            type=int,
+            nargs="+",
+            help="Only invalidate results for these documents' content",
+        )
+        parser.add_argument(
+            "--column-id",
+            type=int,
+            nargs="+",
+            help="Only invalidate results for these columns' definitions",
+        )
+        parser.add_argument(
+            "--fieldset-id",
+            type=int,
+            help="Only invalidate results for the columns of this fieldset",
+        )
+        parser.add_argument(
+            "--model", help="Only invalidate results produced by this model"
+        )
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            help="Only invalidate results cached more than N days ago",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Invalidate every cached result",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many results would be invalidated without deleting",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print cache hit-rate metrics",
+        )
+        parser.add_argument(
+            "--reset-stats",
+            action="store_true",
+            help="Reset the hit and miss counters",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self._print_stats()
+
+        filters = {}
+        if options["document_id"]:
+            filters["documents"] = list(
+                Document.objects.filter(id__in=options["document_id"])
+            )
+        columns = Column.objects.none()
+        if options["column_id"]:
+            columns = columns | Column.objects.filter(id__in=options["column_id"])
+        if options["fieldset_id"]:
+            columns = columns | Column.objects.filter(
+                fieldset_id=options["fieldset_id"]
+            )
+        if options["column_id"] or options["fieldset_id"]:
+            filters["columns"] = list(columns)
+        if options["model"]:
+            filters["model"] = options["model"]
+        if options["older_than_days"] is not None:
+            filters["older_than"] = timezone.now() - timedelta(
+                days=options["older_than_days"]
+            )
+
+        if filters and options["all"]:
+            raise CommandError("--all can't be combined with filters")
+
+        if filters or options["all"]:
+            if options["dry_run"]:
+                count = matching_entries(**filters).count()
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"DRY RUN - {count} cached results would be invalidated"
+                    )
+                )
+            else:
+                deleted = invalidate(**filters)
+                self.stdout.write(
+                    self.style.SUCCESS(f"Invalidated {deleted} cached results")
+                )
+        elif not (options["stats"] or options["reset_stats"]):
+            raise CommandError(
+                "Pass --all or at least one filter (--document-id, --column-id, "
+                "--fieldset-id, --model, --older-than-days), or --stats"
+            )
+
+        if options["reset_stats"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Reset cache hit/miss counters"))
+
+    def _print_stats(self):
+        stats = get_cache_stats()
+        hit_rate = (
+            f"{stats['hit_rate']:.1%}" if stats["hit_rate"] is not None else "n/a"
+        )
+        self.stdout.write(
+            f"Datacell result cache: {stats['entries']} entries, "
+            f"{stats['hits']} hits, {stats['misses']} misses, "
+            f"hit rate {hit_rate} "
+            f"({stats['entry_hits']} hits recorded on stored entries)"
+        )
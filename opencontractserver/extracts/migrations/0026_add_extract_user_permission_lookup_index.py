@@ -0,0 +1,19 @@
+# Generated by Django 4.2.24 on 2026-10-18 21:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("extracts", "0025_merge_20251013_0334"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="extractuserobjectpermission",
+            index=models.Index(
+                fields=["content_object", "user"], name="extracts_ex_content_ff8a6e_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.24 on 2026-10-18 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("extracts", "0026_add_extract_user_permission_lookup_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fieldset",
+            name="batch_extraction",
+            field=models.BooleanField(
+                default=False,
+                help_text="Extract a document's columns together in shared structured calls instead of one agent run per datacell",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fieldset",
+            name="extraction_model",
+            field=models.CharField(
+                blank=True,
+                help_text="LLM used to extract this fieldset's columns (defaults to settings.EXTRACT_DEFAULT_MODEL)",
+                max_length=256,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.24 on 2026-10-18 23:14
+
+from django.db import migrations, models
+import opencontractserver.shared.defaults
+import opencontractserver.shared.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("extracts", "0027_add_fieldset_extraction_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DatacellResultCache",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("cache_key", models.CharField(max_length=64, unique=True)),
+                ("document_hash", models.CharField(db_index=True, max_length=64)),
+                ("column_hash", models.CharField(db_index=True, max_length=64)),
+                ("model", models.CharField(db_index=True, max_length=256)),
+                (
+                    "data",
+                    opencontractserver.shared.fields.NullableJSONField(
+                        blank=True,
+                        default=opencontractserver.shared.defaults.jsonfield_default_value,
+                        null=True,
+                    ),
+                ),
+                ("llm_call_log", models.TextField(blank=True, null=True)),
+                ("hit_count", models.PositiveIntegerField(default=0)),
+                ("last_hit", models.DateTimeField(blank=True, null=True)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
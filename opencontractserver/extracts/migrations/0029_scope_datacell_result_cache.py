@@ -0,0 +1,55 @@
+# Generated manually to scope cached datacell results to a corpus and user
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def delete_unscoped_entries(apps, schema_editor):  # pragma: no cover
+    """
+    Entries stored so far were keyed without a corpus or user and carry the
+    LLM call logs of the run that produced them; they can't be attributed, so
+    they are dropped and recomputed on demand.
+    """
+    DatacellResultCache = apps.get_model("extracts", "DatacellResultCache")
+    DatacellResultCache.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("corpuses", "0026_remove_corpusdocumentfolder"),
+        ("extracts", "0028_add_datacell_result_cache"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_unscoped_entries, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="datacellresultcache",
+            name="llm_call_log",
+        ),
+        migrations.AddField(
+            model_name="datacellresultcache",
+            name="corpus",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="datacell_result_cache",
+                to="corpuses.corpus",
+            ),
+        ),
+        migrations.AddField(
+            model_name="datacellresultcache",
+            name="creator",
+            field=models.ForeignKey(
+                # The table is empty at this point
+                default=None,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="datacell_result_cache",
+                to=settings.AUTH_USER_MODEL,
+            ),
+            preserve_default=False,
+        ),
+    ]
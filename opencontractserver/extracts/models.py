@@ -41,6 +41,20 @@ class Fieldset(BaseOCModel):
         help_text="If set, this fieldset defines the metadata schema for the corpus",
     )
 
+    # Extraction run options
+    extraction_model = django.db.models.CharField(
+        max_length=256,
+        null=True,
+        blank=True,
+        help_text="LLM used to extract this fieldset's columns "
+        "(defaults to settings.EXTRACT_DEFAULT_MODEL)",
+    )
+    batch_extraction = django.db.models.BooleanField(
+        default=False,
+        help_text="Extract a document's columns together in shared structured calls "
+        "instead of one agent run per datacell",
+    )
+
     class Meta:
         permissions = (
             ("permission_fieldset", "permission fieldset"),
@@ -226,6 +240,13 @@ class ExtractUserObjectPermission(UserObjectPermissionBase):
         "Extract", on_delete=django.db.models.CASCADE
     )
 
+    class Meta(UserObjectPermissionBase.Meta):
+        # Serves the correlated EXISTS (content_object = outer.id AND user = ?)
+        # used by visible_to_user.
+        indexes = [
+            django.db.models.Index(fields=["content_object", "user"]),
+        ]
+
 
 class ExtractGroupObjectPermission(GroupObjectPermissionBase):
     content_object = django.db.models.ForeignKey(
@@ -481,3 +502,41 @@ class DatacellGroupObjectPermission(GroupObjectPermissionBase):
     content_object = django.db.models.ForeignKey(
         "Datacell", on_delete=django.db.models.CASCADE
     )
+
+
+class DatacellResultCache(django.db.models.Model):
+    """
+    A successful extraction result, addressed by what produced it.
+
+    Entries are keyed by the document's content hash, a hash of the column's
+    extraction definition, the model used, and the corpus (the root of its
+    fork tree) and user the extraction ran with, so identical work on a re-run
+    extract or in a fork can reuse the result instead of calling the LLM
+    again. See opencontractserver.extracts.result_cache.
+    """
+
+    cache_key = django.db.models.CharField(max_length=64, unique=True)
+    document_hash = django.db.models.CharField(max_length=64, db_index=True)
+    column_hash = django.db.models.CharField(max_length=64, db_index=True)
+    model = django.db.models.CharField(max_length=256, db_index=True)
+    corpus = django.db.models.ForeignKey(
+        "corpuses.Corpus",
+        related_name="datacell_result_cache",
+        on_delete=django.db.models.CASCADE,
+        null=True,
+        blank=True,
+    )
+    creator = django.db.models.ForeignKey(
+        get_user_model(),
+        related_name="datacell_result_cache",
+        on_delete=django.db.models.CASCADE,
+    )
+
+    data = NullableJSONField(default=jsonfield_default_value, null=True, blank=True)
+
+    hit_count = django.db.models.PositiveIntegerField(default=0)
+    last_hit = django.db.models.DateTimeField(null=True, blank=True)
+    created = django.db.models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"DatacellResultCache ({self.model}) - {self.cache_key[:12]}"
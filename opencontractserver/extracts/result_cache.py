@@ -0,0 +1,336 @@
+"""
+Content-addressed cache of datacell extraction results.
+
+Re-running an extract, or running the same fieldset over a forked corpus,
+used to recompute every datacell even when nothing that determines the result
+had changed. Successful results are now stored in DatacellResultCache under a
+key built from:
+
+* the document content hash (``pdf_file_hash``, or a SHA-256 of the extracted
+  text for documents without a PDF),
+* a hash of the column fields that shape the extraction,
+* the model id, and
+* the user the extraction ran as and the corpus its agent searched, taken as
+  the root of that corpus's fork tree.
+
+The user is part of the key because the agent's tools only see what that user
+can read, so a result is never served to anyone who couldn't have produced
+it. The corpus is resolved to its fork root so a fork, which starts as a copy
+of its source, shares the results of the corpus it was forked from (and of
+that corpus's other forks) for the same user. The LLM call log isn't stored
+at all; cells answered from the cache get CACHED_RESULT_LOG instead.
+
+Documents whose content can't be hashed bypass the cache. Hits and misses are
+counted in the Django cache (see get_cache_stats()); entries can be dropped
+with the ``invalidate_datacell_cache`` management command.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.extracts.models import DatacellResultCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATS_KEY = "datacell-result-cache:{outcome}"
+
+DOCUMENT_HASH_KEY = "datacell-result-cache:document-hash:{extract_id}:{document_id}"
+
+# How long a document's content hash is remembered for the cells of an extract
+DOCUMENT_HASH_TIMEOUT = 60 * 60 * 24
+
+FORK_ROOT_KEY = "datacell-result-cache:fork-root:{corpus_id}"
+
+# A corpus's parent is set when it is forked and never changes
+FORK_ROOT_TIMEOUT = 60 * 60 * 24
+
+CACHED_RESULT_LOG = (
+    "Served from cache: this result was reused from cached datacell result "
+    "{cache_key} and no LLM calls were made."
+)
+
+# Column fields that change what an extraction returns. Display-only fields
+# (name, help_text, display_order, ...) are deliberately left out.
+COLUMN_DEFINITION_FIELDS = (
+    "query",
+    "match_text",
+    "must_contain_text",
+    "instructions",
+    "output_type",
+    "extract_is_list",
+    "limit_to_label",
+    "task_name",
+)
+
+
+def document_content_hash(document) -> Optional[str]:
+    """
+    Get a hash identifying the document's content.
+
+    Args:
+        document: The Document to hash.
+
+    Returns:
+        str | None: pdf_file_hash if set, else a SHA-256 of the extracted
+            text file, else None (the document can't be cached).
+    """
+    if document.pdf_file_hash:
+        return document.pdf_file_hash
+
+    if not document.txt_extract_file:
+        return None
+
+    try:
+        sha256_hash = hashlib.sha256()
+        with document.txt_extract_file.open("rb") as txt_file:
+            for chunk in txt_file.chunks(chunk_size=8192):
+                sha256_hash.update(chunk)
+        return sha256_hash.hexdigest()
+    except Exception as e:
+        logger.warning(f"Could not hash text of document {document.id}: {e}")
+        return None
+
+
+def extract_document_hash(extract_id, document) -> Optional[str]:
+    """
+    document_content_hash(), computed once per document per extract.
+
+    Documents without a pdf_file_hash are hashed by reading their text file,
+    so the result is kept in the Django cache for the other cells of the
+    extract (which run as separate tasks).
+    """
+    if document.pdf_file_hash:
+        return document.pdf_file_hash
+
+    key = DOCUMENT_HASH_KEY.format(extract_id=extract_id, document_id=document.id)
+    document_hash = cache.get(key)
+    if document_hash is None:
+        document_hash = document_content_hash(document)
+        if document_hash is not None:
+            cache.set(key, document_hash, timeout=DOCUMENT_HASH_TIMEOUT)
+    return document_hash
+
+
+def fork_root_corpus_id(corpus_id: Optional[int]) -> Optional[int]:
+    """
+    The root of the fork tree corpus_id belongs to: the corpus itself unless
+    it was forked, else the corpus its chain of forks started from.
+    """
+    if corpus_id is None:
+        return None
+
+    key = FORK_ROOT_KEY.format(corpus_id=corpus_id)
+    root_id = cache.get(key)
+    if root_id is None:
+        root_id, seen = corpus_id, set()
+        while root_id not in seen:
+            seen.add(root_id)
+            # The base manager skips the tree CTE of Corpus.objects
+            parent_id = (
+                Corpus._base_manager.filter(pk=root_id)
+                .values_list("parent_id", flat=True)
+                .first()
+            )
+            if parent_id is None:
+                break
+            root_id = parent_id
+        cache.set(key, root_id, timeout=FORK_ROOT_TIMEOUT)
+    return root_id
+
+
+def column_definition_hash(column) -> str:
+    """Hash the column fields listed in COLUMN_DEFINITION_FIELDS."""
+    definition = {name: getattr(column, name) for name in COLUMN_DEFINITION_FIELDS}
+    return hashlib.sha256(
+        json.dumps(definition, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def result_cache_key(
+    document_hash: str,
+    column_hash: str,
+    model: str,
+    corpus_id: Optional[int],
+    creator_id: int,
+) -> str:
+    """
+    Combine the key components into a DatacellResultCache.cache_key.
+    corpus_id is the fork root (see fork_root_corpus_id()).
+    """
+    return hashlib.sha256(
+        f"{document_hash}:{column_hash}:{model}:{corpus_id}:{creator_id}".encode(
+            "utf-8"
+        )
+    ).hexdigest()
+
+
+def _record(outcome: str) -> None:
+    key = CACHE_STATS_KEY.format(outcome=outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); start counting again.
+        cache.set(key, 1, timeout=None)
+
+
+def get_cached_result(
+    document_hash: Optional[str],
+    column,
+    model: str,
+    corpus_id: Optional[int],
+    creator_id: int,
+) -> Optional[DatacellResultCache]:
+    """
+    Look up a stored result for this content, column and model, produced by
+    the same user in the same corpus or another corpus of its fork tree.
+
+    Counts a hit or miss. Returns None (without counting) when the cache is
+    disabled or the document content couldn't be hashed.
+    """
+    if not settings.EXTRACT_RESULT_CACHE_ENABLED or document_hash is None:
+        return None
+
+    cache_key = result_cache_key(
+        document_hash,
+        column_definition_hash(column),
+        model,
+        fork_root_corpus_id(corpus_id),
+        creator_id,
+    )
+    entry = DatacellResultCache.objects.filter(cache_key=cache_key).first()
+    if entry is None:
+        _record("misses")
+        return None
+
+    _record("hits")
+    DatacellResultCache.objects.filter(pk=entry.pk).update(
+        hit_count=F("hit_count") + 1, last_hit=timezone.now()
+    )
+    return entry
+
+
+def store_result(
+    document_hash: Optional[str],
+    column,
+    model: str,
+    corpus_id: Optional[int],
+    creator_id: int,
+    data: dict,
+) -> Optional[DatacellResultCache]:
+    """
+    Store a successful extraction result.
+
+    Returns:
+        The cache entry, or None if the cache is disabled or the document
+        content couldn't be hashed.
+    """
+    if not settings.EXTRACT_RESULT_CACHE_ENABLED or document_hash is None:
+        return None
+
+    column_hash = column_definition_hash(column)
+    root_corpus_id = fork_root_corpus_id(corpus_id)
+    entry, _ = DatacellResultCache.objects.update_or_create(
+        cache_key=result_cache_key(
+            document_hash, column_hash, model, root_corpus_id, creator_id
+        ),
+        defaults={
+            "document_hash": document_hash,
+            "column_hash": column_hash,
+            "model": model,
+            "corpus_id": root_corpus_id,
+            "creator_id": creator_id,
+            "data": data,
+        },
+    )
+    return entry
+
+
+def cached_result_log(entry: DatacellResultCache) -> str:
+    """The llm_call_log recorded on a datacell answered from the cache."""
+    return CACHED_RESULT_LOG.format(cache_key=entry.cache_key[:12])
+
+
+def matching_entries(
+    documents: Optional[Iterable] = None,
+    columns: Optional[Iterable] = None,
+    model: Optional[str] = None,
+    older_than=None,
+):
+    """
+    Get the cached results matching ALL of the given filters.
+
+    Args:
+        documents: Only entries for these documents' content.
+        columns: Only entries for these columns' definitions.
+        model: Only entries produced by this model.
+        older_than: Only entries created before this datetime.
+
+    Returns:
+        QuerySet of DatacellResultCache. With no filters, every entry.
+    """
+    entries = DatacellResultCache.objects.all()
+
+    if documents is not None:
+        document_hashes = {document_content_hash(document) for document in documents}
+        entries = entries.filter(document_hash__in=document_hashes - {None})
+    if columns is not None:
+        entries = entries.filter(
+            column_hash__in={column_definition_hash(column) for column in columns}
+        )
+    if model is not None:
+        entries = entries.filter(model=model)
+    if older_than is not None:
+        entries = entries.filter(created__lt=older_than)
+
+    return entries
+
+
+def invalidate(**filters) -> int:
+    """
+    Delete the cached results selected by matching_entries(**filters).
+
+    Returns:
+        int: Number of entries deleted.
+    """
+    deleted, _ = matching_entries(**filters).delete()
+    logger.info(f"Invalidated {deleted} cached datacell results")
+    return deleted
+
+
+def get_cache_stats() -> dict:
+    """
+    Hit-rate metrics for the datacell result cache.
+
+    Returns:
+        dict: hits, misses, hit_rate (None before any lookup), the number of
+            stored entries and the hits recorded on them.
+    """
+    hits = cache.get(CACHE_STATS_KEY.format(outcome="hits"), 0)
+    misses = cache.get(CACHE_STATS_KEY.format(outcome="misses"), 0)
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else None,
+        "entries": DatacellResultCache.objects.count(),
+        "entry_hits": DatacellResultCache.objects.aggregate(total=Sum("hit_count"))[
+            "total"
+        ]
+        or 0,
+    }
+
+
+def reset_cache_stats() -> None:
+    """Zero the hit and miss counters."""
+    cache.delete_many(
+        [CACHE_STATS_KEY.format(outcome=outcome) for outcome in ("hits", "misses")]
+    )
@@ -0,0 +1,239 @@
+"""
+Windowed, summarised conversation history for agents.
+
+Agents used to receive every message of a conversation on every turn, so
+long-running threads sent ever-growing prompts. ConversationHistoryManager
+instead hands them:
+
+* the last ``AGENT_HISTORY_MAX_TURNS`` turns verbatim, trimmed from the oldest
+  end until they fit ``AGENT_HISTORY_TOKEN_BUDGET``, and
+* a rolling summary of everything older, stored on the Conversation.
+
+Whenever older turns exist that the summary does not cover yet, a Celery task
+(``refresh_conversation_summary``) folds them in in the background; the current
+turn goes ahead with the summary as it stands.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    MessageTypeChoices,
+)
+from opencontractserver.llms.token_counting import count_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_REFRESH_LOCK_KEY = "conversation-history-summary-refresh:{conversation_id}"
+SUMMARY_REFRESH_LOCK_SECONDS = 300
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an "
+    "AI assistant. Merge the new turns into the existing summary. Keep facts, "
+    "decisions, names, document references and open questions; drop small talk. "
+    "Write compact prose of at most 300 words and return only the summary."
+)
+
+SUMMARY_CONTEXT_PREFIX = "Summary of the earlier conversation:\n"
+
+_ROLE_LABELS = {
+    MessageTypeChoices.HUMAN: "User",
+    MessageTypeChoices.LLM: "Assistant",
+    MessageTypeChoices.SYSTEM: "System",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count used for budgeting, from the configured tokenizer."""
+    return count_tokens(text)
+
+
+@dataclass
+class ConversationHistoryWindow:
+    """What an agent should see of a conversation's past."""
+
+    summary: str = ""
+    messages: list[ChatMessage] = field(default_factory=list)
+    # True when turns older than the window are not covered by the summary yet
+    summary_stale: bool = False
+
+
+class ConversationHistoryManager:
+    """Builds history windows and maintains the rolling summary for one conversation."""
+
+    def __init__(
+        self,
+        conversation: Conversation,
+        max_turns: Optional[int] = None,
+        token_budget: Optional[int] = None,
+    ):
+        self.conversation = conversation
+        self.max_turns = (
+            max_turns if max_turns is not None else settings.AGENT_HISTORY_MAX_TURNS
+        )
+        self.token_budget = (
+            token_budget
+            if token_budget is not None
+            else settings.AGENT_HISTORY_TOKEN_BUDGET
+        )
+
+    # ------------------------------------------------------------------
+    # Window selection
+    # ------------------------------------------------------------------
+
+    def _summary_state(self) -> tuple[str, Optional[ChatMessage]]:
+        """Reload the stored summary; a background refresh may have updated it."""
+        conversation = (
+            Conversation.all_objects.select_related("history_summary_through")
+            .only(
+                "history_summary",
+                "history_summary_through__id",
+                "history_summary_through__created",
+            )
+            .get(pk=self.conversation.pk)
+        )
+        return conversation.history_summary, conversation.history_summary_through
+
+    def _messages_qs(self):
+        return ChatMessage.objects.filter(conversation_id=self.conversation.pk)
+
+    @staticmethod
+    def _before(message: ChatMessage) -> Q:
+        return Q(created__lt=message.created) | Q(
+            created=message.created, id__lt=message.id
+        )
+
+    @staticmethod
+    def _after(message: ChatMessage) -> Q:
+        return Q(created__gt=message.created) | Q(
+            created=message.created, id__gt=message.id
+        )
+
+    def get_window(self) -> ConversationHistoryWindow:
+        """
+        Select the verbatim tail of the conversation plus the stored summary.
+
+        Runs a bounded number of queries regardless of conversation length.
+        """
+        summary, summary_through = self._summary_state()
+
+        # Two messages per turn, plus one for a still-empty LLM placeholder.
+        recent = list(
+            self._messages_qs().order_by("-created", "-id")[: self.max_turns * 2 + 1]
+        )
+        messages = [message for message in reversed(recent) if message.content.strip()]
+        messages = messages[-self.max_turns * 2 :] if self.max_turns else []
+
+        budget = self.token_budget - estimate_tokens(summary)
+        used = sum(estimate_tokens(message.content) for message in messages)
+        # Always keep the newest message, even if it alone exceeds the budget.
+        while len(messages) > 1 and used > budget:
+            used -= estimate_tokens(messages.pop(0).content)
+
+        summary_stale = False
+        if messages:
+            older = self._messages_qs().filter(self._before(messages[0]))
+            if summary_through is not None:
+                older = older.filter(self._after(summary_through))
+            summary_stale = older.exclude(content="").exists()
+
+        return ConversationHistoryWindow(
+            summary=summary, messages=messages, summary_stale=summary_stale
+        )
+
+    async def aget_window(
+        self, schedule_refresh: bool = True
+    ) -> ConversationHistoryWindow:
+        """Async get_window(); queues a summary refresh when the summary is stale."""
+        window = await sync_to_async(self.get_window)()
+        if window.summary_stale and schedule_refresh:
+            await sync_to_async(self.schedule_summary_refresh)()
+        return window
+
+    # ------------------------------------------------------------------
+    # Rolling summary
+    # ------------------------------------------------------------------
+
+    def schedule_summary_refresh(self) -> bool:
+        """Queue refresh_conversation_summary unless one is already pending."""
+        lock_key = SUMMARY_REFRESH_LOCK_KEY.format(conversation_id=self.conversation.pk)
+        if not cache.add(lock_key, True, SUMMARY_REFRESH_LOCK_SECONDS):
+            return False
+
+        from opencontractserver.tasks.agent_tasks import refresh_conversation_summary
+
+        refresh_conversation_summary.delay(self.conversation.pk)
+        return True
+
+    def refresh_summary(self, client=None) -> bool:
+        """
+        Fold every turn older than the current window into the stored summary.
+
+        Args:
+            client: Object with a SimpleLLMClient-compatible ``chat()``; defaults
+                to ``opencontractserver.llms.client.create_client()``.
+
+        Returns:
+            True if the summary changed.
+        """
+        from opencontractserver.llms.client import ChatMessage as PromptMessage
+        from opencontractserver.llms.client import create_client
+
+        window = self.get_window()
+        if not window.summary_stale:
+            return False
+
+        summary, summary_through = self._summary_state()
+        pending = (
+            self._messages_qs()
+            .filter(self._before(window.messages[0]))
+            .exclude(content="")
+            .order_by("created", "id")
+        )
+        if summary_through is not None:
+            pending = pending.filter(self._after(summary_through))
+        pending = list(pending)
+
+        client = client or create_client()
+        batch_size = max(1, settings.AGENT_HISTORY_SUMMARY_BATCH_SIZE)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            transcript = "\n\n".join(
+                f"{_ROLE_LABELS.get(message.msg_type.upper(), 'User')}: {message.content}"
+                for message in batch
+            )
+            response = client.chat(
+                [
+                    PromptMessage(role="system", content=SUMMARY_SYSTEM_PROMPT),
+                    PromptMessage(
+                        role="user",
+                        content=(
+                            f"Existing summary:\n{summary or '(none)'}\n\n"
+                            f"New turns:\n{transcript}"
+                        ),
+                    ),
+                ]
+            )
+            summary = response.content.strip()
+
+            # Persist after every batch so a failure part-way keeps progress.
+            Conversation.all_objects.filter(pk=self.conversation.pk).update(
+                history_summary=summary,
+                history_summary_through=batch[-1],
+                history_summary_updated_at=timezone.now(),
+            )
+
+        logger.info(
+            f"Folded {len(pending)} messages into the history summary of "
+            f"conversation {self.conversation.pk}"
+        )
+        return True
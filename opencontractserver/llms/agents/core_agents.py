@@ -15,18 +15,23 @@ from typing import (
     runtime_checkable,
 )
 
-from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db.models import QuerySet
 from django.utils import timezone
 
 from opencontractserver.conversations.models import (
     ChatMessage,
+    ChatMessageStreamChunk,
     Conversation,
     MessageStateChoices,
     MessageTypeChoices,
 )
 from opencontractserver.corpuses.models import Corpus
 from opencontractserver.documents.models import Document
+from opencontractserver.llms.agents.conversation_history import (
+    ConversationHistoryManager,
+    ConversationHistoryWindow,
+)
 from opencontractserver.llms.tools.tool_factory import CoreTool
 from opencontractserver.llms.vector_stores.core_vector_stores import (
     CoreAnnotationVectorStore,
@@ -260,7 +265,8 @@ class AgentConfig:
     system_prompt: Optional[str] = None
     temperature: float = 0.7
     max_tokens: Optional[int] = None
-    # NEW ➜ frequency (in tokens) for interim DB updates during streaming
+    # NEW ➜ frequency (in tokens) for interim DB updates during streaming; each
+    # update appends only the content streamed since the previous one
     stream_update_freq: int = 50
 
     # Optional callback – every emitted UnifiedStreamEvent will also be
@@ -305,13 +311,15 @@ class CorpusAgentContext:
 
     corpus: Corpus
     config: AgentConfig
-    documents: Optional[list[Document]] = None
+    # Lazy queryset over the corpus' active documents; never evaluated wholesale,
+    # tools page through or probe it as needed.
+    documents: Optional[QuerySet[Document]] = None
 
-    async def __post_init__(self):
-        """Initialize documents list if not provided."""
+    def __post_init__(self):
+        """Attach the (unevaluated) documents queryset if not provided."""
         if self.documents is None:
             # Use DocumentPath-based method to get active documents
-            self.documents = await sync_to_async(list)(self.corpus.get_documents())
+            self.documents = self.corpus.get_documents()
 
 
 @runtime_checkable
@@ -784,6 +792,10 @@ class CoreAgentBase(ABC):
         accumulated_content: str = ""
         accumulated_sources: list[SourceNode] = []
         token_counter = 0
+        # Content not yet persisted; flushed as an append-only delta so write
+        # volume stays linear in the answer length.
+        pending_delta: list[str] = []
+        delta_sequence = 0
 
         try:
             async for evt in self._stream_raw(message, **kwargs):
@@ -809,17 +821,20 @@ class CoreAgentBase(ABC):
                 # Track accumulating content for incremental updates
                 if hasattr(evt, "content") and evt.content:
                     accumulated_content += evt.content
+                    pending_delta.append(evt.content)
                     token_counter += 1
 
                 # Periodic DB update
                 if (
                     llm_msg_id
                     and token_counter % self.config.stream_update_freq == 0
-                    and accumulated_content
+                    and pending_delta
                 ):
-                    await self.conversation_manager.update_message_content(
-                        llm_msg_id, accumulated_content
+                    await self.conversation_manager.append_message_delta(
+                        llm_msg_id, delta_sequence, "".join(pending_delta)
                     )
+                    delta_sequence += 1
+                    pending_delta = []
 
                 # Side-channel: forward to observer if configured.
                 await self._emit_observer_event(evt)
@@ -856,6 +871,17 @@ class CoreAgentBase(ABC):
 
         except Exception as exc:
             if llm_msg_id:
+                # Flush the unsaved tail so the partial answer is kept intact.
+                # The error that got us here may still break the write; the
+                # message is marked errored either way.
+                try:
+                    await self.conversation_manager.append_message_delta(
+                        llm_msg_id, delta_sequence, "".join(pending_delta)
+                    )
+                except Exception:
+                    logger.exception(
+                        f"Could not flush the buffered output of message {llm_msg_id}"
+                    )
                 await self.conversation_manager.mark_message_error(llm_msg_id, str(exc))
 
             # Emit error event so front-end can conclude the stream cleanly
@@ -1060,9 +1086,6 @@ class CoreCorpusAgentFactory:
         # Permission check – anonymous sessions cannot access private corpuses
         _assert_access(corpus, config.user_id)
 
-        # Use DocumentPath-based method to get active documents
-        documents = await sync_to_async(list)(corpus.get_documents())
-
         # Set default system prompt if not provided
         if config.system_prompt is None:
             config.system_prompt = CoreCorpusAgentFactory.get_default_system_prompt(
@@ -1073,9 +1096,7 @@ class CoreCorpusAgentFactory:
         if config.embedder_path is None:
             config.embedder_path = corpus.preferred_embedder
 
-        context = CorpusAgentContext(corpus=corpus, config=config, documents=documents)
-        await context.__post_init__()
-        return context
+        return CorpusAgentContext(corpus=corpus, config=config)
 
 
 class CoreConversationManager:
@@ -1214,18 +1235,31 @@ class CoreConversationManager:
 
         return manager
 
-    async def get_conversation_messages(self) -> list[ChatMessage]:
-        """Get all messages in the conversation."""
+    async def get_conversation_messages(
+        self, limit: Optional[int] = None
+    ) -> list[ChatMessage]:
+        """Get messages in the conversation, oldest first.
+
+        Args:
+            limit: If given, only the ``limit`` most recent messages are loaded.
+        """
         # For anonymous conversations, return empty list since nothing is stored
         if not self.conversation:
             return []
 
-        return [
-            msg
-            async for msg in ChatMessage.objects.filter(
-                conversation=self.conversation
-            ).order_by("created")
-        ]
+        queryset = ChatMessage.objects.filter(conversation=self.conversation)
+        if limit is None:
+            return [msg async for msg in queryset.order_by("created")]
+
+        recent = [msg async for msg in queryset.order_by("-created", "-id")[:limit]]
+        return recent[::-1]
+
+    async def get_history_window(self) -> ConversationHistoryWindow:
+        """Get the bounded history window (recent turns + rolling summary)."""
+        if not self.conversation:
+            return ConversationHistoryWindow()
+
+        return await ConversationHistoryManager(self.conversation).aget_window()
 
     async def create_placeholder_message(self, msg_type: str = "LLM") -> int:
         """Create a placeholder message with state tracking."""
@@ -1250,6 +1284,36 @@ class CoreConversationManager:
         )
         return message.id
 
+    async def append_message_delta(
+        self, message_id: int, sequence: int, delta: str
+    ) -> None:
+        """Append a streamed content delta without rewriting the message.
+
+        Deltas are compacted into ``ChatMessage.content`` when the message is
+        completed, cancelled or marked as errored.
+        """
+        # For anonymous conversations, don't store messages
+        if not self.conversation or message_id == 0 or not delta:
+            return
+
+        await ChatMessageStreamChunk.objects.acreate(
+            message_id=message_id, sequence=sequence, content=delta
+        )
+
+    async def _pop_streamed_content(self, message: ChatMessage) -> str:
+        """Return the message's uncompacted stream deltas and drop them."""
+        chunks = [
+            chunk
+            async for chunk in ChatMessageStreamChunk.objects.filter(
+                message_id=message.id
+            )
+            .order_by("sequence")
+            .values_list("content", flat=True)
+        ]
+        if chunks:
+            await ChatMessageStreamChunk.objects.filter(message_id=message.id).adelete()
+        return "".join(chunks)
+
     async def update_message_content(self, message_id: int, content: str) -> None:
         """Update only the content of a message."""
         # For anonymous conversations, don't store messages
@@ -1296,6 +1360,9 @@ class CoreConversationManager:
         message.data = data
         await message.asave()
 
+        # The final content supersedes any streamed deltas.
+        await ChatMessageStreamChunk.objects.filter(message_id=message_id).adelete()
+
     async def cancel_message(self, message_id: int, reason: str = "Cancelled") -> None:
         """Cancel a placeholder message."""
         # For anonymous conversations, don't store messages
@@ -1303,10 +1370,13 @@ class CoreConversationManager:
             return
 
         message = await ChatMessage.objects.aget(id=message_id)
+        partial_content = message.content + await self._pop_streamed_content(message)
         message.content = reason
         message.state = MessageState.CANCELLED
         data = message.data or {}
         data["cancelled_at"] = timezone.now().isoformat()
+        if partial_content:
+            data["partial_content"] = partial_content
         message.data = data
         await message.asave()
 
@@ -1403,12 +1473,15 @@ class CoreConversationManager:
         from opencontractserver.conversations.models import ChatMessage
 
         message = await ChatMessage.objects.aget(id=message_id)
+        partial_content = message.content + await self._pop_streamed_content(message)
         message.content = error
         message.state = MessageState.ERROR
 
         data = message.data or {}
         data["error"] = error
         data["errored_at"] = timezone.now().isoformat()
+        if partial_content:
+            data["partial_content"] = partial_content
         message.data = data
 
         await message.asave()
@@ -1,5 +1,6 @@
 """Clean PydanticAI implementation following PydanticAI patterns."""
 
+import asyncio
 import dataclasses
 import json
 import logging
@@ -7,6 +8,7 @@ from collections.abc import AsyncGenerator
 from typing import Any, Callable, Optional, TypeVar, Union
 from uuid import uuid4
 
+from django.conf import settings
 from pydantic_ai.agent import Agent as PydanticAIAgent
 from pydantic_ai.agent import (
     CallToolsNode,
@@ -32,6 +34,7 @@ from pydantic_ai.messages import (
 from opencontractserver.conversations.models import Conversation
 from opencontractserver.corpuses.models import Corpus
 from opencontractserver.documents.models import Document
+from opencontractserver.llms.agents.conversation_history import SUMMARY_CONTEXT_PREFIX
 from opencontractserver.llms.agents.core_agents import (
     AgentConfig,
     ApprovalNeededEvent,
@@ -56,6 +59,8 @@ from opencontractserver.llms.agents.core_agents import (
 from opencontractserver.llms.agents.timeline_stream_mixin import TimelineStreamMixin
 from opencontractserver.llms.exceptions import ToolConfirmationRequired
 from opencontractserver.llms.tools.core_tools import (
+    DEFAULT_DOCUMENT_PAGE_SIZE,
+    MAX_DOCUMENT_PAGE_SIZE,
     aadd_annotations_from_exact_strings,
     aadd_document_note,
     aduplicate_annotations_with_label,
@@ -65,6 +70,7 @@ from opencontractserver.llms.tools.core_tools import (
     aget_document_summary_versions,
     aget_md_summary_token_length,
     aget_notes_for_document_corpus,
+    alist_corpus_documents,
     aload_document_md_summary,
     aload_document_txt_extract,
     asearch_document_notes,
@@ -149,7 +155,7 @@ class PydanticAICoreAgent(CoreAgentBase, TimelineStreamMixin):
         # Try to reuse the last HUMAN message if it matches the current turn
         user_id: int | None = None
         if self.conversation_manager.conversation:
-            history = await self.conversation_manager.get_conversation_messages()
+            history = await self.conversation_manager.get_conversation_messages(limit=1)
             if history and history[-1].msg_type.upper() == "HUMAN":
                 user_id = history[-1].id
 
@@ -201,13 +207,28 @@ class PydanticAICoreAgent(CoreAgentBase, TimelineStreamMixin):
 
         `UserPrompt` does **not** exist in Pydantic-AI's public API, so we map
         both human and LLM messages to plain `ModelMessage` instances instead.
+
+        Only the recent window chosen by ConversationHistoryManager is sent
+        verbatim; older turns arrive as the conversation's rolling summary.
         """
-        raw_messages = await self.conversation_manager.get_conversation_messages()
-        if not raw_messages:
+        if not self.conversation_manager.conversation:
             return None
 
+        window = await self.conversation_manager.get_history_window()
+
         history: list[ModelMessage] = []
-        for msg in raw_messages:
+        if window.summary:
+            history.append(
+                ModelRequest(
+                    parts=[
+                        SystemPromptPart(
+                            content=f"{SUMMARY_CONTEXT_PREFIX}{window.summary}"
+                        )
+                    ]
+                )
+            )
+
+        for msg in window.messages:
             msg_type_upper = msg.msg_type.upper()
             content = msg.content
 
@@ -294,7 +315,9 @@ class PydanticAICoreAgent(CoreAgentBase, TimelineStreamMixin):
         # ------------------------------------------------------------------
         if self.conversation_manager.conversation and llm_msg_id is None:
             # Check if CoreAgentBase.stream() already created the placeholder
-            history = await self.conversation_manager.get_conversation_messages()
+            history = await self.conversation_manager.get_conversation_messages(
+                limit=10
+            )
             if (
                 history
                 and history[-1].msg_type.upper() == "LLM"
@@ -1476,20 +1499,29 @@ class PydanticAIDocumentAgent(PydanticAICoreAgent):
         tools: Optional[list[Callable]] = None,
         *,
         conversation: Optional[Conversation] = None,
+        context: Optional[DocumentAgentContext] = None,
+        vector_store: Optional[PydanticAIAnnotationVectorStore] = None,
         **kwargs: Any,
     ) -> "PydanticAIDocumentAgent":
-        """Create a Pydantic-AI document agent tied to a specific corpus."""
-        if config is None:
+        """Create a Pydantic-AI document agent tied to a specific corpus.
+
+        ``context`` and ``vector_store`` may be taken from a previously created
+        agent to skip the document/corpus lookups and embedder resolution.
+        """
+        if context is not None:
+            config = context.config
+        elif config is None:
             config = get_default_config()
 
         logger.debug(
             f"Creating Pydantic-AI document agent for document {document} and corpus {corpus}"
         )
         logger.debug(f"Config (type {type(config)}): {config}")
-        # Provide explicit corpus (may be None for standalone) so the factory can pick the proper embedder
-        context = await CoreDocumentAgentFactory.create_context(
-            document, corpus, config
-        )
+        if context is None:
+            # Provide explicit corpus (may be None for standalone) so the factory can pick the proper embedder
+            context = await CoreDocumentAgentFactory.create_context(
+                document, corpus, config
+            )
 
         # Use the CoreConversationManager factory method
         conversation_manager = await CoreConversationManager.create_for_document(
@@ -1507,12 +1539,13 @@ class PydanticAIDocumentAgent(PydanticAICoreAgent):
         # Ensure a vector search tool is always available so that the agent
         # can reference the primary document and emit `sources`.
         # ------------------------------------------------------------------
-        vector_store = PydanticAIAnnotationVectorStore(
-            user_id=config.user_id,
-            corpus_id=context.corpus.id if context.corpus is not None else None,
-            document_id=context.document.id,
-            embedder_path=config.embedder_path,
-        )
+        if vector_store is None:
+            vector_store = PydanticAIAnnotationVectorStore(
+                user_id=config.user_id,
+                corpus_id=context.corpus.id if context.corpus is not None else None,
+                document_id=context.document.id,
+                embedder_path=config.embedder_path,
+            )
 
         # Default vector search tool: bound method on the store. Pydantic-AI
         # will inspect the signature (query: str, k: int) and build the
@@ -1543,15 +1576,7 @@ class PydanticAIDocumentAgent(PydanticAICoreAgent):
 
         async def get_document_text_length_tool() -> int:
             """Get the total character length of the document's plain-text extract."""
-            # Load just the first character to get the full text length from cache
-            full_text = await aload_document_txt_extract(context.document.id, 0, 1)
-            # The function caches the full text, so we can get the length efficiently
-            from opencontractserver.llms.tools.core_tools import _DOC_TXT_CACHE
-
-            if context.document.id in _DOC_TXT_CACHE:
-                _, cached_content = _DOC_TXT_CACHE[context.document.id]
-                return len(cached_content)
-            # Fallback: load the full text if not cached
+            # The full text comes from (and stays in) the shared text cache.
             full_text = await aload_document_txt_extract(context.document.id)
             return len(full_text)
 
@@ -2157,20 +2182,70 @@ class PydanticAICorpusAgent(PydanticAICoreAgent):
         )
         from opencontractserver.llms.types import AgentFramework as _AgentFramework
 
-        async def list_documents_tool() -> list[dict[str, Any]]:
-            """Return basic metadata for all documents in the current corpus.
+        # Document contexts and vector stores built for sub-agents are kept for
+        # the lifetime of this corpus agent (i.e. its conversation), so repeat
+        # questions about a document skip the lookups and embedder resolution.
+        document_agent_parts: dict[
+            int, tuple[DocumentAgentContext, PydanticAIAnnotationVectorStore]
+        ] = {}
+        # Bounds how many document sub-agents run at once, whether they come from
+        # ask_documents or from parallel ask_document tool calls.
+        document_query_slots = asyncio.Semaphore(
+            max(1, settings.CORPUS_AGENT_MAX_CONCURRENT_DOCUMENT_QUERIES)
+        )
 
-            Each list entry contains ``document_id``, ``title`` and ``description`` so
+        async def _get_document_agent(document_id: int) -> "PydanticAIDocumentAgent":
+            cached = document_agent_parts.get(document_id)
+            if cached is not None:
+                doc_context, doc_vector_store = cached
+                return await PydanticAIDocumentAgent.create(
+                    doc_context.document,
+                    doc_context.corpus,
+                    context=doc_context,
+                    vector_store=doc_vector_store,
+                )
+
+            # Guard against cross-corpus leakage
+            if not await context.documents.filter(id=document_id).aexists():
+                logger.warning(
+                    f"[ask_document] Document {document_id} not found in corpus "
+                    f"{context.corpus.id}"
+                )
+                raise ValueError("Document does not belong to current corpus")
+
+            doc_agent = await _agents_api.for_document(
+                document=document_id,
+                corpus=context.corpus.id,
+                user_id=config.user_id,
+                store_user_messages=False,
+                store_llm_messages=False,
+                framework=_AgentFramework.PYDANTIC_AI,
+            )
+            document_agent_parts[document_id] = (
+                doc_agent.context,
+                doc_agent.agent_deps.vector_store,
+            )
+            return doc_agent
+
+        async def list_documents_tool(
+            title_prefix: str | None = None,
+            folder_id: int | None = None,
+            limit: int = DEFAULT_DOCUMENT_PAGE_SIZE,
+            offset: int = 0,
+        ) -> dict[str, Any]:
+            """Return one page of document metadata for the current corpus.
+
+            Each entry contains ``document_id``, ``title`` and ``description`` so
             the coordinator LLM can decide which document-specific agent to consult.
+            When ``has_more`` is true, call again with ``offset=next_offset``.
             """
-            return [
-                {
-                    "document_id": doc.id,
-                    "title": doc.title,
-                    "description": getattr(doc, "description", ""),
-                }
-                for doc in context.documents
-            ]
+            return await alist_corpus_documents(
+                context.corpus.id,
+                title_prefix=title_prefix,
+                folder_id=folder_id,
+                limit=limit,
+                offset=offset,
+            )
 
         async def ask_document_tool(document_id: int, question: str) -> dict[str, Any]:
             """Ask a question to a **document-specific** agent inside this corpus.
@@ -2205,74 +2280,122 @@ class PydanticAICorpusAgent(PydanticAICoreAgent):
                     description="Event timeline (thoughts, tool calls, etc.) from the document agent run",
                 )
 
-            # Guard against cross-corpus leakage
-            if document_id not in {d.id for d in context.documents}:
-                logger.warning(
-                    f"[ask_document] Document {document_id} not found in corpus documents. "
-                    f"Available document IDs: {[d.id for d in context.documents]}"
-                )
-                raise ValueError("Document does not belong to current corpus")
+            async with document_query_slots:
+                doc_agent = await _get_document_agent(document_id)
 
-            doc_agent = await _agents_api.for_document(
-                document=document_id,
-                corpus=context.corpus.id,
-                user_id=config.user_id,
-                store_user_messages=False,
-                store_llm_messages=False,
-                framework=_AgentFramework.PYDANTIC_AI,
-            )
+                # Side-channel observer from AgentConfig (set by WebSocket layer)
+                observer_cb = getattr(config, "stream_observer", None)
 
-            # Side-channel observer from AgentConfig (set by WebSocket layer)
-            observer_cb = getattr(config, "stream_observer", None)
+                accumulated_answer: str = ""
+                captured_sources: list[dict] = []
+                captured_timeline: list[dict] = []
 
-            accumulated_answer: str = ""
-            captured_sources: list[dict] = []
-            captured_timeline: list[dict] = []
+                async for ev in doc_agent.stream(question):
+                    # Capture content
+                    if getattr(ev, "type", "") == "content":
+                        accumulated_answer += getattr(ev, "content", "")
 
-            async for ev in doc_agent.stream(question):
-                # Capture content
-                if getattr(ev, "type", "") == "content":
-                    accumulated_answer += getattr(ev, "content", "")
+                    # Forward raw event upstream (side-channel)
+                    if callable(observer_cb):
+                        try:
+                            await observer_cb(ev)
+                        except Exception:
+                            logger.exception(
+                                "stream_observer raised during ask_document"
+                            )
 
-                # Forward raw event upstream (side-channel)
-                if callable(observer_cb):
-                    try:
-                        await observer_cb(ev)
-                    except Exception:
-                        logger.exception("stream_observer raised during ask_document")
-
-                # Capture mid-stream sources
-                if getattr(ev, "type", "") == "sources":
-                    captured_sources.extend([s.to_dict() for s in ev.sources])
-
-                # Capture timeline (thought events etc.)
-                if getattr(ev, "type", "") == "thought":
-                    captured_timeline.append(
-                        {
-                            "type": ev.type,
-                            "thought": ev.thought,
-                            "metadata": ev.metadata,
-                        }
-                    )
+                    # Capture mid-stream sources
+                    if getattr(ev, "type", "") == "sources":
+                        captured_sources.extend([s.to_dict() for s in ev.sources])
+
+                    # Capture timeline (thought events etc.)
+                    if getattr(ev, "type", "") == "thought":
+                        captured_timeline.append(
+                            {
+                                "type": ev.type,
+                                "thought": ev.thought,
+                                "metadata": ev.metadata,
+                            }
+                        )
+
+                    if getattr(ev, "type", "") == "final":
+                        # Merge any final sources / timeline injected by the adapter
+                        captured_sources = [
+                            s.to_dict() for s in ev.sources
+                        ] or captured_sources
+                        if isinstance(ev.metadata, dict) and ev.metadata.get(
+                            "timeline"
+                        ):
+                            captured_timeline = ev.metadata["timeline"]
+
+                return DocAnswer(
+                    answer=accumulated_answer,
+                    sources=captured_sources,
+                    timeline=captured_timeline,
+                ).model_dump()
+
+        async def ask_documents_tool(
+            document_ids: list[int], question: str
+        ) -> list[dict[str, Any]]:
+            """Ask the same question to several document-specific agents concurrently.
 
-                if getattr(ev, "type", "") == "final":
-                    # Merge any final sources / timeline injected by the adapter
-                    captured_sources = [
-                        s.to_dict() for s in ev.sources
-                    ] or captured_sources
-                    if isinstance(ev.metadata, dict) and ev.metadata.get("timeline"):
-                        captured_timeline = ev.metadata["timeline"]
+            Up to CORPUS_AGENT_MAX_CONCURRENT_DOCUMENT_QUERIES sub-agents run at
+            once. A failure for one document is reported in its entry's ``error``
+            instead of failing the whole call.
 
-            return DocAnswer(
-                answer=accumulated_answer,
-                sources=captured_sources,
-                timeline=captured_timeline,
-            ).model_dump()
+            Args:
+                document_ids: IDs of the target documents (must belong to this corpus).
+                question:     The natural-language question to forward to each.
+
+            Returns:
+                One object per distinct document ID, in request order, with
+                ``document_id`` plus the ``ask_document`` result keys or ``error``.
+            """
+
+            unique_ids = list(dict.fromkeys(document_ids))
+            results = await asyncio.gather(
+                *(ask_document_tool(doc_id, question) for doc_id in unique_ids),
+                return_exceptions=True,
+            )
+
+            answers: list[dict[str, Any]] = []
+            for doc_id, result in zip(unique_ids, results):
+                if isinstance(result, BaseException):
+                    logger.warning(
+                        f"[ask_documents] Document {doc_id} failed: {result}"
+                    )
+                    answers.append({"document_id": doc_id, "error": str(result)})
+                else:
+                    answers.append({"document_id": doc_id, **result})
+            return answers
 
         list_docs_tool_wrapped = PydanticAIToolFactory.from_function(
             list_documents_tool,
             name="list_documents",
-            description="List all documents in the current corpus with basic metadata.",
+            description=(
+                "List documents in the current corpus with basic metadata, one page "
+                "at a time. Filter by title prefix or folder to narrow the results."
+            ),
+            parameter_descriptions={
+                "title_prefix": "Only list documents whose title starts with this text",
+                "folder_id": "Only list documents in this corpus folder",
+                "limit": f"Page size (max {MAX_DOCUMENT_PAGE_SIZE})",
+                "offset": "Number of documents to skip; use next_offset from the previous page",
+            },
+            requires_corpus=True,
+        )
+
+        ask_docs_tool_wrapped = PydanticAIToolFactory.from_function(
+            ask_documents_tool,
+            name="ask_documents",
+            description=(
+                "Ask the same question to several document-specific agents in "
+                "parallel and return each answer with its sources."
+            ),
+            parameter_descriptions={
+                "document_ids": "IDs of the documents to query (must be in this corpus)",
+                "question": "The natural-language question to ask each document agent",
+            },
             requires_corpus=True,
         )
 
@@ -2295,6 +2418,7 @@ class PydanticAICorpusAgent(PydanticAICoreAgent):
             update_corpus_desc_tool_wrapped,
             list_docs_tool_wrapped,
             ask_doc_tool_wrapped,
+            ask_docs_tool_wrapped,
         ]
         if tools:
             effective_tools.extend(tools)
@@ -1,7 +1,6 @@
 """Framework-agnostic core tool functions for document and note operations."""
 
 import logging
-from datetime import datetime
 from functools import partial
 from typing import TYPE_CHECKING, Any, Optional
 from uuid import uuid4
@@ -12,22 +11,23 @@ if TYPE_CHECKING:
 from opencontractserver.annotations.models import Note, NoteRevision
 from opencontractserver.corpuses.models import Corpus, CorpusDescriptionRevision
 from opencontractserver.documents.models import Document
+from opencontractserver.llms.token_counting import count_document_tokens, count_tokens
+from opencontractserver.llms.tools.document_text_cache import document_text_cache
 
 logger = logging.getLogger(__name__)
 
 
 def _token_count(text: str) -> int:
     """
-    Naive token counting function. Splits on whitespace.
-    Replace or augment with more robust tokenization if needed.
+    Count tokens with the configured tokenizer (see llms.token_counting).
 
     Args:
         text: The text to count tokens for
 
     Returns:
-        Number of tokens (whitespace-separated words)
+        Number of tokens
     """
-    return len(text.split())
+    return count_tokens(text)
 
 
 def load_document_md_summary(
@@ -79,14 +79,14 @@ def load_document_md_summary(
 
 def get_md_summary_token_length(document_id: int) -> int:
     """
-    Calculate the approximate token length of a Document's md_summary_file.
-    Uses a naive whitespace-based split for tokenization.
+    Calculate the token length of a Document's md_summary_file.
+    Counts are memoized per document version.
 
     Args:
         document_id: The primary key (ID) of the Document
 
     Returns:
-        An integer representing the approximate token count of the md_summary_file
+        An integer representing the token count of the md_summary_file
 
     Raises:
         ValueError: If document doesn't exist or has no md_summary_file
@@ -102,7 +102,9 @@ def get_md_summary_token_length(document_id: int) -> int:
     with doc.md_summary_file.open("r") as file_obj:
         content = file_obj.read()
 
-    return _token_count(content)
+    return count_document_tokens(
+        doc.id, doc.modified, content, span=("md_summary", doc.md_summary_file.name)
+    )
 
 
 def get_notes_for_document_corpus(
@@ -157,13 +159,13 @@ def get_notes_for_document_corpus(
 
 def get_note_content_token_length(note_id: int) -> int:
     """
-    Calculate the approximate token length of a Note's content using naive whitespace-based split.
+    Calculate the token length of a Note's content.
 
     Args:
         note_id: The primary key (ID) of the Note
 
     Returns:
-        An integer representing the approximate token count of the note's content
+        An integer representing the token count of the note's content
 
     Raises:
         ValueError: If note doesn't exist
@@ -173,7 +175,9 @@ def get_note_content_token_length(note_id: int) -> int:
     except Note.DoesNotExist:
         raise ValueError(f"Note with id={note_id} does not exist.")
 
-    return _token_count(note.content or "")
+    return count_document_tokens(
+        note.id, note.modified, note.content or "", span="note_content"
+    )
 
 
 def get_partial_note_content(
@@ -212,14 +216,14 @@ def get_partial_note_content(
 
 async def aget_md_summary_token_length(document_id: int) -> int:
     """
-    Async version: Calculate the approximate token length of a Document's md_summary_file.
-    Uses a naive whitespace-based split for tokenization.
+    Async version: Calculate the token length of a Document's md_summary_file.
+    Counts are memoized per document version.
 
     Args:
         document_id: The primary key (ID) of the Document
 
     Returns:
-        An integer representing the approximate token count of the md_summary_file
+        An integer representing the token count of the md_summary_file
 
     Raises:
         ValueError: If document doesn't exist or has no md_summary_file
@@ -237,7 +241,9 @@ async def aget_md_summary_token_length(document_id: int) -> int:
     with doc.md_summary_file.open("r") as file_obj:
         content = file_obj.read()
 
-    return _token_count(content)
+    return count_document_tokens(
+        doc.id, doc.modified, content, span=("md_summary", doc.md_summary_file.name)
+    )
 
 
 async def aload_document_md_summary(
@@ -356,9 +362,31 @@ except ModuleNotFoundError:  # Channels not installed – fall back gracefully
 # Plain-text extract helpers                                                  #
 # --------------------------------------------------------------------------- #
 
-# Cache now stores a tuple of (last_modified timestamp, file contents) so we can
-# transparently invalidate entries when the underlying file changes.
-_DOC_TXT_CACHE: dict[int, tuple["datetime", str]] = {}
+
+def _get_document_txt(doc: "Document", *, refresh: bool = False) -> str:
+    """Return the full text of *doc*'s ``txt_extract_file``.
+
+    Reads go through the shared, byte-budgeted ``document_text_cache``;
+    entries are keyed on the document's ``modified`` timestamp so edits are
+    picked up transparently. *refresh=True* forces a re-read from storage.
+    """
+    if refresh:
+        document_text_cache.pop(doc.id)
+    else:
+        cached = document_text_cache.get(doc.id, doc.modified)
+        if cached is not None:
+            return cached
+
+    content_str = doc.txt_extract_file.read().decode("utf-8")  # type: ignore[arg-type]
+    document_text_cache.put(doc.id, doc.modified, content_str)
+
+    logger.debug(
+        "(Re)cached txt_extract_file for document %s (%d characters, ts=%s)",
+        doc.id,
+        len(content_str),
+        doc.modified,
+    )
+    return content_str
 
 
 def load_document_txt_extract(
@@ -412,27 +440,7 @@ def load_document_txt_extract(
     if not doc.txt_extract_file:
         raise ValueError("No txt_extract_file attached to this document.")
 
-    # Decide whether to use the cached value.
-    use_cache = False
-    if not refresh and document_id in _DOC_TXT_CACHE:
-        cached_ts, _ = _DOC_TXT_CACHE[document_id]
-        use_cache = cached_ts == doc.modified
-
-    if not use_cache:
-        # (Re)load from storage.
-        content_bytes = doc.txt_extract_file.read()  # type: ignore[arg-type]
-        content_str = content_bytes.decode("utf-8")
-        _DOC_TXT_CACHE[document_id] = (doc.modified, content_str)
-
-        logger.debug(
-            "(Re)cached txt_extract_file for document %s (%d characters, ts=%s)",
-            document_id,
-            len(content_str),
-            doc.modified,
-        )
-
-    # Unpack cached tuple.
-    content = _DOC_TXT_CACHE[document_id][1]
+    content = _get_document_txt(doc, refresh=refresh)
 
     # Normalise indices.
     start_idx = 0 if start is None else max(0, start)
@@ -461,10 +469,6 @@ async def aload_document_txt_extract(
 
     from opencontractserver.documents.models import Document  # local import
 
-    # Hard timestamp-aware cache validation.
-    if refresh and document_id in _DOC_TXT_CACHE:
-        _DOC_TXT_CACHE.pop(document_id, None)
-
     try:
         doc = await Document.objects.aget(pk=document_id)
     except Document.DoesNotExist as exc:
@@ -473,23 +477,7 @@ async def aload_document_txt_extract(
     if not doc.txt_extract_file:
         raise ValueError("No txt_extract_file attached to this document.")
 
-    use_cache = False
-    if not refresh and document_id in _DOC_TXT_CACHE:
-        cached_ts, _ = _DOC_TXT_CACHE[document_id]
-        use_cache = cached_ts == doc.modified
-
-    if not use_cache:
-        content_str = doc.txt_extract_file.read().decode("utf-8")  # type: ignore[arg-type]
-        _DOC_TXT_CACHE[document_id] = (doc.modified, content_str)
-
-        logger.debug(
-            "(Re)cached txt_extract_file for document %s (%d characters, ts=%s)",
-            document_id,
-            len(content_str),
-            doc.modified,
-        )
-
-    content = _DOC_TXT_CACHE[document_id][1]
+    content = _get_document_txt(doc, refresh=refresh)
 
     # Normalise indices and slice.
     start_idx = 0 if start is None else max(0, start)
@@ -501,6 +489,45 @@ async def aload_document_txt_extract(
     return content[start_idx:end_idx]
 
 
+def _txt_token_length(doc: "Document", start: int | None, end: int | None) -> int:
+    text = _get_document_txt(doc)[max(0, start or 0) : end]
+    return count_document_tokens(doc.id, doc.modified, text, span=("txt", start, end))
+
+
+def get_document_txt_token_length(
+    document_id: int, start: int | None = None, end: int | None = None
+) -> int:
+    """Return the token length of (a slice of) a document's plain-text extract.
+
+    Uses the configured tokenizer; counts are memoized per document version
+    and slice, so budgeting the same chunk repeatedly is cheap.
+    """
+    try:
+        doc = Document.objects.get(pk=document_id)
+    except Document.DoesNotExist as exc:
+        raise ValueError(f"Document with id={document_id} does not exist.") from exc
+
+    if not doc.txt_extract_file:
+        raise ValueError("No txt_extract_file attached to this document.")
+
+    return _txt_token_length(doc, start, end)
+
+
+async def aget_document_txt_token_length(
+    document_id: int, start: int | None = None, end: int | None = None
+) -> int:
+    """Async version of :func:`get_document_txt_token_length`."""
+    try:
+        doc = await Document.objects.aget(pk=document_id)
+    except Document.DoesNotExist as exc:
+        raise ValueError(f"Document with id={document_id} does not exist.") from exc
+
+    if not doc.txt_extract_file:
+        raise ValueError("No txt_extract_file attached to this document.")
+
+    return _txt_token_length(doc, start, end)
+
+
 # --------------------------------------------------------------------------- #
 # Corpus description helpers                                                  #
 # --------------------------------------------------------------------------- #
@@ -636,6 +663,120 @@ async def aupdate_corpus_description(
     )
 
 
+# --------------------------------------------------------------------------- #
+# Corpus document listing helpers                                             #
+# --------------------------------------------------------------------------- #
+
+DEFAULT_DOCUMENT_PAGE_SIZE = 50
+MAX_DOCUMENT_PAGE_SIZE = 200
+
+
+def _corpus_documents_page_queryset(
+    corpus_id: int,
+    title_prefix: str | None,
+    folder_id: int | None,
+    limit: int,
+    offset: int,
+):
+    """Build the (limit + 1)-row slice used to page through a corpus' documents."""
+
+    from opencontractserver.documents.models import DocumentPath
+
+    paths = DocumentPath.objects.filter(
+        corpus_id=corpus_id, is_current=True, is_deleted=False
+    )
+    if folder_id is not None:
+        paths = paths.filter(folder_id=folder_id)
+
+    documents = Document.objects.filter(id__in=paths.values("document_id"))
+    if title_prefix:
+        documents = documents.filter(title__istartswith=title_prefix)
+
+    # One extra row tells us whether another page exists without a COUNT(*).
+    return documents.order_by("title", "id").only("id", "title", "description")[
+        offset : offset + limit + 1
+    ]
+
+
+def _clamp_document_page(limit: int | None, offset: int | None) -> tuple[int, int]:
+    limit = max(1, min(limit or DEFAULT_DOCUMENT_PAGE_SIZE, MAX_DOCUMENT_PAGE_SIZE))
+    return limit, max(0, offset or 0)
+
+
+def _document_page(documents: list, limit: int, offset: int) -> dict[str, Any]:
+    has_more = len(documents) > limit
+    return {
+        "documents": [
+            {
+                "document_id": doc.id,
+                "title": doc.title,
+                "description": doc.description or "",
+            }
+            for doc in documents[:limit]
+        ],
+        "offset": offset,
+        "limit": limit,
+        "has_more": has_more,
+        "next_offset": offset + limit if has_more else None,
+    }
+
+
+def list_corpus_documents(
+    corpus_id: int,
+    *,
+    title_prefix: str | None = None,
+    folder_id: int | None = None,
+    limit: int | None = DEFAULT_DOCUMENT_PAGE_SIZE,
+    offset: int | None = 0,
+) -> dict[str, Any]:
+    """Return one page of the active documents in a corpus, ordered by title.
+
+    Parameters
+    ----------
+    corpus_id: int
+        Primary key of the `Corpus`.
+    title_prefix: str | None, optional
+        Only include documents whose title starts with this (case-insensitive).
+    folder_id: int | None, optional
+        Only include documents filed directly in this `CorpusFolder`.
+    limit: int | None
+        Page size, capped at ``MAX_DOCUMENT_PAGE_SIZE``.
+    offset: int | None
+        Number of matching documents to skip.
+
+    Returns a dict with ``documents`` (``document_id``, ``title`` and
+    ``description`` per entry), ``has_more`` and ``next_offset``.
+    """
+
+    limit, offset = _clamp_document_page(limit, offset)
+    documents = list(
+        _corpus_documents_page_queryset(
+            corpus_id, title_prefix, folder_id, limit, offset
+        )
+    )
+    return _document_page(documents, limit, offset)
+
+
+async def alist_corpus_documents(
+    corpus_id: int,
+    *,
+    title_prefix: str | None = None,
+    folder_id: int | None = None,
+    limit: int | None = DEFAULT_DOCUMENT_PAGE_SIZE,
+    offset: int | None = 0,
+) -> dict[str, Any]:
+    """Async implementation of :func:`list_corpus_documents` using native ORM calls."""
+
+    limit, offset = _clamp_document_page(limit, offset)
+    documents = [
+        doc
+        async for doc in _corpus_documents_page_queryset(
+            corpus_id, title_prefix, folder_id, limit, offset
+        )
+    ]
+    return _document_page(documents, limit, offset)
+
+
 # --------------------------------------------------------------------------- #
 # Document summary helpers                                                    #
 # --------------------------------------------------------------------------- #
@@ -1487,11 +1628,8 @@ def add_annotations_from_exact_strings(
                 raise ValueError(
                     f"Text document id={doc_id} lacks txt_extract_file; cannot annotate."
                 )
-            doc.txt_extract_file.open("r")
-            try:
-                doc_text = doc.txt_extract_file.read()
-            finally:
-                doc.txt_extract_file.close()
+            # Same newline handling as reading the file in text mode.
+            doc_text = _get_document_txt(doc).replace("\r\n", "\n").replace("\r", "\n")
 
             label_type_const = SPAN_LABEL
 
@@ -1684,11 +1822,8 @@ def search_exact_text_as_sources(
                 f"Text document id={document_id} lacks txt_extract_file; cannot search."
             )
 
-        doc.txt_extract_file.open("r")
-        try:
-            doc_text = doc.txt_extract_file.read()
-        finally:
-            doc.txt_extract_file.close()
+        # Same newline handling as reading the file in text mode.
+        doc_text = _get_document_txt(doc).replace("\r\n", "\n").replace("\r", "\n")
 
         # Find all matches for each search string
         for search_str in search_strings:
@@ -0,0 +1,129 @@
+"""Byte-budgeted LRU cache of document plain-text extracts for LLM tools."""
+
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentTextCache:
+    """
+    Least-recently-used cache of full document texts with a memory budget.
+
+    Entries are validated against the document's ``modified`` timestamp, so
+    an edited document is re-read on next access. Once the cached texts exceed
+    ``max_bytes`` the least recently used ones are evicted; a text larger than
+    the whole budget is returned to the caller but never cached.
+
+    Safe to share between threads (sync tools run in a thread pool).
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Memory budget in bytes. When None, the
+                LLM_DOCUMENT_TEXT_CACHE_MAX_BYTES setting is read on every
+                insert, so it can be changed at runtime.
+        """
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[int, tuple[datetime, str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.LLM_DOCUMENT_TEXT_CACHE_MAX_BYTES
+
+    @staticmethod
+    def _sizeof(text: str) -> int:
+        # Actual memory held by the str object, not its encoded length.
+        return sys.getsizeof(text)
+
+    def get(self, document_id: int, modified: datetime) -> Optional[str]:
+        """Return the cached text if present and cached at this *modified* time."""
+        with self._lock:
+            entry = self._entries.get(document_id)
+            if entry is None or entry[0] != modified:
+                if entry is not None:
+                    self._remove(document_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(document_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, document_id: int, modified: datetime, text: str) -> None:
+        """Cache *text*, evicting least recently used entries to stay in budget."""
+        size = self._sizeof(text)
+        max_bytes = self.max_bytes
+        with self._lock:
+            self._remove(document_id)
+            if size > max_bytes:
+                logger.debug(
+                    "Not caching text of document %s: %d bytes exceeds budget %d",
+                    document_id,
+                    size,
+                    max_bytes,
+                )
+                return
+            while self._entries and self._size_bytes + size > max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self.evictions += 1
+            self._entries[document_id] = (modified, text, size)
+            self._size_bytes += size
+
+    def pop(self, document_id: int) -> None:
+        """Drop the cached text of one document, if any."""
+        with self._lock:
+            self._remove(document_id)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Current size, budget, hit and eviction counts."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, document_id: int) -> bool:
+        with self._lock:
+            return document_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # Callers must hold self._lock.
+    def _remove(self, document_id: int) -> None:
+        entry = self._entries.pop(document_id, None)
+        if entry is not None:
+            self._size_bytes -= entry[2]
+
+
+# Shared by every tool that reads a document's txt_extract_file.
+document_text_cache = DocumentTextCache()
@@ -271,11 +271,17 @@ AVAILABLE_TOOLS: tuple[ToolDefinition, ...] = (
     ToolDefinition(
         name="list_documents",
         description=(
-            "List all documents in the current corpus with their IDs, titles, and descriptions. "
-            "Use this to decide which document to query with ask_document."
+            "List documents in the current corpus with their IDs, titles, and descriptions, "
+            "one page at a time. Use this to decide which document to query with ask_document."
         ),
         category=ToolCategory.COORDINATION,
         requires_corpus=True,
+        parameters=(
+            ("title_prefix", "Only list documents whose title starts with this", False),
+            ("folder_id", "Only list documents in this corpus folder", False),
+            ("limit", "Page size (max 200)", False),
+            ("offset", "Number of documents to skip", False),
+        ),
     ),
     ToolDefinition(
         name="ask_document",
@@ -294,6 +300,23 @@ AVAILABLE_TOOLS: tuple[ToolDefinition, ...] = (
             ("question", "The natural-language question to forward", True),
         ),
     ),
+    ToolDefinition(
+        name="ask_documents",
+        description=(
+            "Ask the same question to several document-specific agents in parallel "
+            "and return each answer with its sources."
+        ),
+        category=ToolCategory.COORDINATION,
+        requires_corpus=True,
+        parameters=(
+            (
+                "document_ids",
+                "IDs of the target documents (must belong to this corpus)",
+                True,
+            ),
+            ("question", "The natural-language question to forward", True),
+        ),
+    ),
     # -------------------------------------------------------------------------
     # ANNOTATION TOOLS
     # -------------------------------------------------------------------------
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from opencontractserver.notifications.models import Notification
+from opencontractserver.notifications.models import Notification, NotificationOutbox
 
 
 @admin.register(Notification)
@@ -72,3 +72,21 @@ class NotificationAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    """Admin interface for pending and processed notification events."""
+
+    list_display = (
+        "id",
+        "event_type",
+        "object_id",
+        "created_at",
+        "processed_at",
+        "attempts",
+    )
+    list_filter = ("event_type",)
+    search_fields = ("dedupe_key",)
+    readonly_fields = ("created_at",)
+    ordering = ("-id",)
@@ -0,0 +1,117 @@
+# Generated by Django 4.2.24 on 2026-10-18 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("MESSAGE_REPLY", "Message Posted"),
+                            ("MESSAGE_MENTION", "Users Mentioned in Message"),
+                            ("BADGE_AWARDED", "Badge Awarded"),
+                            ("MODERATION_ACTION", "Moderation Action Taken"),
+                        ],
+                        help_text="Kind of event to fan out",
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.BigIntegerField(
+                        help_text="Primary key of the message, user badge or moderation action"
+                    ),
+                ),
+                (
+                    "dedupe_key",
+                    models.CharField(
+                        help_text="Identifies the event; recording the same event twice is a no-op",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="When the event was recorded"
+                    ),
+                ),
+                (
+                    "processed_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the event was fanned out (null while pending)",
+                        null=True,
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text="Number of failed fan-out attempts"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="Error from the most recent failed attempt",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="dedupe_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Key of the outbox event that produced this notification; makes redelivered events idempotent per recipient",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("dedupe_key__isnull", False)),
+                fields=("recipient", "dedupe_key"),
+                name="unique_notification_per_recipient_and_event",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationoutbox",
+            index=models.Index(
+                condition=models.Q(("processed_at__isnull", True)),
+                fields=["id"],
+                name="notification_outbox_pending",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationoutbox",
+            index=models.Index(
+                fields=["processed_at"], name="notificatio_process_9eaf1c_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.24 on 2026-10-19 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_add_notification_outbox"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("dedupe_key__isnull", False)),
+                fields=["dedupe_key"],
+                name="notification_dedupe_key",
+            ),
+        ),
+    ]
@@ -112,6 +112,16 @@ class Notification(models.Model):
         help_text="Additional context data for the notification (e.g., vote type, badge info)",
     )
 
+    dedupe_key = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text=(
+            "Key of the outbox event that produced this notification; makes "
+            "redelivered events idempotent per recipient"
+        ),
+    )
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
@@ -120,6 +130,19 @@ class Notification(models.Model):
             models.Index(fields=["notification_type"]),
             models.Index(fields=["conversation"]),
             models.Index(fields=["message"]),
+            # The outbox drain looks up notifications by dedupe_key alone
+            models.Index(
+                fields=["dedupe_key"],
+                condition=models.Q(dedupe_key__isnull=False),
+                name="notification_dedupe_key",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipient", "dedupe_key"],
+                condition=models.Q(dedupe_key__isnull=False),
+                name="unique_notification_per_recipient_and_event",
+            ),
         ]
 
     def __str__(self):
@@ -171,3 +194,99 @@ class Notification(models.Model):
                 unique_matches.append(match)
 
         return unique_matches
+
+
+class NotificationEventTypeChoices(models.TextChoices):
+    """Events recorded in the notification outbox."""
+
+    MESSAGE_REPLY = "MESSAGE_REPLY", "Message Posted"
+    MESSAGE_MENTION = "MESSAGE_MENTION", "Users Mentioned in Message"
+    BADGE_AWARDED = "BADGE_AWARDED", "Badge Awarded"
+    MODERATION_ACTION = "MODERATION_ACTION", "Moderation Action Taken"
+
+
+class NotificationOutbox(models.Model):
+    """
+    An event that still has to be fanned out into notifications.
+
+    Signal handlers record events here with a single insert inside the
+    transaction that caused them, so the event is committed (or rolled back)
+    together with its source. drain_notification_outbox later expands each
+    event into per-recipient Notification rows and pushes them over
+    WebSockets. Delivery is at-least-once: an event is only marked processed
+    after its notifications are written, and the dedupe key carried onto
+    each Notification makes a redelivered event a no-op.
+    """
+
+    event_type = models.CharField(
+        max_length=32,
+        choices=NotificationEventTypeChoices.choices,
+        help_text="Kind of event to fan out",
+    )
+
+    object_id = models.BigIntegerField(
+        help_text="Primary key of the message, user badge or moderation action",
+    )
+
+    dedupe_key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="Identifies the event; recording the same event twice is a no-op",
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the event was recorded",
+    )
+
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the event was fanned out (null while pending)",
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Number of failed fan-out attempts",
+    )
+
+    last_error = models.TextField(
+        blank=True,
+        default="",
+        help_text="Error from the most recent failed attempt",
+    )
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(processed_at__isnull=True),
+                name="notification_outbox_pending",
+            ),
+            models.Index(fields=["processed_at"]),
+        ]
+
+    def __str__(self):
+        state = "processed" if self.processed_at else "pending"
+        return f"{self.dedupe_key} ({state})"
+
+    @classmethod
+    def record(cls, event_type: str, object_id: int) -> None:
+        """
+        Record an event with one INSERT; an already-recorded event is ignored.
+
+        Args:
+            event_type: A NotificationEventTypeChoices value
+            object_id: Primary key of the object the event is about
+        """
+        cls.objects.bulk_create(
+            [
+                cls(
+                    event_type=event_type,
+                    object_id=object_id,
+                    dedupe_key=f"{event_type.lower()}:{object_id}",
+                )
+            ],
+            ignore_conflicts=True,
+        )
@@ -4,14 +4,16 @@ import logging
 import zipfile
 from collections.abc import Mapping
 
-from pdfredact import build_text_redacted_pdf, redact_pdf_to_images
-
 from opencontractserver.pipeline.base.file_types import FileTypeEnum
 from opencontractserver.pipeline.base.post_processor import BasePostProcessor
 from opencontractserver.types.dicts import (
     OpenContractsAnnotationPythonType,
     OpenContractsExportDataJsonPythonType,
-    OpenContractsSinglePageAnnotationType,
+)
+from opencontractserver.utils.pdf_redaction import (
+    DEFAULT_REDACTION_WORKERS,
+    group_redactions_by_page,
+    redact_pdfs,
 )
 
 logger = logging.getLogger(__name__)
@@ -51,11 +53,14 @@ class PDFRedactor(BasePostProcessor):
         """
         Read a ZIP that contains PDFs and annotation data, produce a new ZIP
         with redacted PDFs.
-        Settings (like 'labels_to_redact') are sourced from all_kwargs.
+        Settings (like 'labels_to_redact') are sourced from all_kwargs;
+        'max_workers' (from PIPELINE_SETTINGS) sets how many threads redact
+        documents in parallel.
         """
         logger.debug(f"PDFRedactor processing export. Effective kwargs: {all_kwargs}")
         try:
             labels_to_redact = all_kwargs.get("labels_to_redact", [])
+            max_workers = int(all_kwargs.get("max_workers", DEFAULT_REDACTION_WORKERS))
 
             output_zip_bytes = io.BytesIO()
             input_zip_bytes = io.BytesIO(zip_bytes)
@@ -64,18 +69,21 @@ class PDFRedactor(BasePostProcessor):
                 output_zip_bytes, "w", compression=zipfile.ZIP_DEFLATED
             ) as output_zip:
 
-                for filename in input_zip.namelist():
-                    if filename.lower().endswith(".pdf"):
-                        logger.info(f"Redacting PDF {filename}...")
+                def redaction_jobs():
+                    """Copy files that need no redaction; yield the PDFs that do."""
+                    for filename in input_zip.namelist():
+                        file_bytes = input_zip.read(filename)
+                        if not filename.lower().endswith(".pdf"):
+                            output_zip.writestr(filename, file_bytes)
+                            continue
 
-                        pdf_data = input_zip.read(filename)
                         doc_data = export_data["annotated_docs"].get(filename, None)
                         if not doc_data:
                             logger.warning(
                                 f"No annotation data for {filename}, skipping..."
                             )
                             # If no annotation data, copy PDF unchanged
-                            output_zip.writestr(filename, pdf_data)
+                            output_zip.writestr(filename, file_bytes)
                             continue
 
                         pawls_pages = doc_data.get("pawls_file_content", [])
@@ -97,42 +105,20 @@ class PDFRedactor(BasePostProcessor):
                                 f"Redacting all {len(annotations)} annotations."
                             )
 
-                        # This is a bunch of hoops to jump through to unnest the annotation_json
-                        # into list of annotations by page. Probably aught to be in pdfredact...
-                        annotation_jsons = [
-                            ann["annotation_json"] for ann in annotations
-                        ]
-                        page_count = len(pawls_pages) if pawls_pages else 1
-                        annots_by_page: dict[
-                            int, list[OpenContractsSinglePageAnnotationType]
-                        ] = {i: [] for i in range(page_count)}
-
-                        for ann in annotation_jsons:
-                            for p in ann:
-                                annots_by_page[int(p)].append(ann[p])
-                        annots_by_page_list = list(annots_by_page.values())
-
-                        redacted_image_list = redact_pdf_to_images(
-                            pdf_bytes=pdf_data,
-                            pawls_pages=pawls_pages,
-                            page_annotations=annots_by_page_list,
-                            dpi=200,
+                        page_redactions = group_redactions_by_page(
+                            annotations, len(pawls_pages) if pawls_pages else 1
                         )
+                        if not any(page_redactions):
+                            output_zip.writestr(filename, file_bytes)
+                            continue
 
-                        # Test with BytesIO
-                        output_pdf_bytesio = io.BytesIO()
-                        build_text_redacted_pdf(
-                            output_pdf=output_pdf_bytesio,
-                            redacted_images=redacted_image_list,
-                            pawls_pages=pawls_pages,
-                            page_redactions=annots_by_page_list,
-                            dpi=200,
-                            hide_text=True,
-                        )
-                        output_zip.writestr(filename, output_pdf_bytesio.getvalue())
-                    else:
-                        file_bytes = input_zip.read(filename)
-                        output_zip.writestr(filename, file_bytes)
+                        logger.info(f"Redacting PDF {filename}...")
+                        yield filename, file_bytes, pawls_pages, page_redactions
+
+                for filename, redacted_pdf in redact_pdfs(
+                    redaction_jobs(), max_workers=max_workers
+                ):
+                    output_zip.writestr(filename, redacted_pdf)
 
             output_zip_bytes.seek(0)
             return output_zip_bytes.getvalue(), export_data
@@ -10,6 +10,11 @@ This module provides an efficient, cached registry of pipeline components
 Performance:
 - First access: ~50-100ms (module scanning)
 - Subsequent accesses: ~0ms (cached dict lookup)
+
+Components outside the pipeline packages (e.g. a custom embedder configured
+by dotted path in settings) are imported on their first lookup and cached
+with the rest. Call reset_registry() after adding, changing or removing
+component modules at runtime, as the tests do.
 """
 
 import importlib
@@ -30,6 +35,30 @@ from opencontractserver.pipeline.base.thumbnailer import BaseThumbnailGenerator
 logger = logging.getLogger(__name__)
 
 
+PIPELINE_PACKAGES = (
+    "opencontractserver.pipeline.parsers",
+    "opencontractserver.pipeline.embedders",
+    "opencontractserver.pipeline.thumbnailers",
+    "opencontractserver.pipeline.post_processors",
+)
+
+COMPONENT_BASE_CLASSES = (
+    BaseParser,
+    BaseEmbedder,
+    BaseThumbnailGenerator,
+    BasePostProcessor,
+)
+
+
+def is_component_class(obj: Any) -> bool:
+    """Whether obj is a concrete pipeline component class (not a base class)."""
+    return (
+        inspect.isclass(obj)
+        and issubclass(obj, COMPONENT_BASE_CLASSES)
+        and obj not in COMPONENT_BASE_CLASSES
+    )
+
+
 class ComponentType(str, Enum):
     """Types of pipeline components."""
 
@@ -114,6 +143,13 @@ class PipelineComponentRegistry:
         self._by_name: dict[str, PipelineComponentDefinition] = {}
         self._by_class_name: dict[str, PipelineComponentDefinition] = {}
 
+        # Module path -> first component class found in it, for script names
+        self._by_module: dict[str, type] = {}
+        # (package, base class) -> subclasses found in the package's modules
+        self._subclasses: dict[tuple[str, type], tuple[type, ...]] = {}
+        # Name or path -> class for components resolved by importing them
+        self._resolved: dict[str, type] = {}
+
         # File type -> Components lookup for filtering
         self._parsers_by_filetype: dict[str, list[PipelineComponentDefinition]] = {}
         self._thumbnailers_by_filetype: dict[str, list[PipelineComponentDefinition]] = (
@@ -144,13 +180,41 @@ class PipelineComponentRegistry:
                         for name, obj in inspect.getmembers(module, inspect.isclass):
                             if issubclass(obj, base_class) and obj != base_class:
                                 subclasses.append(obj)
+                                self._by_module.setdefault(modname, obj)
                     except Exception as e:
                         logger.warning(f"Failed to import {modname}: {e}")
         except Exception as e:
             logger.error(f"Failed to discover components in {module_name}: {e}")
 
+        self._subclasses[(module_name, base_class)] = tuple(subclasses)
         return subclasses
 
+    def _import_component(self, component_name: str) -> Optional[type]:
+        """
+        Import a component that discovery did not index: one outside the
+        pipeline packages, or a module added since the registry was built.
+        """
+        if "." in component_name:
+            module_path, class_name = component_name.rsplit(".", 1)
+            try:
+                module = importlib.import_module(module_path)
+            except ModuleNotFoundError:
+                module = None
+            obj = getattr(module, class_name, None)
+            if is_component_class(obj):
+                return obj
+
+        for package in PIPELINE_PACKAGES:
+            try:
+                module = importlib.import_module(f"{package}.{component_name}")
+            except ModuleNotFoundError:
+                continue
+            members = inspect.getmembers(module, is_component_class)
+            if members:
+                return members[0][1]
+
+        return None
+
     def _create_definition(
         self, component_class: type, component_type: ComponentType
     ) -> PipelineComponentDefinition:
@@ -292,6 +356,44 @@ class PipelineComponentRegistry:
         """
         return self._by_class_name.get(class_name)
 
+    def get_component_class(self, component_name: str) -> Optional[type]:
+        """
+        Get a component class by full class path or by script name.
+
+        E.g., 'opencontractserver.pipeline.parsers.docling_parser_rest.DoclingParser'
+        or 'docling_parser_rest'. Returns None if no such component exists.
+        """
+        definition = self._by_class_name.get(component_name)
+        if definition is not None:
+            return definition.component_class
+
+        component_class = self._resolved.get(component_name)
+        if component_class is not None:
+            return component_class
+
+        if "." not in component_name:
+            for package in PIPELINE_PACKAGES:
+                component_class = self._by_module.get(f"{package}.{component_name}")
+                if component_class is not None:
+                    return component_class
+
+        component_class = self._import_component(component_name)
+        if component_class is not None:
+            self._resolved[component_name] = component_class
+        return component_class
+
+    def get_subclasses(self, module_name: str, base_class: type) -> tuple[type, ...]:
+        """
+        Get all subclasses of base_class in the modules of a package.
+
+        The pipeline packages are scanned during discovery; any other package
+        is scanned on first request.
+        """
+        subclasses = self._subclasses.get((module_name, base_class))
+        if subclasses is None:
+            subclasses = tuple(self._discover_subclasses(module_name, base_class))
+        return subclasses
+
     def get_parsers_for_filetype(
         self, file_type: str
     ) -> list[PipelineComponentDefinition]:
@@ -400,9 +502,10 @@ def get_all_components_cached() -> dict[str, tuple[PipelineComponentDefinition,
 
 def reset_registry() -> None:
     """
-    Reset the registry singleton.
+    Reset the registry singleton, dropping every cached lookup.
 
-    Useful for testing or if components are dynamically added.
+    Useful for testing or if components are dynamically added, changed or
+    removed.
     """
     PipelineComponentRegistry._instance = None
     PipelineComponentRegistry._initialized = False
@@ -1,7 +1,4 @@
-import importlib
-import inspect
 import logging
-import pkgutil
 from typing import Any, Optional, Union
 
 from django.conf import settings
@@ -11,6 +8,7 @@ from opencontractserver.pipeline.base.file_types import FileTypeEnum
 from opencontractserver.pipeline.base.parser import BaseParser
 from opencontractserver.pipeline.base.post_processor import BasePostProcessor
 from opencontractserver.pipeline.base.thumbnailer import BaseThumbnailGenerator
+from opencontractserver.pipeline.registry import get_registry
 from opencontractserver.types.dicts import OpenContractsExportDataJsonPythonType
 
 logger = logging.getLogger(__name__)
@@ -20,6 +18,8 @@ def get_all_subclasses(module_name: str, base_class: type) -> list[type]:
     """
     Get all subclasses of a base class within a given module.
 
+    Modules are scanned once per process; see PipelineComponentRegistry.
+
     Args:
         module_name (str): The module to search in.
         base_class (Type): The base class to find subclasses of.
@@ -27,17 +27,7 @@ def get_all_subclasses(module_name: str, base_class: type) -> list[type]:
     Returns:
         List[Type]: List of subclass types.
     """
-    subclasses = []
-    package = importlib.import_module(module_name)
-    prefix = package.__name__ + "."
-
-    for _, modname, ispkg in pkgutil.iter_modules(package.__path__, prefix):
-        if not ispkg:
-            module = importlib.import_module(modname)
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                if issubclass(obj, base_class) and obj != base_class:
-                    subclasses.append(obj)
-    return subclasses
+    return list(get_registry().get_subclasses(module_name, base_class))
 
 
 def get_all_parsers() -> list[type[BaseParser]]:
@@ -174,8 +164,6 @@ def get_components_by_mimetype(
     # Get compatible post-processors
     for post_processor_class in get_all_post_processors():
         if file_type in post_processor_class.supported_file_types:
-            logger.info(post_processor_class)
-            logger.info(dir(post_processor_class))
             module_name = post_processor_class.__module__.split(".")[-1]
             post_processors.append(
                 {
@@ -250,54 +238,19 @@ def get_component_by_name(component_name: str) -> type:
     """
     Given the script name or full path of a pipeline component, return the class itself.
 
+    Lookups are served from the PipelineComponentRegistry index, so only the
+    first lookup of a component outside the pipeline packages imports anything.
+
     Args:
         component_name (str): The name or full path of the component script.
 
     Returns:
         Type: The component class.
     """
-    # Handle full path case by extracting the module and class names
-    if "." in component_name:
-        try:
-            module_path, class_name = component_name.rsplit(".", 1)
-            module = importlib.import_module(module_path)
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                if name == class_name and (
-                    issubclass(obj, BaseParser)
-                    or issubclass(obj, BaseEmbedder)
-                    or issubclass(obj, BaseThumbnailGenerator)
-                    or issubclass(obj, BasePostProcessor)
-                ):
-                    return obj
-        except (ModuleNotFoundError, AttributeError):
-            pass
-
-    # Original implementation for script name only
-    base_paths = [
-        "opencontractserver.pipeline.parsers",
-        "opencontractserver.pipeline.embedders",
-        "opencontractserver.pipeline.thumbnailers",
-        "opencontractserver.pipeline.post_processors",
-    ]
-
-    for base_path in base_paths:
-        try:
-            module = importlib.import_module(f"{base_path}.{component_name}")
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                if (
-                    (issubclass(obj, BaseParser) and obj != BaseParser)
-                    or (issubclass(obj, BaseEmbedder) and obj != BaseEmbedder)
-                    or (
-                        issubclass(obj, BaseThumbnailGenerator)
-                        and obj != BaseThumbnailGenerator
-                    )
-                    or (issubclass(obj, BasePostProcessor) and obj != BasePostProcessor)
-                ):
-                    return obj
-        except ModuleNotFoundError:
-            continue
-
-    raise ValueError(f"Component '{component_name}' not found.")
+    component_class = get_registry().get_component_class(component_name)
+    if component_class is None:
+        raise ValueError(f"Component '{component_name}' not found.")
+    return component_class
 
 
 def get_preferred_embedder(mimetype: str) -> Optional[type[BaseEmbedder]]:
@@ -312,14 +265,10 @@ def get_preferred_embedder(mimetype: str) -> Optional[type[BaseEmbedder]]:
     """
     embedder_path = settings.PREFERRED_EMBEDDERS.get(mimetype)
     if embedder_path:
-        try:
-            module_path, class_name = embedder_path.rsplit(".", 1)
-            module = importlib.import_module(module_path)
-            embedder_class = getattr(module, class_name)
-            return embedder_class
-        except (ModuleNotFoundError, AttributeError) as e:
-            logger.error(f"Error loading embedder '{embedder_path}': {e}")
-            return None
+        embedder_class = get_registry().get_component_class(embedder_path)
+        if embedder_class is None:
+            logger.error(f"Error loading embedder '{embedder_path}'")
+        return embedder_class
     else:
         logger.warning(f"No preferred embedder set for mimetype: {mimetype}")
         return None
@@ -334,14 +283,10 @@ def get_default_embedder() -> Optional[type[BaseEmbedder]]:
     """
     embedder_path = settings.DEFAULT_EMBEDDER
     if embedder_path:
-        try:
-            module_path, class_name = embedder_path.rsplit(".", 1)
-            module = importlib.import_module(module_path)
-            embedder_class = getattr(module, class_name)
-            return embedder_class
-        except (ModuleNotFoundError, AttributeError) as e:
-            logger.error(f"Error loading default embedder '{embedder_path}': {e}")
-            return None
+        embedder_class = get_registry().get_component_class(embedder_path)
+        if embedder_class is None:
+            logger.error(f"Error loading default embedder '{embedder_path}'")
+        return embedder_class
     else:
         logger.error("No default embedder specified in settings")
         return None
@@ -366,14 +311,10 @@ def get_default_embedder_for_filetype(mimetype: str) -> Optional[type[BaseEmbedd
     )
 
     if embedder_path:
-        try:
-            module_path, class_name = embedder_path.rsplit(".", 1)
-            module = importlib.import_module(module_path)
-            embedder_class = getattr(module, class_name)
-            return embedder_class
-        except (ModuleNotFoundError, AttributeError) as e:
-            logger.error(f"Error loading embedder '{embedder_path}': {e}")
-            return None
+        embedder_class = get_registry().get_component_class(embedder_path)
+        if embedder_class is None:
+            logger.error(f"Error loading embedder '{embedder_path}'")
+        return embedder_class
     else:
         logger.warning(f"No default embedder found for mimetype '{mimetype}'")
         return None
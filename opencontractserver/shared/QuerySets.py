@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
 from django_cte import CTEQuerySet
 from tree_queries.query import TreeQuerySet
@@ -85,8 +85,9 @@ class PermissionedTreeQuerySet(TreeQuerySet):
 
         return queryset.with_tree_fields()
 
-    def with_tree_fields(self):
-        return super().with_tree_fields()
+    def with_tree_fields(self, tree_fields=True):
+        # Accept tree_fields so TreeQuerySet.without_tree_fields() keeps working.
+        return super().with_tree_fields(tree_fields)
 
 
 class UserFeedbackQuerySet(models.QuerySet):
@@ -135,53 +136,23 @@ class UserFeedbackQuerySet(models.QuerySet):
 
 class PermissionQuerySet(models.QuerySet):
     def visible_to_user(self, user, perm=None):
+        """
+        Objects that are public or created by the user.
+
+        Both branches are column predicates, so the result never contains
+        duplicates and no ``.distinct()`` is needed. That keeps index-ordered
+        LIMIT plans available to callers.
+        """
 
         if user.is_superuser:
             return self.all()
 
-        # model = self.model
-        # content_type = ContentType.objects.get_for_model(model)
-        #
-        # # Determine the permission codename
-        # permission_codename = f'{perm}_{model._meta.model_name}'
-        #
-        # # User permission subquery
-        # user_perm = UserObjectPermission.objects.filter(
-        #     content_type=content_type,
-        #     user=user,
-        #     permission__codename=permission_codename,
-        #     object_pk=OuterRef('pk')
-        # )
-        #
-        # # Group permission subquery
-        # group_perm = GroupObjectPermission.objects.filter(
-        #     content_type=content_type,
-        #     group__user=user,
-        #     permission__codename=permission_codename,
-        #     object_pk=OuterRef('pk')
-        # )
-
-        # Construct the base queryset
-        # queryset = self.annotate(
-        #     has_user_perm=Exists(user_perm),
-        #     has_group_perm=Exists(group_perm)
-        # )
-
-        # Filter based on permissions and public status - TODO - make this work for user/obj instance level sharing
-        # permission_filter = Q(has_user_perm=True) | Q(has_group_perm=True) | Q(is_public=True)
+        # TODO - make this work for user/obj instance level sharing
         permission_filter = Q(is_public=True)
         if not user.is_anonymous:
             permission_filter |= Q(creator=user)
 
-        # # Add extra conditions based on permission type
-        # if perm == 'read':
-        #     # For read permission, include objects created by the user
-        #     permission_filter |= Q(creator=user)
-        # elif perm == 'publish':
-        #     # For publish permission, only include objects created by the user
-        #     permission_filter &= Q(creator=user)
-
-        return self.filter(permission_filter).distinct()
+        return self.filter(permission_filter)
 
 
 class DocumentQuerySet(PermissionQuerySet, VectorSearchViaEmbeddingMixin):
@@ -220,6 +191,8 @@ class AnnotationQuerySet(
             Analysis,
             AnalysisUserObjectPermission,
         )
+        from opencontractserver.corpuses.models import Corpus
+        from opencontractserver.documents.models import Document
         from opencontractserver.extracts.models import (
             Extract,
             ExtractUserObjectPermission,
@@ -232,30 +205,49 @@ class AnnotationQuerySet(
         # Start with base queryset
         qs = self.all()
 
+        # Every predicate below is a plain column test or a correlated EXISTS.
+        # Nothing joins a to-many relation, so rows cannot be duplicated and we
+        # never need .distinct() - which would force Postgres to sort/hash the
+        # whole result and defeat index-ordered LIMIT for pagination.
+        public_document = Exists(
+            Document.objects.filter(pk=OuterRef("document_id"), is_public=True)
+        )
+        public_corpus = Exists(
+            Corpus.objects.without_tree_fields().filter(
+                pk=OuterRef("corpus_id"), is_public=True
+            )
+        )
+
         # For anonymous users, only show public structural annotations
         if user.is_anonymous:
             return qs.filter(
                 Q(structural=True)
-                & Q(document__is_public=True)
-                & (Q(corpus__isnull=True) | Q(corpus__is_public=True))
+                & Q(public_document)
+                & (Q(corpus__isnull=True) | Q(public_corpus))
             )
 
-        # Build visibility filters for analyses
-        visible_analyses = Analysis.objects.filter(Q(is_public=True) | Q(creator=user))
-        analyses_with_permission = AnalysisUserObjectPermission.objects.filter(
-            user=user
-        ).values_list("content_object_id", flat=True)
-        visible_analyses = visible_analyses | Analysis.objects.filter(
-            id__in=analyses_with_permission
+        # Analysis-created annotations are visible if the analysis is public, was
+        # created by the user, or has been shared with the user.
+        visible_analysis = Exists(
+            Analysis.objects.filter(pk=OuterRef("created_by_analysis_id")).filter(
+                Q(is_public=True) | Q(creator_id=user.id)
+            )
+        ) | Exists(
+            AnalysisUserObjectPermission.objects.filter(
+                content_object_id=OuterRef("created_by_analysis_id"), user_id=user.id
+            )
         )
 
-        # Build visibility filters for extracts
-        visible_extracts = Extract.objects.filter(Q(creator=user))
-        extracts_with_permission = ExtractUserObjectPermission.objects.filter(
-            user=user
-        ).values_list("content_object_id", flat=True)
-        visible_extracts = visible_extracts | Extract.objects.filter(
-            id__in=extracts_with_permission
+        # Extract-created annotations are visible if the user created the
+        # extract or it has been shared with them.
+        visible_extract = Exists(
+            Extract.objects.filter(
+                pk=OuterRef("created_by_extract_id"), creator_id=user.id
+            )
+        ) | Exists(
+            ExtractUserObjectPermission.objects.filter(
+                content_object_id=OuterRef("created_by_extract_id"), user_id=user.id
+            )
         )
 
         # Complex filter for annotation visibility
@@ -275,20 +267,31 @@ class AnnotationQuerySet(
             (Q(created_by_analysis__isnull=True) & Q(created_by_extract__isnull=True))
             |
             # Analysis-created annotations user can see
-            (Q(created_by_analysis__in=visible_analyses))
+            Q(visible_analysis)
             |
             # Extract-created annotations user can see
-            (Q(created_by_extract__in=visible_extracts))
+            Q(visible_extract)
         )
 
         # Also need document/corpus visibility
-        doc_corpus_filter = (
-            Q(document__is_public=True) | Q(document__creator=user)
+        doc_corpus_filter = Q(
+            Exists(
+                Document.objects.filter(pk=OuterRef("document_id")).filter(
+                    Q(is_public=True) | Q(creator_id=user.id)
+                )
+            )
         ) & (
-            Q(corpus__isnull=True) | Q(corpus__is_public=True) | Q(corpus__creator=user)
+            Q(corpus__isnull=True)
+            | Q(
+                Exists(
+                    Corpus.objects.without_tree_fields()
+                    .filter(pk=OuterRef("corpus_id"))
+                    .filter(Q(is_public=True) | Q(creator_id=user.id))
+                )
+            )
         )
 
-        return qs.filter(visibility_filter & doc_corpus_filter).distinct()
+        return qs.filter(visibility_filter & doc_corpus_filter)
 
 
 class NoteQuerySet(CTEQuerySet, PermissionQuerySet, VectorSearchViaEmbeddingMixin):
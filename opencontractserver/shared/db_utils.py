@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from functools import lru_cache
 
 from django.db import connection
@@ -18,3 +19,22 @@ def table_has_column(db_table: str, column_name: str) -> bool:
     except Exception:
         # If introspection fails (e.g. table not created yet), assume column absent
         return False
+
+
+class QueryTimer:
+    """
+    connection.execute_wrapper() callable that counts the queries run through
+    it and the time spent executing them.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - start
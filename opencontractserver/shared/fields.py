@@ -1,7 +1,9 @@
 import json
 import logging
 
+from django.db.models import FileField
 from django.db.models import JSONField as DbJSONField
+from django.db.models.fields.files import FieldFile
 from django.forms.fields import InvalidJSONInput, JSONField
 from drf_extra_fields.fields import Base64FileField
 from filetype import filetype
@@ -71,3 +73,33 @@ class NullableJSONField(DbJSONField):
 
     def formfield(self, **kwargs):
         return super().formfield(**{"form_class": UTF8JSONFormField, **kwargs})
+
+
+class BlobFieldFile(FieldFile):
+    """
+    FieldFile whose save() stores the content as a content-addressed blob
+    (see opencontractserver.documents.blob_storage) instead of under the
+    field's upload_to path, so identical bytes are only written once.
+    """
+
+    def save(self, name, content, save=True):
+        from opencontractserver.documents.blob_storage import store_blob
+
+        self.name = store_blob(self.storage, name, content)
+        setattr(self.instance, self.field.attname, self.name)
+        self._committed = True
+
+        if save:
+            self.instance.save()
+
+    save.alters_data = True
+
+
+class BlobFileField(FileField):
+    """
+    FileField backed by content-addressed blobs. Assigning the FieldFile of
+    another instance copies the pointer, and the blob's reference count
+    tracks how many rows point at it.
+    """
+
+    attr_class = BlobFieldFile
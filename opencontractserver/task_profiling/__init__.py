@@ -0,0 +1 @@
+default_app_config = "opencontractserver.task_profiling.apps.TaskProfilingConfig"
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from opencontractserver.task_profiling.models import TaskProfile
+
+
+@admin.register(TaskProfile)
+class TaskProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        "task_name",
+        "state",
+        "started_at",
+        "wall_ms",
+        "cpu_ms",
+        "db_queries",
+        "peak_rss_kb",
+    )
+    list_filter = ("task_name", "state")
+    search_fields = ("task_name", "task_id")
+    readonly_fields = ("started_at",)
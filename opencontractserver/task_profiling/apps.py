@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class TaskProfilingConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "opencontractserver.task_profiling"
+    verbose_name = "Task Profiling"
+
+    def ready(self):
+        """
+        Import signal handlers when the app is ready.
+        """
+        import opencontractserver.task_profiling.signals  # noqa: F401
@@ -0,0 +1,105 @@
+"""
+Management command summarizing recorded Celery task profiles per task name.
+
+Usage:
+    python manage.py task_profile_percentiles [--task NAME] [--hours N]
+        [--metric METRIC] [--percentiles P [P ...]] [--json]
+
+The table shows the chosen metric (wall_ms by default) at each percentile;
+--json reports every metric.
+"""
+
+import json
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from opencontractserver.task_profiling.models import TaskProfile
+
+METRICS = (
+    "wall_ms",
+    "cpu_ms",
+    "db_queries",
+    "db_ms",
+    "storage_bytes_read",
+    "storage_bytes_written",
+    "peak_rss_kb",
+)
+
+
+def _percentile(ordered: list, percent: float):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[int(percent / 100 * (len(ordered) - 1))]
+
+
+class Command(BaseCommand):
+    help = "Summarize Celery task profile percentiles per task name"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--task", help="Only tasks whose name contains this")
+        parser.add_argument(
+            "--hours",
+            type=int,
+            help="Only invocations started in the last N hours (default: all)",
+        )
+        parser.add_argument(
+            "--metric",
+            choices=METRICS,
+            default="wall_ms",
+            help="Metric shown in the table (default: wall_ms)",
+        )
+        parser.add_argument(
+            "--percentiles",
+            type=float,
+            nargs="+",
+            default=[50, 95, 99],
+            help="Percentiles to report (default: 50 95 99)",
+        )
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        if any(not 0 <= p <= 100 for p in options["percentiles"]):
+            raise CommandError("--percentiles must be between 0 and 100")
+
+        profiles = TaskProfile.objects.all()
+        if options["task"]:
+            profiles = profiles.filter(task_name__icontains=options["task"])
+        if options["hours"]:
+            profiles = profiles.filter(
+                started_at__gte=timezone.now() - timedelta(hours=options["hours"])
+            )
+
+        samples = defaultdict(lambda: defaultdict(list))
+        for row in profiles.values("task_name", *METRICS).iterator():
+            for metric in METRICS:
+                samples[row["task_name"]][metric].append(row[metric])
+
+        results = []
+        for task_name, metrics in sorted(samples.items()):
+            summary = {"task_name": task_name, "count": len(metrics["wall_ms"])}
+            for metric, values in metrics.items():
+                values.sort()
+                summary[metric] = {
+                    f"p{p:g}": round(_percentile(values, p), 3)
+                    for p in options["percentiles"]
+                }
+            results.append(summary)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        metric = options["metric"]
+        headers = [f"p{p:g}" for p in options["percentiles"]]
+        self.stdout.write(
+            f"{'task':<60} {'count':>7} "
+            + " ".join(f"{header:>12}" for header in headers)
+            + f"   ({metric})"
+        )
+        for summary in results:
+            self.stdout.write(
+                f"{summary['task_name']:<60} {summary['count']:>7} "
+                + " ".join(f"{summary[metric][header]:>12}" for header in headers)
+            )
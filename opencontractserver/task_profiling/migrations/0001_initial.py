@@ -0,0 +1,71 @@
+# Generated by Django 4.2.24 on 2026-10-19 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_name", models.CharField(max_length=255)),
+                ("task_id", models.CharField(blank=True, max_length=255)),
+                (
+                    "state",
+                    models.CharField(
+                        blank=True,
+                        help_text="Celery state the task finished in (SUCCESS, FAILURE, RETRY...)",
+                        max_length=32,
+                    ),
+                ),
+                ("started_at", models.DateTimeField()),
+                ("wall_ms", models.FloatField()),
+                (
+                    "cpu_ms",
+                    models.FloatField(help_text="CPU time of the worker process"),
+                ),
+                ("db_queries", models.PositiveIntegerField()),
+                ("db_ms", models.FloatField()),
+                (
+                    "storage_bytes_read",
+                    models.BigIntegerField(
+                        help_text="Bytes read from files opened through the default storage"
+                    ),
+                ),
+                (
+                    "storage_bytes_written",
+                    models.BigIntegerField(
+                        help_text="Bytes saved through the default storage"
+                    ),
+                ),
+                (
+                    "peak_rss_kb",
+                    models.PositiveBigIntegerField(
+                        help_text="Peak resident memory of the worker process during the task"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["task_name", "started_at"],
+                        name="task_profil_task_na_3c4fc4_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import models
+
+
+class TaskProfile(models.Model):
+    """
+    Resource usage of one Celery task invocation, recorded by the
+    task_prerun/task_postrun handlers in signals.py.
+
+    The table is capped to the TASK_PROFILE_MAX_ROWS most recent invocations;
+    summarize it with the task_profile_percentiles management command.
+    """
+
+    task_name = models.CharField(max_length=255)
+
+    task_id = models.CharField(max_length=255, blank=True)
+
+    state = models.CharField(
+        max_length=32,
+        blank=True,
+        help_text="Celery state the task finished in (SUCCESS, FAILURE, RETRY...)",
+    )
+
+    started_at = models.DateTimeField()
+
+    wall_ms = models.FloatField()
+
+    cpu_ms = models.FloatField(help_text="CPU time of the worker process")
+
+    db_queries = models.PositiveIntegerField()
+
+    db_ms = models.FloatField()
+
+    storage_bytes_read = models.BigIntegerField(
+        help_text="Bytes read from files opened through the default storage"
+    )
+
+    storage_bytes_written = models.BigIntegerField(
+        help_text="Bytes saved through the default storage"
+    )
+
+    peak_rss_kb = models.PositiveBigIntegerField(
+        help_text="Peak resident memory of the worker process during the task"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["task_name", "started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name} [{self.task_id}] {self.wall_ms:.0f} ms"
@@ -0,0 +1,200 @@
+"""
+Celery signal handlers that profile task invocations.
+
+task_prerun starts measuring a sample (TASK_PROFILING_SAMPLE_RATE) of task
+invocations and task_postrun stores a TaskProfile with their wall time, CPU
+time, SQL query count and time, bytes read and written through the default
+storage, and peak RSS. With TASK_PROFILING_LOG each profile is also logged
+as a JSON line.
+
+CPU time and peak RSS are per worker process, so they are only meaningful
+with the prefork pool, where a process runs one task at a time. A task run
+eagerly inside another is included in the outer task's numbers.
+"""
+
+import json
+import logging
+import random
+import resource
+import threading
+import time
+from contextlib import ExitStack
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from opencontractserver.shared.db_utils import QueryTimer
+from opencontractserver.task_profiling.models import TaskProfile
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_storage_counters_installed = False
+
+
+class _ActiveProfile:
+    def __init__(self):
+        self.started_at = timezone.now()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.query_timer = QueryTimer()
+        self.exit_stack = ExitStack()
+        self.storage_bytes_read = 0
+        self.storage_bytes_written = 0
+
+
+def _active_profiles() -> dict:
+    if not hasattr(_local, "profiles"):
+        _local.profiles = {}
+    return _local.profiles
+
+
+def _count_storage_bytes(field: str, size: int) -> None:
+    for profile in _active_profiles().values():
+        setattr(profile, field, getattr(profile, field) + size)
+
+
+class _ReadCountingStream:
+    """Proxy for a file-like object that counts the bytes read from it."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def read(self, *args, **kwargs):
+        data = self._stream.read(*args, **kwargs)
+        _count_storage_bytes("storage_bytes_read", len(data))
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _install_storage_counters() -> None:
+    """Wrap the default storage so files opened or saved through it are counted."""
+    global _storage_counters_installed
+    if _storage_counters_installed:
+        return
+    _storage_counters_installed = True
+
+    original_open = default_storage._open
+    original_save = default_storage._save
+
+    def _open(name, mode="rb"):
+        file = original_open(name, mode)
+        read = file.read
+
+        def counting_read(*args, **kwargs):
+            data = read(*args, **kwargs)
+            _count_storage_bytes("storage_bytes_read", len(data))
+            return data
+
+        try:
+            file.read = counting_read
+        except AttributeError:
+            # django File proxies read() to its wrapped stream through a property
+            file.file = _ReadCountingStream(file.file)
+        return file
+
+    def _save(name, content):
+        try:
+            _count_storage_bytes("storage_bytes_written", content.size)
+        except (AttributeError, OSError):
+            pass
+        return original_save(name, content)
+
+    default_storage._open = _open
+    default_storage._save = _save
+
+
+def _reset_peak_rss() -> None:
+    """Reset the process's peak RSS (Linux only; elsewhere the peak is lifetime)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # kB on Linux, bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@task_prerun.connect
+def start_task_profile(sender=None, task_id=None, task=None, **kwargs):
+    """Start measuring a sampled task invocation."""
+    if (
+        not settings.TASK_PROFILING_ENABLED
+        or random.random() >= settings.TASK_PROFILING_SAMPLE_RATE
+    ):
+        return
+
+    _install_storage_counters()
+    profiles = _active_profiles()
+    if not profiles:
+        _reset_peak_rss()
+
+    profile = _ActiveProfile()
+    profile.exit_stack.enter_context(connection.execute_wrapper(profile.query_timer))
+    profiles[task_id] = profile
+
+
+@task_postrun.connect
+def finish_task_profile(sender=None, task_id=None, task=None, state=None, **kwargs):
+    """Store the profile of a measured task invocation."""
+    profile = _active_profiles().pop(task_id, None)
+    if profile is None:
+        return
+    profile.exit_stack.close()
+
+    record = TaskProfile(
+        task_name=getattr(task, "name", None) or str(sender),
+        task_id=task_id or "",
+        state=state or "",
+        started_at=profile.started_at,
+        wall_ms=(time.perf_counter() - profile.wall_start) * 1000,
+        cpu_ms=(time.process_time() - profile.cpu_start) * 1000,
+        db_queries=profile.query_timer.queries,
+        db_ms=profile.query_timer.seconds * 1000,
+        storage_bytes_read=profile.storage_bytes_read,
+        storage_bytes_written=profile.storage_bytes_written,
+        peak_rss_kb=_peak_rss_kb(),
+    )
+
+    try:
+        with transaction.atomic():
+            record.save()
+            TaskProfile.objects.filter(
+                id__lte=record.id - settings.TASK_PROFILE_MAX_ROWS
+            ).delete()
+    except DatabaseError as e:
+        logger.warning(f"Could not store profile of task {record.task_name}: {e}")
+
+    if settings.TASK_PROFILING_LOG:
+        logger.info(
+            json.dumps(
+                {
+                    "event": "celery_task_profile",
+                    "task_name": record.task_name,
+                    "task_id": record.task_id,
+                    "state": record.state,
+                    "wall_ms": round(record.wall_ms, 3),
+                    "cpu_ms": round(record.cpu_ms, 3),
+                    "db_queries": record.db_queries,
+                    "db_ms": round(record.db_ms, 3),
+                    "storage_bytes_read": record.storage_bytes_read,
+                    "storage_bytes_written": record.storage_bytes_written,
+                    "peak_rss_kb": record.peak_rss_kb,
+                }
+            )
+        )
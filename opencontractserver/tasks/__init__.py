@@ -1,5 +1,14 @@
-from .agent_tasks import generate_agent_response, trigger_agent_responses_for_message
-from .badge_tasks import check_auto_badges, check_badges_for_all_users
+from .agent_tasks import (
+    generate_agent_response,
+    recover_interrupted_agent_messages,
+    refresh_conversation_summary,
+    trigger_agent_responses_for_message,
+)
+from .badge_tasks import (
+    check_auto_badges,
+    check_badges_for_all_users,
+    evaluate_pending_badge_checks,
+)
 from .cleanup_tasks import delete_analysis_and_annotations_task
 from .corpus_tasks import *  # noqa: F403, F401
 from .data_extract_tasks import *  # noqa: F403, F401
@@ -13,10 +22,17 @@ from .import_tasks import (
     import_document_to_corpus,
     process_documents_zip,
 )
+from .leaderboard_tasks import (
+    refresh_community_snapshots,
+    refresh_community_stats,
+    refresh_leaderboard,
+)
 from .lookup_tasks import build_label_lookups_task
+from .notification_tasks import drain_notification_outbox
 
 # Materialized view tasks removed - using direct queries instead
 from .permissioning_tasks import make_analysis_public_task, make_corpus_public_task
+from .reputation_tasks import reconcile_vote_counters
 
 # Great, quick guidance on how to restructure tasks into multiple modules:
 # https://blog.sneawo.com/blog/2018/12/05/how-to-split-celery-tasks-file/
@@ -38,6 +54,14 @@ __all__ = [
     "delete_analysis_and_annotations_task",
     "check_auto_badges",
     "check_badges_for_all_users",
+    "evaluate_pending_badge_checks",
     "generate_agent_response",
     "trigger_agent_responses_for_message",
+    "recover_interrupted_agent_messages",
+    "refresh_conversation_summary",
+    "reconcile_vote_counters",
+    "drain_notification_outbox",
+    "refresh_community_snapshots",
+    "refresh_leaderboard",
+    "refresh_community_stats",
 ]
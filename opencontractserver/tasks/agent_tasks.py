@@ -16,6 +16,7 @@ from celery import shared_task
 from channels.layers import get_channel_layer
 
 from opencontractserver.conversations.models import (
+    Conversation,
     MessageStateChoices,
     MessageTypeChoices,
 )
@@ -107,6 +108,7 @@ def generate_agent_response(
     from django.contrib.auth import get_user_model
 
     from opencontractserver.agents.models import AgentConfiguration
+    from opencontractserver.conversations.coalescing import StreamCoalescer
     from opencontractserver.conversations.models import ChatMessage
     from opencontractserver.llms.agents.core_agents import (
         ContentEvent,
@@ -169,8 +171,6 @@ def generate_agent_response(
         timeline_data = []
 
         async def run_agent():
-            nonlocal accumulated_content
-
             # Build the agent - for_corpus is async
             if corpus:
                 agent = await agent_api.for_corpus(
@@ -192,9 +192,33 @@ def generate_agent_response(
                     conversation=conversation,
                 )
 
+            async def broadcast_tokens(text: str, seq: int, token_count: int):
+                await async_broadcast_to_thread(
+                    conversation_id,
+                    "agent.stream_token",
+                    {
+                        "message_id": str(response_message.pk),
+                        "token": text,
+                        "seq": seq,
+                        "token_count": token_count,
+                    },
+                )
+
+            # Tokens are batched into one group_send per window instead of
+            # one per token.
+            tokens = StreamCoalescer(broadcast_tokens)
+
             # Stream the agent response
             # Pass store_messages=False since we handle message persistence ourselves
             # (we already created response_message above with parent_message set)
+            try:
+                await stream_events(agent, tokens)
+            finally:
+                await tokens.close()
+
+        async def stream_events(agent, tokens):
+            nonlocal accumulated_content
+
             async for event in agent.stream(user_message, store_messages=False):
                 if isinstance(event, ContentEvent):
                     # Token/content chunk
@@ -202,16 +226,7 @@ def generate_agent_response(
                     accumulated_content = event.accumulated_content or (
                         accumulated_content + token
                     )
-
-                    # Broadcast token (use async version inside async context)
-                    await async_broadcast_to_thread(
-                        conversation_id,
-                        "agent.stream_token",
-                        {
-                            "message_id": str(response_message.pk),
-                            "token": token,
-                        },
-                    )
+                    await tokens.add(token)
 
                 elif isinstance(event, ThoughtEvent):
                     # Agent thinking/tool usage
@@ -220,6 +235,8 @@ def generate_agent_response(
                     tool_name = metadata.get("tool_name")
 
                     if tool_name:
+                        # Deliver pending tokens before the tool call event
+                        await tokens.flush()
                         timeline_data.append(
                             {
                                 "type": "tool_call",
@@ -391,3 +408,68 @@ def trigger_agent_responses_for_message(message_id: int, user_id: int) -> dict:
         "agents_triggered": len(task_ids),
         "task_ids": task_ids,
     }
+
+
+@shared_task
+def recover_interrupted_agent_messages(stale_after_seconds: int | None = None) -> dict:
+    """
+    Reassemble and finalise LLM messages left in progress by a crashed worker.
+
+    Intended to run periodically (schedule it through django-celery-beat).
+    Partial answers streamed as ChatMessageStreamChunk deltas are compacted
+    into the message content and the message is marked as errored.
+
+    Args:
+        stale_after_seconds: Inactivity window before a stream counts as
+            abandoned; defaults to settings.AGENT_STREAM_RECOVERY_STALE_SECONDS.
+
+    Returns:
+        dict with the 'recovered' message count
+    """
+    from opencontractserver.conversations.streaming import (
+        recover_interrupted_stream_messages,
+    )
+
+    recovered = recover_interrupted_stream_messages(stale_after_seconds)
+    if recovered:
+        logger.warning(f"[AgentTask] Recovered {recovered} interrupted agent messages")
+    return {"recovered": recovered}
+
+
+@shared_task
+def refresh_conversation_summary(conversation_id: int) -> dict:
+    """
+    Fold turns that fell out of a conversation's history window into its
+    rolling summary.
+
+    Queued by ConversationHistoryManager when an agent builds its message
+    history and finds unsummarised older turns.
+
+    Args:
+        conversation_id: ID of the Conversation to summarise
+
+    Returns:
+        dict with 'status' and whether the summary was 'refreshed'
+    """
+    from django.core.cache import cache
+
+    from opencontractserver.llms.agents.conversation_history import (
+        SUMMARY_REFRESH_LOCK_KEY,
+        ConversationHistoryManager,
+    )
+
+    try:
+        conversation = Conversation.all_objects.get(pk=conversation_id)
+        refreshed = ConversationHistoryManager(conversation).refresh_summary()
+    except Conversation.DoesNotExist:
+        logger.warning(f"[AgentTask] Conversation {conversation_id} not found")
+        return {"status": "error", "error": "Conversation not found"}
+    except Exception as e:
+        logger.exception(
+            f"[AgentTask] Failed to summarise conversation {conversation_id}: {e}"
+        )
+        return {"status": "error", "error": str(e)}
+    finally:
+        cache.delete(SUMMARY_REFRESH_LOCK_KEY.format(conversation_id=conversation_id))
+
+    return {"status": "ok", "refreshed": refreshed}
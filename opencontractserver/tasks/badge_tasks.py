@@ -3,13 +3,22 @@ Celery tasks for badge auto-awarding and management.
 """
 
 import logging
+from collections import defaultdict
 from typing import Optional
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
 
 from config import celery_app
-from opencontractserver.badges.models import Badge, BadgeTypeChoices, UserBadge
-from opencontractserver.conversations.models import ChatMessage
+from opencontractserver.badges.criteria_registry import BadgeCriteriaRegistry
+from opencontractserver.badges.models import (
+    Badge,
+    BadgeTypeChoices,
+    PendingBadgeCheck,
+    UserBadge,
+)
 from opencontractserver.corpuses.models import Corpus
 
 logger = logging.getLogger(__name__)
@@ -27,6 +36,16 @@ class BadgeCriteriaType:
     CORPUS_CONTRIBUTION = "corpus_contribution"
 
 
+# Max PendingBadgeCheck rows evaluate_pending_badge_checks handles per run
+PENDING_BADGE_CHECK_BATCH_SIZE = 5000
+
+# Badge signals queue one evaluation this many seconds after the first mark;
+# marks made in the meantime are evaluated by the same run.
+PENDING_BADGE_CHECK_DELAY_SECONDS = 30
+PENDING_BADGE_CHECK_LOCK_KEY = "pending-badge-check-evaluation"
+PENDING_BADGE_CHECK_LOCK_SECONDS = 300
+
+
 class BadgeCriteriaError(Exception):
     """Raised when badge criteria configuration is invalid."""
 
@@ -118,6 +137,9 @@ def _check_badge_criteria(
     """
     Check if user meets the criteria for a badge.
 
+    Evaluation is delegated to the criteria type's set-based evaluator in
+    BadgeCriteriaRegistry, with the user as the only candidate.
+
     Args:
         user: User to check
         badge: Badge to check criteria for
@@ -137,8 +159,6 @@ def _check_badge_criteria(
         return False
 
     # Validate criteria config against registry
-    from opencontractserver.badges.criteria_registry import BadgeCriteriaRegistry
-
     is_valid, error_message = BadgeCriteriaRegistry.validate_config(
         badge.criteria_config
     )
@@ -148,118 +168,14 @@ def _check_badge_criteria(
         )
         return False
 
-    # Get value field if criteria type uses it
-    value = badge.criteria_config.get("value")
+    if criteria_type == BadgeCriteriaType.CORPUS_CONTRIBUTION and not corpus:
+        logger.warning(f"Badge {badge.name} requires corpus context but none provided")
+        return False
 
     try:
-        if criteria_type == BadgeCriteriaType.REPUTATION:
-            # Check user's reputation score
-            from opencontractserver.conversations.models import UserReputation
-
-            if corpus:
-                # Corpus-specific reputation
-                try:
-                    reputation = UserReputation.objects.get(user=user, corpus=corpus)
-                    return reputation.reputation_score >= int(value)
-                except UserReputation.DoesNotExist:
-                    # No reputation record means score is 0
-                    return int(value) <= 0
-            else:
-                # Global reputation (corpus=null)
-                try:
-                    reputation = UserReputation.objects.get(
-                        user=user, corpus__isnull=True
-                    )
-                    return reputation.reputation_score >= int(value)
-                except UserReputation.DoesNotExist:
-                    # No reputation record means score is 0
-                    return int(value) <= 0
-
-        elif criteria_type == BadgeCriteriaType.MESSAGE_COUNT:
-            # Check number of messages created
-            if corpus:
-                # Corpus-specific message count
-                count = ChatMessage.objects.filter(
-                    creator=user, conversation__chat_with_corpus=corpus
-                ).count()
-            else:
-                # Global message count
-                count = ChatMessage.objects.filter(creator=user).count()
-
-            return count >= int(value)
-
-        elif criteria_type == BadgeCriteriaType.FIRST_POST:
-            # Award on first message created
-            if corpus:
-                count = ChatMessage.objects.filter(
-                    creator=user, conversation__chat_with_corpus=corpus
-                ).count()
-            else:
-                count = ChatMessage.objects.filter(creator=user).count()
-
-            return count >= 1
-
-        elif criteria_type == BadgeCriteriaType.MESSAGE_UPVOTES:
-            # Check if user has a message with N upvotes
-            from opencontractserver.conversations.models import MessageVote, VoteType
-
-            # Get user's messages in the appropriate scope
-            if corpus:
-                # Corpus-specific messages
-                user_messages = ChatMessage.objects.filter(
-                    creator=user, conversation__chat_with_corpus=corpus
-                )
-            else:
-                # All messages
-                user_messages = ChatMessage.objects.filter(creator=user)
-
-            # For each message, count upvotes and check if any meets threshold
-            for message in user_messages:
-                upvote_count = MessageVote.objects.filter(
-                    message=message, vote_type=VoteType.UPVOTE
-                ).count()
-
-                if upvote_count >= int(value):
-                    return True
-
-            return False
-
-        elif criteria_type == BadgeCriteriaType.CORPUS_CONTRIBUTION:
-            # Check contribution to corpus (documents, annotations, etc.)
-            if not corpus:
-                logger.warning(
-                    f"Badge {badge.name} requires corpus context but none provided"
-                )
-                return False
-
-            # Count documents uploaded to corpus
-            # Note: Uses DocumentPath-based source of truth via get_documents()
-            doc_count = corpus.get_documents().filter(creator=user).count()
-
-            # Count annotations in corpus
-            from opencontractserver.annotations.models import Annotation
-
-            annotation_count = Annotation.objects.filter(
-                creator=user, corpus=corpus
-            ).count()
-
-            total_contributions = doc_count + annotation_count
-            return total_contributions >= int(value)
-
-        else:
-            valid_types = [
-                BadgeCriteriaType.REPUTATION,
-                BadgeCriteriaType.MESSAGE_COUNT,
-                BadgeCriteriaType.FIRST_POST,
-                BadgeCriteriaType.MESSAGE_UPVOTES,
-                BadgeCriteriaType.CORPUS_CONTRIBUTION,
-            ]
-            logger.error(
-                f"Unknown criteria type '{criteria_type}' for badge {badge.name}. "
-                f"Valid types: {', '.join(valid_types)}"
-            )
-            return False
-
+        return user.id in BadgeCriteriaRegistry.qualifying_users(
+            badge.criteria_config, [user.id], corpus.id if corpus else None
+        )
     except (ValueError, TypeError) as e:
         # Configuration errors - invalid value format
         logger.error(
@@ -275,6 +191,131 @@ def _check_badge_criteria(
         return False
 
 
+@celery_app.task()
+def evaluate_pending_badge_checks(
+    batch_size: int = PENDING_BADGE_CHECK_BATCH_SIZE,
+) -> dict:
+    """
+    Evaluate auto-award badges for the users marked by badge signals.
+
+    Every marked user is evaluated once per run, however many events marked
+    them, and each badge is evaluated for all of its marked users with one
+    set-based query. Checks marked while a run is in progress, and checks
+    whose badges could not be evaluated, are kept for the next run.
+
+    Queued by the badge signals PENDING_BADGE_CHECK_DELAY_SECONDS after they
+    mark a check; a full batch queues the next run straight away.
+
+    Args:
+        batch_size: Max pending checks to process in one run
+
+    Returns:
+        Dictionary with evaluation results
+    """
+    # Marks from here on queue another run
+    cache.delete(PENDING_BADGE_CHECK_LOCK_KEY)
+
+    cutoff = timezone.now()
+    pending = list(
+        PendingBadgeCheck.objects.filter(marked_at__lte=cutoff)
+        .order_by("marked_at")
+        .values_list("pk", "user_id", "corpus_id", "criteria_type")[:batch_size]
+    )
+    if not pending:
+        return {"ok": True, "checks": 0, "users_checked": 0, "awards_count": 0}
+
+    # (corpus_id or None, criteria type) -> marked user IDs
+    marked = defaultdict(set)
+    for _, user_id, corpus_id, criteria_type in pending:
+        marked[(corpus_id, criteria_type)].add(user_id)
+
+    corpus_ids = {corpus_id for corpus_id, _ in marked if corpus_id}
+    badges = Badge.objects.filter(
+        Q(badge_type=BadgeTypeChoices.GLOBAL)
+        | Q(badge_type=BadgeTypeChoices.CORPUS, corpus_id__in=corpus_ids),
+        is_auto_awarded=True,
+        criteria_config__type__in={criteria_type for _, criteria_type in marked},
+    )
+
+    awards = []
+    # (corpus_id, criteria type) pairs with a badge that failed to evaluate
+    unevaluated = set()
+    for badge in badges:
+        corpus_id = (
+            badge.corpus_id if badge.badge_type == BadgeTypeChoices.CORPUS else None
+        )
+        pair = (corpus_id, badge.criteria_config["type"])
+        candidates = marked.get(pair)
+        if not candidates:
+            continue
+
+        is_valid, error_message = BadgeCriteriaRegistry.validate_config(
+            badge.criteria_config
+        )
+        if not is_valid:
+            logger.warning(
+                f"Badge {badge.name} has invalid criteria config: {error_message}"
+            )
+            continue
+
+        candidates = candidates - set(
+            UserBadge.objects.filter(
+                badge=badge, user_id__in=candidates, corpus_id=corpus_id
+            ).values_list("user_id", flat=True)
+        )
+        try:
+            qualifying = BadgeCriteriaRegistry.qualifying_users(
+                badge.criteria_config, candidates, corpus_id
+            )
+        except Exception as e:
+            logger.exception(
+                f"Unexpected error evaluating badge criteria for '{badge.name}': {e}"
+            )
+            unevaluated.add(pair)
+            continue
+
+        # Created one at a time so post_save notifies each recipient; a
+        # concurrent run may have awarded the badge in the meantime.
+        awarded = 0
+        for user_id in qualifying:
+            user_badge, created = UserBadge.objects.get_or_create(
+                user_id=user_id,
+                badge=badge,
+                corpus_id=corpus_id,
+                defaults={"awarded_by": None},
+            )
+            if created:
+                awards.append(user_badge)
+                awarded += 1
+        if awarded:
+            logger.info(f"Auto-awarded badge '{badge.name}' to {awarded} user(s)")
+
+    # Checks re-marked after the cutoff stay pending for the next run, and so
+    # do those of badges that failed, so their users are evaluated again.
+    evaluated = [
+        pk
+        for pk, _, corpus_id, criteria_type in pending
+        if (corpus_id, criteria_type) not in unevaluated
+    ]
+    deleted, _ = PendingBadgeCheck.objects.filter(
+        pk__in=evaluated, marked_at__lte=cutoff
+    ).delete()
+    if unevaluated:
+        logger.warning(
+            f"Kept {len(pending) - len(evaluated)} pending badge checks whose "
+            "badges failed to evaluate"
+        )
+    if deleted and len(pending) == batch_size:
+        evaluate_pending_badge_checks.delay(batch_size)
+
+    return {
+        "ok": True,
+        "checks": len(pending),
+        "users_checked": len({user_id for _, user_id, _, _ in pending}),
+        "awards_count": len(awards),
+    }
+
+
 @celery_app.task()
 def check_badges_for_all_users(corpus_id: Optional[int] = None) -> dict:
     """
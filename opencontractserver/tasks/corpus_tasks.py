@@ -1,12 +1,15 @@
 import logging
+from collections import defaultdict
 from datetime import timedelta
 
 from celery import chord, group, shared_task
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 
 from opencontractserver.analyzer.models import Analysis, Analyzer
+from opencontractserver.annotations.models import Annotation
 from opencontractserver.conversations.models import (
     ChatMessage,
     Conversation,
@@ -17,6 +20,7 @@ from opencontractserver.conversations.models import (
 from opencontractserver.corpuses.models import (
     Corpus,
     CorpusAction,
+    CorpusEngagementBucket,
     CorpusEngagementMetrics,
 )
 from opencontractserver.documents.models import DocumentAnalysisRow
@@ -239,21 +243,248 @@ def process_corpus_action(
 # --------------------------------------------------------------------------- #
 # Engagement Metrics Tasks (Epic #565)
 # --------------------------------------------------------------------------- #
+#
+# Signal handlers keep per-(corpus, day, user) CorpusEngagementBucket counters
+# current (see opencontractserver/corpuses/engagement_signals.py), so metrics
+# are derived from a corpus's buckets instead of being recounted from its
+# threads, messages, votes and annotations. Rolling windows ("last 7 days")
+# are measured in whole days: the current day and the six before it.
+
+ENGAGEMENT_ROLLUP_BATCH_SIZE = 500
+
+ENGAGEMENT_METRIC_FIELDS = [
+    "total_threads",
+    "active_threads",
+    "total_messages",
+    "messages_last_7_days",
+    "messages_last_30_days",
+    "unique_contributors",
+    "active_contributors_30_days",
+    "total_upvotes",
+    "avg_messages_per_thread",
+    "total_annotations",
+]
+
+
+def _rebuild_engagement_buckets(corpus_id: int) -> int:
+    """
+    Recompute a corpus's engagement buckets from scratch and repair any that
+    differ.
+
+    Returns:
+        int: Number of buckets that had drifted from the source tables
+    """
+    per_day_and_user = {
+        "threads": Conversation.objects.filter(
+            chat_with_corpus_id=corpus_id,
+            conversation_type=ConversationTypeChoices.THREAD,
+            deleted_at__isnull=True,
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "creator_id")
+        .annotate(
+            threads=Count("id"), locked_threads=Count("id", filter=Q(is_locked=True))
+        ),
+        # Excluding soft-deleted messages and messages in soft-deleted threads
+        "messages": ChatMessage.objects.filter(
+            conversation__chat_with_corpus_id=corpus_id,
+            conversation__conversation_type=ConversationTypeChoices.THREAD,
+            deleted_at__isnull=True,
+            conversation__deleted_at__isnull=True,
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "creator_id")
+        .annotate(messages=Count("id")),
+        "upvotes": MessageVote.objects.filter(
+            message__conversation__chat_with_corpus_id=corpus_id,
+            message__conversation__conversation_type=ConversationTypeChoices.THREAD,
+            vote_type=VoteType.UPVOTE,
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "creator_id")
+        .annotate(upvotes=Count("id")),
+        "annotations": Annotation.objects.filter(corpus_id=corpus_id, structural=False)
+        .annotate(day=TruncDate("created"))
+        .values("day", "creator_id")
+        .annotate(annotations=Count("id")),
+    }
+
+    expected = defaultdict(lambda: dict.fromkeys(CorpusEngagementBucket.COUNTERS, 0))
+    for queryset in per_day_and_user.values():
+        for row in queryset:
+            expected[(row.pop("day"), row.pop("creator_id"))].update(row)
+
+    now = timezone.now()
+    repairs, missing = [], []
+    with transaction.atomic():
+        existing = {
+            (bucket.day, bucket.user_id): bucket
+            for bucket in CorpusEngagementBucket.objects.select_for_update().filter(
+                corpus_id=corpus_id
+            )
+        }
+        for (day, user_id), counters in expected.items():
+            bucket = existing.pop((day, user_id), None)
+            if bucket is None:
+                missing.append(
+                    CorpusEngagementBucket(
+                        corpus_id=corpus_id,
+                        day=day,
+                        user_id=user_id,
+                        needs_rollup=False,
+                        modified=now,
+                        **counters,
+                    )
+                )
+            elif any(
+                getattr(bucket, name) != value for name, value in counters.items()
+            ):
+                for name, value in counters.items():
+                    setattr(bucket, name, value)
+                bucket.modified = now
+                repairs.append(bucket)
+
+        # Buckets left over count nothing any more
+        stale = [
+            bucket.pk
+            for bucket in existing.values()
+            if any(getattr(bucket, name) for name in CorpusEngagementBucket.COUNTERS)
+        ]
+        CorpusEngagementBucket.objects.filter(
+            pk__in=[bucket.pk for bucket in existing.values()]
+        ).delete()
+        CorpusEngagementBucket.objects.bulk_update(
+            repairs,
+            [*CorpusEngagementBucket.COUNTERS, "modified"],
+            batch_size=ENGAGEMENT_ROLLUP_BATCH_SIZE,
+        )
+        CorpusEngagementBucket.objects.bulk_create(
+            missing, batch_size=ENGAGEMENT_ROLLUP_BATCH_SIZE
+        )
+        # The metrics derived next include everything counted so far.
+        CorpusEngagementBucket.objects.filter(
+            corpus_id=corpus_id, needs_rollup=True, modified__lte=now
+        ).update(needs_rollup=False)
+
+    return len(repairs) + len(missing) + len(stale)
+
+
+def _derive_engagement_metrics(corpus_ids: list[int]) -> dict[int, dict]:
+    """Compute metric values for the given corpora from their buckets."""
+    today = timezone.localdate()
+    last_7_days = Q(day__gt=today - timedelta(days=7))
+    last_30_days = Q(day__gt=today - timedelta(days=30))
+
+    metrics = {
+        corpus_id: dict.fromkeys(ENGAGEMENT_METRIC_FIELDS, 0)
+        for corpus_id in corpus_ids
+    }
+    buckets = CorpusEngagementBucket.objects.filter(corpus_id__in=corpus_ids)
+
+    totals = buckets.values("corpus_id").annotate(
+        sum_threads=Sum("threads"),
+        sum_locked_threads=Sum("locked_threads"),
+        sum_messages=Sum("messages"),
+        sum_messages_7=Sum("messages", filter=last_7_days),
+        sum_messages_30=Sum("messages", filter=last_30_days),
+        sum_upvotes=Sum("upvotes"),
+        sum_annotations=Sum("annotations"),
+    )
+    for row in totals:
+        threads, messages = row["sum_threads"], row["sum_messages"]
+        corpus_metrics = metrics[row["corpus_id"]]
+        corpus_metrics["total_threads"] = threads
+        corpus_metrics["active_threads"] = threads - row["sum_locked_threads"]
+        corpus_metrics["total_messages"] = messages
+        corpus_metrics["messages_last_7_days"] = row["sum_messages_7"] or 0
+        corpus_metrics["messages_last_30_days"] = row["sum_messages_30"] or 0
+        corpus_metrics["total_upvotes"] = row["sum_upvotes"]
+        corpus_metrics["total_annotations"] = row["sum_annotations"]
+        corpus_metrics["avg_messages_per_thread"] = (
+            float(messages) / float(threads) if threads > 0 else 0.0
+        )
+
+    contributors = (
+        buckets.values("corpus_id", "user_id")
+        .annotate(
+            sum_messages=Sum("messages"),
+            sum_messages_30=Sum("messages", filter=last_30_days),
+        )
+        .filter(sum_messages__gt=0)
+    )
+    for row in contributors:
+        corpus_metrics = metrics[row["corpus_id"]]
+        corpus_metrics["unique_contributors"] += 1
+        if row["sum_messages_30"]:
+            corpus_metrics["active_contributors_30_days"] += 1
+
+    return metrics
+
+
+def _store_engagement_metrics(metrics: dict[int, dict]) -> set[int]:
+    """
+    Write derived metrics to CorpusEngagementMetrics.
+
+    Returns:
+        set[int]: IDs of the corpora whose metrics record was created
+    """
+    now = timezone.now()
+    existing = CorpusEngagementMetrics.objects.in_bulk(
+        list(metrics), field_name="corpus_id"
+    )
+    updated, created = [], []
+    for corpus_id, values in metrics.items():
+        record = existing.get(corpus_id)
+        if record is None:
+            created.append(CorpusEngagementMetrics(corpus_id=corpus_id, **values))
+            continue
+        for name, value in values.items():
+            setattr(record, name, value)
+        # bulk_update() skips auto_now, so stamp last_updated explicitly.
+        record.last_updated = now
+        updated.append(record)
+
+    CorpusEngagementMetrics.objects.bulk_update(
+        updated,
+        [*ENGAGEMENT_METRIC_FIELDS, "last_updated"],
+        batch_size=ENGAGEMENT_ROLLUP_BATCH_SIZE,
+    )
+    CorpusEngagementMetrics.objects.bulk_create(
+        created, batch_size=ENGAGEMENT_ROLLUP_BATCH_SIZE
+    )
+    return {record.corpus_id for record in created}
+
+
+def _corpora_pending_rollup(cutoff) -> list[int]:
+    """
+    Corpora whose metrics are out of date: those with bucket changes up to
+    ``cutoff``, and those whose rolling windows moved on since they were last
+    derived while they still had recent messages.
+    """
+    changed = CorpusEngagementBucket.objects.filter(
+        needs_rollup=True, modified__lte=cutoff
+    ).values_list("corpus_id", flat=True)
+    windows_moved = CorpusEngagementMetrics.objects.filter(
+        last_updated__date__lt=timezone.localdate(), messages_last_30_days__gt=0
+    ).values_list("corpus_id", flat=True)
+    return sorted(set(changed) | set(windows_moved))
 
 
 @shared_task
 def update_corpus_engagement_metrics(corpus_id: int | str):
     """
-    Calculate and update engagement metrics for a specific corpus.
+    Recalculate engagement metrics for a specific corpus from scratch.
 
-    This task aggregates statistics about thread participation, message activity,
-    and voting patterns to populate the CorpusEngagementMetrics model.
+    This is the reconciliation path: it recounts thread participation,
+    message activity, voting and annotation activity from the source tables,
+    repairs the corpus's engagement buckets where they have drifted, and
+    derives CorpusEngagementMetrics from the repaired buckets.
 
     Args:
         corpus_id: The ID of the corpus to update metrics for
 
     Returns:
-        dict: Summary of updated metrics
+        dict: Summary of updated metrics and the number of buckets repaired
 
     Raises:
         Corpus.DoesNotExist: If corpus_id is invalid
@@ -267,91 +498,31 @@ def update_corpus_engagement_metrics(corpus_id: int | str):
             f"Updating engagement metrics for corpus {corpus_id}: {corpus.title}"
         )
 
-        now = timezone.now()
-        seven_days_ago = now - timedelta(days=7)
-        thirty_days_ago = now - timedelta(days=30)
-
-        # Get all threads for this corpus (excluding soft-deleted)
-        threads = Conversation.objects.filter(
-            chat_with_corpus=corpus,
-            conversation_type=ConversationTypeChoices.THREAD,
-            deleted_at__isnull=True,
-        )
-
-        # Calculate thread counts
-        total_threads = threads.count()
-        active_threads = threads.filter(is_locked=False).count()
-
-        # Get all messages in corpus threads (excluding soft-deleted messages and messages in soft-deleted threads)
-        messages = ChatMessage.objects.filter(
-            conversation__chat_with_corpus=corpus,
-            conversation__conversation_type=ConversationTypeChoices.THREAD,
-            deleted_at__isnull=True,
-            conversation__deleted_at__isnull=True,  # Also exclude messages in deleted threads
-        )
-
-        # Calculate message counts
-        total_messages = messages.count()
-        messages_last_7_days = messages.filter(created_at__gte=seven_days_ago).count()
-        messages_last_30_days = messages.filter(created_at__gte=thirty_days_ago).count()
-
-        # Calculate contributor counts
-        unique_contributors = messages.values("creator").distinct().count()
-        active_contributors_30_days = (
-            messages.filter(created_at__gte=thirty_days_ago)
-            .values("creator")
-            .distinct()
-            .count()
-        )
-
-        # Calculate total upvotes
-        total_upvotes = MessageVote.objects.filter(
-            message__conversation__chat_with_corpus=corpus,
-            message__conversation__conversation_type=ConversationTypeChoices.THREAD,
-            vote_type=VoteType.UPVOTE,
-        ).count()
-
-        # Calculate average messages per thread
-        avg_messages_per_thread = (
-            float(total_messages) / float(total_threads) if total_threads > 0 else 0.0
-        )
+        buckets_repaired = _rebuild_engagement_buckets(corpus.id)
+        if buckets_repaired:
+            logger.warning(
+                f"Repaired {buckets_repaired} drifted engagement buckets "
+                f"for corpus {corpus_id}"
+            )
 
-        # Get or create metrics record
-        metrics, created = CorpusEngagementMetrics.objects.get_or_create(corpus=corpus)
-
-        # Update all metrics
-        metrics.total_threads = total_threads
-        metrics.active_threads = active_threads
-        metrics.total_messages = total_messages
-        metrics.messages_last_7_days = messages_last_7_days
-        metrics.messages_last_30_days = messages_last_30_days
-        metrics.unique_contributors = unique_contributors
-        metrics.active_contributors_30_days = active_contributors_30_days
-        metrics.total_upvotes = total_upvotes
-        metrics.avg_messages_per_thread = avg_messages_per_thread
-        metrics.save()
+        metrics = _derive_engagement_metrics([corpus.id])[corpus.id]
+        created = corpus.id in _store_engagement_metrics({corpus.id: metrics})
 
         result = {
             "corpus_id": corpus_id,
             "corpus_title": corpus.title,
             "created": created,
+            "buckets_repaired": buckets_repaired,
             "metrics": {
-                "total_threads": total_threads,
-                "active_threads": active_threads,
-                "total_messages": total_messages,
-                "messages_last_7_days": messages_last_7_days,
-                "messages_last_30_days": messages_last_30_days,
-                "unique_contributors": unique_contributors,
-                "active_contributors_30_days": active_contributors_30_days,
-                "total_upvotes": total_upvotes,
-                "avg_messages_per_thread": round(avg_messages_per_thread, 2),
+                **metrics,
+                "avg_messages_per_thread": round(metrics["avg_messages_per_thread"], 2),
             },
         }
 
         logger.info(
             f"Successfully updated metrics for corpus {corpus_id}: "
-            f"{total_threads} threads, {total_messages} messages, "
-            f"{unique_contributors} contributors"
+            f"{metrics['total_threads']} threads, {metrics['total_messages']} "
+            f"messages, {metrics['unique_contributors']} contributors"
         )
 
         return result
@@ -368,20 +539,51 @@ def update_corpus_engagement_metrics(corpus_id: int | str):
 
 
 @shared_task
-def update_all_corpus_engagement_metrics():
+def update_all_corpus_engagement_metrics(reconcile: bool = False):
     """
-    Update engagement metrics for all corpuses.
+    Bring corpus engagement metrics up to date.
+
+    By default only corpora with new engagement events (or whose rolling
+    windows moved on) are touched, and their metrics are derived from the
+    engagement buckets in batches. Intended to run periodically (schedule it
+    through django-celery-beat).
 
-    This task iterates through all corpuses and queues individual
-    update_corpus_engagement_metrics tasks for each one.
+    With ``reconcile=True`` every corpus is recalculated from scratch by
+    queueing update_corpus_engagement_metrics for each one, which also
+    repairs drifted buckets. Run it occasionally to verify the buckets (the
+    corpuses 0028 migration seeded them from the activity that existed
+    before they were added).
+
+    Args:
+        reconcile: Recalculate all corpora from scratch
 
     Returns:
-        dict: Summary of queued updates
+        dict: Summary of updated or queued corpora
 
     Epic: #565 - Corpus Engagement Metrics & Analytics
     Issue: #567 - Create Celery periodic task for updating engagement metrics
     """
-    logger.info("Starting batch update of all corpus engagement metrics")
+    if not reconcile:
+        cutoff = timezone.now()
+        corpus_ids = _corpora_pending_rollup(cutoff)
+        logger.info(f"Rolling up engagement metrics for {len(corpus_ids)} corpuses")
+
+        for start in range(0, len(corpus_ids), ENGAGEMENT_ROLLUP_BATCH_SIZE):
+            batch = corpus_ids[start : start + ENGAGEMENT_ROLLUP_BATCH_SIZE]
+            with transaction.atomic():
+                _store_engagement_metrics(_derive_engagement_metrics(batch))
+                # Changes after the cutoff stay flagged for the next run.
+                CorpusEngagementBucket.objects.filter(
+                    corpus_id__in=batch, needs_rollup=True, modified__lte=cutoff
+                ).update(needs_rollup=False)
+
+        return {
+            "reconcile": False,
+            "updated": len(corpus_ids),
+            "corpus_ids": corpus_ids,
+        }
+
+    logger.info("Starting batch reconciliation of all corpus engagement metrics")
 
     # Get all corpus IDs
     corpus_ids = list(Corpus.objects.values_list("id", flat=True))
@@ -397,6 +599,7 @@ def update_all_corpus_engagement_metrics():
         )
 
     return {
+        "reconcile": True,
         "queued_updates": len(corpus_ids),
         "corpus_ids": corpus_ids,
     }
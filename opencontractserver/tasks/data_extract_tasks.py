@@ -2,10 +2,17 @@
 import json
 import logging
 import os
+from typing import Optional
 
 from asgiref.sync import sync_to_async
 
 from opencontractserver.extracts.models import Datacell
+from opencontractserver.extracts.result_cache import (
+    cached_result_log,
+    extract_document_hash,
+    get_cached_result,
+    store_result,
+)
 from opencontractserver.shared.decorators import celery_task_with_async_to_sync
 
 logger = logging.getLogger(__name__)
@@ -77,6 +84,113 @@ def get_column_extraction_params(datacell):
     )
 
 
+DOC_EXTRACT_QUERY_TASK_NAME = (
+    "opencontractserver.tasks.data_extract_tasks.doc_extract_query_task"
+)
+
+
+def get_extraction_model(fieldset) -> str:
+    """
+    Get the LLM to use for a fieldset's extraction.
+
+    Args:
+        fieldset: The Fieldset being extracted (may be None).
+
+    Returns:
+        str: The fieldset's extraction_model, or settings.EXTRACT_DEFAULT_MODEL.
+    """
+    from django.conf import settings
+
+    if fieldset is not None and fieldset.extraction_model:
+        return fieldset.extraction_model
+    return settings.EXTRACT_DEFAULT_MODEL
+
+
+def build_column_output_type(column):
+    """
+    Parse a column's output_type, wrapping it in a list for list columns.
+
+    Args:
+        column: The Column to build the target type for.
+
+    Returns:
+        The Python type (primitive or Pydantic model) to extract.
+    """
+    from typing import get_origin
+
+    from opencontractserver.utils.etl import parse_model_or_primitive
+
+    output_type = parse_model_or_primitive(column.output_type)
+
+    # Handle list types
+    if column.extract_is_list:
+        # If it's not already a List type, wrap it
+        if get_origin(output_type) is not list:
+            output_type = list[output_type]
+
+    return output_type
+
+
+def build_column_prompt(column) -> str:
+    """
+    Build the extraction prompt for a column from its query / match_text.
+
+    Args:
+        column: The Column to build the prompt for.
+
+    Returns:
+        str: The prompt, including any few-shot examples from match_text.
+    """
+    prompt = column.query if column.query else column.match_text
+    if not prompt:
+        raise ValueError("Column must have either query or match_text!")
+
+    # Handle special match_text with ||| separator (few-shot examples)
+    if column.match_text and "|||" in column.match_text:
+        examples = [ex.strip() for ex in column.match_text.split("|||") if ex.strip()]
+        if examples:
+            prompt += "Here are example values to guide your extraction:\n" + "\n".join(
+                f"- {ex}" for ex in examples
+            )
+            logger.info(f"Added {len(examples)} few-shot examples from match_text")
+
+    return prompt
+
+
+def serialize_extraction_result(result) -> dict:
+    """
+    Convert an extraction result into the datacell data payload.
+
+    Args:
+        result: The extracted value (primitive, Pydantic model or list thereof).
+
+    Returns:
+        dict: ``{"data": ...}`` with Pydantic models dumped to dicts.
+    """
+    from pydantic import BaseModel
+
+    if isinstance(result, BaseModel):
+        return {"data": result.model_dump()}
+    if isinstance(result, list) and result and isinstance(result[0], BaseModel):
+        return {"data": [item.model_dump() for item in result]}
+    return {"data": result}
+
+
+@sync_to_async
+def get_document_corpus_id(document):
+    """
+    Get the ID of a corpus containing the document, if any.
+
+    Args:
+        document: The document to look up.
+
+    Returns:
+        int | None: A corpus ID, or None if the document isn't in a corpus.
+    """
+    corpus = document.corpus_set.only("id").first()
+    return corpus.id if corpus else None
+
+
 @celery_task_with_async_to_sync()
 async def doc_extract_query_task(
     cell_id: int, similarity_top_k: int = 10, max_token_length: int = 64000
@@ -87,16 +201,13 @@ async def doc_extract_query_task(
     No more marvin. No more flakiness. Just pure extraction power! 🚀
     """
     import traceback
-    from typing import get_origin
 
     from django.utils import timezone
-    from pydantic import BaseModel
     from pydantic_ai import capture_run_messages
     from pydantic_ai.messages import ModelMessagesTypeAdapter
 
     from opencontractserver.llms import agents
     from opencontractserver.llms.types import AgentFramework
-    from opencontractserver.utils.etl import parse_model_or_primitive
 
     logger = logging.getLogger(__name__)
 
@@ -107,7 +218,7 @@ async def doc_extract_query_task(
     def sync_get_datacell(pk: int):
         """Get datacell with all related objects."""
         return Datacell.objects.select_related(
-            "extract", "column", "document", "creator"
+            "extract__fieldset", "column", "document", "creator"
         ).get(pk=pk)
 
     @sync_to_async
@@ -134,14 +245,6 @@ async def doc_extract_query_task(
             dc.llm_call_log = llm_log
         dc.save()
 
-    @sync_to_async
-    def sync_get_corpus_id(document):
-        """Get corpus ID for document."""
-        corpus_set = document.corpus_set.all()
-        if corpus_set.exists():
-            return corpus_set.first().id
-        return None
-
     @sync_to_async
     def sync_add_sources(datacell, sources):
         """Add source annotations to datacell."""
@@ -171,22 +274,28 @@ async def doc_extract_query_task(
         logger.info(f"Document: {document.id}, Column: {column.name}")
 
         # Get corpus ID (None if document isn't in a corpus - that's OK now!)
-        corpus_id = await sync_get_corpus_id(document)
+        corpus_id = await get_document_corpus_id(document)
         logger.info(f"Corpus ID: {corpus_id}")
 
         # 2. Parse the output type
-        output_type = parse_model_or_primitive(column.output_type)
+        output_type = build_column_output_type(column)
 
-        # Handle list types
-        if column.extract_is_list:
-            # If it's not already a List type, wrap it
-            if get_origin(output_type) is not list:
-                output_type = list[output_type]
+        # 3. Build the prompt (including few-shot examples from match_text)
+        prompt = build_column_prompt(column)
+        model = get_extraction_model(getattr(datacell.extract, "fieldset", None))
 
-        # 3. Build the prompt
-        prompt = column.query if column.query else column.match_text
-        if not prompt:
-            raise ValueError("Column must have either query or match_text!")
+        # Reuse an earlier result for the same content, column and model,
+        # produced in this corpus by this user
+        document_hash = await sync_to_async(extract_document_hash)(
+            datacell.extract_id, document
+        )
+        cached = await sync_to_async(get_cached_result)(
+            document_hash, column, model, corpus_id, datacell.creator_id
+        )
+        if cached is not None:
+            await sync_mark_completed(datacell, cached.data, cached_result_log(cached))
+            logger.info(f"✓ Reused cached result for cell {cell_id}")
+            return
 
         # 4. Build system prompt with constraints
         # system_prompt_parts = [
@@ -221,18 +330,6 @@ async def doc_extract_query_task(
         #     )
         #     logger.info(f"Added instructions: {column.instructions[:100]}...")
 
-        # Handle special match_text with ||| separator (few-shot examples)
-        if column.match_text and "|||" in column.match_text:
-            examples = [
-                ex.strip() for ex in column.match_text.split("|||") if ex.strip()
-            ]
-            if examples:
-                prompt += (
-                    "Here are example values to guide your extraction:\n"
-                    + "\n".join(f"- {ex}" for ex in examples)
-                )
-                logger.info(f"Added {len(examples)} few-shot examples from match_text")
-
         # extra_context = (
         #     "\n\n".join(extra_context_parts) if extra_context_parts else None
         # )
@@ -251,6 +348,7 @@ async def doc_extract_query_task(
         logger.info(f"  - Output type: {output_type}")
         logger.info(f"  - Is list: {column.extract_is_list}")
         logger.info(f"  - Corpus ID: {corpus_id}")
+        logger.info(f"  - Model: {model}")
 
         # Capture LLM messages for debugging
         llm_log = None
@@ -267,7 +365,7 @@ async def doc_extract_query_task(
                     framework=AgentFramework.PYDANTIC_AI,
                     temperature=0.3,  # Low temperature for consistent extraction
                     similarity_top_k=similarity_top_k,
-                    model="gpt-4o-mini",  # Fast and reliable
+                    model=model,
                     user_id=datacell.creator.id,
                 )
 
@@ -293,19 +391,12 @@ async def doc_extract_query_task(
 
         if result is not None:
             # Convert result to saveable format
-            if isinstance(result, BaseModel):
-                data = {"data": result.model_dump()}
-                logger.info(f"Converted BaseModel to dict: {data}")
-            elif (
-                isinstance(result, list) and result and isinstance(result[0], BaseModel)
-            ):
-                data = {"data": [item.model_dump() for item in result]}
-                logger.info(f"Converted list of BaseModels to dict: {data}")
-            else:
-                data = {"data": result}
-                logger.info(f"Using raw result as data: {data}")
+            data = serialize_extraction_result(result)
 
             await sync_mark_completed(datacell, data, llm_log)
+            await sync_to_async(store_result)(
+                document_hash, column, model, corpus_id, datacell.creator_id, data
+            )
             logger.info(f"✓ Successfully extracted and saved data for cell {cell_id}")
             logger.info(f"  Final saved data: {data}")
             logger.info(f"  LLM log saved: {len(llm_log) if llm_log else 0} characters")
@@ -340,6 +431,197 @@ async def doc_extract_query_task(
         raise
 
 
+BATCH_EXTRACTION_PROMPT = (
+    "Extract each of the following fields from this document. Use the available "
+    "tools to find the information; each field's description says what to look "
+    "for. Return null for any field whose information is not present rather than "
+    "guessing.\n\n{fields}"
+)
+
+
+@celery_task_with_async_to_sync()
+async def doc_extract_batch_task(
+    cell_ids: list[int], similarity_top_k: int = 10
+) -> None:
+    """
+    Extract several datacells of ONE document together.
+
+    Used for fieldsets with ``batch_extraction`` enabled. Instead of one agent
+    run per datacell, a single document agent is created and the columns are
+    requested as fields of one structured output (in chunks of at most
+    settings.EXTRACT_BATCH_MAX_COLUMNS), so the agent's retrieval is shared
+    across them. Each datacell is completed or failed individually.
+    """
+    import traceback
+
+    from django.conf import settings
+    from django.utils import timezone
+    from pydantic import Field, create_model
+    from pydantic_ai import capture_run_messages
+    from pydantic_ai.messages import ModelMessagesTypeAdapter
+
+    from opencontractserver.llms import agents
+    from opencontractserver.llms.types import AgentFramework
+
+    @sync_to_async
+    def sync_get_datacells(pks: list[int]) -> list[Datacell]:
+        return list(
+            Datacell.objects.select_related(
+                "extract__fieldset", "column", "document", "creator"
+            )
+            .filter(pk__in=pks)
+            .order_by("column_id", "pk")
+        )
+
+    @sync_to_async
+    def sync_mark_started(pks: list[int]) -> None:
+        Datacell.objects.filter(pk__in=pks).update(started=timezone.now())
+
+    @sync_to_async
+    def sync_mark_completed(dc, data_dict, llm_log=None):
+        dc.data = data_dict
+        dc.completed = timezone.now()
+        if llm_log:
+            dc.llm_call_log = llm_log
+        dc.save()
+
+    @sync_to_async
+    def sync_mark_failed(dc, exc, tb, llm_log=None):
+        dc.stacktrace = f"Error: {exc}\n\nTraceback:\n{tb}"
+        dc.failed = timezone.now()
+        if llm_log:
+            dc.llm_call_log = llm_log
+        dc.save()
+
+    datacells = await sync_get_datacells(cell_ids)
+    if not datacells:
+        logger.warning(f"doc_extract_batch_task: no datacells found for {cell_ids}")
+        return
+
+    document_ids = {dc.document_id for dc in datacells}
+    if len(document_ids) != 1:
+        raise ValueError(
+            f"doc_extract_batch_task expects datacells of one document, got {document_ids}"
+        )
+
+    await sync_mark_started([dc.pk for dc in datacells])
+
+    first = datacells[0]
+    document = first.document
+    model = get_extraction_model(getattr(first.extract, "fieldset", None))
+    logger.info(
+        f"doc_extract_batch_task: {len(datacells)} cells for document {document.id} "
+        f"using model {model}"
+    )
+
+    corpus_id = await get_document_corpus_id(document)
+    document_hash = await sync_to_async(extract_document_hash)(
+        first.extract_id, document
+    )
+
+    # Prepare one output field per datacell not answered from the result cache;
+    # a column that can't be prepared fails on its own.
+    fields: list[tuple[Datacell, str, object, str]] = []
+    for dc in datacells:
+        cached = await sync_to_async(get_cached_result)(
+            document_hash, dc.column, model, corpus_id, dc.creator_id
+        )
+        if cached is not None:
+            await sync_mark_completed(dc, cached.data, cached_result_log(cached))
+            continue
+        try:
+            fields.append(
+                (
+                    dc,
+                    f"column_{dc.column_id}",
+                    build_column_output_type(dc.column),
+                    build_column_prompt(dc.column),
+                )
+            )
+        except Exception as e:
+            await sync_mark_failed(dc, e, traceback.format_exc())
+
+    if not fields:
+        return
+
+    try:
+        agent = await agents.for_document(
+            document=document.id,
+            corpus=corpus_id,
+            framework=AgentFramework.PYDANTIC_AI,
+            user_id=first.creator_id,
+            model=model,
+            temperature=0.3,  # Low temperature for consistent extraction
+            streaming=False,
+            persist=False,
+            similarity_top_k=similarity_top_k,
+        )
+    except Exception as e:
+        tb = traceback.format_exc()
+        logger.exception(f"Could not create extraction agent for {document.id}: {e}")
+        for dc, *_ in fields:
+            await sync_mark_failed(dc, e, tb)
+        return
+
+    chunk_size = max(1, settings.EXTRACT_BATCH_MAX_COLUMNS)
+    for start in range(0, len(fields), chunk_size):
+        chunk = fields[start : start + chunk_size]
+
+        target_type = create_model(
+            f"Document{document.id}Extraction",
+            **{
+                name: (Optional[output_type], Field(default=None, description=prompt))
+                for _, name, output_type, prompt in chunk
+            },
+        )
+        prompt = BATCH_EXTRACTION_PROMPT.format(
+            fields="\n".join(f"- {name}: {prompt}" for _, name, _, prompt in chunk)
+        )
+
+        llm_log = None
+        try:
+            with capture_run_messages() as messages:
+                result = await agent.structured_response(
+                    prompt=prompt,
+                    target_type=target_type,
+                    model=model,
+                    temperature=0.3,
+                )
+            llm_log = ModelMessagesTypeAdapter.dump_json(messages, indent=2).decode()
+        except Exception as e:
+            tb = traceback.format_exc()
+            if "messages" in locals():
+                llm_log = ModelMessagesTypeAdapter.dump_json(
+                    messages, indent=2
+                ).decode()
+            logger.exception(f"Batch extraction failed for document {document.id}")
+            for dc, *_ in chunk:
+                await sync_mark_failed(dc, e, tb, llm_log)
+            continue
+
+        for dc, name, _, _ in chunk:
+            value = getattr(result, name, None) if result is not None else None
+            if value is None:
+                await sync_mark_failed(
+                    dc,
+                    "Failed to extract requested data from document",
+                    "The extraction returned None - the requested information may "
+                    "not be present in the document.",
+                    llm_log,
+                )
+            else:
+                data = serialize_extraction_result(value)
+                await sync_mark_completed(dc, data, llm_log)
+                await sync_to_async(store_result)(
+                    document_hash, dc.column, model, corpus_id, dc.creator_id, data
+                )
+
+        logger.info(
+            f"doc_extract_batch_task: extracted {len(chunk)} columns for document "
+            f"{document.id} in one structured call"
+        )
+
+
 def text_search(document_id: int, query_str: str) -> str:
     """
     Performs case-insensitive substring search in structural annotations.
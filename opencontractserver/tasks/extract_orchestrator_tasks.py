@@ -7,6 +7,10 @@ from django.utils import timezone
 
 from opencontractserver.documents.models import DocumentAnalysisRow
 from opencontractserver.extracts.models import Datacell, Extract
+from opencontractserver.tasks.data_extract_tasks import (
+    DOC_EXTRACT_QUERY_TASK_NAME,
+    doc_extract_batch_task,
+)
 from opencontractserver.types.enums import PermissionTypes
 from opencontractserver.utils.celery_tasks import get_task_by_name
 from opencontractserver.utils.permissioning import set_permissions_for_obj_to_user
@@ -45,6 +49,11 @@ def run_extract(extract_id: Optional[str | int], user_id: str | int):
     document_ids = extract.documents.all().values_list("id", flat=True)
     logger.info(f"Found {len(document_ids)} documents to process: {list(document_ids)}")
 
+    # With batch_extraction on, a document's default-extractor columns are run
+    # together by one doc_extract_batch_task instead of one task per cell.
+    batch_extraction = fieldset.batch_extraction
+    columns = list(fieldset.columns.all())
+
     tasks = []
     logger.info(f"Beginning document processing loop for extract {extract.id}")
 
@@ -56,7 +65,9 @@ def run_extract(extract_id: Optional[str | int], user_id: str | int):
         )
         row_results.save()
 
-        for column in fieldset.columns.all():
+        batch_cell_ids = []
+
+        for column in columns:
 
             with transaction.atomic():
                 cell = Datacell.objects.create(
@@ -84,9 +95,19 @@ def run_extract(extract_id: Optional[str | int], user_id: str | int):
                     f"  Created datacell {cell.pk} for column '{column.name}' with task '{column.task_name}'"
                 )
 
+                if batch_extraction and column.task_name == DOC_EXTRACT_QUERY_TASK_NAME:
+                    batch_cell_ids.append(cell.pk)
+                    continue
+
                 # Add the task to the group
                 tasks.append(task_func.si(cell.pk))
 
+        if batch_cell_ids:
+            logger.info(
+                f"  Batching {len(batch_cell_ids)} datacells for document {document_id}"
+            )
+            tasks.append(doc_extract_batch_task.si(batch_cell_ids))
+
     # Execute the tasks
     if tasks:
         # Check if we're in eager mode (test/synchronous execution)
@@ -2,15 +2,26 @@ import logging
 from pathlib import Path
 from typing import Optional
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.db import transaction
+from django.utils import timezone
 
 from config import celery_app
-from opencontractserver.annotations.models import Annotation, AnnotationLabel, LabelSet
+from opencontractserver.annotations.models import (
+    Annotation,
+    AnnotationLabel,
+    Embedding,
+    LabelSet,
+)
 from opencontractserver.corpuses.models import Corpus
 from opencontractserver.documents.models import Document
+from opencontractserver.tasks.embeddings_task import (
+    calculate_embedding_for_annotation_text,
+    calculate_embedding_for_doc_text,
+)
 from opencontractserver.types.enums import PermissionTypes
 from opencontractserver.utils.permissioning import set_permissions_for_obj_to_user
 
@@ -20,6 +31,74 @@ logger.setLevel(logging.DEBUG)
 
 User = get_user_model()
 
+FORK_EMBEDDING_BATCH_SIZE = 1000
+
+EMBEDDING_VECTOR_FIELDS = ("vector_384", "vector_768", "vector_1536", "vector_3072")
+
+
+def copy_embeddings(parent_field: str, id_map: dict[int, int], user_id: int) -> int:
+    """
+    Bulk copy the Embedding rows of the source objects in ``id_map`` (old id ->
+    new id) to their copies. ``parent_field`` is the Embedding foreign key the
+    ids refer to, "document" or "annotation". Returns the number of rows copied.
+    """
+    parent_id_field = f"{parent_field}_id"
+    old_ids = list(id_map)
+    copied = 0
+    for start in range(0, len(old_ids), FORK_EMBEDDING_BATCH_SIZE):
+        batch_ids = old_ids[start : start + FORK_EMBEDDING_BATCH_SIZE]
+        copies = [
+            Embedding(
+                **{parent_id_field: id_map[embedding[parent_id_field]]},
+                embedder_path=embedding["embedder_path"],
+                creator_id=user_id,
+                **{field: embedding[field] for field in EMBEDDING_VECTOR_FIELDS},
+            )
+            for embedding in Embedding.objects.filter(
+                **{f"{parent_id_field}__in": batch_ids}
+            ).values(parent_id_field, "embedder_path", *EMBEDDING_VECTOR_FIELDS)
+        ]
+        Embedding.objects.bulk_create(copies, batch_size=FORK_EMBEDDING_BATCH_SIZE)
+        copied += len(copies)
+    return copied
+
+
+def queue_missing_fork_embeddings(corpus, doc_ids, annotation_ids) -> None:
+    """
+    Queue embedding tasks for forked documents and annotations whose source had
+    no embedding for the forked corpus' embedder, so the fork ends up no less
+    complete than a fresh import would be.
+    """
+    embedder_path = corpus.preferred_embedder or getattr(
+        settings, "DEFAULT_EMBEDDER", None
+    )
+    if not embedder_path:
+        return
+
+    missing_docs = (
+        Document.objects.filter(pk__in=list(doc_ids))
+        .exclude(embedding_set__embedder_path=embedder_path)
+        .values_list("id", flat=True)
+    )
+    for doc_id in missing_docs:
+        transaction.on_commit(
+            lambda doc_id=doc_id: calculate_embedding_for_doc_text.delay(
+                doc_id=doc_id, corpus_id=corpus.id
+            )
+        )
+
+    missing_annotations = (
+        Annotation.objects.filter(pk__in=list(annotation_ids))
+        .exclude(embedding_set__embedder_path=embedder_path)
+        .values_list("id", flat=True)
+    )
+    for annotation_id in missing_annotations:
+        transaction.on_commit(
+            lambda annotation_id=annotation_id: calculate_embedding_for_annotation_text.delay(
+                annotation_id=annotation_id, embedder_path=embedder_path
+            )
+        )
+
 
 @celery_app.task()
 def fork_corpus(
@@ -116,57 +195,37 @@ def fork_corpus(
                 )
                 raise e
 
-            # logger.info("Cloning documents")
+            # Fork the documents as corpus-isolated copies of the originals. The
+            # copies share file blobs and the structural annotation set with their
+            # source, and are already parsed, so no ingest chain is queued for them.
+            # Create-signal embedding is suppressed; embeddings are copied below.
+            corpus._skip_embedding = True
+            user = User.objects.get(pk=user_id)
+            added_doc_map = {}
+            docs_with_structural_set = set()
             for document in Document.objects.filter(pk__in=doc_ids):
 
                 try:
                     logger.info(f"Clone document: {document}")
-                    old_id = document.pk
-
-                    # First start by copying the document (the procedure below
-                    # is a trick to get ORM to copy the Django database obj). Resetting
-                    # pk to None will, on save, save a NEW object with old obj properties,
-                    # except as modified
-                    document.pk = None
-                    document.title = f"[FORK] {document.title}"
-                    document.creator_id = user_id
-                    document.backend_lock = True  # Lock doc while we process stuff
-                    document.save()
-
-                    # If there's a text extract file... copy it to a new file
-                    if document.txt_extract_file:
-                        file_object = default_storage.open(
-                            document.txt_extract_file.name
-                        )
-                        txt_file = ContentFile(file_object.read())
-                        document.txt_extract_file.save(f"{document.id}.txt", txt_file)
-                        document.save()
-                        logger.info("Clone txt layer")
-
-                    # If there's a pawls file... copy it to new file
-                    if document.pawls_parse_file:
-                        file_object = default_storage.open(
-                            document.pawls_parse_file.name
-                        )
-                        pawls_file = ContentFile(file_object.read())
-                        document.pawls_parse_file.save(
-                            f"doc_{document.id}.pawls", pawls_file
-                        )
-                        document.save()
-                        logger.info("Cloned pawls file")
-
-                    # Unlock the document.
-                    document.backend_lock = False
-                    document.save()
-
-                    set_permissions_for_obj_to_user(
-                        user_id, document, [PermissionTypes.CRUD]
+                    forked_document, status, _ = corpus.add_document(
+                        document=document,
+                        user=user,
+                        title=f"[FORK] {document.title}",
+                        processing_started=document.processing_started
+                        or timezone.now(),
                     )
 
-                    corpus.add_document(document=document, user=user_id)
-
                     # Store map of old id to new id
-                    doc_map[old_id] = document.pk
+                    doc_map[document.pk] = forked_document.pk
+
+                    # Documents with the same content share one copy in the fork
+                    if status == "added":
+                        set_permissions_for_obj_to_user(
+                            user_id, forked_document, [PermissionTypes.CRUD]
+                        )
+                        added_doc_map[document.pk] = forked_document.pk
+                    if document.structural_annotation_set_id:
+                        docs_with_structural_set.add(document.pk)
 
                 except Exception as e:
                     logger.error(f"ERROR - could not fork document {document}: {e}")
@@ -179,30 +238,66 @@ def fork_corpus(
             logger.info(f"Label map: {label_map}")
 
             # Fetch annotations and map to new docs, labels and corpus
+            annotation_map = {}
+            parent_map = {}
             for annotation in Annotation.objects.filter(pk__in=annotation_ids):
 
+                # Structural annotations are shared through the structural annotation
+                # set the forked document points to, so they are not copied.
+                if annotation.document_id is None or (
+                    annotation.structural
+                    and annotation.document_id in docs_with_structural_set
+                ):
+                    continue
+
                 try:
                     logger.info(f"Clone annotation: {annotation}")
+                    old_id = annotation.pk
 
                     # Copy the annotation, update label and doc object references using our
                     # object maps of old objs to new objs
                     annotation.pk = None
                     annotation.creator_id = user_id
                     annotation.corpus_id = new_corpus_id
-                    annotation.document_id = doc_map[annotation.document.id]
+                    annotation.document_id = doc_map[annotation.document_id]
                     annotation.annotation_label_id = label_map[
-                        annotation.annotation_label.id
+                        annotation.annotation_label_id
                     ]
+                    annotation._skip_embedding = True
                     annotation.save()
 
                     set_permissions_for_obj_to_user(
                         user_id, annotation, [PermissionTypes.CRUD]
                     )
 
+                    annotation_map[old_id] = annotation.pk
+                    if annotation.parent_id:
+                        parent_map[annotation.pk] = annotation.parent_id
+
                 except Exception as e:
                     logger.error(f"ERROR - could not fork annotation {annotation}: {e}")
                     raise e
 
+            # Point forked children at their forked parents
+            Annotation.objects.bulk_update(
+                [
+                    Annotation(pk=new_id, parent_id=annotation_map[old_parent_id])
+                    for new_id, old_parent_id in parent_map.items()
+                    if old_parent_id in annotation_map
+                ],
+                ["parent"],
+                batch_size=FORK_EMBEDDING_BATCH_SIZE,
+            )
+
+            # The text is byte-identical, so reuse the source's vectors instead of
+            # running every forked document and annotation through the embedder.
+            copied = copy_embeddings("document", added_doc_map, user_id)
+            copied += copy_embeddings("annotation", annotation_map, user_id)
+            logger.info(f"Copied {copied} embeddings into forked corpus")
+            queue_missing_fork_embeddings(
+                corpus, added_doc_map.values(), annotation_map.values()
+            )
+
             logger.info("Annotations completed...")
 
             # Unlock the corpus
@@ -0,0 +1,368 @@
+"""
+Celery tasks that materialize leaderboards and community statistics.
+
+The leaderboard and communityStats GraphQL queries read LeaderboardSnapshot
+and CommunityStatsSnapshot rows instead of aggregating activity on every
+request. A snapshot that does not exist (anymore) is computed on first read,
+and reading one older than LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS queues its
+refresh. refresh_community_snapshots can also run periodically to recompute
+the global snapshots and those of corpora read within
+LEADERBOARD_SNAPSHOT_RETENTION_DAYS, and delete the other corpus snapshots.
+
+Each snapshot is replaced by a single upsert, so readers keep seeing the
+previous snapshot while a refresh runs and never wait on it.
+
+Issue: #613 - Create leaderboard and community stats dashboard
+Epic: #572 - Social Features Epic
+"""
+
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from opencontractserver.annotations.models import Annotation
+from opencontractserver.badges.models import (
+    CommunityStatsSnapshot,
+    LeaderboardSnapshot,
+    UserBadge,
+)
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    MessageTypeChoices,
+    UserReputation,
+)
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+LEADERBOARD_METRICS = ("badges", "messages", "threads", "annotations", "reputation")
+LEADERBOARD_SCOPES = ("all_time", "monthly", "weekly")
+SCOPE_DAYS = {"weekly": 7, "monthly": 30}
+BADGE_DISTRIBUTION_SIZE = 10
+
+SNAPSHOT_REFRESH_LOCK_KEY = "leaderboard-snapshot-refresh:{model}:{key}"
+SNAPSHOT_REFRESH_LOCK_SECONDS = 300
+
+
+def _activity(corpus_id: Optional[int]):
+    """
+    Messages, threads and annotations counted in a snapshot. Snapshots are
+    shown to every viewer, so only public activity is counted: public
+    conversations globally, and the public discussion threads of a corpus.
+    """
+    threads = Conversation.objects.visible_to_user(AnonymousUser())
+    annotations = Annotation.objects.visible_to_user(AnonymousUser())
+    if corpus_id is not None:
+        # Private chats with the corpus belong to their participants
+        threads = threads.filter(
+            chat_with_corpus_id=corpus_id, conversation_type="thread"
+        )
+        annotations = annotations.filter(document__corpus__id=corpus_id)
+    messages = ChatMessage.objects.filter(conversation__in=threads)
+
+    return (
+        messages.filter(msg_type=MessageTypeChoices.HUMAN),
+        threads.filter(conversation_type="thread"),
+        annotations,
+    )
+
+
+def _badges(corpus_id: Optional[int]):
+    badges = UserBadge.objects.all()
+    if corpus_id is not None:
+        badges = badges.filter(Q(corpus_id=corpus_id) | Q(corpus__isnull=True))
+    return badges
+
+
+def _top_counts(queryset, user_field: str, limit: int) -> list[list[int]]:
+    """[user id, count] pairs for the users with the highest counts."""
+    rows = (
+        queryset.values(user_field)
+        .annotate(count=Count("id"))
+        .order_by("-count", user_field)[:limit]
+    )
+    return [[row[user_field], row["count"]] for row in rows]
+
+
+def compute_leaderboard(
+    metric: str, scope: str, corpus_id: Optional[int] = None
+) -> list[list[int]]:
+    """
+    Rank users with public profiles by a metric.
+
+    Returns:
+        list: Up to LEADERBOARD_SNAPSHOT_SIZE [user id, score] pairs in rank order
+    """
+    limit = settings.LEADERBOARD_SNAPSHOT_SIZE
+    users = User.objects.visible_to_user(AnonymousUser())
+    cutoff = None
+    if scope in SCOPE_DAYS:
+        cutoff = timezone.now() - timedelta(days=SCOPE_DAYS[scope])
+
+    if metric == "reputation":
+        # Reputation is a running total, so it has no time window.
+        reputations = UserReputation.objects.filter(user__in=users, corpus_id=corpus_id)
+        return [
+            list(row)
+            for row in reputations.order_by("-reputation_score", "user_id").values_list(
+                "user_id", "reputation_score"
+            )[:limit]
+        ]
+
+    if metric == "badges":
+        badges = _badges(corpus_id).filter(user__in=users)
+        if cutoff:
+            badges = badges.filter(awarded_at__gte=cutoff)
+        return _top_counts(badges, "user", limit)
+
+    messages, threads, annotations = _activity(corpus_id)
+    activity = {"messages": messages, "threads": threads, "annotations": annotations}
+    if metric not in activity:
+        raise ValueError(f"Unknown leaderboard metric: {metric}")
+
+    queryset = activity[metric].filter(creator__in=users)
+    if cutoff:
+        queryset = queryset.filter(created__gte=cutoff)
+    return _top_counts(queryset, "creator", limit)
+
+
+def compute_community_stats(corpus_id: Optional[int] = None) -> dict:
+    """Totals, recent activity and the most awarded badges."""
+    now = timezone.now()
+    week_ago = now - timedelta(days=SCOPE_DAYS["weekly"])
+    month_ago = now - timedelta(days=SCOPE_DAYS["monthly"])
+    messages, threads, annotations = _activity(corpus_id)
+    badges = _badges(corpus_id)
+
+    message_stats = messages.aggregate(
+        total=Count("id"),
+        this_week=Count("id", filter=Q(created__gte=week_ago)),
+        this_month=Count("id", filter=Q(created__gte=month_ago)),
+        active_users_week=Count(
+            "creator", filter=Q(created__gte=week_ago), distinct=True
+        ),
+        active_users_month=Count(
+            "creator", filter=Q(created__gte=month_ago), distinct=True
+        ),
+    )
+    distribution = (
+        badges.values("badge")
+        .annotate(
+            award_count=Count("id"), unique_recipients=Count("user", distinct=True)
+        )
+        .order_by("-award_count", "badge")[:BADGE_DISTRIBUTION_SIZE]
+    )
+
+    return {
+        "total_users": User.objects.visible_to_user(AnonymousUser()).count(),
+        "total_messages": message_stats["total"],
+        "total_threads": threads.count(),
+        "total_annotations": annotations.count(),
+        "total_badges_awarded": badges.count(),
+        "messages_this_week": message_stats["this_week"],
+        "messages_this_month": message_stats["this_month"],
+        "active_users_this_week": message_stats["active_users_week"],
+        "active_users_this_month": message_stats["active_users_month"],
+        "badge_distribution": [
+            [row["badge"], row["award_count"], row["unique_recipients"]]
+            for row in distribution
+        ],
+    }
+
+
+def refresh_leaderboard_snapshot(
+    metric: str, scope: str, corpus_id: Optional[int] = None
+) -> LeaderboardSnapshot:
+    """Recompute one leaderboard and store it, replacing the previous snapshot."""
+    snapshot = LeaderboardSnapshot(
+        key=LeaderboardSnapshot.snapshot_key(metric, scope, corpus_id),
+        metric=metric,
+        scope=scope,
+        corpus_id=corpus_id,
+        entries=compute_leaderboard(metric, scope, corpus_id),
+        computed_at=timezone.now(),
+    )
+    LeaderboardSnapshot.objects.bulk_create(
+        [snapshot],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["entries", "computed_at"],
+    )
+    return snapshot
+
+
+def refresh_community_stats_snapshot(
+    corpus_id: Optional[int] = None,
+) -> CommunityStatsSnapshot:
+    """Recompute community statistics and store them, replacing the previous snapshot."""
+    snapshot = CommunityStatsSnapshot(
+        key=CommunityStatsSnapshot.snapshot_key(corpus_id),
+        corpus_id=corpus_id,
+        stats=compute_community_stats(corpus_id),
+        computed_at=timezone.now(),
+    )
+    CommunityStatsSnapshot.objects.bulk_create(
+        [snapshot],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["stats", "computed_at"],
+    )
+    return snapshot
+
+
+def _mark_requested(snapshot) -> None:
+    """
+    Record that a snapshot was read. To keep reads free of writes, this is
+    only written once per LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS.
+    """
+    now = timezone.now()
+    interval = timedelta(seconds=settings.LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS)
+    if now - snapshot.last_requested_at > interval:
+        type(snapshot).objects.filter(pk=snapshot.pk).update(last_requested_at=now)
+        snapshot.last_requested_at = now
+
+
+def _refresh_lock_key(snapshot) -> str:
+    return SNAPSHOT_REFRESH_LOCK_KEY.format(
+        model=snapshot._meta.model_name, key=snapshot.key
+    )
+
+
+def _schedule_refresh(snapshot, task, *args) -> None:
+    """
+    Queue a refresh of a stale snapshot once the current transaction commits,
+    unless one is already pending. The reader is served the stale snapshot.
+    """
+    lock_key = _refresh_lock_key(snapshot)
+
+    def _enqueue():
+        if not cache.add(lock_key, True, SNAPSHOT_REFRESH_LOCK_SECONDS):
+            return
+        try:
+            task.delay(*args)
+        except Exception as e:
+            cache.delete(lock_key)
+            logger.error(f"Failed to queue refresh of {snapshot}: {e}")
+
+    transaction.on_commit(_enqueue)
+
+
+def get_leaderboard_snapshot(
+    metric: str, scope: str, corpus_id: Optional[int] = None
+) -> LeaderboardSnapshot:
+    """The stored leaderboard; computed now if missing, refreshed if stale."""
+    snapshot = LeaderboardSnapshot.objects.filter(
+        key=LeaderboardSnapshot.snapshot_key(metric, scope, corpus_id)
+    ).first()
+    if snapshot is None:
+        return refresh_leaderboard_snapshot(metric, scope, corpus_id)
+    _mark_requested(snapshot)
+    if is_snapshot_stale(snapshot.computed_at):
+        _schedule_refresh(snapshot, refresh_leaderboard, metric, scope, corpus_id)
+    return snapshot
+
+
+def get_community_stats_snapshot(
+    corpus_id: Optional[int] = None,
+) -> CommunityStatsSnapshot:
+    """The stored community statistics; computed now if missing, refreshed if stale."""
+    snapshot = CommunityStatsSnapshot.objects.filter(
+        key=CommunityStatsSnapshot.snapshot_key(corpus_id)
+    ).first()
+    if snapshot is None:
+        return refresh_community_stats_snapshot(corpus_id)
+    _mark_requested(snapshot)
+    if is_snapshot_stale(snapshot.computed_at):
+        _schedule_refresh(snapshot, refresh_community_stats, corpus_id)
+    return snapshot
+
+
+def is_snapshot_stale(computed_at) -> bool:
+    """Whether a snapshot is older than LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS."""
+    max_age = timedelta(seconds=settings.LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS)
+    return timezone.now() - computed_at > max_age
+
+
+@shared_task
+def refresh_leaderboard(
+    metric: str, scope: str, corpus_id: Optional[int] = None
+) -> None:
+    """Refresh one stale leaderboard snapshot; queued when it is read."""
+    try:
+        snapshot = refresh_leaderboard_snapshot(metric, scope, corpus_id)
+    finally:
+        cache.delete(
+            SNAPSHOT_REFRESH_LOCK_KEY.format(
+                model=LeaderboardSnapshot._meta.model_name,
+                key=LeaderboardSnapshot.snapshot_key(metric, scope, corpus_id),
+            )
+        )
+    logger.debug(f"Refreshed {snapshot}")
+
+
+@shared_task
+def refresh_community_stats(corpus_id: Optional[int] = None) -> None:
+    """Refresh one stale community stats snapshot; queued when it is read."""
+    try:
+        snapshot = refresh_community_stats_snapshot(corpus_id)
+    finally:
+        cache.delete(
+            SNAPSHOT_REFRESH_LOCK_KEY.format(
+                model=CommunityStatsSnapshot._meta.model_name,
+                key=CommunityStatsSnapshot.snapshot_key(corpus_id),
+            )
+        )
+    logger.debug(f"Refreshed {snapshot}")
+
+
+@shared_task
+def refresh_community_snapshots() -> dict:
+    """
+    Recompute the global leaderboards and community statistics, and those of
+    every corpus whose snapshots were requested within
+    LEADERBOARD_SNAPSHOT_RETENTION_DAYS. Corpus snapshots that were not are
+    deleted instead; they are computed again if they are read later.
+
+    Stale snapshots are also refreshed when they are read. Scheduling this
+    through django-celery-beat at an interval below
+    LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS keeps them fresh ahead of readers and
+    drops the snapshots of corpora nobody views.
+
+    Returns:
+        dict: Number of leaderboard and community stats snapshots refreshed
+    """
+    cutoff = timezone.now() - timedelta(
+        days=settings.LEADERBOARD_SNAPSHOT_RETENTION_DAYS
+    )
+    corpus_ids = set()
+    for model in (LeaderboardSnapshot, CommunityStatsSnapshot):
+        corpus_snapshots = model.objects.filter(corpus__isnull=False)
+        expired, _ = corpus_snapshots.filter(last_requested_at__lt=cutoff).delete()
+        if expired:
+            logger.info(f"Deleted {expired} unrequested {model.__name__} rows")
+        corpus_ids |= set(corpus_snapshots.values_list("corpus_id", flat=True))
+
+    leaderboards = 0
+    for corpus_id in [None, *sorted(corpus_ids)]:
+        for metric in LEADERBOARD_METRICS:
+            for scope in LEADERBOARD_SCOPES:
+                refresh_leaderboard_snapshot(metric, scope, corpus_id)
+                leaderboards += 1
+        refresh_community_stats_snapshot(corpus_id)
+
+    logger.info(
+        f"Refreshed {leaderboards} leaderboards and community stats for "
+        f"{len(corpus_ids)} corpora plus the global scope"
+    )
+    return {"leaderboards": leaderboards, "community_stats": len(corpus_ids) + 1}
@@ -0,0 +1,415 @@
+"""
+Celery tasks that fan notification events out to their recipients.
+
+Signal handlers only record NotificationOutbox events (see
+opencontractserver/notifications/signals.py). drain_notification_outbox
+expands pending events into Notification rows with bulk inserts, marks the
+events processed in the same transaction, and then pushes the new
+notifications to each recipient's WebSocket group.
+
+Delivery is at-least-once: a crash between writing notifications and
+marking an event processed leads to the event being drained again, and the
+event's dedupe key on each Notification turns the second insert into a no-op.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from celery import shared_task
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from config.websocket.consumers.notification_updates import (
+    get_notification_channel_group,
+)
+from opencontractserver.badges.models import UserBadge
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    ModerationAction,
+    ModerationActionType,
+)
+from opencontractserver.notifications.models import (
+    Notification,
+    NotificationEventTypeChoices,
+    NotificationOutbox,
+    NotificationTypeChoices,
+)
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_BULK_CREATE_BATCH_SIZE = 1000
+
+# Map moderation action types to notification types
+MODERATION_NOTIFICATION_TYPES = {
+    ModerationActionType.LOCK_THREAD: NotificationTypeChoices.THREAD_LOCKED,
+    ModerationActionType.UNLOCK_THREAD: NotificationTypeChoices.THREAD_UNLOCKED,
+    ModerationActionType.PIN_THREAD: NotificationTypeChoices.THREAD_PINNED,
+    ModerationActionType.UNPIN_THREAD: NotificationTypeChoices.THREAD_UNPINNED,
+    ModerationActionType.DELETE_MESSAGE: NotificationTypeChoices.MESSAGE_DELETED,
+    ModerationActionType.DELETE_THREAD: NotificationTypeChoices.THREAD_DELETED,
+    ModerationActionType.RESTORE_MESSAGE: NotificationTypeChoices.MESSAGE_RESTORED,
+    ModerationActionType.RESTORE_THREAD: NotificationTypeChoices.THREAD_RESTORED,
+}
+
+
+def _expand_replies(events: list[NotificationOutbox]) -> list[Notification]:
+    """
+    REPLY notifications for parent message authors and THREAD_REPLY
+    notifications for everyone who had posted in the thread before.
+    """
+    messages = ChatMessage.objects.select_related(
+        "parent_message", "conversation"
+    ).in_bulk([event.object_id for event in events])
+
+    # First message per (thread, participant), for all threads at once.
+    thread_ids = {
+        m.conversation_id
+        for m in messages.values()
+        if m.conversation and m.conversation.conversation_type == "thread"
+    }
+    participants = defaultdict(list)
+    for row in (
+        ChatMessage.objects.filter(conversation_id__in=thread_ids)
+        .values("conversation_id", "creator_id")
+        .annotate(first_message_id=Min("id"))
+    ):
+        participants[row["conversation_id"]].append(
+            (row["creator_id"], row["first_message_id"])
+        )
+
+    notifications = []
+    for event in events:
+        message = messages.get(event.object_id)
+        if message is None:
+            continue
+
+        parent_creator_id = (
+            message.parent_message.creator_id if message.parent_message else None
+        )
+
+        # 1. Notify parent message creator (direct reply), but not self
+        if parent_creator_id and parent_creator_id != message.creator_id:
+            notifications.append(
+                Notification(
+                    recipient_id=parent_creator_id,
+                    notification_type=NotificationTypeChoices.REPLY,
+                    message=message,
+                    conversation=message.conversation,
+                    actor_id=message.creator_id,
+                    dedupe_key=event.dedupe_key,
+                    data={
+                        "parent_message_id": message.parent_message_id,
+                        "reply_content_preview": message.content[:100],
+                    },
+                )
+            )
+
+        # 2. Notify thread participants, skipping self and the parent creator
+        for participant_id, first_message_id in participants.get(
+            message.conversation_id, []
+        ):
+            if first_message_id >= message.pk or participant_id in (
+                message.creator_id,
+                parent_creator_id,
+            ):
+                continue
+            notifications.append(
+                Notification(
+                    recipient_id=participant_id,
+                    notification_type=NotificationTypeChoices.THREAD_REPLY,
+                    message=message,
+                    conversation=message.conversation,
+                    actor_id=message.creator_id,
+                    dedupe_key=event.dedupe_key,
+                    data={
+                        "thread_title": message.conversation.title,
+                        "reply_content_preview": message.content[:100],
+                    },
+                )
+            )
+
+    return notifications
+
+
+def _expand_mentions(events: list[NotificationOutbox]) -> list[Notification]:
+    """MENTION notifications for every @username found in a message."""
+    messages = ChatMessage.objects.in_bulk([event.object_id for event in events])
+    mentions = {
+        pk: Notification.extract_mentions(message.content)
+        for pk, message in messages.items()
+    }
+    user_ids = dict(
+        User.objects.filter(
+            username__in={name for names in mentions.values() for name in names}
+        ).values_list("username", "id")
+    )
+
+    notifications = []
+    for event in events:
+        message = messages.get(event.object_id)
+        if message is None:
+            continue
+        for username in mentions[message.pk]:
+            user_id = user_ids.get(username)
+            # Unknown users are skipped, and so is self
+            if user_id is None or user_id == message.creator_id:
+                continue
+            notifications.append(
+                Notification(
+                    recipient_id=user_id,
+                    notification_type=NotificationTypeChoices.MENTION,
+                    message=message,
+                    conversation_id=message.conversation_id,
+                    actor_id=message.creator_id,
+                    dedupe_key=event.dedupe_key,
+                    data={
+                        "mention_context": message.content[:200],
+                    },
+                )
+            )
+
+    return notifications
+
+
+def _expand_badges(events: list[NotificationOutbox]) -> list[Notification]:
+    """BADGE notifications for the users who were awarded a badge."""
+    user_badges = UserBadge.objects.select_related("badge").in_bulk(
+        [event.object_id for event in events]
+    )
+
+    notifications = []
+    for event in events:
+        user_badge = user_badges.get(event.object_id)
+        if user_badge is None:
+            continue
+        notifications.append(
+            Notification(
+                recipient_id=user_badge.user_id,
+                notification_type=NotificationTypeChoices.BADGE,
+                actor_id=user_badge.awarded_by_id,  # May be None for auto-awards
+                dedupe_key=event.dedupe_key,
+                data={
+                    "badge_id": user_badge.badge.id,
+                    "badge_name": user_badge.badge.name,
+                    "badge_description": user_badge.badge.description,
+                    "badge_icon": user_badge.badge.icon,
+                    "badge_color": user_badge.badge.color,
+                    "is_auto_awarded": user_badge.awarded_by_id is None,
+                },
+            )
+        )
+
+    return notifications
+
+
+def _expand_moderation(events: list[NotificationOutbox]) -> list[Notification]:
+    """
+    Notifications for the authors of moderated content: the message creator
+    for message-level actions, the thread creator for thread-level actions.
+    """
+    actions = ModerationAction.objects.select_related(
+        "message", "conversation", "moderator"
+    ).in_bulk([event.object_id for event in events])
+
+    notifications = []
+    for event in events:
+        action = actions.get(event.object_id)
+        if action is None:
+            continue
+
+        notification_type = MODERATION_NOTIFICATION_TYPES.get(action.action_type)
+        if not notification_type:
+            logger.debug(
+                f"No notification type mapped for action: {action.action_type}"
+            )
+            continue
+
+        recipient_id = None
+        if action.message:
+            recipient_id = action.message.creator_id
+        elif action.conversation:
+            recipient_id = action.conversation.creator_id
+
+        # Don't notify if moderator is acting on their own content
+        if not recipient_id or recipient_id == action.moderator_id:
+            continue
+
+        notifications.append(
+            Notification(
+                recipient_id=recipient_id,
+                notification_type=notification_type,
+                message=action.message,
+                conversation=action.conversation,
+                actor_id=action.moderator_id,
+                dedupe_key=event.dedupe_key,
+                data={
+                    "action_type": action.action_type,
+                    "reason": action.reason,
+                    "moderator_username": action.moderator.username,
+                },
+            )
+        )
+
+    return notifications
+
+
+EVENT_EXPANDERS = {
+    NotificationEventTypeChoices.MESSAGE_REPLY: _expand_replies,
+    NotificationEventTypeChoices.MESSAGE_MENTION: _expand_mentions,
+    NotificationEventTypeChoices.BADGE_AWARDED: _expand_badges,
+    NotificationEventTypeChoices.MODERATION_ACTION: _expand_moderation,
+}
+
+
+def _push_notifications(dedupe_keys: list[str]) -> int:
+    """
+    Push notifications produced by the given events to their recipients'
+    WebSocket groups. Returns the number of notifications pushed.
+    """
+    channel_layer = get_channel_layer()
+    if not channel_layer or not dedupe_keys:
+        return 0
+
+    notifications = Notification.objects.filter(dedupe_key__in=dedupe_keys).values(
+        "id",
+        "recipient_id",
+        "notification_type",
+        "message_id",
+        "conversation_id",
+        "actor_id",
+        "created_at",
+        "data",
+    )
+    pushed = 0
+    for notification in notifications:
+        try:
+            async_to_sync(channel_layer.group_send)(
+                get_notification_channel_group(notification.pop("recipient_id")),
+                {
+                    "type": "notification_created",
+                    **notification,
+                    "created_at": notification["created_at"].isoformat(),
+                },
+            )
+            pushed += 1
+        except Exception as e:
+            # The notification is stored; clients still see it on next fetch.
+            logger.warning(f"Failed to push notification {notification['id']}: {e}")
+    return pushed
+
+
+def _drain_batch(batch_size: int, max_attempts: int) -> tuple[int, int, list[str]]:
+    """
+    Fan out one batch of pending events.
+
+    Returns:
+        (events processed, events failed, dedupe keys of processed events)
+    """
+    with transaction.atomic():
+        # skip_locked lets concurrent drains work on disjoint batches.
+        events = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True).filter(
+                processed_at__isnull=True, attempts__lt=max_attempts
+            )[:batch_size]
+        )
+        if not events:
+            return 0, 0, []
+
+        by_type = defaultdict(list)
+        for event in events:
+            by_type[event.event_type].append(event)
+
+        notifications = []
+        processed, failed = [], []
+        for event_type, typed_events in by_type.items():
+            try:
+                with transaction.atomic():
+                    notifications.extend(EVENT_EXPANDERS[event_type](typed_events))
+                processed.extend(typed_events)
+            except Exception as e:
+                logger.error(
+                    f"Failed to expand {len(typed_events)} {event_type} "
+                    f"notification events: {e}",
+                    exc_info=True,
+                )
+                failed.append(([event.pk for event in typed_events], str(e)))
+
+        Notification.objects.bulk_create(
+            notifications,
+            batch_size=NOTIFICATION_BULK_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        NotificationOutbox.objects.filter(
+            pk__in=[event.pk for event in processed]
+        ).update(processed_at=timezone.now())
+        for event_ids, error in failed:
+            NotificationOutbox.objects.filter(pk__in=event_ids).update(
+                attempts=F("attempts") + 1, last_error=error
+            )
+
+    return (
+        len(processed),
+        sum(len(event_ids) for event_ids, _ in failed),
+        [event.dedupe_key for event in processed],
+    )
+
+
+@shared_task
+def drain_notification_outbox(batch_size: int | None = None) -> dict:
+    """
+    Expand pending notification events into notifications and push them to
+    connected clients.
+
+    Queued by the notification signal handlers after each commit. Also
+    intended to run periodically (schedule it through django-celery-beat) to
+    pick up events whose drain could not be queued and to purge processed
+    events.
+
+    Args:
+        batch_size: Events fanned out per transaction
+            (default: settings.NOTIFICATION_OUTBOX_BATCH_SIZE)
+
+    Returns:
+        dict: Number of events processed and failed, notifications pushed, and
+        processed events purged
+    """
+    batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+    max_attempts = settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS
+
+    processed = failed = pushed = 0
+    while True:
+        batch_processed, batch_failed, dedupe_keys = _drain_batch(
+            batch_size, max_attempts
+        )
+        processed += batch_processed
+        failed += batch_failed
+        pushed += _push_notifications(dedupe_keys)
+        # Failed events are retried by the next drain, not straight away.
+        if batch_failed or batch_processed < batch_size:
+            break
+
+    cutoff = timezone.now() - timedelta(
+        days=settings.NOTIFICATION_OUTBOX_RETENTION_DAYS
+    )
+    purged, _ = NotificationOutbox.objects.filter(processed_at__lt=cutoff).delete()
+
+    if failed:
+        logger.warning(f"{failed} notification events failed to fan out")
+    logger.debug(
+        f"Drained notification outbox: {processed} events, {pushed} notifications "
+        f"pushed, {purged} processed events purged"
+    )
+
+    return {
+        "processed": processed,
+        "failed": failed,
+        "pushed": pushed,
+        "purged": purged,
+    }
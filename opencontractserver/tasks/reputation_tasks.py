@@ -0,0 +1,160 @@
+"""
+Celery tasks that keep denormalized vote counts and user reputation correct.
+
+Votes update ChatMessage.upvote_count/downvote_count and UserReputation with
+atomic increments (see opencontractserver/conversations/signals.py). Writes
+that bypass signals (queryset.update(), raw SQL, restores) or messages being
+soft-deleted make those counters drift; reconcile_vote_counters recomputes
+them set-wise from the votes table and repairs only the rows that differ.
+"""
+
+import logging
+from collections import defaultdict
+
+from celery import shared_task
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    MessageVote,
+    UserReputation,
+    VoteType,
+)
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BATCH_SIZE = 500
+
+
+def _reconcile_message_counts() -> int:
+    """Repair message vote counts that differ from their votes. Returns the count."""
+    drifted = (
+        ChatMessage.all_objects.annotate(
+            actual_upvotes=Count("votes", filter=Q(votes__vote_type=VoteType.UPVOTE)),
+            actual_downvotes=Count(
+                "votes", filter=Q(votes__vote_type=VoteType.DOWNVOTE)
+            ),
+        )
+        .exclude(upvote_count=F("actual_upvotes"), downvote_count=F("actual_downvotes"))
+        .values_list("pk", "actual_upvotes", "actual_downvotes")
+    )
+
+    repairs = [
+        ChatMessage(pk=pk, upvote_count=upvotes, downvote_count=downvotes)
+        for pk, upvotes, downvotes in drifted.iterator()
+    ]
+    ChatMessage.all_objects.bulk_update(
+        repairs, ["upvote_count", "downvote_count"], batch_size=RECONCILE_BATCH_SIZE
+    )
+    return len(repairs)
+
+
+def _reconcile_reputations() -> tuple[int, int]:
+    """
+    Repair reputation rows that differ from the votes on live messages.
+
+    Returns:
+        (rows repaired, rows created)
+    """
+    # (user_id, corpus_id) -> [upvotes, downvotes]; corpus_id None is global.
+    expected = defaultdict(lambda: [0, 0])
+    per_scope = (
+        MessageVote.objects.filter(message__deleted_at__isnull=True)
+        .values("message__creator_id", "message__conversation__chat_with_corpus_id")
+        .annotate(
+            upvotes=Count("id", filter=Q(vote_type=VoteType.UPVOTE)),
+            downvotes=Count("id", filter=Q(vote_type=VoteType.DOWNVOTE)),
+        )
+    )
+    for row in per_scope.iterator():
+        user_id = row["message__creator_id"]
+        corpus_id = row["message__conversation__chat_with_corpus_id"]
+        scopes = [None] if corpus_id is None else [None, corpus_id]
+        for scope in scopes:
+            expected[(user_id, scope)][0] += row["upvotes"]
+            expected[(user_id, scope)][1] += row["downvotes"]
+
+    now = timezone.now()
+    repairs = []
+    existing = UserReputation.objects.values_list(
+        "pk",
+        "user_id",
+        "corpus_id",
+        "reputation_score",
+        "total_upvotes_received",
+        "total_downvotes_received",
+    )
+    for pk, user_id, corpus_id, score, upvotes, downvotes in existing.iterator():
+        actual_up, actual_down = expected.pop((user_id, corpus_id), (0, 0))
+        if (score, upvotes, downvotes) != (
+            actual_up - actual_down,
+            actual_up,
+            actual_down,
+        ):
+            repairs.append(
+                UserReputation(
+                    pk=pk,
+                    reputation_score=actual_up - actual_down,
+                    total_upvotes_received=actual_up,
+                    total_downvotes_received=actual_down,
+                    last_calculated_at=now,
+                )
+            )
+    UserReputation.objects.bulk_update(
+        repairs,
+        [
+            "reputation_score",
+            "total_upvotes_received",
+            "total_downvotes_received",
+            "last_calculated_at",
+        ],
+        batch_size=RECONCILE_BATCH_SIZE,
+    )
+
+    missing = [
+        UserReputation(
+            user_id=user_id,
+            corpus_id=corpus_id,
+            creator_id=user_id,
+            reputation_score=upvotes - downvotes,
+            total_upvotes_received=upvotes,
+            total_downvotes_received=downvotes,
+        )
+        for (user_id, corpus_id), (upvotes, downvotes) in expected.items()
+    ]
+    UserReputation.objects.bulk_create(missing, batch_size=RECONCILE_BATCH_SIZE)
+
+    return len(repairs), len(missing)
+
+
+@shared_task
+def reconcile_vote_counters() -> dict:
+    """
+    Recompute message vote counts and user reputation from the votes table
+    and repair any rows that have drifted.
+
+    Intended to run periodically (schedule it through django-celery-beat).
+
+    Returns:
+        dict: Number of messages and reputation rows repaired or created
+    """
+    with transaction.atomic():
+        messages_repaired = _reconcile_message_counts()
+        reputations_repaired, reputations_created = _reconcile_reputations()
+
+    if messages_repaired or reputations_repaired or reputations_created:
+        logger.warning(
+            f"Reconciled vote counters: {messages_repaired} messages, "
+            f"{reputations_repaired} reputations repaired, "
+            f"{reputations_created} reputations created"
+        )
+    else:
+        logger.info("Vote counters are consistent; nothing to reconcile")
+
+    return {
+        "messages_repaired": messages_repaired,
+        "reputations_repaired": reputations_repaired,
+        "reputations_created": reputations_created,
+    }
@@ -0,0 +1,130 @@
+"""
+Scaling tests for corpus agent start-up and the paginated list_documents tool.
+
+Corpus agent contexts used to materialize every document in the corpus (twice)
+and the list tool returned all of them. The context now carries a lazy
+queryset, so start-up cost must not grow with corpus size, and document
+listings come back one bounded page at a time.
+"""
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from opencontractserver.corpuses.models import Corpus, CorpusFolder
+from opencontractserver.documents.models import Document, DocumentPath
+from opencontractserver.llms.agents.core_agents import (
+    AgentConfig,
+    CoreCorpusAgentFactory,
+)
+from opencontractserver.llms.tools.core_tools import (
+    MAX_DOCUMENT_PAGE_SIZE,
+    alist_corpus_documents,
+    list_corpus_documents,
+)
+
+User = get_user_model()
+
+
+class CorpusAgentContextScalingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="ctx_owner", password="test")
+        cls.small = Corpus.objects.create(title="Small", creator=cls.user)
+        cls.large = Corpus.objects.create(title="Large", creator=cls.user)
+        cls.folder = CorpusFolder.objects.create(
+            name="Contracts", corpus=cls.large, creator=cls.user
+        )
+        cls._populate(cls.small, 10)
+        cls._populate(cls.large, 2000, folder=cls.folder, folder_every=10)
+
+    @classmethod
+    def _populate(cls, corpus, count, folder=None, folder_every=None):
+        # bulk_create skips save()/signals, which keeps fixture creation fast.
+        documents = Document.objects.bulk_create(
+            [
+                Document(
+                    title=f"{'Lease' if i % 4 == 0 else 'Memo'} {i:05d}",
+                    description=f"Document {i}",
+                    creator=cls.user,
+                )
+                for i in range(count)
+            ]
+        )
+        DocumentPath.objects.bulk_create(
+            [
+                DocumentPath(
+                    document=doc,
+                    corpus=corpus,
+                    creator=cls.user,
+                    folder=folder if folder_every and i % folder_every == 0 else None,
+                    path=f"/doc-{i}.pdf",
+                    version_number=1,
+                    is_current=True,
+                )
+                for i, doc in enumerate(documents)
+            ]
+        )
+
+    def _create_context(self, corpus):
+        config = AgentConfig(user_id=self.user.id, embedder_path="test/embedder")
+        with CaptureQueriesContext(connection) as ctx:
+            context = async_to_sync(CoreCorpusAgentFactory.create_context)(
+                corpus.id, config
+            )
+        return context, len(ctx.captured_queries)
+
+    def test_context_startup_does_not_scale_with_corpus_size(self):
+        small_context, small_queries = self._create_context(self.small)
+        large_context, large_queries = self._create_context(self.large)
+
+        self.assertEqual(small_queries, large_queries)
+        # The documents handle is an unevaluated queryset.
+        self.assertIsNone(large_context.documents._result_cache)
+        self.assertEqual(large_context.documents.count(), 2000)
+        self.assertEqual(small_context.documents.count(), 10)
+
+    def test_list_returns_bounded_pages(self):
+        first = list_corpus_documents(self.large.id, limit=50)
+
+        self.assertEqual(len(first["documents"]), 50)
+        self.assertTrue(first["has_more"])
+        self.assertEqual(first["next_offset"], 50)
+        self.assertEqual(first["documents"][0]["title"], "Lease 00000")
+
+        second = list_corpus_documents(self.large.id, limit=50, offset=50)
+        self.assertFalse(
+            {d["document_id"] for d in first["documents"]}
+            & {d["document_id"] for d in second["documents"]}
+        )
+
+        capped = list_corpus_documents(self.large.id, limit=10_000)
+        self.assertEqual(len(capped["documents"]), MAX_DOCUMENT_PAGE_SIZE)
+
+        last = list_corpus_documents(self.small.id, limit=50)
+        self.assertEqual(len(last["documents"]), 10)
+        self.assertFalse(last["has_more"])
+        self.assertIsNone(last["next_offset"])
+
+    def test_list_filters_by_title_prefix_and_folder(self):
+        leases = async_to_sync(alist_corpus_documents)(
+            self.large.id, title_prefix="lease", limit=MAX_DOCUMENT_PAGE_SIZE
+        )
+        self.assertTrue(
+            all(d["title"].startswith("Lease") for d in leases["documents"])
+        )
+        self.assertEqual(len(leases["documents"]), MAX_DOCUMENT_PAGE_SIZE)
+
+        in_folder = list_corpus_documents(
+            self.large.id, folder_id=self.folder.id, limit=MAX_DOCUMENT_PAGE_SIZE
+        )
+        self.assertEqual(len(in_folder["documents"]), 200)
+        self.assertFalse(in_folder["has_more"])
+
+    def test_page_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            list_corpus_documents(self.small.id)
+        with self.assertNumQueries(1):
+            list_corpus_documents(self.large.id, title_prefix="Memo", offset=500)
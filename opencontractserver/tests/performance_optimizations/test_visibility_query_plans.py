@@ -0,0 +1,120 @@
+"""
+EXPLAIN-based tests for the EXISTS-style visible_to_user querysets.
+
+The visibility predicates must not require DISTINCT, so a paginated
+``visible_to_user(...).order_by(...)[:n]`` should be answered by walking an
+index and stopping at the LIMIT, rather than materializing, de-duplicating and
+sorting the whole table first.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from opencontractserver.annotations.models import Annotation, AnnotationLabel, Note
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.documents.models import Document
+
+User = get_user_model()
+
+ROW_COUNT = 100_000
+BATCH_SIZE = 10_000
+
+
+class VisibilityQueryPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="plan_owner", password="test")
+        cls.reader = User.objects.create_user(username="plan_reader", password="test")
+
+        cls.corpus = Corpus.objects.create(
+            title="Plan Corpus", creator=cls.owner, is_public=True
+        )
+        cls.doc = Document.objects.create(
+            title="Plan Doc", creator=cls.owner, is_public=True
+        )
+        cls.label = AnnotationLabel.objects.create(
+            text="Plan Label", label_type="TOKEN_LABEL", creator=cls.owner
+        )
+
+        # bulk_create skips save()/signals, which keeps fixture creation fast.
+        for start in range(0, ROW_COUNT, BATCH_SIZE):
+            Annotation.objects.bulk_create(
+                [
+                    Annotation(
+                        document=cls.doc,
+                        corpus=cls.corpus,
+                        annotation_label=cls.label,
+                        raw_text="",
+                        page=(i % 500) + 1,
+                        creator=cls.owner,
+                    )
+                    for i in range(start, start + BATCH_SIZE)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            Note.objects.bulk_create(
+                [
+                    Note(
+                        document=cls.doc,
+                        title=f"note {i}",
+                        creator=cls.owner,
+                        is_public=bool(i % 2),
+                    )
+                    for i in range(start, start + BATCH_SIZE)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Annotation._meta.db_table}")
+            cursor.execute(f"ANALYZE {Note._meta.db_table}")
+
+    def assertIndexOrderedLimit(self, plan):
+        self.assertIn("Limit", plan)
+        self.assertIn("Index Scan", plan)
+        # A DISTINCT would show up as Unique / HashAggregate, and a sort over the
+        # full result as a Sort node; neither should be needed.
+        self.assertNotIn("Unique", plan)
+        self.assertNotIn("HashAggregate", plan)
+        self.assertNotIn("Sort", plan)
+
+    def test_annotation_visibility_has_no_distinct(self):
+        qs = Annotation.objects.visible_to_user(self.reader)
+        self.assertFalse(qs.query.distinct)
+
+    def test_annotation_page_uses_index_scan_with_limit(self):
+        plan = (
+            Annotation.objects.visible_to_user(self.reader)
+            .filter(document=self.doc)
+            .order_by("page", "id")[:50]
+            .explain()
+        )
+        self.assertIndexOrderedLimit(plan)
+
+    def test_annotation_visibility_for_anonymous_has_no_distinct(self):
+        from django.contrib.auth.models import AnonymousUser
+
+        qs = Annotation.objects.visible_to_user(AnonymousUser())
+        self.assertFalse(qs.query.distinct)
+
+        plan = qs.order_by("id")[:50].explain()
+        self.assertIn("Limit", plan)
+        self.assertNotIn("Unique", plan)
+        self.assertNotIn("HashAggregate", plan)
+
+    def test_note_visibility_uses_index_scan_with_limit(self):
+        qs = Note.objects.visible_to_user(self.reader)
+        self.assertFalse(qs.query.distinct)
+
+        plan = qs.order_by("-created")[:50].explain()
+        self.assertIndexOrderedLimit(plan)
+
+    def test_visible_counts_are_unchanged(self):
+        self.assertEqual(
+            Annotation.objects.visible_to_user(self.reader).count(), ROW_COUNT
+        )
+        self.assertEqual(
+            Note.objects.visible_to_user(self.reader).count(), ROW_COUNT // 2
+        )
+        self.assertEqual(Note.objects.visible_to_user(self.owner).count(), ROW_COUNT)
@@ -9,6 +9,7 @@ from django.test import TestCase, override_settings
 from opencontractserver.annotations.models import Annotation, AnnotationLabel, Note
 from opencontractserver.corpuses.models import Corpus
 from opencontractserver.documents.models import Document
+from opencontractserver.llms.token_counting import count_tokens
 from opencontractserver.llms.tools.core_tools import (
     aget_md_summary_token_length,
     aget_notes_for_document_corpus,
@@ -309,8 +310,8 @@ class TestCoreTools(TestCase):
     # get_note_content_token_length
     # ---------------------------------------------------------------------
     def test_get_note_content_token_length(self):
-        """Should return correct whitespace token count for a note."""
-        expected = len(self.note1_content.split())
+        """Should return the tokenizer's count for a note."""
+        expected = count_tokens(self.note1_content)
         result = get_note_content_token_length(self.note1.id)
         self.assertEqual(result, expected)
 
@@ -366,7 +367,7 @@ class TestCoreTools(TestCase):
         # ---------------------------------------------------------------------
         # aget_md_summary_token_length returns correct token count
         # ---------------------------------------------------------------------
-        expected_tokens = len(md_summary_text.split())
+        expected_tokens = count_tokens(md_summary_text)
         token_length = await aget_md_summary_token_length(doc.id)
         self.assertEqual(token_length, expected_tokens)
 
@@ -0,0 +1,180 @@
+"""
+Tests for delta-based persistence of streamed agent responses.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    ChatMessageStreamChunk,
+    Conversation,
+    MessageStateChoices,
+)
+from opencontractserver.conversations.streaming import (
+    INTERRUPTED_STREAM_ERROR,
+    recover_interrupted_stream_messages,
+)
+from opencontractserver.llms.agents.core_agents import (
+    AgentConfig,
+    ContentEvent,
+    CoreAgentBase,
+    CoreConversationManager,
+)
+
+User = get_user_model()
+
+TOKENS = [f"tok{i} " for i in range(10)]
+
+
+class _FakeStreamingAgent(CoreAgentBase):
+    """Emits a fixed token stream, optionally failing part-way through."""
+
+    def __init__(self, config, conversation_manager, fail_after=None):
+        super().__init__(config, conversation_manager)
+        self.fail_after = fail_after
+
+    async def _stream_raw(self, message, **kwargs):
+        for i, token in enumerate(TOKENS):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("model went away")
+            yield ContentEvent(content=token)
+
+
+class AgentStreamPersistenceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="streamer", password="test")
+        cls.conversation = Conversation.objects.create(
+            title="Stream Convo", creator=cls.user
+        )
+
+    def _agent(self, fail_after=None):
+        config = AgentConfig(user_id=self.user.id, stream_update_freq=3)
+        manager = CoreConversationManager(self.conversation, self.user.id, config)
+        return _FakeStreamingAgent(config, manager, fail_after=fail_after)
+
+    async def test_stream_appends_deltas_and_compacts_on_completion(self):
+        agent = self._agent()
+
+        llm_msg_id = None
+        async for evt in agent.stream("hello"):
+            llm_msg_id = evt.llm_message_id
+            if evt.content == TOKENS[7]:
+                # Two flushes of three tokens each so far; content untouched.
+                message = await ChatMessage.objects.aget(id=llm_msg_id)
+                self.assertEqual(message.content, "")
+                chunks = [
+                    chunk
+                    async for chunk in ChatMessageStreamChunk.objects.filter(
+                        message_id=llm_msg_id
+                    )
+                    .order_by("sequence")
+                    .values_list("sequence", "content")
+                ]
+                self.assertEqual(
+                    chunks, [(0, "".join(TOKENS[:3])), (1, "".join(TOKENS[3:6]))]
+                )
+                streamed = await sync_to_async(message.get_streamed_content)()
+                self.assertEqual(streamed, "".join(TOKENS[:6]))
+
+        message = await ChatMessage.objects.aget(id=llm_msg_id)
+        self.assertEqual(message.content, "".join(TOKENS))
+        self.assertEqual(message.state, MessageStateChoices.COMPLETED)
+        self.assertFalse(
+            await ChatMessageStreamChunk.objects.filter(message_id=llm_msg_id).aexists()
+        )
+
+    async def test_error_keeps_partial_answer(self):
+        agent = self._agent(fail_after=5)
+
+        events = [evt async for evt in agent.stream("hello")]
+        llm_msg_id = events[-1].llm_message_id
+
+        message = await ChatMessage.objects.aget(id=llm_msg_id)
+        self.assertEqual(message.state, MessageStateChoices.ERROR)
+        self.assertEqual(message.data["partial_content"], "".join(TOKENS[:5]))
+        self.assertFalse(
+            await ChatMessageStreamChunk.objects.filter(message_id=llm_msg_id).aexists()
+        )
+
+    async def test_error_is_recorded_when_flushing_the_tail_fails(self):
+        # Fails before the first periodic flush, so only the tail is written
+        agent = self._agent(fail_after=2)
+
+        with mock.patch.object(
+            CoreConversationManager,
+            "append_message_delta",
+            side_effect=RuntimeError("database unavailable"),
+        ):
+            events = [evt async for evt in agent.stream("hello")]
+
+        self.assertEqual(events[-1].error, "model went away")
+        message = await ChatMessage.objects.aget(id=events[-1].llm_message_id)
+        self.assertEqual(message.state, MessageStateChoices.ERROR)
+        self.assertEqual(message.data["error"], "model went away")
+
+
+class InterruptedStreamRecoveryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="recover", password="test")
+        self.conversation = Conversation.objects.create(
+            title="Recovery Convo", creator=self.user
+        )
+
+    def _in_progress_message(self, age_seconds, chunks=()):
+        message = ChatMessage.objects.create(
+            conversation=self.conversation,
+            msg_type="LLM",
+            content="",
+            state=MessageStateChoices.IN_PROGRESS,
+            creator=self.user,
+        )
+        ChatMessage.all_objects.filter(id=message.id).update(
+            created=timezone.now() - timedelta(seconds=age_seconds)
+        )
+        for sequence, content in enumerate(chunks):
+            chunk = ChatMessageStreamChunk.objects.create(
+                message=message, sequence=sequence, content=content
+            )
+            ChatMessageStreamChunk.objects.filter(id=chunk.id).update(
+                created=timezone.now() - timedelta(seconds=age_seconds)
+            )
+        return message
+
+    def test_reassembles_abandoned_streams(self):
+        abandoned = self._in_progress_message(3600, chunks=["Partial ", "answer"])
+        empty = self._in_progress_message(3600)
+        live = self._in_progress_message(5, chunks=["still going"])
+
+        recovered = recover_interrupted_stream_messages(stale_after_seconds=600)
+
+        self.assertEqual(recovered, 2)
+        abandoned.refresh_from_db()
+        self.assertEqual(abandoned.content, "Partial answer")
+        self.assertEqual(abandoned.state, MessageStateChoices.ERROR)
+        self.assertEqual(abandoned.data["error"], INTERRUPTED_STREAM_ERROR)
+        self.assertFalse(abandoned.stream_chunks.exists())
+
+        empty.refresh_from_db()
+        self.assertEqual(empty.content, INTERRUPTED_STREAM_ERROR)
+
+        live.refresh_from_db()
+        self.assertEqual(live.state, MessageStateChoices.IN_PROGRESS)
+        self.assertEqual(live.get_streamed_content(), "still going")
+
+    def test_drops_leftover_chunks_of_finished_messages(self):
+        message = self._in_progress_message(3600, chunks=["stale"])
+        ChatMessage.all_objects.filter(id=message.id).update(
+            content="final", state=MessageStateChoices.COMPLETED
+        )
+
+        self.assertEqual(recover_interrupted_stream_messages(600), 0)
+        self.assertFalse(ChatMessageStreamChunk.objects.exists())
+        message.refresh_from_db()
+        self.assertEqual(message.content, "final")
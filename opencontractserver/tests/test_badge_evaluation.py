@@ -0,0 +1,300 @@
+"""
+Tests for debounced badge evaluation: signals mark pending checks and
+evaluate_pending_badge_checks evaluates them in bulk.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from opencontractserver.annotations.models import Annotation
+from opencontractserver.badges.criteria_registry import BadgeCriteriaRegistry
+from opencontractserver.badges.models import (
+    Badge,
+    BadgeTypeChoices,
+    PendingBadgeCheck,
+    UserBadge,
+)
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    MessageVote,
+    VoteType,
+)
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.documents.models import Document
+from opencontractserver.notifications.models import (
+    NotificationEventTypeChoices,
+    NotificationOutbox,
+)
+from opencontractserver.tasks.badge_tasks import (
+    PENDING_BADGE_CHECK_DELAY_SECONDS,
+    PENDING_BADGE_CHECK_LOCK_KEY,
+    BadgeCriteriaType,
+    evaluate_pending_badge_checks,
+)
+
+User = get_user_model()
+
+
+class DebouncedBadgeEvaluationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="badge_admin", password="test", is_superuser=True
+        )
+        cls.users = [
+            User.objects.create_user(username=f"poster{i}", password="test")
+            for i in range(3)
+        ]
+        cls.corpus = Corpus.objects.create(title="Badges", creator=cls.admin)
+        cls.document = Document.objects.create(title="Doc", creator=cls.admin)
+        cls.thread = Conversation.objects.create(
+            title="Thread", chat_with_corpus=cls.corpus, creator=cls.admin
+        )
+
+        # Start from a clean set of auto-awarded badges
+        Badge.objects.filter(is_auto_awarded=True).delete()
+        cls.first_post = Badge.objects.create(
+            name="First Post",
+            description="First post",
+            icon="MessageSquare",
+            badge_type=BadgeTypeChoices.GLOBAL,
+            is_auto_awarded=True,
+            criteria_config={"type": BadgeCriteriaType.FIRST_POST},
+            creator=cls.admin,
+        )
+        cls.chatty = Badge.objects.create(
+            name="Chatty",
+            description="Three posts in the corpus",
+            icon="MessageCircle",
+            badge_type=BadgeTypeChoices.CORPUS,
+            corpus=cls.corpus,
+            is_auto_awarded=True,
+            criteria_config={"type": BadgeCriteriaType.MESSAGE_COUNT, "value": 3},
+            creator=cls.admin,
+        )
+        cls.contributor = Badge.objects.create(
+            name="Contributor",
+            description="Five annotations in the corpus",
+            icon="Users",
+            badge_type=BadgeTypeChoices.CORPUS,
+            corpus=cls.corpus,
+            is_auto_awarded=True,
+            criteria_config={
+                "type": BadgeCriteriaType.CORPUS_CONTRIBUTION,
+                "value": 5,
+            },
+            creator=cls.admin,
+        )
+
+    def setUp(self):
+        cache.delete(PENDING_BADGE_CHECK_LOCK_KEY)
+
+    def _post(self, user, count=1):
+        for i in range(count):
+            ChatMessage.objects.create(
+                conversation=self.thread,
+                msg_type="HUMAN",
+                content=f"Post {i}",
+                creator=user,
+            )
+
+    def _annotate(self, user, count=1, structural=False):
+        for i in range(count):
+            Annotation.objects.create(
+                document=self.document,
+                corpus=self.corpus,
+                raw_text=f"Annotation {i}",
+                page=1,
+                structural=structural,
+                creator=user,
+            )
+
+    def _awarded(self, badge):
+        return set(
+            UserBadge.objects.filter(badge=badge).values_list("user_id", flat=True)
+        )
+
+    def test_signals_mark_checks_instead_of_queueing_tasks(self):
+        with patch(
+            "opencontractserver.tasks.badge_tasks.check_auto_badges.delay"
+        ) as delay:
+            self._post(self.users[0], count=4)
+            self._annotate(self.users[0], count=20)
+
+        delay.assert_not_called()
+        self.assertEqual(
+            set(PendingBadgeCheck.objects.values_list("corpus_id", "criteria_type")),
+            {
+                (None, "first_post"),
+                (None, "message_count"),
+                (self.corpus.id, "first_post"),
+                (self.corpus.id, "message_count"),
+                (self.corpus.id, "corpus_contribution"),
+            },
+        )
+
+    def test_marks_queue_one_delayed_evaluation(self):
+        with patch(
+            "opencontractserver.tasks.badge_tasks."
+            "evaluate_pending_badge_checks.apply_async"
+        ) as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._post(self.users[0], count=3)
+                self._annotate(self.users[1], count=5)
+            with self.captureOnCommitCallbacks(execute=True):
+                self._post(self.users[2])
+
+        apply_async.assert_called_once_with(countdown=PENDING_BADGE_CHECK_DELAY_SECONDS)
+
+    def test_committed_marks_are_evaluated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post(self.users[0], count=3)
+
+        self.assertEqual(self._awarded(self.first_post), {self.users[0].id})
+        self.assertEqual(self._awarded(self.chatty), {self.users[0].id})
+        self.assertFalse(PendingBadgeCheck.objects.exists())
+
+        # The run released the lock, so later marks queue another one
+        with self.captureOnCommitCallbacks(execute=True):
+            self._annotate(self.users[0], count=5)
+        self.assertEqual(self._awarded(self.contributor), {self.users[0].id})
+
+    def test_checks_of_badges_that_fail_stay_pending(self):
+        self._post(self.users[0], count=3)
+        self._annotate(self.users[0], count=5)
+        evaluate = BadgeCriteriaRegistry.qualifying_users
+
+        def fail_message_count(config, user_ids, corpus_id=None):
+            if config["type"] == BadgeCriteriaType.MESSAGE_COUNT:
+                raise RuntimeError("evaluator broke")
+            return evaluate(config, user_ids, corpus_id)
+
+        with patch.object(
+            BadgeCriteriaRegistry, "qualifying_users", side_effect=fail_message_count
+        ):
+            evaluate_pending_badge_checks()
+
+        self.assertEqual(self._awarded(self.contributor), {self.users[0].id})
+        self.assertEqual(
+            set(PendingBadgeCheck.objects.values_list("corpus_id", "criteria_type")),
+            {(self.corpus.id, "message_count")},
+        )
+
+        evaluate_pending_badge_checks()
+        self.assertEqual(self._awarded(self.chatty), {self.users[0].id})
+        self.assertFalse(PendingBadgeCheck.objects.exists())
+
+    def test_structural_annotations_are_skipped(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self._annotate(self.users[0], count=5, structural=True)
+
+        self.assertFalse(PendingBadgeCheck.objects.exists())
+        self.assertFalse(
+            any("badges_pendingbadgecheck" in q["sql"] for q in ctx.captured_queries)
+        )
+
+    def test_pending_checks_are_evaluated_once_in_bulk(self):
+        self._post(self.users[0], count=3)
+        self._post(self.users[1], count=1)
+        self._annotate(self.users[1], count=5)
+        self._annotate(self.users[2], count=4)
+
+        result = evaluate_pending_badge_checks()
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["users_checked"], 3)
+        self.assertEqual(self._awarded(self.first_post), {u.id for u in self.users[:2]})
+        self.assertEqual(self._awarded(self.chatty), {self.users[0].id})
+        self.assertEqual(self._awarded(self.contributor), {self.users[1].id})
+        self.assertFalse(PendingBadgeCheck.objects.exists())
+
+        # Every award records a notification event, as awarding one by hand does
+        self.assertEqual(
+            set(
+                NotificationOutbox.objects.filter(
+                    event_type=NotificationEventTypeChoices.BADGE_AWARDED
+                ).values_list("object_id", flat=True)
+            ),
+            set(UserBadge.objects.values_list("pk", flat=True)),
+        )
+        self.assertEqual(result["awards_count"], 4)
+
+        # Nothing left to do, and no duplicate awards on later events.
+        self.assertEqual(evaluate_pending_badge_checks()["checks"], 0)
+        self._post(self.users[0])
+        evaluate_pending_badge_checks()
+        self.assertEqual(UserBadge.objects.filter(user=self.users[0]).count(), 2)
+
+    def test_evaluation_queries_do_not_scale_with_marked_users(self):
+        # Criteria are evaluated for all marked users at once; only the awards
+        # themselves are written one by one, so measure runs that award nothing.
+        def evaluation_queries(users):
+            for user in users:
+                UserBadge.objects.create(user=user, badge=self.first_post)
+                self._post(user)
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(evaluate_pending_badge_checks()["awards_count"], 0)
+            return len(ctx.captured_queries)
+
+        extra_users = [
+            User.objects.create_user(username=f"extra{i}", password="test")
+            for i in range(15)
+        ]
+        self.assertEqual(
+            evaluation_queries(self.users[:1]), evaluation_queries(extra_users)
+        )
+
+    def test_checks_marked_after_cutoff_stay_pending(self):
+        PendingBadgeCheck.mark(self.users[0].id, ["first_post"])
+        PendingBadgeCheck.objects.update(marked_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(evaluate_pending_badge_checks()["checks"], 0)
+        self.assertEqual(PendingBadgeCheck.objects.count(), 1)
+
+    def test_votes_mark_author_for_reputation_badges(self):
+        reputable = Badge.objects.create(
+            name="Reputable",
+            description="Two reputation",
+            icon="Star",
+            badge_type=BadgeTypeChoices.GLOBAL,
+            is_auto_awarded=True,
+            criteria_config={"type": BadgeCriteriaType.REPUTATION, "value": 2},
+            creator=self.admin,
+        )
+        self._post(self.users[0])
+        message = ChatMessage.objects.get(creator=self.users[0])
+        for voter in self.users[1:]:
+            MessageVote.objects.create(
+                message=message, vote_type=VoteType.UPVOTE, creator=voter
+            )
+
+        evaluate_pending_badge_checks()
+
+        self.assertEqual(self._awarded(reputable), {self.users[0].id})
+
+    def test_registry_evaluators_answer_for_many_users(self):
+        self._post(self.users[0], count=2)
+        self._post(self.users[1], count=5)
+
+        self.assertEqual(
+            BadgeCriteriaRegistry.qualifying_users(
+                {"type": "message_count", "value": 2},
+                [u.id for u in self.users],
+                self.corpus.id,
+            ),
+            {self.users[0].id, self.users[1].id},
+        )
+        self.assertEqual(
+            BadgeCriteriaRegistry.qualifying_users(
+                {"type": "message_count", "value": 3}, [u.id for u in self.users]
+            ),
+            {self.users[1].id},
+        )
@@ -13,6 +13,8 @@ Tests cover:
 7. Permission checks for badge management
 """
 
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.test import TestCase, TransactionTestCase
@@ -1302,10 +1304,12 @@ class TestBadgeAutoAwardTasks(TransactionTestCase):
             for i in range(4)
         ]
 
-        for voter in voters[:4]:
-            MessageVote.objects.create(
-                message=msg, vote_type=VoteType.UPVOTE, creator=voter
-            )
+        # Keep the votes' own badge evaluation from awarding it first
+        with patch("opencontractserver.badges.signals._schedule_evaluation"):
+            for voter in voters[:4]:
+                MessageVote.objects.create(
+                    message=msg, vote_type=VoteType.UPVOTE, creator=voter
+                )
 
         # Check badges for corpus context
         result = check_auto_badges(self.user.id, corpus_id=self.corpus.id)
@@ -14,6 +14,7 @@ from opencontractserver.annotations.models import (
 )
 from opencontractserver.corpuses.models import Corpus
 from opencontractserver.documents.models import Document
+from opencontractserver.pipeline.registry import reset_registry
 from opencontractserver.types.dicts import (
     OpenContractDocExport,
     OpenContractsAnnotationPythonType,
@@ -77,6 +78,7 @@ class MockParser(BaseParser):
         import opencontractserver.pipeline.parsers
 
         importlib.reload(opencontractserver.pipeline.parsers)
+        reset_registry()
 
     @classmethod
     def tearDownClass(cls) -> None:
@@ -86,6 +88,7 @@ class MockParser(BaseParser):
         for file_path in getattr(cls, "test_files", []):
             if os.path.exists(file_path):
                 os.remove(file_path)
+        reset_registry()
         super().tearDownClass()
 
     def setUp(self):
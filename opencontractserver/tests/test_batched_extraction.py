@@ -0,0 +1,207 @@
+"""
+Tests for batched (multi-column) datacell extraction.
+
+Fieldsets with ``batch_extraction`` enabled extract all of a document's
+default-extractor columns through one agent, one structured call per chunk of
+columns, instead of one agent run per datacell.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from pydantic_ai.agent import Agent
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+
+from opencontractserver.documents.models import Document
+from opencontractserver.extracts.models import Column, Datacell, Extract, Fieldset
+from opencontractserver.tasks.data_extract_tasks import (
+    DOC_EXTRACT_QUERY_TASK_NAME,
+    doc_extract_batch_task,
+)
+from opencontractserver.tasks.extract_orchestrator_tasks import run_extract
+
+User = get_user_model()
+
+STUB_MODEL = "stub-extractor"
+
+
+class _StubExtractor:
+    """
+    Fake LLM that fills every requested field it has an answer for.
+
+    Records the fields requested by each structured call so tests can check
+    how columns were batched.
+    """
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+
+    def respond(self, messages, info):
+        output_tool = info.output_tools[0]
+        fields = list(output_tool.parameters_json_schema["properties"])
+        self.calls.append(fields)
+        return ModelResponse(
+            parts=[
+                ToolCallPart(
+                    output_tool.name,
+                    {
+                        name: self.answers[name]
+                        for name in fields
+                        if name in self.answers
+                    },
+                )
+            ]
+        )
+
+    def agent_class(self):
+        """An Agent that swaps the stub model name for this FunctionModel."""
+        function_model = FunctionModel(self.respond)
+
+        class _StubAgent(Agent):
+            def __init__(self, model=None, **kwargs):
+                if model == STUB_MODEL:
+                    model = function_model
+                super().__init__(model=model, **kwargs)
+
+        return _StubAgent
+
+
+@override_settings(EXTRACT_BATCH_MAX_COLUMNS=2)
+class BatchedExtractionTest(TestCase):
+    def setUp(self):
+        # Agents build OpenAI clients eagerly; no request is ever sent.
+        env = patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.user = User.objects.create_user(username="batcher", password="test")
+        self.fieldset = Fieldset.objects.create(
+            name="Contract terms",
+            description="Key contract terms",
+            creator=self.user,
+            extraction_model=STUB_MODEL,
+            batch_extraction=True,
+        )
+        self.parties = Column.objects.create(
+            fieldset=self.fieldset,
+            name="Parties",
+            query="Who are the parties?",
+            output_type="str",
+            extract_is_list=True,
+            creator=self.user,
+        )
+        self.term = Column.objects.create(
+            fieldset=self.fieldset,
+            name="Term",
+            query="How many months does the agreement run?",
+            output_type="int",
+            creator=self.user,
+        )
+        self.law = Column.objects.create(
+            fieldset=self.fieldset,
+            name="Governing law",
+            query="Which law governs the agreement?",
+            output_type="str",
+            creator=self.user,
+        )
+        self.document = Document.objects.create(
+            title="Services Agreement",
+            description="A services agreement",
+            creator=self.user,
+        )
+        self.extract = Extract.objects.create(
+            name="Terms", fieldset=self.fieldset, creator=self.user
+        )
+
+        # The governing law is deliberately missing from the stub's answers.
+        self.stub = _StubExtractor(
+            {
+                f"column_{self.parties.id}": ["Acme Corp", "Globex Ltd"],
+                f"column_{self.term.id}": 24,
+            }
+        )
+        agent_patch = patch(
+            "opencontractserver.llms.agents.pydantic_ai_agents.PydanticAIAgent",
+            self.stub.agent_class(),
+        )
+        agent_patch.start()
+        self.addCleanup(agent_patch.stop)
+
+    def _cells(self):
+        return {
+            cell.column_id: cell
+            for cell in Datacell.objects.filter(extract=self.extract)
+        }
+
+    def test_batch_task_extracts_columns_in_chunks(self):
+        cells = [
+            Datacell.objects.create(
+                extract=self.extract,
+                column=column,
+                document=self.document,
+                data_definition=column.output_type,
+                creator=self.user,
+            )
+            for column in (self.parties, self.term, self.law)
+        ]
+
+        doc_extract_batch_task.si([cell.pk for cell in cells]).apply()
+
+        # Three columns with a chunk size of two -> two structured calls.
+        self.assertEqual(
+            self.stub.calls,
+            [
+                [f"column_{self.parties.id}", f"column_{self.term.id}"],
+                [f"column_{self.law.id}"],
+            ],
+        )
+
+        cells = self._cells()
+        self.assertEqual(
+            cells[self.parties.id].data, {"data": ["Acme Corp", "Globex Ltd"]}
+        )
+        self.assertEqual(cells[self.term.id].data, {"data": 24})
+        for column in (self.parties, self.term):
+            self.assertIsNotNone(cells[column.id].completed)
+            self.assertIsNone(cells[column.id].failed)
+            self.assertTrue(cells[column.id].llm_call_log)
+
+        law = cells[self.law.id]
+        self.assertIsNone(law.completed)
+        self.assertIsNotNone(law.failed)
+        self.assertIn("Failed to extract requested data", law.stacktrace)
+
+    def test_run_extract_groups_cells_per_document(self):
+        other = Column.objects.create(
+            fieldset=self.fieldset,
+            name="Custom",
+            query="Anything",
+            output_type="str",
+            task_name="opencontractserver.tasks.data_extract_tasks.custom_task",
+            creator=self.user,
+        )
+        self.assertEqual(self.parties.task_name, DOC_EXTRACT_QUERY_TASK_NAME)
+        self.extract.documents.add(self.document)
+
+        queued = []
+        with patch(
+            "opencontractserver.tasks.extract_orchestrator_tasks.get_task_by_name"
+        ) as get_task, patch.object(
+            doc_extract_batch_task,
+            "si",
+            side_effect=lambda ids: queued.append(ids) or MagicMock(),
+        ):
+            run_extract(self.extract.id, self.user.id)
+
+        cells = self._cells()
+        self.assertEqual(len(queued), 1)
+        self.assertEqual(
+            sorted(queued[0]),
+            sorted(cells[c.id].pk for c in (self.parties, self.term, self.law)),
+        )
+        # Columns with their own task still get one task per cell.
+        get_task.return_value.si.assert_called_once_with(cells[other.id].pk)
@@ -0,0 +1,157 @@
+"""
+Tests for keyset-paginated and streamed bulk annotation access.
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from graphene.test import Client
+from graphql_relay import from_global_id, to_global_id
+from rest_framework.test import APIClient
+
+from config.graphql.schema import schema
+from opencontractserver.annotations.models import Annotation, AnnotationLabel
+from opencontractserver.annotations.streaming import (
+    InvalidCursorError,
+    decode_annotation_cursor,
+    encode_annotation_cursor,
+)
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.documents.models import Document
+
+User = get_user_model()
+
+
+class TestContext:
+    def __init__(self, user):
+        self.user = user
+
+
+PAGE_QUERY = """
+    query BulkPage($corpusId: ID!, $documentId: ID!, $first: Int, $after: String) {
+        bulkDocAnnotationsInCorpusPage(
+            corpusId: $corpusId, documentId: $documentId, first: $first, after: $after
+        ) {
+            annotations { id page }
+            nextCursor
+            hasNextPage
+            pageSize
+        }
+    }
+"""
+
+
+@override_settings(BULK_ANNOTATION_PAGE_SIZE_DEFAULT=4, BULK_ANNOTATION_PAGE_SIZE_MAX=5)
+class BulkAnnotationPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="bulk_user", password="test")
+        self.other_user = User.objects.create_user(
+            username="bulk_other", password="test"
+        )
+        self.corpus = Corpus.objects.create(title="Bulk Corpus", creator=self.user)
+        self.doc = Document.objects.create(title="Bulk Doc", creator=self.user)
+        self.label = AnnotationLabel.objects.create(
+            text="Bulk Label", label_type="TOKEN_LABEL", creator=self.user
+        )
+
+        # Interleave page numbers so id order != (page, id) order.
+        self.annotations = []
+        for i in range(12):
+            self.annotations.append(
+                Annotation.objects.create(
+                    document=self.doc,
+                    corpus=self.corpus,
+                    annotation_label=self.label,
+                    raw_text=f"annotation {i}",
+                    page=(i * 7) % 4 + 1,
+                    creator=self.user,
+                )
+            )
+        self.expected_order = [
+            a.id for a in sorted(self.annotations, key=lambda a: (a.page, a.id))
+        ]
+
+        self.client = Client(schema, context_value=TestContext(self.user))
+        self.variables = {
+            "corpusId": to_global_id("CorpusType", self.corpus.id),
+            "documentId": to_global_id("DocumentType", self.doc.id),
+        }
+
+    def test_pages_cover_everything_in_page_id_order(self):
+        result = self.client.execute(PAGE_QUERY, variables=self.variables)
+        first_page = result["data"]["bulkDocAnnotationsInCorpusPage"]
+        self.assertEqual(first_page["pageSize"], 4)
+        self.assertEqual(len(first_page["annotations"]), 4)
+
+        seen, after = [], None
+        while True:
+            result = self.client.execute(
+                PAGE_QUERY, variables={**self.variables, "after": after}
+            )
+            page = result["data"]["bulkDocAnnotationsInCorpusPage"]
+            seen.extend(int(from_global_id(a["id"])[1]) for a in page["annotations"])
+            if not page["hasNextPage"]:
+                break
+            after = page["nextCursor"]
+
+        self.assertEqual(seen, self.expected_order)
+
+    def test_page_size_is_clamped_server_side(self):
+        result = self.client.execute(
+            PAGE_QUERY, variables={**self.variables, "first": 10_000}
+        )
+        page = result["data"]["bulkDocAnnotationsInCorpusPage"]
+        self.assertEqual(page["pageSize"], 5)
+        self.assertEqual(len(page["annotations"]), 5)
+        self.assertTrue(page["hasNextPage"])
+
+    def test_invalid_cursor_returns_error(self):
+        result = self.client.execute(
+            PAGE_QUERY, variables={**self.variables, "after": "not-a-cursor"}
+        )
+        self.assertIsNotNone(result.get("errors"))
+        self.assertIn("Invalid annotation cursor", result["errors"][0]["message"])
+
+    def test_other_user_sees_nothing(self):
+        client = Client(schema, context_value=TestContext(self.other_user))
+        result = client.execute(PAGE_QUERY, variables=self.variables)
+        page = result["data"]["bulkDocAnnotationsInCorpusPage"]
+        self.assertEqual(page["annotations"], [])
+        self.assertFalse(page["hasNextPage"])
+
+    def test_cursor_round_trip(self):
+        cursor = encode_annotation_cursor(3, 42)
+        self.assertEqual(decode_annotation_cursor(cursor), (3, 42))
+        with self.assertRaises(InvalidCursorError):
+            decode_annotation_cursor("Zm9vOjE6Mg==")  # "foo:1:2"
+
+    def test_ndjson_stream(self):
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.user)
+        response = api_client.get(
+            f"/api/documents/{self.doc.id}/annotations.ndjson",
+            {"corpus_id": self.corpus.id},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row["id"] for row in rows], self.expected_order)
+        self.assertEqual(rows[0]["annotation_label__text"], "Bulk Label")
+
+    def test_ndjson_stream_requires_visible_document(self):
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.other_user)
+        response = api_client.get(
+            f"/api/documents/{self.doc.id}/annotations.ndjson",
+            {"corpus_id": self.corpus.id},
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_ndjson_stream_requires_corpus_id(self):
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.user)
+        response = api_client.get(f"/api/documents/{self.doc.id}/annotations.ndjson")
+        self.assertEqual(response.status_code, 400)
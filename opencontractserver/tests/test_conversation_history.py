@@ -0,0 +1,193 @@
+"""
+Tests for windowed agent history with a rolling conversation summary.
+"""
+
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+
+from opencontractserver.conversations.models import ChatMessage, Conversation
+from opencontractserver.llms.agents.conversation_history import (
+    SUMMARY_CONTEXT_PREFIX,
+    ConversationHistoryManager,
+    estimate_tokens,
+)
+from opencontractserver.llms.agents.core_agents import (
+    AgentConfig,
+    CoreConversationManager,
+)
+from opencontractserver.llms.agents.pydantic_ai_agents import PydanticAICoreAgent
+from opencontractserver.llms.client import ChatResponse
+
+User = get_user_model()
+
+
+class _FakeSummaryClient:
+    """Deterministic stand-in for SimpleLLMClient that records its prompts."""
+
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, messages, **kwargs):
+        self.calls.append(messages)
+        return ChatResponse(
+            content=f"summary #{len(self.calls)} ({len(messages[-1].content)} chars)",
+            model="fake",
+        )
+
+
+@override_settings(AGENT_HISTORY_SUMMARY_BATCH_SIZE=4)
+class ConversationHistoryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="historian", password="test")
+        self.conversation = Conversation.objects.create(
+            title="Long Convo", creator=self.user
+        )
+
+    def _add_turns(self, count, answer="answer", first=0):
+        start = timezone.now() - timedelta(hours=1)
+        messages = []
+        for i in range(first, first + count):
+            for offset, (msg_type, content) in enumerate(
+                (("HUMAN", f"question {i}"), ("LLM", f"{answer} {i}"))
+            ):
+                message = ChatMessage.objects.create(
+                    conversation=self.conversation,
+                    msg_type=msg_type,
+                    content=content,
+                    creator=self.user,
+                )
+                ChatMessage.all_objects.filter(id=message.id).update(
+                    created=start + timedelta(seconds=i * 2 + offset)
+                )
+                messages.append(message)
+        return messages
+
+    def test_window_keeps_last_turns_verbatim(self):
+        self._add_turns(12)
+
+        window = ConversationHistoryManager(
+            self.conversation, max_turns=3, token_budget=10_000
+        ).get_window()
+
+        self.assertEqual(
+            [message.content for message in window.messages],
+            [
+                "question 9",
+                "answer 9",
+                "question 10",
+                "answer 10",
+                "question 11",
+                "answer 11",
+            ],
+        )
+        self.assertEqual(window.summary, "")
+        self.assertTrue(window.summary_stale)
+
+    def test_window_is_trimmed_to_token_budget(self):
+        self._add_turns(4, answer="x" * 400)
+
+        budget = estimate_tokens("question 3") + estimate_tokens("x" * 400 + " 3")
+        window = ConversationHistoryManager(
+            self.conversation, max_turns=4, token_budget=budget
+        ).get_window()
+
+        self.assertEqual(
+            [message.content for message in window.messages],
+            ["question 3", "x" * 400 + " 3"],
+        )
+
+    def test_short_conversation_is_not_stale(self):
+        self._add_turns(2)
+
+        window = ConversationHistoryManager(self.conversation, max_turns=5).get_window()
+
+        self.assertEqual(len(window.messages), 4)
+        self.assertFalse(window.summary_stale)
+
+    def test_refresh_folds_older_turns_in_batches(self):
+        messages = self._add_turns(8)
+        manager = ConversationHistoryManager(
+            self.conversation, max_turns=2, token_budget=10_000
+        )
+        client = _FakeSummaryClient()
+
+        self.assertTrue(manager.refresh_summary(client=client))
+
+        # 12 messages precede the 4-message window -> 3 batches of 4.
+        self.assertEqual(len(client.calls), 3)
+        self.assertIn("User: question 0", client.calls[0][-1].content)
+        self.assertIn("summary #1", client.calls[1][-1].content)
+
+        self.conversation.refresh_from_db()
+        self.assertTrue(self.conversation.history_summary.startswith("summary #3"))
+        self.assertEqual(self.conversation.history_summary_through_id, messages[11].id)
+        self.assertIsNotNone(self.conversation.history_summary_updated_at)
+
+        window = manager.get_window()
+        self.assertFalse(window.summary_stale)
+        self.assertEqual(window.summary, self.conversation.history_summary)
+
+        # Nothing new fell out of the window, so nothing to do.
+        self.assertFalse(manager.refresh_summary(client=client))
+        self.assertEqual(len(client.calls), 3)
+
+        # A new turn pushes one more turn out of the window.
+        self._add_turns(1, first=8)
+        self.assertTrue(manager.refresh_summary(client=client))
+        self.assertEqual(len(client.calls), 4)
+
+    async def test_agent_history_uses_summary_and_window(self):
+        await sync_to_async(self._add_turns)(6)
+        await Conversation.all_objects.filter(pk=self.conversation.pk).aupdate(
+            history_summary="They discussed the indemnity clause."
+        )
+        manager = CoreConversationManager(
+            self.conversation, self.user.id, AgentConfig(user_id=self.user.id)
+        )
+        agent = SimpleNamespace(conversation_manager=manager)
+
+        with override_settings(AGENT_HISTORY_MAX_TURNS=2), patch(
+            "opencontractserver.tasks.agent_tasks.refresh_conversation_summary.delay"
+        ) as delay:
+            history = await PydanticAICoreAgent._get_message_history(agent)
+
+        delay.assert_called_once_with(self.conversation.pk)
+        self.assertEqual(len(history), 5)
+        self.assertIsInstance(history[0], ModelRequest)
+        self.assertIsInstance(history[0].parts[0], SystemPromptPart)
+        self.assertEqual(
+            history[0].parts[0].content,
+            f"{SUMMARY_CONTEXT_PREFIX}They discussed the indemnity clause.",
+        )
+        self.assertIsInstance(history[1].parts[0], UserPromptPart)
+        self.assertEqual(history[1].parts[0].content, "question 4")
+        self.assertIsInstance(history[-1], ModelResponse)
+        self.assertIsInstance(history[-1].parts[0], TextPart)
+        self.assertEqual(history[-1].parts[0].content, "answer 5")
+
+    def test_refresh_is_scheduled_once_while_pending(self):
+        self._add_turns(6)
+        manager = ConversationHistoryManager(self.conversation, max_turns=2)
+
+        with patch(
+            "opencontractserver.tasks.agent_tasks.refresh_conversation_summary.delay"
+        ) as delay:
+            self.assertTrue(manager.schedule_summary_refresh())
+            self.assertFalse(manager.schedule_summary_refresh())
+
+        delay.assert_called_once_with(self.conversation.pk)
@@ -164,12 +164,12 @@ class TestAgentContexts(TestCoreAgentComponentsSetup):
         )  # Config object should be the same instance
         self.assertIsNotNone(context.documents)
 
-        doc_ids_in_context = {doc.id for doc in context.documents}
+        doc_ids_in_context = {doc.id async for doc in context.documents}
 
         # Check that corpus-isolated copies are found in the context
         self.assertIn(corpus_doc1.id, doc_ids_in_context)
         self.assertIn(corpus_doc2.id, doc_ids_in_context)
-        self.assertEqual(len(context.documents), 2)  # Expecting two documents
+        self.assertEqual(await context.documents.acount(), 2)  # Expecting two documents
 
         # Check if corpus preferred embedder was used (this part of the logic remains)
         self.assertEqual(config.embedder_path, "test/embedder/corpus_default")
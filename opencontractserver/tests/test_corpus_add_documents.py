@@ -0,0 +1,226 @@
+"""
+Tests for the bulk Corpus.add_documents() API.
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from opencontractserver.corpuses.folder_service import DocumentFolderService
+from opencontractserver.corpuses.models import Corpus, CorpusFolder
+from opencontractserver.documents.models import Document, DocumentPath
+from opencontractserver.types.enums import PermissionTypes
+from opencontractserver.utils.permissioning import user_has_permission_for_obj
+
+User = get_user_model()
+
+
+class CorpusAddDocumentsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="bulk_adder", password="test")
+        self.corpus = Corpus.objects.create(title="Bulk Add", creator=self.user)
+
+    def _doc(self, title, content_hash=None):
+        return Document.objects.create(
+            title=title, pdf_file_hash=content_hash, creator=self.user
+        )
+
+    def _current_paths(self):
+        return DocumentPath.objects.filter(
+            corpus=self.corpus, is_current=True, is_deleted=False
+        )
+
+    def test_adds_isolated_copies_in_input_order(self):
+        folder = CorpusFolder.objects.create(
+            name="Inbox", corpus=self.corpus, creator=self.user
+        )
+        sources = [self._doc(f"Doc {i}", f"hash-{i}") for i in range(5)]
+
+        results = self.corpus.add_documents(sources, user=self.user, folder=folder)
+
+        self.assertEqual(len(results), 5)
+        for source, (corpus_doc, status, path_record) in zip(sources, results):
+            self.assertEqual(status, "added")
+            self.assertNotEqual(corpus_doc.pk, source.pk)
+            self.assertEqual(corpus_doc.source_document_id, source.pk)
+            self.assertNotEqual(corpus_doc.version_tree_id, source.version_tree_id)
+            self.assertEqual(path_record.document_id, corpus_doc.pk)
+            self.assertEqual(path_record.folder_id, folder.pk)
+            self.assertEqual(path_record.version_number, 1)
+            self.assertEqual(
+                path_record.path, self.corpus._default_document_path(source)
+            )
+
+        self.assertEqual(self._current_paths().count(), 5)
+        self.assertEqual(
+            set(self.corpus.documents.values_list("pk", flat=True)),
+            {corpus_doc.pk for corpus_doc, _, _ in results},
+        )
+
+    def test_dedupes_against_corpus_and_within_batch(self):
+        existing, _, existing_path = self.corpus.add_document(
+            document=self._doc("Existing", "same"), user=self.user
+        )
+
+        results = self.corpus.add_documents(
+            [
+                self._doc("Again", "same"),
+                self._doc("New", "fresh"),
+                self._doc("New copy", "fresh"),
+                self._doc("No hash 1"),
+                self._doc("No hash 2"),
+            ],
+            user=self.user,
+        )
+        statuses = [status for _, status, _ in results]
+
+        self.assertEqual(
+            statuses, ["already_exists", "added", "already_exists", "added", "added"]
+        )
+        self.assertEqual(results[0][0].pk, existing.pk)
+        self.assertEqual(results[0][2].pk, existing_path.pk)
+        self.assertEqual(results[2][0].pk, results[1][0].pk)
+        # NULL hashes never dedupe
+        self.assertNotEqual(results[3][0].pk, results[4][0].pk)
+
+    def test_path_conflicts_keep_version_chain(self):
+        _, _, original_path = self.corpus.add_document(
+            document=self._doc("Report", "v1"), user=self.user
+        )
+
+        results = self.corpus.add_documents(
+            [self._doc("Report", "v2"), self._doc("Report", "v3")], user=self.user
+        )
+        (doc_v2, _, path_v2), (doc_v3, _, path_v3) = results
+
+        original_path.refresh_from_db()
+        path_v2.refresh_from_db()
+        self.assertFalse(original_path.is_current)
+        self.assertFalse(path_v2.is_current)
+        self.assertTrue(path_v3.is_current)
+        self.assertEqual(path_v2.parent_id, original_path.pk)
+        self.assertEqual(path_v3.parent_id, path_v2.pk)
+        self.assertEqual(
+            [
+                original_path.version_number,
+                path_v2.version_number,
+                path_v3.version_number,
+            ],
+            [1, 2, 3],
+        )
+        current = self._current_paths().get(path=original_path.path)
+        self.assertEqual(current.document_id, doc_v3.pk)
+
+    def _add_one_by_one(self, corpus, sources):
+        return [
+            corpus.add_document(document=source, user=self.user) for source in sources
+        ]
+
+    def _result_shape(self, results):
+        """Statuses, plus which result each document is a copy or duplicate of."""
+        first_result = {}
+        outcome = []
+        for index, (corpus_doc, status, _) in enumerate(results):
+            outcome.append((status, first_result.setdefault(corpus_doc.pk, index)))
+        return outcome
+
+    def test_superseded_paths_stop_deduping_as_with_single_adds(self):
+        # B replaces A at A's path, so C (A's content) is added afresh; the
+        # existing document at "Draft" is replaced by D, so E is added too.
+        self.corpus.add_document(document=self._doc("Draft", "draft"), user=self.user)
+        sources = [
+            self._doc("Report", "a"),
+            self._doc("Report", "b"),
+            self._doc("Copy of A", "a"),
+            self._doc("Draft", "d"),
+            self._doc("Copy of draft", "draft"),
+            self._doc("Copy of B", "b"),
+        ]
+        one_by_one = Corpus.objects.create(title="Singles", creator=self.user)
+        one_by_one.add_document(document=self._doc("Draft", "draft"), user=self.user)
+
+        bulk = self._result_shape(self.corpus.add_documents(sources, user=self.user))
+
+        self.assertEqual(
+            bulk, self._result_shape(self._add_one_by_one(one_by_one, sources))
+        )
+        self.assertEqual(
+            [status for status, _ in bulk],
+            ["added", "added", "added", "added", "added", "already_exists"],
+        )
+        self.assertEqual(bulk[5][1], 1)
+
+    def test_path_and_m2m_rows_are_bulk_inserted(self):
+        sources = [self._doc(f"Bulk {i}", f"bulk-{i}") for i in range(10)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.corpus.add_documents(sources, user=self.user)
+
+        path_table = DocumentPath._meta.db_table
+        m2m_table = Corpus.documents.through._meta.db_table
+        inserts = [
+            q["sql"] for q in ctx.captured_queries if q["sql"].startswith("INSERT")
+        ]
+        self.assertEqual(sum(f'"{path_table}"' in sql for sql in inserts), 1)
+        self.assertEqual(sum(f'"{m2m_table}"' in sql for sql in inserts), 1)
+        dedupe_lookups = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if '"pdf_file_hash" IN' in q["sql"] and q["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(len(dedupe_lookups), 1)
+
+    def test_folder_service_uses_bulk_add(self):
+        sources = [self._doc(f"Svc {i}", f"svc-{i}") for i in range(3)]
+
+        added_count, added_ids, error = DocumentFolderService.add_documents_to_corpus(
+            user=self.user,
+            document_ids=[doc.pk for doc in sources],
+            corpus=self.corpus,
+        )
+
+        self.assertEqual(error, "")
+        self.assertEqual(added_count, 3)
+        self.assertEqual(
+            set(self._current_paths().values_list("document_id", flat=True)),
+            set(added_ids),
+        )
+        for corpus_doc in Document.objects.filter(pk__in=added_ids):
+            self.assertTrue(
+                user_has_permission_for_obj(
+                    self.user, corpus_doc, PermissionTypes.UPDATE
+                )
+            )
+
+    def test_folder_service_reports_errors_per_document_if_the_batch_fails(self):
+        sources = [self._doc(f"Svc {i}", f"svc-{i}") for i in range(3)]
+        broken = sources[1]
+        add_document = Corpus.add_document
+
+        def fail_for_broken(corpus, document=None, **kwargs):
+            if document.pk == broken.pk:
+                raise ValueError("unreadable")
+            return add_document(corpus, document=document, **kwargs)
+
+        with patch.object(
+            Corpus, "add_documents", side_effect=ValueError("unreadable")
+        ), patch.object(Corpus, "add_document", fail_for_broken):
+            added_count, added_ids, error = (
+                DocumentFolderService.add_documents_to_corpus(
+                    user=self.user,
+                    document_ids=[doc.pk for doc in sources],
+                    corpus=self.corpus,
+                )
+            )
+
+        self.assertEqual(added_count, 2)
+        self.assertEqual(
+            set(self._current_paths().values_list("document_id", flat=True)),
+            set(added_ids),
+        )
+        self.assertEqual(
+            error, f"Doc {broken.pk}: Error adding document to corpus: unreadable"
+        )
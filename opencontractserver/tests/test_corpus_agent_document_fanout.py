@@ -0,0 +1,173 @@
+"""
+Tests for concurrent ask_document(s) fan-out in the corpus agent.
+"""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.documents.models import Document
+from opencontractserver.llms.agents.core_agents import (
+    AgentConfig,
+    ContentEvent,
+    CoreDocumentAgentFactory,
+    FinalEvent,
+)
+from opencontractserver.llms.agents.pydantic_ai_agents import (
+    PydanticAICorpusAgent,
+    PydanticAIDocumentAgent,
+)
+
+User = get_user_model()
+
+
+class _ConcurrencyRecordingLLM:
+    """Stands in for document sub-agent streams and records how many overlap."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.active = 0
+        self.peak = 0
+        self.questions = []
+
+    def as_stream(self):
+        """Return a replacement for PydanticAIDocumentAgent.stream."""
+        llm = self
+
+        async def _stream(agent, message, **kwargs):
+            llm.active += 1
+            llm.peak = max(llm.peak, llm.active)
+            llm.questions.append((agent.context.document.id, message))
+            try:
+                await asyncio.sleep(llm.latency)
+                answer = f"answer from {agent.context.document.id}"
+                yield ContentEvent(content=answer)
+                yield FinalEvent(accumulated_content=answer, sources=[], metadata={})
+            finally:
+                llm.active -= 1
+
+        return _stream
+
+
+@override_settings(CORPUS_AGENT_MAX_CONCURRENT_DOCUMENT_QUERIES=3)
+class CorpusAgentDocumentFanoutTest(TestCase):
+    def setUp(self):
+        # Agents build OpenAI clients eagerly; no request is ever sent.
+        env = patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.user = User.objects.create_user(username="fanout", password="test")
+        self.corpus = Corpus.objects.create(title="Fan-out", creator=self.user)
+        self.other_corpus = Corpus.objects.create(title="Other", creator=self.user)
+        self.doc_ids = []
+        for i in range(8):
+            corpus_doc, _, _ = self.corpus.add_document(
+                document=Document.objects.create(
+                    title=f"Doc {i}", pdf_file_hash=f"fanout-{i}", creator=self.user
+                ),
+                user=self.user,
+            )
+            self.doc_ids.append(corpus_doc.id)
+        outsider, _, _ = self.other_corpus.add_document(
+            document=Document.objects.create(
+                title="Outsider", pdf_file_hash="outsider", creator=self.user
+            ),
+            user=self.user,
+        )
+        self.outsider_id = outsider.id
+
+    async def _corpus_agent(self):
+        config = AgentConfig(
+            user_id=self.user.id,
+            embedder_path="test/embedder",
+            store_user_messages=False,
+            store_llm_messages=False,
+        )
+        return await PydanticAICorpusAgent.create(corpus=self.corpus, config=config)
+
+    def _coordinator_model(self, tool_name, args):
+        """Fake coordinator LLM: one tool call, then echo what the tool returned."""
+        self.tool_results = []
+
+        def respond(messages, info):
+            returns = [
+                part
+                for message in messages
+                for part in message.parts
+                if part.part_kind == "tool-return"
+            ]
+            if not returns:
+                return ModelResponse(parts=[ToolCallPart(tool_name, args)])
+            self.tool_results.append(returns[-1].content)
+            return ModelResponse(parts=[TextPart("done")])
+
+        return FunctionModel(respond)
+
+    async def test_ask_documents_runs_bounded_concurrent_fanout(self):
+        llm = _ConcurrencyRecordingLLM()
+        agent = await self._corpus_agent()
+        model = self._coordinator_model(
+            "ask_documents",
+            {"document_ids": self.doc_ids + [self.outsider_id], "question": "Term?"},
+        )
+
+        with patch.object(
+            PydanticAIDocumentAgent, "stream", llm.as_stream()
+        ), agent.pydantic_ai_agent.override(model=model):
+            await agent.chat("Summarise the term of every document")
+
+        self.assertEqual(llm.peak, 3)
+        self.assertEqual(
+            sorted(doc_id for doc_id, _ in llm.questions), sorted(self.doc_ids)
+        )
+        results = self.tool_results[0]
+        self.assertEqual(
+            [entry["document_id"] for entry in results],
+            self.doc_ids + [self.outsider_id],
+        )
+        for doc_id, entry in zip(self.doc_ids, results):
+            self.assertEqual(entry["answer"], f"answer from {doc_id}")
+        self.assertIn("does not belong", results[-1]["error"])
+
+    async def test_document_contexts_are_reused_within_conversation(self):
+        llm = _ConcurrencyRecordingLLM(latency=0)
+        agent = await self._corpus_agent()
+        target_ids = self.doc_ids[:2]
+
+        create_context = CoreDocumentAgentFactory.create_context
+        with patch.object(
+            CoreDocumentAgentFactory, "create_context", wraps=create_context
+        ) as built, patch.object(PydanticAIDocumentAgent, "stream", llm.as_stream()):
+            for _ in range(3):
+                model = self._coordinator_model(
+                    "ask_documents",
+                    {"document_ids": target_ids, "question": "Parties?"},
+                )
+                with agent.pydantic_ai_agent.override(model=model):
+                    await agent.chat("Who are the parties?")
+
+        self.assertEqual(built.call_count, len(target_ids))
+        self.assertEqual(len(llm.questions), 3 * len(target_ids))
+
+        # A fresh corpus agent (new conversation) builds its own contexts.
+        other_agent = await self._corpus_agent()
+        model = self._coordinator_model(
+            "ask_document", {"document_id": target_ids[0], "question": "Parties?"}
+        )
+        with patch.object(
+            CoreDocumentAgentFactory, "create_context", wraps=create_context
+        ) as built, patch.object(
+            PydanticAIDocumentAgent, "stream", llm.as_stream()
+        ), other_agent.pydantic_ai_agent.override(
+            model=model
+        ):
+            await other_agent.chat("Who are the parties?")
+        self.assertEqual(built.call_count, 1)
+        self.assertEqual(self.tool_results[0]["answer"], f"answer from {target_ids[0]}")
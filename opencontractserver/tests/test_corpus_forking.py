@@ -1,12 +1,23 @@
 import base64
 import pathlib
 import uuid
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.core.files.base import ContentFile
 from django.db import transaction
-
+from django.test import TestCase
+from django.utils import timezone
+
+from opencontractserver.annotations.models import (
+    Annotation,
+    AnnotationLabel,
+    Embedding,
+    LabelSet,
+    StructuralAnnotationSet,
+)
 from opencontractserver.corpuses.models import Corpus, TemporaryFileHandle
+from opencontractserver.documents.models import Document
 from opencontractserver.tasks import import_corpus
 from opencontractserver.tasks.utils import package_zip_into_base64
 from opencontractserver.types.enums import PermissionTypes
@@ -100,3 +111,131 @@ class CorpusForkTestCase:
         print("\t\tSUCCESS")
 
         # TODO - improve tests to actually check data integrity of cloned objs...
+
+
+class CorpusForkEmbeddingTestCase(TestCase):
+    """fork_corpus copies embeddings instead of recomputing them."""
+
+    EMBEDDER_PATH = "opencontractserver.pipeline.embedders.test.Embedder"
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="12345678")
+        self.forker = User.objects.create_user(username="forker", password="12345678")
+
+        label = AnnotationLabel.objects.create(text="Clause", creator=self.owner)
+        label_set = LabelSet.objects.create(title="Labels", creator=self.owner)
+        label_set.annotation_labels.add(label)
+
+        self.corpus = Corpus.objects.create(
+            title="Source",
+            creator=self.owner,
+            label_set=label_set,
+            preferred_embedder=self.EMBEDDER_PATH,
+        )
+        # The source is set up without running the embedder
+        self.corpus._skip_embedding = True
+
+        self.structural_set = StructuralAnnotationSet.objects.create(
+            content_hash="fork-test-hash", creator=self.owner
+        )
+        document = Document.objects.create(
+            title="Contract",
+            creator=self.owner,
+            pdf_file_hash="fork-test-hash",
+            processing_started=timezone.now(),
+            structural_annotation_set=self.structural_set,
+        )
+        self.document, _, _ = self.corpus.add_document(
+            document=document, user=self.owner
+        )
+        Embedding.objects.create(
+            document=self.document,
+            embedder_path=self.EMBEDDER_PATH,
+            vector_384=[0.5] * 384,
+            creator=self.owner,
+        )
+
+        self.parent = self._create_annotation(label, "Section 1")
+        self.child = self._create_annotation(label, "Clause 1.1", parent=self.parent)
+        self.unembedded = self._create_annotation(label, "Clause 1.2")
+        self.structural = self._create_annotation(label, "Header", structural=True)
+        for index, annotation in enumerate((self.parent, self.child)):
+            Embedding.objects.create(
+                annotation=annotation,
+                embedder_path=self.EMBEDDER_PATH,
+                vector_384=[float(index)] * 384,
+                creator=self.owner,
+            )
+
+    def _create_annotation(self, label, text, parent=None, structural=False):
+        annotation = Annotation(
+            raw_text=text,
+            document=self.document,
+            corpus=self.corpus,
+            annotation_label=label,
+            parent=parent,
+            structural=structural,
+            creator=self.owner,
+        )
+        annotation._skip_embedding = True
+        annotation.save()
+        return annotation
+
+    @patch("opencontractserver.tasks.fork_tasks.calculate_embedding_for_doc_text")
+    @patch(
+        "opencontractserver.tasks.fork_tasks.calculate_embedding_for_annotation_text"
+    )
+    @patch("opencontractserver.documents.signals.calculate_embedding_for_doc_text")
+    @patch(
+        "opencontractserver.annotations.signals.calculate_embedding_for_annotation_text"
+    )
+    def test_fork_copies_embeddings(
+        self,
+        annotation_signal_task,
+        doc_signal_task,
+        fork_annotation_task,
+        fork_doc_task,
+    ):
+        with self.captureOnCommitCallbacks(execute=True):
+            forked_id = (
+                build_fork_corpus_task(self.corpus.id, self.forker).apply().get()
+            )
+
+        forked_corpus = Corpus.objects.get(id=forked_id)
+        self.assertFalse(forked_corpus.error)
+
+        # The forked document is an isolated copy sharing the structural set
+        forked_document = forked_corpus.get_documents().get()
+        self.assertNotEqual(forked_document.pk, self.document.pk)
+        self.assertEqual(forked_document.source_document_id, self.document.pk)
+        self.assertEqual(
+            forked_document.structural_annotation_set_id, self.structural_set.pk
+        )
+        self.assertEqual(
+            list(forked_document.embedding_set.get().vector_384), [0.5] * 384
+        )
+
+        # Structural annotations come from the shared set, not copies
+        forked = {
+            annotation.raw_text: annotation
+            for annotation in Annotation.objects.filter(corpus=forked_corpus)
+        }
+        self.assertEqual(set(forked), {"Section 1", "Clause 1.1", "Clause 1.2"})
+        for annotation in forked.values():
+            self.assertEqual(annotation.document_id, forked_document.pk)
+        self.assertEqual(forked["Clause 1.1"].parent_id, forked["Section 1"].pk)
+
+        self.assertEqual(
+            list(forked["Section 1"].embedding_set.get().vector_384), [0.0] * 384
+        )
+        self.assertEqual(
+            list(forked["Clause 1.1"].embedding_set.get().vector_384), [1.0] * 384
+        )
+
+        # Nothing is re-embedded except the annotation the source had no vector for
+        annotation_signal_task.si.assert_not_called()
+        doc_signal_task.delay.assert_not_called()
+        fork_doc_task.delay.assert_not_called()
+        fork_annotation_task.delay.assert_called_once_with(
+            annotation_id=forked["Clause 1.2"].pk, embedder_path=self.EMBEDDER_PATH
+        )
@@ -0,0 +1,250 @@
+"""
+Tests for the content-addressed datacell result cache.
+"""
+
+from io import StringIO
+from unittest.mock import AsyncMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.documents.models import Document
+from opencontractserver.extracts import result_cache
+from opencontractserver.extracts.models import (
+    Column,
+    Datacell,
+    DatacellResultCache,
+    Extract,
+    Fieldset,
+)
+from opencontractserver.extracts.result_cache import get_cache_stats
+from opencontractserver.llms import agents
+from opencontractserver.tasks.data_extract_tasks import (
+    doc_extract_batch_task,
+    doc_extract_query_task,
+)
+
+User = get_user_model()
+
+
+@override_settings(EXTRACT_RESULT_CACHE_ENABLED=True)
+class DatacellResultCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="cacher", password="test")
+        self.fieldset = Fieldset.objects.create(
+            name="Terms",
+            description="Contract terms",
+            creator=self.user,
+            extraction_model="model-a",
+        )
+        self.column = Column.objects.create(
+            fieldset=self.fieldset,
+            name="Parties",
+            query="Who are the parties?",
+            output_type="str",
+            creator=self.user,
+        )
+        self.document = Document.objects.create(
+            title="Agreement", creator=self.user, pdf_file_hash="a" * 64
+        )
+        # Same content, e.g. the copy of the document in a forked corpus.
+        self.copy = Document.objects.create(
+            title="Agreement (fork)", creator=self.user, pdf_file_hash="a" * 64
+        )
+        self.llm = AsyncMock(return_value="Acme Corp")
+        llm_patch = patch.object(
+            agents, "get_structured_response_from_document", self.llm
+        )
+        llm_patch.start()
+        self.addCleanup(llm_patch.stop)
+
+    def _extract(self, document=None, user=None):
+        user = user or self.user
+        extract = Extract.objects.create(
+            name="Run", fieldset=self.fieldset, creator=user
+        )
+        cell = Datacell.objects.create(
+            extract=extract,
+            column=self.column,
+            document=document or self.document,
+            data_definition=self.column.output_type,
+            creator=user,
+        )
+        doc_extract_query_task.si(cell.pk).apply()
+        cell.refresh_from_db()
+        return cell
+
+    def test_rerun_and_copies_reuse_cached_result(self):
+        first = self._extract()
+        rerun = self._extract()
+        copied = self._extract(document=self.copy)
+
+        self.assertEqual(self.llm.await_count, 1)
+        for cell in (first, rerun, copied):
+            self.assertEqual(cell.data, {"data": "Acme Corp"})
+            self.assertIsNotNone(cell.completed)
+
+        # The original run's LLM log is never handed to the cells served from
+        # the cache; they only record where their result came from.
+        for cell in (rerun, copied):
+            self.assertTrue(cell.llm_call_log.startswith("Served from cache"))
+
+        stats = get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["entry_hits"], 2)
+
+    def test_column_or_model_change_misses(self):
+        self._extract()
+
+        self.column.query = "Who signed the agreement?"
+        self.column.save()
+        self._extract()
+
+        self.fieldset.extraction_model = "model-b"
+        self.fieldset.save()
+        self._extract()
+
+        # Renaming a column doesn't change what gets extracted.
+        self.column.name = "Signatories"
+        self.column.save()
+        self._extract()
+
+        self.assertEqual(self.llm.await_count, 3)
+        self.assertEqual(DatacellResultCache.objects.count(), 3)
+
+    def test_results_are_scoped_to_user_and_corpus(self):
+        self._extract()
+
+        # Another user's run never sees the first user's result
+        other_user = User.objects.create_user(username="tenant", password="test")
+        other = self._extract(user=other_user)
+        self.assertEqual(self.llm.await_count, 2)
+        self.assertFalse(other.llm_call_log.startswith("Served from cache"))
+
+        # Nor does the same content extracted within a corpus
+        corpus = Corpus.objects.create(title="Corpus", creator=self.user)
+        corpus.documents.add(self.copy)
+        self._extract(document=self.copy)
+        self.assertEqual(self.llm.await_count, 3)
+
+        self.assertEqual(
+            set(DatacellResultCache.objects.values_list("corpus_id", "creator_id")),
+            {(None, self.user.id), (None, other_user.id), (corpus.id, self.user.id)},
+        )
+
+    def test_forked_corpora_reuse_cached_result(self):
+        corpus = Corpus.objects.create(title="Source", creator=self.user)
+        corpus.documents.add(self.document)
+        fork = Corpus.objects.create(title="Fork", creator=self.user, parent=corpus)
+        fork.documents.add(self.copy)
+        fork_of_fork = Corpus.objects.create(
+            title="Fork of fork", creator=self.user, parent=fork
+        )
+        third = Document.objects.create(
+            title="Agreement (fork of fork)", creator=self.user, pdf_file_hash="a" * 64
+        )
+        fork_of_fork.documents.add(third)
+
+        self._extract()
+        cells = [self._extract(document=self.copy), self._extract(document=third)]
+
+        self.assertEqual(self.llm.await_count, 1)
+        for cell in cells:
+            self.assertEqual(cell.data, {"data": "Acme Corp"})
+            self.assertTrue(cell.llm_call_log.startswith("Served from cache"))
+        self.assertEqual(DatacellResultCache.objects.get().corpus_id, corpus.id)
+
+    def test_text_hash_is_computed_once_per_document_per_extract(self):
+        document = Document.objects.create(title="Text only", creator=self.user)
+        document.txt_extract_file.save("terms.txt", ContentFile(b"Acme and Beta"))
+        second_column = Column.objects.create(
+            fieldset=self.fieldset,
+            name="Term",
+            query="How long does the agreement last?",
+            output_type="str",
+            creator=self.user,
+        )
+        extract = Extract.objects.create(
+            name="Run", fieldset=self.fieldset, creator=self.user
+        )
+        cells = [
+            Datacell.objects.create(
+                extract=extract,
+                column=column,
+                document=document,
+                data_definition=column.output_type,
+                creator=self.user,
+            )
+            for column in (self.column, second_column)
+        ]
+
+        with patch.object(
+            result_cache,
+            "document_content_hash",
+            wraps=result_cache.document_content_hash,
+        ) as content_hash:
+            for cell in cells:
+                doc_extract_query_task.si(cell.pk).apply()
+            doc_extract_batch_task.si([cell.pk for cell in cells]).apply()
+
+        self.assertEqual(content_hash.call_count, 1)
+        self.assertEqual(DatacellResultCache.objects.count(), 2)
+        self.assertEqual(self.llm.await_count, 2)
+
+    def test_failed_extractions_are_not_cached(self):
+        self.llm.return_value = None
+
+        self._extract()
+        self._extract()
+
+        self.assertEqual(self.llm.await_count, 2)
+        self.assertFalse(DatacellResultCache.objects.exists())
+
+    def test_invalidate_command(self):
+        self._extract()
+        other = Document.objects.create(
+            title="Other", creator=self.user, pdf_file_hash="b" * 64
+        )
+        self._extract(document=other)
+        self.assertEqual(DatacellResultCache.objects.count(), 2)
+
+        out = StringIO()
+        call_command(
+            "invalidate_datacell_cache",
+            "--document-id",
+            str(self.copy.id),
+            "--dry-run",
+            stdout=out,
+        )
+        self.assertIn("1 cached results would be invalidated", out.getvalue())
+        self.assertEqual(DatacellResultCache.objects.count(), 2)
+
+        call_command(
+            "invalidate_datacell_cache",
+            "--document-id",
+            str(self.copy.id),
+            stdout=out,
+        )
+        self.assertEqual(
+            list(DatacellResultCache.objects.values_list("document_hash", flat=True)),
+            ["b" * 64],
+        )
+
+        # A re-run after invalidation calls the model again.
+        self._extract()
+        self.assertEqual(self.llm.await_count, 3)
+
+        out = StringIO()
+        call_command(
+            "invalidate_datacell_cache", "--all", "--stats", "--reset-stats", stdout=out
+        )
+        self.assertIn("2 entries, 0 hits, 3 misses, hit rate 0.0%", out.getvalue())
+        self.assertFalse(DatacellResultCache.objects.exists())
+        self.assertEqual(get_cache_stats()["misses"], 0)
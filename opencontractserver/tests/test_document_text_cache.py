@@ -0,0 +1,112 @@
+"""
+Tests for the byte-budgeted LRU cache of document texts used by LLM tools.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from opencontractserver.documents.models import Document
+from opencontractserver.llms.tools.core_tools import load_document_txt_extract
+from opencontractserver.llms.tools.document_text_cache import (
+    DocumentTextCache,
+    document_text_cache,
+)
+
+User = get_user_model()
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class DocumentTextCacheUnitTest(SimpleTestCase):
+    def test_memory_stays_within_budget_under_churn(self):
+        text = "x" * 10_000
+        budget = 5 * sys.getsizeof(text)
+        cache = DocumentTextCache(max_bytes=budget)
+
+        for document_id in range(1_000):
+            cache.put(document_id, T0, text)
+            self.assertLessEqual(cache.stats()["size_bytes"], budget)
+
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 5)
+        self.assertEqual(stats["evictions"], 995)
+        # The survivors are the most recently inserted documents.
+        self.assertEqual([doc_id in cache for doc_id in range(995, 1_000)], [True] * 5)
+
+    def test_recently_used_entries_survive_eviction(self):
+        text = "y" * 1_000
+        cache = DocumentTextCache(max_bytes=3 * sys.getsizeof(text))
+        for document_id in (1, 2, 3):
+            cache.put(document_id, T0, text)
+
+        self.assertEqual(cache.get(1, T0), text)
+        cache.put(4, T0, text)
+
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+
+    def test_stale_entries_miss_and_are_dropped(self):
+        cache = DocumentTextCache(max_bytes=1_000_000)
+        cache.put(1, T0, "old text")
+
+        self.assertIsNone(cache.get(1, T0 + timedelta(seconds=1)))
+        self.assertNotIn(1, cache)
+        self.assertEqual(cache.stats()["size_bytes"], 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_text_larger_than_budget_is_not_cached(self):
+        cache = DocumentTextCache(max_bytes=1_000)
+        cache.put(1, T0, "small")
+        cache.put(2, T0, "z" * 5_000)
+
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+        self.assertEqual(cache.stats()["evictions"], 0)
+
+
+class DocumentTextToolCacheTest(TestCase):
+    def setUp(self):
+        document_text_cache.clear()
+        self.addCleanup(document_text_cache.clear)
+        self.user = User.objects.create_user(username="reader", password="test")
+        self.documents = []
+        for i in range(20):
+            document = Document.objects.create(title=f"Doc {i}", creator=self.user)
+            document.txt_extract_file.save(
+                f"doc_{i}.txt", ContentFile((f"{i:02d}" * 2_000).encode())
+            )
+            self.documents.append(document)
+
+    def test_tools_share_a_bounded_cache(self):
+        budget = 4 * sys.getsizeof("00" * 2_000)
+        with override_settings(LLM_DOCUMENT_TEXT_CACHE_MAX_BYTES=budget):
+            for _ in range(3):
+                for document in self.documents:
+                    text = load_document_txt_extract(document.id, 0, 2)
+                    self.assertEqual(text, f"{self.documents.index(document):02d}")
+                    self.assertLessEqual(
+                        document_text_cache.stats()["size_bytes"], budget
+                    )
+
+            stats = document_text_cache.stats()
+            self.assertEqual(stats["entries"], 4)
+            self.assertEqual(stats["evictions"], 60 - 4)
+
+            # Repeated reads of a hot document are served from memory.
+            hot = self.documents[-1]
+            load_document_txt_extract(hot.id)
+            load_document_txt_extract(hot.id, 10, 20)
+            self.assertEqual(document_text_cache.stats()["hits"], 2)
+
+    def test_modified_document_is_reread(self):
+        document = self.documents[0]
+        self.assertEqual(load_document_txt_extract(document.id, 0, 4), "0000")
+
+        document.txt_extract_file.save("doc_0_v2.txt", ContentFile(b"new text"))
+        document.save()
+
+        self.assertEqual(load_document_txt_extract(document.id), "new text")
@@ -284,8 +284,8 @@ class TestUpdateAllCorpusEngagementMetricsTask(TestCase):
         )
 
     def test_batch_task_queues_all_corpuses(self):
-        """Test that batch task queues updates for all corpuses."""
-        result = update_all_corpus_engagement_metrics()
+        """Test that reconciliation queues updates for all corpuses."""
+        result = update_all_corpus_engagement_metrics(reconcile=True)
 
         # Should queue 3 updates
         self.assertEqual(result["queued_updates"], 3)
@@ -299,7 +299,7 @@ class TestUpdateAllCorpusEngagementMetricsTask(TestCase):
         # Delete all corpuses
         Corpus.objects.all().delete()
 
-        result = update_all_corpus_engagement_metrics()
+        result = update_all_corpus_engagement_metrics(reconcile=True)
 
         self.assertEqual(result["queued_updates"], 0)
         self.assertEqual(result["corpus_ids"], [])
@@ -0,0 +1,201 @@
+"""
+Tests for the incremental engagement rollup: signals keep per-day buckets
+current and update_all_corpus_engagement_metrics derives metrics from them
+for changed corpora only.
+"""
+
+from datetime import timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from opencontractserver.annotations.models import Annotation
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    ConversationTypeChoices,
+    MessageVote,
+    VoteType,
+)
+from opencontractserver.corpuses.models import (
+    Corpus,
+    CorpusEngagementBucket,
+    CorpusEngagementMetrics,
+)
+from opencontractserver.documents.models import Document
+from opencontractserver.tasks.corpus_tasks import (
+    update_all_corpus_engagement_metrics,
+    update_corpus_engagement_metrics,
+)
+
+User = get_user_model()
+
+
+class EngagementRollupTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user(username="rollup_alice", password="x")
+        cls.bob = User.objects.create_user(username="rollup_bob", password="x")
+        cls.corpus = Corpus.objects.create(title="Busy", creator=cls.alice)
+        cls.quiet_corpus = Corpus.objects.create(title="Quiet", creator=cls.alice)
+        cls.document = Document.objects.create(title="Doc", creator=cls.alice)
+
+    def _thread(self, creator, corpus=None):
+        return Conversation.objects.create(
+            title="Thread",
+            conversation_type=ConversationTypeChoices.THREAD,
+            chat_with_corpus=corpus or self.corpus,
+            creator=creator,
+        )
+
+    def _message(self, thread, creator):
+        return ChatMessage.objects.create(
+            conversation=thread, msg_type="HUMAN", content="Hi", creator=creator
+        )
+
+    def _build_activity(self):
+        thread = self._thread(self.alice)
+        other = self._thread(self.bob)
+        first = self._message(thread, self.alice)
+        self._message(thread, self.bob)
+        self._message(other, self.bob)
+        MessageVote.objects.create(
+            message=first, vote_type=VoteType.UPVOTE, creator=self.bob
+        )
+        Annotation.objects.create(
+            document=self.document,
+            corpus=self.corpus,
+            raw_text="Clause",
+            page=1,
+            creator=self.alice,
+        )
+        return thread, other, first
+
+    def _metrics(self):
+        return CorpusEngagementMetrics.objects.filter(corpus=self.corpus).values(
+            "total_threads",
+            "active_threads",
+            "total_messages",
+            "messages_last_7_days",
+            "unique_contributors",
+            "total_upvotes",
+            "total_annotations",
+        )[0]
+
+    def test_rollup_matches_full_recalculation(self):
+        thread, other, first = self._build_activity()
+        thread.lock(self.alice)
+        other.soft_delete_thread(self.alice)
+        first.soft_delete_message(self.alice)
+
+        result = update_all_corpus_engagement_metrics()
+        rolled_up = self._metrics()
+
+        self.assertEqual(result["corpus_ids"], [self.corpus.id])
+        self.assertEqual(
+            rolled_up,
+            {
+                "total_threads": 1,
+                "active_threads": 0,
+                "total_messages": 1,
+                "messages_last_7_days": 1,
+                "unique_contributors": 1,
+                "total_upvotes": 1,
+                "total_annotations": 1,
+            },
+        )
+        reconciled = update_corpus_engagement_metrics(self.corpus.id)
+        self.assertEqual(reconciled["buckets_repaired"], 0)
+        self.assertEqual(self._metrics(), rolled_up)
+
+        # Restoring the thread brings its messages back
+        other.restore_thread(self.alice)
+        update_all_corpus_engagement_metrics()
+        self.assertEqual(self._metrics()["total_messages"], 2)
+
+    def test_only_changed_corpora_are_touched(self):
+        self._build_activity()
+        update_all_corpus_engagement_metrics()
+
+        self.assertEqual(update_all_corpus_engagement_metrics()["updated"], 0)
+        self._message(self._thread(self.bob, self.quiet_corpus), self.bob)
+        self.assertEqual(
+            update_all_corpus_engagement_metrics()["corpus_ids"],
+            [self.quiet_corpus.id],
+        )
+
+    def test_rollup_queries_do_not_scale_with_activity(self):
+        def rollup_queries(rounds):
+            for _ in range(rounds):
+                self._build_activity()
+                self._message(self._thread(self.bob, self.quiet_corpus), self.bob)
+            with CaptureQueriesContext(connection) as ctx:
+                update_all_corpus_engagement_metrics()
+            return len(ctx.captured_queries)
+
+        # The first rollup creates the metrics records.
+        rollup_queries(1)
+        self.assertEqual(rollup_queries(1), rollup_queries(5))
+
+    def test_windows_age_out_without_new_events(self):
+        self._build_activity()
+        update_all_corpus_engagement_metrics()
+        CorpusEngagementBucket.objects.update(
+            day=timezone.localdate() - timedelta(days=10)
+        )
+        CorpusEngagementMetrics.objects.update(
+            last_updated=timezone.now() - timedelta(days=1)
+        )
+
+        self.assertEqual(
+            update_all_corpus_engagement_metrics()["corpus_ids"], [self.corpus.id]
+        )
+        self.assertEqual(self._metrics()["messages_last_7_days"], 0)
+
+    def test_reconcile_repairs_drifted_buckets(self):
+        thread, _, _ = self._build_activity()
+        # Writes that bypass signals make the buckets drift
+        ChatMessage.objects.filter(conversation=thread).update(
+            deleted_at=timezone.now()
+        )
+
+        result = update_corpus_engagement_metrics(self.corpus.id)
+
+        self.assertEqual(result["buckets_repaired"], 2)
+        self.assertEqual(result["metrics"]["total_messages"], 1)
+        self.assertFalse(
+            CorpusEngagementBucket.objects.filter(needs_rollup=True).exists()
+        )
+
+    def test_deleting_corpus_cascades_cleanly(self):
+        self._build_activity()
+
+        self.corpus.delete()
+
+        self.assertFalse(CorpusEngagementBucket.objects.exists())
+
+    def test_migration_backfills_buckets_for_existing_activity(self):
+        self._build_activity()
+        update_corpus_engagement_metrics(self.corpus.id)
+        expected = self._metrics()
+        # Activity from before the buckets existed
+        CorpusEngagementBucket.objects.all().delete()
+
+        backfill = import_module(
+            "opencontractserver.corpuses.migrations.0028_backfill_engagement_buckets"
+        )
+        backfill.backfill_engagement_buckets(apps, None)
+
+        # The first incremental run keeps the real totals
+        self.assertEqual(
+            update_all_corpus_engagement_metrics()["corpus_ids"], [self.corpus.id]
+        )
+        self.assertEqual(self._metrics(), expected)
+        self.assertEqual(
+            update_corpus_engagement_metrics(self.corpus.id)["buckets_repaired"], 0
+        )
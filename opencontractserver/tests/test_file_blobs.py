@@ -0,0 +1,174 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from opencontractserver.annotations.models import StructuralAnnotationSet
+from opencontractserver.documents.blob_storage import (
+    BLOB_PREFIX,
+    collect_garbage,
+    recount_blob_references,
+)
+from opencontractserver.documents.models import Document, FileBlob
+
+User = get_user_model()
+
+PDF_BYTES = b"%PDF-1.4 blob storage test content"
+
+
+class FileBlobTestCase(TestCase):
+    """Content-addressed document files on local filesystem storage."""
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        media_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.addCleanup(self.media_root.cleanup)
+
+        self.user = User.objects.create_user(username="blobuser", password="test")
+
+    def _create_document(self, content=PDF_BYTES, name="contract.pdf", **kwargs):
+        return Document.objects.create(
+            title=name,
+            creator=self.user,
+            pdf_file=ContentFile(content, name=name),
+            # Keeps the ingest pipeline from being queued
+            processing_started=timezone.now(),
+            **kwargs,
+        )
+
+    def _blob(self, document):
+        return FileBlob.objects.get(name=document.pdf_file.name)
+
+    def _age_blobs(self):
+        FileBlob.objects.update(modified=timezone.now() - timedelta(days=2))
+
+    def test_identical_content_is_stored_once(self):
+        first = self._create_document(name="first.pdf")
+        second = self._create_document(name="second.pdf")
+
+        self.assertTrue(first.pdf_file.name.startswith(BLOB_PREFIX))
+        self.assertEqual(first.pdf_file.name, second.pdf_file.name)
+        # The name of the first upload is kept for downloads and exports
+        self.assertTrue(first.pdf_file.name.endswith("/first.pdf"))
+
+        blob = self._blob(first)
+        self.assertEqual(FileBlob.objects.count(), 1)
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.size, len(PDF_BYTES))
+        self.assertEqual(len(blob.content_hash), 64)
+
+        blob_dir = os.path.dirname(default_storage.path(blob.name))
+        self.assertEqual(os.listdir(blob_dir), ["first.pdf"])
+        with default_storage.open(second.pdf_file.name) as stored:
+            self.assertEqual(stored.read(), PDF_BYTES)
+
+    def test_pointer_copies_and_deletes_update_ref_count(self):
+        original = self._create_document()
+        copy = Document.objects.create(
+            title="copy",
+            creator=self.user,
+            pdf_file=original.pdf_file,
+            processing_started=timezone.now(),
+        )
+        blob = self._blob(original)
+        self.assertEqual(copy.pdf_file.name, blob.name)
+        self.assertEqual(FileBlob.objects.get(pk=blob.pk).ref_count, 2)
+
+        original.delete()
+        self.assertEqual(FileBlob.objects.get(pk=blob.pk).ref_count, 1)
+
+        copy.pdf_file = ContentFile(b"%PDF-1.4 revised", name="revised.pdf")
+        copy.save()
+        self.assertEqual(FileBlob.objects.get(pk=blob.pk).ref_count, 0)
+        self.assertEqual(self._blob(copy).ref_count, 1)
+
+        # Saves that leave the file fields alone do not change the counts
+        copy.title = "renamed"
+        copy.save()
+        copy.save(update_fields=["title"])
+        self.assertEqual(self._blob(copy).ref_count, 1)
+
+    def test_derived_files_are_shared_across_models(self):
+        txt = b"Plain text extract shared by a document and its structural set"
+        document = self._create_document()
+        document.txt_extract_file.save("doc.txt", ContentFile(txt))
+        structural_set = StructuralAnnotationSet.objects.create(
+            content_hash="0" * 64,
+            txt_extract_file=ContentFile(txt, name="set.txt"),
+        )
+
+        self.assertEqual(
+            document.txt_extract_file.name, structural_set.txt_extract_file.name
+        )
+        self.assertEqual(
+            FileBlob.objects.get(name=structural_set.txt_extract_file.name).ref_count,
+            2,
+        )
+
+    def test_text_content_is_stored_like_its_utf8_bytes(self):
+        document = self._create_document()
+        document.txt_extract_file.save("text.txt", ContentFile("Vertragsparteien ä"))
+        other = self._create_document(name="other.pdf")
+        other.txt_extract_file.save(
+            "other.txt", ContentFile("Vertragsparteien ä".encode())
+        )
+
+        self.assertEqual(document.txt_extract_file.name, other.txt_extract_file.name)
+
+    def test_collect_garbage_deletes_only_unreferenced_blobs(self):
+        kept = self._create_document()
+        removed = self._create_document(b"%PDF-1.4 soon unreferenced", "old.pdf")
+        removed_name = removed.pdf_file.name
+        removed.delete()
+        self._age_blobs()
+        fresh = self._create_document(b"%PDF-1.4 just stored", "fresh.pdf")
+        fresh_name = fresh.pdf_file.name
+        Document.objects.filter(pk=fresh.pk).update(pdf_file="")
+
+        deleted, freed = collect_garbage(min_age=timedelta(hours=24), dry_run=True)
+        self.assertEqual((deleted, freed), (1, len(b"%PDF-1.4 soon unreferenced")))
+        self.assertTrue(default_storage.exists(removed_name))
+
+        deleted, _ = collect_garbage(min_age=timedelta(hours=24))
+        self.assertEqual(deleted, 1)
+        self.assertFalse(default_storage.exists(removed_name))
+        self.assertFalse(FileBlob.objects.filter(name=removed_name).exists())
+
+        # Referenced blobs stay, and so do unreferenced ones inside the grace period
+        self.assertTrue(default_storage.exists(kept.pdf_file.name))
+        self.assertTrue(default_storage.exists(fresh_name))
+        self.assertEqual(FileBlob.objects.get(name=fresh_name).ref_count, 0)
+
+    def test_recount_corrects_counts_changed_behind_the_signals(self):
+        document = self._create_document()
+        Document.objects.filter(pk=document.pk).update(pdf_file="")
+        self.assertEqual(self._blob(document).ref_count, 1)
+
+        self.assertEqual(recount_blob_references(), 1)
+        self.assertEqual(self._blob(document).ref_count, 0)
+        self.assertEqual(recount_blob_references(), 0)
+
+    def test_gc_file_blobs_command(self):
+        document = self._create_document()
+        name = document.pdf_file.name
+        document.delete()
+        self._age_blobs()
+
+        out = StringIO()
+        call_command("gc_file_blobs", "--dry-run", stdout=out)
+        self.assertIn("Would delete 1 unreferenced blobs", out.getvalue())
+        self.assertTrue(default_storage.exists(name))
+
+        out = StringIO()
+        call_command("gc_file_blobs", stdout=out)
+        self.assertIn("Deleted 1 unreferenced blobs", out.getvalue())
+        self.assertFalse(default_storage.exists(name))
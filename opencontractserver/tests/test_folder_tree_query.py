@@ -0,0 +1,151 @@
+"""
+Tests for the single-statement, cached DocumentFolderService.get_folder_tree().
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from opencontractserver.corpuses.folder_service import (
+    FOLDER_TREE_CACHE_KEY,
+    DocumentFolderService,
+)
+from opencontractserver.corpuses.models import Corpus, CorpusFolder
+from opencontractserver.documents.models import Document, DocumentPath
+
+User = get_user_model()
+
+
+class FolderTreeQueryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="tree_owner", password="test")
+        self.stranger = User.objects.create_user(
+            username="tree_stranger", password="test"
+        )
+        self.corpus = Corpus.objects.create(
+            title="Tree Corpus", creator=self.owner, is_public=False
+        )
+
+        # Legal -> Contracts -> 2024, plus a sibling root "Archive"
+        self.legal = CorpusFolder.objects.create(
+            name="Legal", corpus=self.corpus, creator=self.owner
+        )
+        self.contracts = CorpusFolder.objects.create(
+            name="Contracts", corpus=self.corpus, parent=self.legal, creator=self.owner
+        )
+        self.year = CorpusFolder.objects.create(
+            name="2024", corpus=self.corpus, parent=self.contracts, creator=self.owner
+        )
+        self.archive = CorpusFolder.objects.create(
+            name="Archive", corpus=self.corpus, creator=self.owner
+        )
+
+        self.paths = {}
+        for i, folder in enumerate(
+            [self.legal, self.contracts, self.year, self.year, None]
+        ):
+            self.paths[i] = self._add_path(f"doc{i}", folder)
+
+        # Deleted and historical paths must not be counted.
+        self._add_path("deleted", self.year, is_deleted=True)
+        self._add_path("old", self.year, is_current=False)
+
+    def _add_path(self, name, folder, is_current=True, is_deleted=False):
+        document = Document.objects.create(title=name, creator=self.owner)
+        return DocumentPath.objects.create(
+            document=document,
+            corpus=self.corpus,
+            creator=self.owner,
+            folder=folder,
+            path=f"/{name}.pdf",
+            version_number=1,
+            is_current=is_current,
+            is_deleted=is_deleted,
+        )
+
+    def _get_tree(self, user=None):
+        return DocumentFolderService.get_folder_tree(
+            user=user or self.owner, corpus_id=self.corpus.id
+        )
+
+    def test_tree_shape_paths_and_counts(self):
+        tree = self._get_tree()
+
+        self.assertEqual([node["name"] for node in tree], ["Archive", "Legal"])
+        archive, legal = tree
+        contracts = legal["children"][0]
+        year = contracts["children"][0]
+
+        self.assertEqual(year["path"], "Legal/Contracts/2024")
+        self.assertEqual(year["path"], self.year.get_path())
+        self.assertEqual(year["parentId"], self.contracts.id)
+
+        for node, folder in (
+            (archive, self.archive),
+            (legal, self.legal),
+            (contracts, self.contracts),
+            (year, self.year),
+        ):
+            self.assertEqual(node["documentCount"], folder.get_document_count())
+            self.assertEqual(
+                node["descendantDocumentCount"],
+                folder.get_descendant_document_count(),
+            )
+
+        self.assertEqual(legal["descendantDocumentCount"], 4)
+        self.assertEqual(year["documentCount"], 2)
+
+    def test_query_count_is_constant(self):
+        for i in range(30):
+            CorpusFolder.objects.create(
+                name=f"Sub {i}",
+                corpus=self.corpus,
+                parent=self.year,
+                creator=self.owner,
+            )
+        cache.clear()
+
+        # Corpus lookup + the tree statement, regardless of folder count.
+        with self.assertNumQueries(2):
+            tree = self._get_tree()
+        year = tree[1]["children"][0]["children"][0]
+        self.assertEqual(len(year["children"]), 30)
+
+        # Warm cache: only the corpus lookup for the permission check.
+        with self.assertNumQueries(1):
+            self.assertEqual(self._get_tree(), tree)
+
+    def test_cached_tree_is_not_served_without_permission(self):
+        self.assertTrue(self._get_tree())
+        self.assertIsNotNone(
+            cache.get(FOLDER_TREE_CACHE_KEY.format(corpus_id=self.corpus.id))
+        )
+        self.assertEqual(self._get_tree(self.stranger), [])
+
+    def test_folder_changes_invalidate_cache(self):
+        self._get_tree()
+
+        self.archive.name = "Old Stuff"
+        self.archive.save()
+        names = [node["name"] for node in self._get_tree()]
+        self.assertIn("Old Stuff", names)
+
+        CorpusFolder.objects.create(name="Zeta", corpus=self.corpus, creator=self.owner)
+        self.assertEqual(len(self._get_tree()), 3)
+
+    def test_document_moves_invalidate_cache(self):
+        self._get_tree()
+
+        success, _ = DocumentFolderService.move_document_to_folder(
+            user=self.owner,
+            document=self.paths[4].document,
+            corpus=self.corpus,
+            folder=self.archive,
+        )
+        self.assertTrue(success)
+        archive = self._get_tree()[0]
+        self.assertEqual(archive["documentCount"], 1)
+
+        self._add_path("new", self.archive)
+        self.assertEqual(self._get_tree()[0]["documentCount"], 2)
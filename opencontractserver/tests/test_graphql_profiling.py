@@ -0,0 +1,112 @@
+"""
+Tests for the sampled per-resolver SQL profiling middleware and its
+staff-only endpoint.
+"""
+
+import json
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from graphene.test import Client
+from rest_framework.test import APIClient
+
+from config.graphql.profiling import (
+    ResolverProfileStore,
+    ResolverProfilingMiddleware,
+    resolver_profile_store,
+)
+from config.graphql.schema import schema
+from opencontractserver.corpuses.models import Corpus
+
+User = get_user_model()
+
+CORPUSES_QUERY = """
+    query CorpusTitles {
+        corpuses {
+            edges {
+                node {
+                    title
+                }
+            }
+        }
+    }
+"""
+
+
+class ResolverProfilingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="profiled", password="x")
+        cls.staff = User.objects.create_user(
+            username="profile_staff", password="x", is_staff=True
+        )
+        for i in range(3):
+            Corpus.objects.create(title=f"Profiled {i}", creator=cls.user)
+
+    def setUp(self):
+        self.store = ResolverProfileStore(max_paths=50)
+        self.client = Client(schema)
+
+    def _execute(self, store=None):
+        result = self.client.execute(
+            CORPUSES_QUERY,
+            context_value=SimpleNamespace(user=self.user),
+            middleware=[ResolverProfilingMiddleware(store or self.store)],
+        )
+        self.assertIsNone(result.get("errors"))
+
+    @override_settings(GRAPHQL_PROFILING_SAMPLE_RATE=1.0)
+    def test_records_queries_per_resolver_path(self):
+        self._execute()
+        self._execute()
+
+        rows = {row["path"]: row for row in self.store.snapshot()}
+        self.assertEqual(rows["corpuses"]["calls"], 2)
+        self.assertGreater(rows["corpuses"]["queries"], 0)
+        self.assertGreater(rows["corpuses"]["wall_ms"], 0)
+        # Plain attribute lookups that run no SQL are left out
+        self.assertNotIn("corpuses.edges.node.title", rows)
+
+    @override_settings(GRAPHQL_PROFILING_SAMPLE_RATE=0.0)
+    def test_unsampled_operations_are_not_recorded(self):
+        self._execute()
+
+        self.assertEqual(self.store.snapshot(), [])
+
+    def test_store_keeps_most_recent_paths(self):
+        store = ResolverProfileStore(max_paths=2)
+        store.record("a", 1, 1.0, 2.0)
+        store.record("b", 5, 1.0, 2.0)
+        store.record("a", 1, 1.0, 2.0)
+        store.record("c", 3, 1.0, 2.0)
+
+        self.assertEqual([row["path"] for row in store.snapshot()], ["c", "a"])
+        self.assertEqual(store.snapshot()[1]["calls"], 2)
+
+    @override_settings(GRAPHQL_PROFILING_SAMPLE_RATE=1.0, GRAPHQL_PROFILING_LOG=True)
+    def test_logs_structured_lines(self):
+        with self.assertLogs("config.graphql.profiling", level="INFO") as logs:
+            self._execute()
+
+        lines = [json.loads(record.getMessage()) for record in logs.records]
+        corpuses = next(line for line in lines if line["path"] == "corpuses")
+        self.assertEqual(corpuses["operation"], "CorpusTitles")
+        self.assertGreater(corpuses["queries"], 0)
+
+    @override_settings(GRAPHQL_PROFILING_SAMPLE_RATE=1.0)
+    def test_endpoint_is_staff_only(self):
+        resolver_profile_store.reset()
+        self._execute(store=resolver_profile_store)
+        api_client = APIClient()
+
+        api_client.force_authenticate(user=self.user)
+        self.assertEqual(api_client.get("/api/graphql-profile/").status_code, 403)
+
+        api_client.force_authenticate(user=self.staff)
+        response = api_client.get("/api/graphql-profile/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("corpuses", [row["path"] for row in response.data["resolvers"]])
+
+        self.assertEqual(api_client.delete("/api/graphql-profile/").status_code, 204)
+        self.assertEqual(resolver_profile_store.snapshot(), [])
@@ -0,0 +1,252 @@
+"""
+Tests for materialized leaderboards: the leaderboard and communityStats
+queries read snapshots that refresh_community_snapshots keeps current.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from graphene.test import Client
+from graphql_relay import to_global_id
+
+from config.graphql.schema import schema
+from opencontractserver.badges.models import CommunityStatsSnapshot, LeaderboardSnapshot
+from opencontractserver.conversations.models import ChatMessage, Conversation
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.tasks.leaderboard_tasks import (
+    LEADERBOARD_METRICS,
+    LEADERBOARD_SCOPES,
+    get_community_stats_snapshot,
+    refresh_community_snapshots,
+)
+
+User = get_user_model()
+
+LEADERBOARD_QUERY = """
+    query($corpusId: ID) {
+        leaderboard(metric: MESSAGES, scope: ALL_TIME, corpusId: $corpusId) {
+            computedAt
+            isStale
+            entries {
+                rank
+                score
+                user {
+                    username
+                }
+            }
+        }
+    }
+"""
+
+COMMUNITY_STATS_QUERY = """
+    query {
+        communityStats {
+            totalMessages
+            computedAt
+            isStale
+            badgeDistribution {
+                awardCount
+            }
+        }
+    }
+"""
+
+
+class LeaderboardSnapshotTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = User.objects.create_user(
+            username="snapshot_viewer", password="x", is_profile_public=True
+        )
+        cls.corpus = Corpus.objects.create(
+            title="Snapshots", creator=cls.viewer, is_public=True
+        )
+        cls.thread = Conversation.objects.create(
+            title="Thread",
+            conversation_type="thread",
+            chat_with_corpus=cls.corpus,
+            creator=cls.viewer,
+            is_public=True,
+        )
+
+    def setUp(self):
+        self.client = Client(schema)
+
+    def _execute(self, query, **variables):
+        result = self.client.execute(
+            query,
+            variables=variables,
+            context_value=type("Context", (), {"user": self.viewer}),
+        )
+        self.assertIsNone(result.get("errors"))
+        return result["data"]
+
+    def _post(self, creator, count=1):
+        for i in range(count):
+            ChatMessage.objects.create(
+                conversation=self.thread,
+                msg_type="HUMAN",
+                content=f"Message {i}",
+                creator=creator,
+            )
+
+    def _leaderboard(self, corpus_id=None):
+        return self._execute(LEADERBOARD_QUERY, corpusId=corpus_id)["leaderboard"]
+
+    def test_reads_snapshot_until_refreshed(self):
+        self._post(self.viewer, 2)
+
+        first = self._leaderboard()
+        self.assertEqual(first["entries"][0]["score"], 2)
+        self.assertFalse(first["isStale"])
+        self.assertIsNotNone(first["computedAt"])
+
+        self._post(self.viewer)
+        self.assertEqual(self._leaderboard(), first)
+        stats = self._execute(COMMUNITY_STATS_QUERY)["communityStats"]
+        self.assertEqual(stats["totalMessages"], 3)
+
+        refresh_community_snapshots()
+
+        self.assertEqual(self._leaderboard()["entries"][0]["score"], 3)
+
+    def test_request_queries_do_not_scale_with_activity(self):
+        def request_queries():
+            refresh_community_snapshots()
+            with CaptureQueriesContext(connection) as ctx:
+                self._leaderboard()
+                self._execute(COMMUNITY_STATS_QUERY)
+            return len(ctx.captured_queries)
+
+        self._post(self.viewer)
+        baseline = request_queries()
+        for i in range(10):
+            user = User.objects.create_user(
+                username=f"snapshot_poster{i}", password="x", is_profile_public=True
+            )
+            self._post(user, 3)
+
+        self.assertEqual(request_queries(), baseline)
+
+    def test_reports_stale_snapshots(self):
+        self._leaderboard()
+        self._execute(COMMUNITY_STATS_QUERY)
+        an_hour_ago = LeaderboardSnapshot.objects.get().computed_at - timedelta(hours=1)
+        LeaderboardSnapshot.objects.update(computed_at=an_hour_ago)
+        CommunityStatsSnapshot.objects.update(computed_at=an_hour_ago)
+
+        self.assertTrue(self._leaderboard()["isStale"])
+        self.assertTrue(
+            self._execute(COMMUNITY_STATS_QUERY)["communityStats"]["isStale"]
+        )
+        with self.settings(LEADERBOARD_SNAPSHOT_MAX_AGE_SECONDS=7200):
+            self.assertFalse(self._leaderboard()["isStale"])
+
+    def test_reading_a_stale_snapshot_queues_its_refresh(self):
+        self._post(self.viewer)
+        self._leaderboard()
+        self._execute(COMMUNITY_STATS_QUERY)
+        an_hour_ago = LeaderboardSnapshot.objects.get().computed_at - timedelta(hours=1)
+        LeaderboardSnapshot.objects.update(computed_at=an_hour_ago)
+        CommunityStatsSnapshot.objects.update(computed_at=an_hour_ago)
+        self._post(self.viewer)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            stale = self._leaderboard()
+            stale_stats = self._execute(COMMUNITY_STATS_QUERY)["communityStats"]
+
+        # The reader gets the stored snapshot; the refresh runs after commit
+        self.assertEqual(len(callbacks), 2)
+        self.assertTrue(stale["isStale"])
+        self.assertEqual(stale["entries"][0]["score"], 1)
+        self.assertEqual(stale_stats["totalMessages"], 1)
+
+        fresh = self._leaderboard()
+        self.assertFalse(fresh["isStale"])
+        self.assertEqual(fresh["entries"][0]["score"], 2)
+        self.assertEqual(
+            self._execute(COMMUNITY_STATS_QUERY)["communityStats"]["totalMessages"], 2
+        )
+
+    def test_refresh_covers_requested_corpora(self):
+        self._leaderboard(to_global_id("CorpusType", self.corpus.id))
+        untouched = Corpus.objects.create(title="Never viewed", creator=self.viewer)
+
+        result = refresh_community_snapshots()
+
+        per_scope = len(LEADERBOARD_METRICS) * len(LEADERBOARD_SCOPES)
+        self.assertEqual(result, {"leaderboards": 2 * per_scope, "community_stats": 2})
+        self.assertTrue(LeaderboardSnapshot.objects.filter(corpus=self.corpus).exists())
+        self.assertFalse(LeaderboardSnapshot.objects.filter(corpus=untouched).exists())
+
+    def test_corpus_snapshots_count_only_public_threads(self):
+        private_chat = Conversation.objects.create(
+            title="Private chat",
+            conversation_type="chat",
+            chat_with_corpus=self.corpus,
+            creator=self.viewer,
+        )
+        private_thread = Conversation.objects.create(
+            title="Private thread",
+            conversation_type="thread",
+            chat_with_corpus=self.corpus,
+            creator=self.viewer,
+        )
+        for conversation in (private_chat, private_thread):
+            ChatMessage.objects.create(
+                conversation=conversation,
+                msg_type="HUMAN",
+                content="Not for everyone",
+                creator=self.viewer,
+            )
+        self._post(self.viewer)
+
+        entries = self._leaderboard(to_global_id("CorpusType", self.corpus.id))[
+            "entries"
+        ]
+        self.assertEqual([entry["score"] for entry in entries], [1])
+        stats = get_community_stats_snapshot(self.corpus.id).stats
+        self.assertEqual((stats["total_messages"], stats["total_threads"]), (1, 1))
+
+    def test_refresh_drops_corpora_no_longer_requested(self):
+        corpus_id = to_global_id("CorpusType", self.corpus.id)
+        self._leaderboard(corpus_id)
+        LeaderboardSnapshot.objects.filter(corpus=self.corpus).update(
+            last_requested_at=timezone.now() - timedelta(days=8)
+        )
+
+        result = refresh_community_snapshots()
+
+        per_scope = len(LEADERBOARD_METRICS) * len(LEADERBOARD_SCOPES)
+        self.assertEqual(result, {"leaderboards": per_scope, "community_stats": 1})
+        self.assertFalse(
+            LeaderboardSnapshot.objects.filter(corpus=self.corpus).exists()
+        )
+
+        # Reading it again brings the corpus back into the refresh
+        self._leaderboard(corpus_id)
+        self.assertEqual(refresh_community_snapshots()["community_stats"], 2)
+
+    def test_users_who_go_private_are_dropped_from_snapshot(self):
+        other = User.objects.create_user(
+            username="snapshot_other", password="x", is_profile_public=True
+        )
+        self._post(other, 2)
+        self._post(self.viewer)
+        self.assertEqual(
+            [entry["user"]["username"] for entry in self._leaderboard()["entries"]],
+            ["snapshot_other", "snapshot_viewer"],
+        )
+
+        other.is_profile_public = False
+        other.save()
+
+        entries = self._leaderboard()["entries"]
+        self.assertEqual(
+            [(entry["user"]["username"], entry["rank"]) for entry in entries],
+            [("snapshot_viewer", 1)],
+        )
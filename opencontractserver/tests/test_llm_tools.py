@@ -102,9 +102,9 @@ class TestLLMTools(TestCase):
         self.assertEqual(result, 0)
 
     def test_token_count_whitespace(self):
-        """Test token counting with only whitespace."""
+        """Whitespace still costs tokens with a real tokenizer."""
         result = _token_count("   \n\t   ")
-        self.assertEqual(result, 0)
+        self.assertGreater(result, 0)
 
     def test_load_document_md_summary_nonexistent_doc(self):
         """Test loading summary for non-existent document."""
@@ -0,0 +1,177 @@
+"""
+Tests for the notification outbox: signals record events cheaply and
+drain_notification_outbox fans them out, idempotently, to recipients.
+"""
+
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from config.websocket.consumers.notification_updates import (
+    get_notification_channel_group,
+)
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    ConversationTypeChoices,
+)
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.notifications.models import (
+    Notification,
+    NotificationEventTypeChoices,
+    NotificationOutbox,
+    NotificationTypeChoices,
+)
+from opencontractserver.tasks import notification_tasks
+from opencontractserver.tasks.notification_tasks import drain_notification_outbox
+
+User = get_user_model()
+
+
+class NotificationOutboxTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username="outbox_author", password="x")
+        cls.replier = User.objects.create_user(username="outbox_replier", password="x")
+        cls.corpus = Corpus.objects.create(title="Outbox", creator=cls.author)
+        cls.thread = Conversation.objects.create(
+            title="Busy thread",
+            conversation_type=ConversationTypeChoices.THREAD,
+            chat_with_corpus=cls.corpus,
+            creator=cls.author,
+        )
+
+    def _post(self, creator, content="Hello", parent=None):
+        return ChatMessage.objects.create(
+            conversation=self.thread,
+            msg_type="HUMAN",
+            content=content,
+            creator=creator,
+            parent_message=parent,
+        )
+
+    def _add_participants(self, count):
+        participants = [
+            User.objects.create_user(username=f"participant{i}", password="x")
+            for i in range(count)
+        ]
+        for user in participants:
+            self._post(user)
+        return participants
+
+    def test_posting_records_one_event_regardless_of_audience(self):
+        def queries_to_post():
+            with CaptureQueriesContext(connection) as ctx:
+                self._post(self.replier, "@outbox_author take a look")
+            return len(ctx.captured_queries)
+
+        # The replier's first post also marks their badge checks.
+        queries_to_post()
+        baseline = queries_to_post()
+        self._add_participants(20)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.assertEqual(queries_to_post(), baseline)
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertTrue(callbacks)
+        latest = ChatMessage.objects.latest("id")
+        self.assertEqual(
+            set(
+                NotificationOutbox.objects.filter(object_id=latest.pk).values_list(
+                    "event_type", flat=True
+                )
+            ),
+            {
+                NotificationEventTypeChoices.MESSAGE_REPLY,
+                NotificationEventTypeChoices.MESSAGE_MENTION,
+            },
+        )
+
+    def test_drain_fans_out_to_recipients(self):
+        participants = self._add_participants(3)
+        parent = self._post(self.author, "Parent")
+        reply = self._post(
+            self.replier, "Agreed, @participant0 what do you think?", parent=parent
+        )
+        # Posted after the reply, so not a participant of it
+        self._post(User.objects.create_user(username="latecomer", password="x"))
+
+        result = drain_notification_outbox()
+
+        self.assertEqual(result["failed"], 0)
+        self.assertFalse(
+            NotificationOutbox.objects.filter(processed_at__isnull=True).exists()
+        )
+        received = set(
+            Notification.objects.filter(message=reply).values_list(
+                "recipient__username", "notification_type"
+            )
+        )
+        self.assertEqual(
+            received,
+            {
+                ("outbox_author", NotificationTypeChoices.REPLY),
+                ("participant0", NotificationTypeChoices.MENTION),
+            }
+            | {
+                (user.username, NotificationTypeChoices.THREAD_REPLY)
+                for user in participants
+            },
+        )
+
+    def test_redelivered_events_do_not_duplicate_notifications(self):
+        self._add_participants(2)
+        self._post(self.replier, "@outbox_author hi")
+        drain_notification_outbox()
+        delivered = Notification.objects.count()
+        # participant1 -> participant0, then the reply to both and the mention
+        self.assertEqual(delivered, 4)
+
+        # Simulate a crash after the notifications were written
+        NotificationOutbox.objects.update(processed_at=None)
+        drain_notification_outbox()
+
+        self.assertEqual(Notification.objects.count(), delivered)
+
+    def test_failed_events_stay_pending_for_retry(self):
+        self._post(self.replier, "Hello")
+        failing = {
+            **notification_tasks.EVENT_EXPANDERS,
+            NotificationEventTypeChoices.MESSAGE_REPLY: lambda events: 1 / 0,
+        }
+
+        with patch.object(notification_tasks, "EVENT_EXPANDERS", failing):
+            result = drain_notification_outbox()
+
+        self.assertEqual(result["failed"], 1)
+        event = NotificationOutbox.objects.get()
+        self.assertIsNone(event.processed_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertIn("division by zero", event.last_error)
+
+        with self.settings(NOTIFICATION_OUTBOX_MAX_ATTEMPTS=1):
+            self.assertEqual(drain_notification_outbox()["processed"], 0)
+        self.assertEqual(drain_notification_outbox()["processed"], 1)
+
+    def test_drain_pushes_to_recipient_group(self):
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(
+            get_notification_channel_group(self.author.pk), channel
+        )
+        parent = self._post(self.author, "Parent")
+        self._post(self.replier, "Reply", parent=parent)
+
+        self.assertEqual(drain_notification_outbox()["pushed"], 1)
+
+        event = async_to_sync(channel_layer.receive)(channel)
+        notification = Notification.objects.get(recipient=self.author)
+        self.assertEqual(event["type"], "notification_created")
+        self.assertEqual(event["id"], notification.pk)
+        self.assertEqual(event["notification_type"], NotificationTypeChoices.REPLY)
@@ -3,10 +3,14 @@
 import io
 import json
 import logging
+import multiprocessing
 import os
 import random
+import shutil
+import threading
 import zipfile
-from unittest import TestCase
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
 
 from PyPDF2 import PdfReader
 
@@ -677,3 +681,172 @@ class TestPDFRedaction(TestCase):
             combined_text,
             msg="Redacted text 'June 12, 2019' was detected by OCR.",
         )
+
+
+def _build_text_pdf(page_words: list[list[str]]) -> tuple[bytes, list[dict]]:
+    """Build a PDF with one line of words per page, plus its PAWLS pages."""
+    from reportlab.pdfgen import canvas
+
+    width, height, font_size = 612, 792, 12
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(width, height))
+    pawls_pages = []
+    for index, words in enumerate(page_words):
+        pdf.setFont("Helvetica", font_size)
+        tokens = []
+        x = 72.0
+        for word in words:
+            word_width = pdf.stringWidth(word, "Helvetica", font_size)
+            pdf.drawString(x, height - 100, word)
+            tokens.append(
+                {
+                    "x": x,
+                    "y": 100 - font_size,
+                    "width": word_width,
+                    "height": font_size,
+                    "text": word,
+                }
+            )
+            x += word_width + 10
+        pdf.showPage()
+        pawls_pages.append(
+            {
+                "page": {"width": width, "height": height, "index": index},
+                "tokens": tokens,
+            }
+        )
+    pdf.save()
+    return buffer.getvalue(), pawls_pages
+
+
+def _span(token: dict) -> dict:
+    return {
+        "bounds": {
+            "left": token["x"],
+            "right": token["x"] + token["width"],
+            "top": token["y"],
+            "bottom": token["y"] + token["height"],
+        },
+        "tokensJsons": [],
+        "rawText": token["text"],
+    }
+
+
+def _redact_in_daemonic_process(results) -> None:
+    """Run redact_pdfs(max_workers=2) and report the threads that did the work."""
+    from opencontractserver.utils import pdf_redaction
+
+    threads = set()
+    redact_pdf_pages = pdf_redaction.redact_pdf_pages
+
+    def record_thread(*args, **kwargs):
+        threads.add(threading.current_thread().name)
+        return redact_pdf_pages(*args, **kwargs)
+
+    jobs = [
+        (f"doc{i}.pdf", *_build_text_pdf([[f"Document{i}"]]), [[]]) for i in range(4)
+    ]
+    with patch.object(pdf_redaction, "redact_pdf_pages", record_thread):
+        keys = [key for key, _ in pdf_redaction.redact_pdfs(jobs, max_workers=2)]
+    results.put((multiprocessing.current_process().daemon, keys, sorted(threads)))
+
+
+class TestPageLevelRedaction(TestCase):
+    """Tests for the page-level redaction engine behind PDFRedactor."""
+
+    def setUp(self):
+        self.pdf_bytes, self.pawls_pages = _build_text_pdf(
+            [["Opening", "terms"], ["Secret", "Counterparty"], ["Closing", "terms"]]
+        )
+
+    def test_document_without_spans_is_returned_unchanged(self):
+        from opencontractserver.utils.pdf_redaction import redact_pdf_pages
+
+        with patch(
+            "opencontractserver.utils.pdf_redaction.redact_pdf_to_images"
+        ) as rasterize:
+            redacted = redact_pdf_pages(self.pdf_bytes, self.pawls_pages, [[], [], []])
+
+        self.assertEqual(redacted, self.pdf_bytes)
+        rasterize.assert_not_called()
+
+    @skipUnless(shutil.which("pdftoppm"), "poppler is required to rasterize pages")
+    def test_only_pages_with_spans_are_rasterized(self):
+        from opencontractserver.utils import pdf_redaction
+
+        secret = self.pawls_pages[1]["tokens"][0]
+        with patch.object(
+            pdf_redaction,
+            "redact_pdf_to_images",
+            wraps=pdf_redaction.redact_pdf_to_images,
+        ) as rasterize:
+            redacted = pdf_redaction.redact_pdf_pages(
+                self.pdf_bytes, self.pawls_pages, [[], [_span(secret)], []]
+            )
+
+        self.assertEqual(
+            rasterize.call_args.kwargs["pawls_pages"], [self.pawls_pages[1]]
+        )
+        original = PdfReader(io.BytesIO(self.pdf_bytes))
+        reader = PdfReader(io.BytesIO(redacted))
+        self.assertEqual(len(reader.pages), 3)
+        for index in (0, 2):
+            self.assertEqual(
+                reader.pages[index].extract_text(),
+                original.pages[index].extract_text(),
+            )
+        page_text = reader.pages[1].extract_text()
+        self.assertNotIn("Secret", page_text)
+        self.assertIn("Counterparty", page_text)
+
+    def test_copied_pages_drop_xobjects_they_do_not_draw(self):
+        from PyPDF2.generic import DictionaryObject, NameObject
+
+        from opencontractserver.utils.pdf_redaction import _strip_unused_xobjects
+
+        page = PdfReader(io.BytesIO(self.pdf_bytes)).pages[0]
+        shared = DictionaryObject(page["/Resources"].get_object())
+        shared[NameObject("/XObject")] = DictionaryObject(
+            {NameObject("/SecretImage"): DictionaryObject()}
+        )
+        page[NameObject("/Resources")] = shared
+
+        _strip_unused_xobjects(page)
+
+        self.assertEqual(dict(page["/Resources"]["/XObject"]), {})
+        # The shared dictionary other pages may use is left alone
+        self.assertIn("/SecretImage", shared["/XObject"])
+
+    def test_redact_pdfs_returns_results_in_job_order_from_the_pool(self):
+        from opencontractserver.utils.pdf_redaction import redact_pdfs
+
+        documents = [_build_text_pdf([[f"Document{i}"]]) for i in range(5)]
+        jobs = (
+            (f"doc{i}.pdf", pdf_bytes, pawls_pages, [[]])
+            for i, (pdf_bytes, pawls_pages) in enumerate(documents)
+        )
+
+        results = list(redact_pdfs(jobs, max_workers=2))
+
+        self.assertEqual([key for key, _ in results], [f"doc{i}.pdf" for i in range(5)])
+        self.assertEqual(
+            [pdf_bytes for _, pdf_bytes in results],
+            [pdf_bytes for pdf_bytes, _ in documents],
+        )
+
+    def test_redact_pdfs_uses_the_pool_in_daemonic_processes(self):
+        # Celery prefork workers are daemonic and cannot start child processes
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        worker = context.Process(
+            target=_redact_in_daemonic_process, args=(results,), daemon=True
+        )
+        worker.start()
+        daemon, keys, threads = results.get(timeout=60)
+        worker.join(timeout=60)
+
+        self.assertTrue(daemon)
+        self.assertEqual(keys, [f"doc{i}.pdf" for i in range(4)])
+        # Redacted by the pool's threads, not serially in the calling thread
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith("pdf-redaction") for name in threads))
@@ -5,8 +5,11 @@ Tests the cached registry pattern that provides efficient access to
 pipeline components (parsers, embedders, thumbnailers, post-processors).
 """
 
+from unittest.mock import patch
+
 from django.test import TestCase
 
+from opencontractserver.pipeline.base.parser import BaseParser
 from opencontractserver.pipeline.registry import (
     ComponentType,
     PipelineComponentDefinition,
@@ -150,6 +153,49 @@ class TestPipelineComponentRegistry(TestCase):
             self.assertIsNotNone(result)
             self.assertEqual(result.class_name, class_name)
 
+    def test_get_component_class_by_path_and_script_name(self):
+        """Test resolving component classes by full path and by script name."""
+        registry = get_registry()
+        parser = registry.parsers[0]
+        self.assertIs(
+            registry.get_component_class(parser.class_name), parser.component_class
+        )
+
+        module = parser.component_class.__module__
+        script_name = module.rsplit(".", 1)[-1]
+        resolved = registry.get_component_class(script_name)
+        self.assertEqual(resolved.__module__, module)
+
+        self.assertIsNone(registry.get_component_class("non_existing_component"))
+        self.assertIsNone(registry.get_component_class("non.existent.Embedder"))
+
+    def test_get_component_class_does_not_rescan(self):
+        """Test that indexed and previously resolved lookups import nothing."""
+        registry = get_registry()
+        embedder_path = registry.embedders[0].class_name
+        outside_path = "opencontractserver.pipeline.base.embedder.BaseEmbedder"
+        # Base classes are not components
+        self.assertIsNone(registry.get_component_class(outside_path))
+
+        with patch(
+            "opencontractserver.pipeline.registry.importlib.import_module"
+        ) as import_module:
+            registry.get_component_class(embedder_path)
+            registry.get_subclasses("opencontractserver.pipeline.parsers", BaseParser)
+        import_module.assert_not_called()
+
+    def test_reset_registry_invalidates_resolved_components(self):
+        """Test that reset_registry drops components resolved by import."""
+        registry = get_registry()
+        parser = registry.parsers[0]
+        registry._resolved["custom.path.Parser"] = parser.component_class
+        self.assertIs(
+            registry.get_component_class("custom.path.Parser"), parser.component_class
+        )
+
+        reset_registry()
+        self.assertIsNone(get_registry().get_component_class("custom.path.Parser"))
+
     def test_get_parsers_for_filetype_pdf(self):
         """Test getting parsers for PDF files."""
         registry = get_registry()
@@ -11,6 +11,7 @@ from opencontractserver.pipeline.base.embedder import BaseEmbedder
 from opencontractserver.pipeline.base.file_types import FileTypeEnum
 from opencontractserver.pipeline.base.parser import BaseParser
 from opencontractserver.pipeline.base.thumbnailer import BaseThumbnailGenerator
+from opencontractserver.pipeline.registry import reset_registry
 from opencontractserver.pipeline.utils import (
     get_all_embedders,
     get_all_parsers,
@@ -258,6 +259,9 @@ class TestPostProcessor(BasePostProcessor):
         except ImportError as e:
             logger.error(f"Failed to import test classes: {e}")
 
+        # Rediscover components now that the test modules exist
+        reset_registry()
+
         # Verify the embedders were loaded correctly
         embedders = get_all_embedders()
         embedder_titles = [embedder.title for embedder in embedders]
@@ -280,6 +284,7 @@ class TestPostProcessor(BasePostProcessor):
         for file_path in cls.test_files:
             if os.path.exists(file_path):
                 os.remove(file_path)
+        reset_registry()
         # Optionally, you can remove the __pycache__ directories
         # in the package directories to clean up compiled files
 
@@ -303,6 +308,7 @@ class TestPostProcessor(BasePostProcessor):
             )
         except ImportError as e:
             logger.error(f"Failed to import TestPostProcessor in setUp: {e}")
+        reset_registry()
 
     def test_get_all_subclasses(self):
         """
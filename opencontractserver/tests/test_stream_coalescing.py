@@ -0,0 +1,278 @@
+"""
+Tests for coalescing of streamed agent tokens before they reach clients.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from config.websocket.consumers.thread_updates import ThreadUpdatesConsumer
+from config.websocket.consumers.unified_agent_conversation import (
+    UnifiedAgentConsumer,
+)
+from opencontractserver.agents.models import AgentConfiguration
+from opencontractserver.conversations.coalescing import StreamCoalescer
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    MessageTypeChoices,
+)
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.llms.agents.core_agents import (
+    ContentEvent,
+    FinalEvent,
+    ThoughtEvent,
+)
+from opencontractserver.llms.api import agents
+from opencontractserver.tasks.agent_tasks import (
+    async_broadcast_to_thread,
+    generate_agent_response,
+)
+
+User = get_user_model()
+
+
+class Recorder:
+    """Flush callback that records every batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, text: str, seq: int, token_count: int) -> None:
+        self.batches.append((text, seq, token_count))
+
+
+class StreamCoalescerTest(SimpleTestCase):
+    async def test_byte_threshold_flushes_immediately(self):
+        recorder = Recorder()
+        coalescer = StreamCoalescer(recorder, window_ms=10_000, max_bytes=8)
+
+        await coalescer.add("abcd")
+        self.assertEqual(recorder.batches, [])
+        await coalescer.add("efgh")
+        await coalescer.add("ij")
+        self.assertEqual(recorder.batches, [("abcdefgh", 1, 2)])
+
+        await coalescer.close()
+        self.assertEqual(recorder.batches, [("abcdefgh", 1, 2), ("ij", 2, 1)])
+
+    async def test_threshold_counts_utf8_bytes(self):
+        recorder = Recorder()
+        coalescer = StreamCoalescer(recorder, window_ms=10_000, max_bytes=6)
+
+        await coalescer.add("§§§")  # 6 bytes, 3 characters
+        self.assertEqual(recorder.batches, [("§§§", 1, 1)])
+
+    async def test_window_flushes_pending_tokens(self):
+        recorder = Recorder()
+        coalescer = StreamCoalescer(recorder, window_ms=20, max_bytes=1_000)
+
+        for token in ("The ", "lease ", "ends"):
+            await coalescer.add(token)
+        self.assertEqual(recorder.batches, [])
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(recorder.batches, [("The lease ends", 1, 3)])
+
+        # Nothing is left for close() to send.
+        await coalescer.close()
+        self.assertEqual(len(recorder.batches), 1)
+
+    async def test_zero_window_sends_every_token(self):
+        recorder = Recorder()
+        coalescer = StreamCoalescer(recorder, window_ms=0, max_bytes=1_000)
+
+        for token in ("a", "b", "c"):
+            await coalescer.add(token)
+
+        self.assertEqual(recorder.batches, [("a", 1, 1), ("b", 2, 1), ("c", 3, 1)])
+
+    async def test_batches_are_sequenced_and_lossless(self):
+        recorder = Recorder()
+        coalescer = StreamCoalescer(recorder, window_ms=5, max_bytes=16)
+        tokens = [f"tok{i} " for i in range(200)]
+
+        for i, token in enumerate(tokens):
+            await coalescer.add(token)
+            if i % 25 == 0:
+                await asyncio.sleep(0.01)
+        await coalescer.close()
+
+        self.assertLess(len(recorder.batches), len(tokens))
+        self.assertEqual(
+            [seq for _, seq, _ in recorder.batches],
+            list(range(1, len(recorder.batches) + 1)),
+        )
+        self.assertEqual(
+            "".join(text for text, _, _ in recorder.batches), "".join(tokens)
+        )
+        self.assertEqual(sum(count for _, _, count in recorder.batches), len(tokens))
+
+
+class ThreadBroadcastCoalescingTest(SimpleTestCase):
+    async def test_batches_reach_thread_group_over_channel_layer(self):
+        channel_layer = get_channel_layer()
+        channel = await channel_layer.new_channel()
+        await channel_layer.group_add("thread_4242", channel)
+
+        async def broadcast(text, seq, token_count):
+            await async_broadcast_to_thread(
+                4242,
+                "agent.stream_token",
+                {
+                    "message_id": "1",
+                    "token": text,
+                    "seq": seq,
+                    "token_count": token_count,
+                },
+            )
+
+        tokens = [f"word{i} " for i in range(50)]
+        coalescer = StreamCoalescer(broadcast, window_ms=10_000, max_bytes=64)
+        for token in tokens:
+            await coalescer.add(token)
+        await coalescer.close()
+
+        messages = []
+        while sum(m["token_count"] for m in messages) < len(tokens):
+            messages.append(await asyncio.wait_for(channel_layer.receive(channel), 1))
+
+        self.assertLess(len(messages), len(tokens))
+        self.assertEqual({m["type"] for m in messages}, {"agent_stream_token"})
+        self.assertEqual(
+            [m["seq"] for m in messages], list(range(1, len(messages) + 1))
+        )
+        self.assertEqual("".join(m["token"] for m in messages), "".join(tokens))
+        await channel_layer.group_discard("thread_4242", channel)
+
+    async def test_thread_consumer_forwards_batch_metadata(self):
+        consumer = ThreadUpdatesConsumer()
+        consumer.send = AsyncMock()
+
+        await consumer.agent_stream_token(
+            {"message_id": "7", "token": "Hello world", "seq": 3, "token_count": 2}
+        )
+
+        payload = json.loads(consumer.send.call_args.kwargs["text_data"])
+        self.assertEqual(
+            payload,
+            {
+                "type": "AGENT_STREAM_TOKEN",
+                "message_id": "7",
+                "token": "Hello world",
+                "seq": 3,
+                "token_count": 2,
+            },
+        )
+
+
+class UnifiedAgentConsumerCoalescingTest(SimpleTestCase):
+    @override_settings(
+        AGENT_STREAM_BROADCAST_WINDOW_MS=10_000, AGENT_STREAM_BROADCAST_MAX_BYTES=1_000
+    )
+    async def test_content_is_batched_and_flushed_before_other_events(self):
+        consumer = UnifiedAgentConsumer()
+        consumer.send = AsyncMock()
+
+        ids = {"user_message_id": 1, "llm_message_id": 2}
+        for token in ("Hel", "lo"):
+            await consumer._handle_agent_event(ContentEvent(content=token, **ids))
+        await consumer._handle_agent_event(
+            ThoughtEvent(thought="Searching", metadata={"tool_name": "search"}, **ids)
+        )
+        await consumer._handle_agent_event(ContentEvent(content=" there", **ids))
+        await consumer._handle_agent_event(
+            FinalEvent(accumulated_content="Hello there", **ids)
+        )
+
+        sent = [json.loads(call.args[0]) for call in consumer.send.call_args_list]
+        self.assertEqual(
+            [(m["type"], m["content"]) for m in sent],
+            [
+                ("ASYNC_START", ""),
+                ("ASYNC_CONTENT", "Hello"),
+                ("ASYNC_THOUGHT", "Searching"),
+                ("ASYNC_CONTENT", " there"),
+                ("ASYNC_FINISH", "Hello there"),
+            ],
+        )
+        self.assertEqual(sent[1]["data"], {"message_id": 2, "seq": 1, "token_count": 2})
+        self.assertEqual(sent[3]["data"], {"message_id": 2, "seq": 1, "token_count": 1})
+
+
+class FakeAgent:
+    """Streams a fixed answer with a tool call in the middle."""
+
+    async def stream(self, message, store_messages=True):
+        for token in ("The ", "term ", "is "):
+            yield ContentEvent(content=token)
+        yield ThoughtEvent(thought="Checking", metadata={"tool_name": "search"})
+        for token in ("five ", "years."):
+            yield ContentEvent(content=token)
+        yield FinalEvent()
+
+
+@override_settings(
+    AGENT_STREAM_BROADCAST_WINDOW_MS=10_000, AGENT_STREAM_BROADCAST_MAX_BYTES=1_000
+)
+class AgentTaskCoalescingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="streamer", password="test")
+        corpus = Corpus.objects.create(title="Leases", creator=cls.user)
+        conversation = Conversation.objects.create(
+            title="Thread",
+            conversation_type="thread",
+            chat_with_corpus=corpus,
+            creator=cls.user,
+        )
+        cls.agent_config = AgentConfiguration.objects.create(
+            name="Streamer",
+            slug="streamer",
+            description="Streams",
+            system_instructions="Answer.",
+            scope="CORPUS",
+            corpus=corpus,
+            creator=cls.user,
+            is_active=True,
+        )
+        cls.message = ChatMessage.objects.create(
+            conversation=conversation,
+            msg_type=MessageTypeChoices.HUMAN,
+            content="How long is the term?",
+            creator=cls.user,
+        )
+
+    def test_task_broadcasts_batches_in_order(self):
+        broadcasts = []
+
+        async def record(conversation_id, message_type, data):
+            broadcasts.append((message_type, data))
+
+        with patch.object(
+            agents, "for_corpus", AsyncMock(return_value=FakeAgent())
+        ), patch(
+            "opencontractserver.tasks.agent_tasks.async_broadcast_to_thread", record
+        ):
+            result = generate_agent_response(
+                self.message.pk, self.agent_config.pk, self.user.pk
+            )
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(
+            [(kind, data.get("token"), data.get("seq")) for kind, data in broadcasts],
+            [
+                ("agent.stream_token", "The term is ", 1),
+                ("agent.tool_call", None, None),
+                ("agent.stream_token", "five years.", 2),
+            ],
+        )
+        self.assertEqual(broadcasts[0][1]["token_count"], 3)
+        self.assertEqual(
+            ChatMessage.objects.get(pk=result["message_id"]).content,
+            "The term is five years.",
+        )
@@ -0,0 +1,100 @@
+"""
+Tests for Celery task profiling: task_prerun/task_postrun record a capped
+TaskProfile per invocation and task_profile_percentiles summarizes them.
+"""
+
+import json
+from io import StringIO
+
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from opencontractserver.task_profiling.models import TaskProfile
+
+User = get_user_model()
+
+
+@shared_task
+def profiled_storage_task(payload: str) -> int:
+    User.objects.count()
+    name = default_storage.save("task_profiling/payload.txt", ContentFile(payload))
+    with default_storage.open(name) as stored:
+        size = len(stored.read())
+    default_storage.delete(name)
+    return size
+
+
+@override_settings(TASK_PROFILING_ENABLED=True, TASK_PROFILING_SAMPLE_RATE=1.0)
+class TaskProfilingTest(TestCase):
+    def test_records_task_resources(self):
+        profiled_storage_task.delay("x" * 2048)
+
+        profile = TaskProfile.objects.get()
+        self.assertEqual(profile.task_name, profiled_storage_task.name)
+        self.assertEqual(profile.state, "SUCCESS")
+        self.assertGreaterEqual(profile.db_queries, 1)
+        self.assertEqual(profile.storage_bytes_written, 2048)
+        self.assertEqual(profile.storage_bytes_read, 2048)
+        self.assertGreater(profile.wall_ms, 0)
+        self.assertGreater(profile.peak_rss_kb, 0)
+
+    def test_table_is_capped(self):
+        with self.settings(TASK_PROFILE_MAX_ROWS=2):
+            for _ in range(4):
+                profiled_storage_task.delay("x")
+
+        self.assertEqual(TaskProfile.objects.count(), 2)
+
+    def test_unsampled_tasks_are_not_recorded(self):
+        with self.settings(TASK_PROFILING_SAMPLE_RATE=0.0):
+            profiled_storage_task.delay("x")
+
+        self.assertFalse(TaskProfile.objects.exists())
+
+    def test_logs_json_lines(self):
+        with self.settings(TASK_PROFILING_LOG=True), self.assertLogs(
+            "opencontractserver.task_profiling.signals", level="INFO"
+        ) as logs:
+            profiled_storage_task.delay("xyz")
+
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(line["task_name"], profiled_storage_task.name)
+        self.assertEqual(line["storage_bytes_written"], 3)
+
+    def test_percentiles_command(self):
+        now = timezone.now()
+        TaskProfile.objects.bulk_create(
+            TaskProfile(
+                task_name="tasks.slow",
+                started_at=now,
+                wall_ms=wall_ms,
+                cpu_ms=1,
+                db_queries=wall_ms // 10,
+                db_ms=1,
+                storage_bytes_read=0,
+                storage_bytes_written=0,
+                peak_rss_kb=1024,
+            )
+            for wall_ms in range(10, 1010, 10)
+        )
+        out = StringIO()
+
+        call_command(
+            "task_profile_percentiles",
+            "--json",
+            "--percentiles",
+            "50",
+            "99",
+            stdout=out,
+        )
+
+        (summary,) = json.loads(out.getvalue())
+        self.assertEqual(summary["task_name"], "tasks.slow")
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(summary["wall_ms"], {"p50": 500, "p99": 990})
+        self.assertEqual(summary["db_queries"]["p99"], 99)
@@ -0,0 +1,148 @@
+"""
+Tests for the offline tokenizer subsystem used for LLM context budgeting.
+"""
+
+import base64
+import json
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from opencontractserver.documents.models import Document
+from opencontractserver.llms.token_counting import (
+    ApproximateTokenizer,
+    BaseTokenizer,
+    BPETokenizer,
+    _build_tokenizer,
+    count_document_tokens,
+    count_tokens,
+    get_tokenizer,
+    token_count_cache,
+)
+from opencontractserver.llms.tools.core_tools import (
+    get_document_txt_token_length,
+    get_md_summary_token_length,
+)
+
+User = get_user_model()
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class CountingTokenizer(BaseTokenizer):
+    """One token per character; records how often it is asked to count."""
+
+    name = "counting"
+    calls = 0
+
+    def count(self, text: str) -> int:
+        CountingTokenizer.calls += 1
+        return len(text)
+
+
+def _write_tiny_bpe(directory: str, encoding_name: str) -> None:
+    """A byte-level vocabulary plus merges for "he" and "the"."""
+    ranks = {bytes([i]): i for i in range(256)}
+    ranks[b"he"] = 256
+    ranks[b"the"] = 257
+    with open(f"{directory}/{encoding_name}.tiktoken", "w") as f:
+        for token, rank in ranks.items():
+            f.write(f"{base64.b64encode(token).decode()} {rank}\n")
+
+
+class TokenCountingTest(TestCase):
+    def setUp(self):
+        self.bpe_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.bpe_dir)
+        _build_tokenizer.cache_clear()
+        self.addCleanup(_build_tokenizer.cache_clear)
+        token_count_cache.clear()
+        self.addCleanup(token_count_cache.clear)
+        CountingTokenizer.calls = 0
+
+    def test_bpe_tokenizer_loads_local_rank_file(self):
+        _write_tiny_bpe(self.bpe_dir, "cl100k_base")
+
+        with override_settings(
+            LLM_TOKENIZER="bpe",
+            LLM_TOKENIZER_ENCODING="cl100k_base",
+            LLM_TOKENIZER_BPE_DIR=self.bpe_dir,
+        ):
+            tokenizer = get_tokenizer()
+            # "the" -> [the]; " the" -> [" ", the]; "hex" -> [he, x]
+            self.assertEqual(count_tokens("the the hex"), 1 + 2 + 3)
+
+        self.assertIsInstance(tokenizer, BPETokenizer)
+        self.assertEqual(tokenizer.name, "cl100k_base")
+
+    def test_missing_rank_file_falls_back_to_approximate(self):
+        with override_settings(
+            LLM_TOKENIZER="bpe",
+            LLM_TOKENIZER_ENCODING="o200k_base",
+            LLM_TOKENIZER_BPE_DIR=self.bpe_dir,
+        ), self.assertLogs("opencontractserver.llms.token_counting", level="WARNING"):
+            self.assertIsInstance(get_tokenizer(), ApproximateTokenizer)
+            self.assertEqual(count_tokens("x" * 41), 11)
+
+    def test_approximate_mode_ignores_configured_tokenizer(self):
+        with override_settings(
+            LLM_TOKENIZER="opencontractserver.tests.test_token_counting.CountingTokenizer"
+        ):
+            self.assertEqual(count_tokens("abcdefgh"), 8)
+            self.assertEqual(count_tokens("abcdefgh", approximate=True), 2)
+        self.assertEqual(count_tokens(""), 0)
+
+    @override_settings(
+        LLM_TOKENIZER="opencontractserver.tests.test_token_counting.CountingTokenizer",
+        LLM_TOKEN_COUNT_CACHE_SIZE=2,
+    )
+    def test_counts_are_memoized_per_document_version_and_span(self):
+        for _ in range(3):
+            self.assertEqual(count_document_tokens(1, T0, "abc", span=(0, 3)), 3)
+        self.assertEqual(CountingTokenizer.calls, 1)
+
+        # A different span or a newer version is counted again.
+        count_document_tokens(1, T0, "ab", span=(0, 2))
+        count_document_tokens(1, T0 + timedelta(seconds=1), "abcd", span=(0, 3))
+        self.assertEqual(CountingTokenizer.calls, 3)
+
+        # The memo is bounded.
+        self.assertEqual(len(token_count_cache), 2)
+
+    @override_settings(
+        LLM_TOKENIZER="opencontractserver.tests.test_token_counting.CountingTokenizer"
+    )
+    def test_document_tools_use_tokenizer(self):
+        user = User.objects.create_user(username="counter", password="test")
+        document = Document.objects.create(title="Lease", creator=user)
+        document.md_summary_file.save("summary.md", ContentFile(b"Summary text"))
+        document.txt_extract_file.save("lease.txt", ContentFile(b"0123456789"))
+
+        self.assertEqual(get_md_summary_token_length(document.id), 12)
+        self.assertEqual(get_document_txt_token_length(document.id), 10)
+        self.assertEqual(get_document_txt_token_length(document.id, 2, 6), 4)
+        get_document_txt_token_length(document.id, 2, 6)
+        self.assertEqual(CountingTokenizer.calls, 3)
+
+    def test_benchmark_command_compares_modes(self):
+        _write_tiny_bpe(self.bpe_dir, "cl100k_base")
+        out = StringIO()
+
+        with override_settings(
+            LLM_TOKENIZER="bpe",
+            LLM_TOKENIZER_ENCODING="cl100k_base",
+            LLM_TOKENIZER_BPE_DIR=self.bpe_dir,
+        ):
+            call_command("benchmark_tokenizers", "--repeat", "1", "--json", stdout=out)
+
+        results = json.loads(out.getvalue())
+        self.assertEqual(results["exact"]["tokenizer"], "cl100k_base")
+        self.assertEqual(results["approximate"]["tokenizer"], "approximate")
+        self.assertGreater(results["exact"]["tokens"], 0)
+        self.assertIsNotNone(results["approximate"]["error_pct"])
@@ -0,0 +1,184 @@
+"""
+Tests for incremental vote counts and reputation, and their reconciliation.
+"""
+
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from opencontractserver.conversations.models import (
+    ChatMessage,
+    Conversation,
+    ConversationTypeChoices,
+    MessageVote,
+    UserReputation,
+    VoteType,
+)
+from opencontractserver.corpuses.models import Corpus
+from opencontractserver.tasks.reputation_tasks import reconcile_vote_counters
+
+User = get_user_model()
+
+
+class VoteCounterTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username="author", password="test")
+        cls.voters = [
+            User.objects.create_user(username=f"voter{i}", password="test")
+            for i in range(3)
+        ]
+        cls.corpus = Corpus.objects.create(title="Corpus", creator=cls.author)
+        cls.thread = Conversation.objects.create(
+            title="Thread",
+            conversation_type=ConversationTypeChoices.THREAD,
+            chat_with_corpus=cls.corpus,
+            creator=cls.author,
+        )
+        cls.message = ChatMessage.objects.create(
+            conversation=cls.thread,
+            msg_type="HUMAN",
+            content="Vote on me",
+            creator=cls.author,
+        )
+
+    def _reputation(self, corpus=None):
+        rep = UserReputation.objects.get(user=self.author, corpus=corpus)
+        return (
+            rep.reputation_score,
+            rep.total_upvotes_received,
+            rep.total_downvotes_received,
+        )
+
+    def _vote(self, voter, vote_type, message=None):
+        return MessageVote.objects.create(
+            message=message or self.message, vote_type=vote_type, creator=voter
+        )
+
+    def test_votes_adjust_counts_and_reputation_incrementally(self):
+        self._vote(self.voters[0], VoteType.UPVOTE)
+        self._vote(self.voters[1], VoteType.UPVOTE)
+        downvote = self._vote(self.voters[2], VoteType.DOWNVOTE)
+
+        self.message.refresh_from_db()
+        self.assertEqual(
+            (self.message.upvote_count, self.message.downvote_count), (2, 1)
+        )
+        self.assertEqual(self._reputation(), (1, 2, 1))
+        self.assertEqual(self._reputation(self.corpus), (1, 2, 1))
+
+        downvote.vote_type = VoteType.UPVOTE
+        downvote.save()
+        # Saving an unchanged vote is a no-op.
+        downvote.save()
+        self.assertEqual(self._reputation(), (3, 3, 0))
+
+        downvote.delete()
+        self.message.refresh_from_db()
+        self.assertEqual(
+            (self.message.upvote_count, self.message.downvote_count), (2, 0)
+        )
+        self.assertEqual(self._reputation(), (2, 2, 0))
+        self.assertEqual(self._reputation(self.corpus), (2, 2, 0))
+
+    def test_vote_cost_does_not_grow_with_author_messages(self):
+        def queries_for_vote(voter):
+            message = ChatMessage.objects.filter(creator=self.author).last()
+            with CaptureQueriesContext(connection) as ctx:
+                self._vote(voter, VoteType.UPVOTE, message)
+            return len(ctx.captured_queries)
+
+        # First votes create the author's reputation rows and the voters'
+        # engagement buckets.
+        self._vote(self.voters[0], VoteType.UPVOTE)
+        self._vote(self.voters[1], VoteType.UPVOTE)
+        ChatMessage.objects.create(
+            conversation=self.thread,
+            msg_type="HUMAN",
+            content="Baseline",
+            creator=self.author,
+        )
+        baseline = queries_for_vote(self.voters[1])
+        for i in range(200):
+            message = ChatMessage.objects.create(
+                conversation=self.thread,
+                msg_type="HUMAN",
+                content=f"Message {i}",
+                creator=self.author,
+            )
+            MessageVote.objects.create(
+                message=message, vote_type=VoteType.UPVOTE, creator=self.voters[2]
+            )
+
+        self.assertEqual(queries_for_vote(self.voters[0]), baseline)
+        self.assertEqual(self._reputation()[1], 204)
+
+    def test_reconcile_repairs_drift(self):
+        self._vote(self.voters[0], VoteType.UPVOTE)
+        self._vote(self.voters[1], VoteType.DOWNVOTE)
+
+        # Writes that bypass signals make the counters drift.
+        ChatMessage.objects.filter(pk=self.message.pk).update(upvote_count=10)
+        MessageVote.objects.filter(creator=self.voters[1]).update(
+            vote_type=VoteType.UPVOTE
+        )
+        UserReputation.objects.filter(user=self.author, corpus=self.corpus).delete()
+        stale = UserReputation.objects.create(
+            user=self.voters[0], reputation_score=7, creator=self.voters[0]
+        )
+
+        result = reconcile_vote_counters()
+
+        self.assertEqual(
+            result,
+            {
+                "messages_repaired": 1,
+                "reputations_repaired": 2,
+                "reputations_created": 1,
+            },
+        )
+        self.message.refresh_from_db()
+        self.assertEqual(
+            (self.message.upvote_count, self.message.downvote_count), (2, 0)
+        )
+        self.assertEqual(self._reputation(), (2, 2, 0))
+        self.assertEqual(self._reputation(self.corpus), (2, 2, 0))
+        stale.refresh_from_db()
+        self.assertEqual(stale.reputation_score, 0)
+
+        self.assertEqual(
+            reconcile_vote_counters(),
+            {
+                "messages_repaired": 0,
+                "reputations_repaired": 0,
+                "reputations_created": 0,
+            },
+        )
+
+    def test_benchmark_command_rolls_back(self):
+        out = StringIO()
+        votes_before = MessageVote.objects.count()
+
+        call_command(
+            "benchmark_vote_latency",
+            "--messages",
+            "3",
+            "30",
+            "--votes",
+            "4",
+            "--json",
+            stdout=out,
+        )
+
+        results = json.loads(out.getvalue())
+        self.assertEqual([row["messages"] for row in results], [3, 30])
+        self.assertIn("median_ms", results[0]["create"])
+        self.assertEqual(MessageVote.objects.count(), votes_before)
+        self.assertFalse(
+            User.objects.filter(username__startswith="vote-bench").exists()
+        )
@@ -0,0 +1,181 @@
+"""
+Page-level PDF redaction used by the PDFRedactor post-processor.
+
+Only the pages that carry redaction spans are rasterized (through
+pdfredact) and rebuilt with an image plus a text layer without the redacted
+tokens; every other page is copied through as is. Documents are redacted in
+a bounded pool of worker threads and the results come back in the order
+the documents were submitted, so callers can stream them into an archive.
+
+Threads rather than processes: the rasterizing is done by poppler
+subprocesses (through pdf2image), and the PDFRedactor runs in Celery
+prefork workers, whose daemonic processes cannot start child processes of
+their own.
+"""
+
+import io
+import logging
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
+from pdfredact import build_text_redacted_pdf, redact_pdf_to_images
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import DictionaryObject, NameObject
+
+from opencontractserver.types.dicts import (
+    OpenContractsAnnotationPythonType,
+    OpenContractsSinglePageAnnotationType,
+    PawlsPagePythonType,
+)
+
+logger = logging.getLogger(__name__)
+
+REDACTION_DPI = 200
+
+# Worker threads used when the PDFRedactor settings don't set max_workers
+DEFAULT_REDACTION_WORKERS = 2
+
+# Documents queued per worker; bounds how many PDFs are held in memory at once
+JOBS_PER_WORKER = 2
+
+# Operand of a "Do" operator, i.e. an XObject a content stream draws
+XOBJECT_USE = re.compile(rb"/([^\s/\[\]()<>{}%]+)\s+Do\b")
+
+
+def group_redactions_by_page(
+    annotations: list[OpenContractsAnnotationPythonType], page_count: int
+) -> list[list[OpenContractsSinglePageAnnotationType]]:
+    """Unnest the annotation_json of annotations into one list of spans per page."""
+    page_redactions: list[list[OpenContractsSinglePageAnnotationType]] = [
+        [] for _ in range(page_count)
+    ]
+    for annotation in annotations:
+        for page, page_annotation in annotation["annotation_json"].items():
+            page_redactions[int(page)].append(page_annotation)
+    return page_redactions
+
+
+def _strip_unused_xobjects(page) -> None:
+    """
+    Drop XObjects the page's own content never draws. Pages often share one
+    resource dictionary, and copying a page would otherwise carry along the
+    images and forms of pages that were redacted.
+    """
+    resources = page.get("/Resources")
+    if resources is None:
+        return
+    resources = resources.get_object()
+    xobjects = resources.get("/XObject")
+    if xobjects is None:
+        return
+
+    contents = page.get_contents()
+    data = contents.get_data() if contents is not None else b""
+    used = {name.decode("latin-1") for name in XOBJECT_USE.findall(data)}
+
+    filtered = DictionaryObject(
+        {key: value for key, value in xobjects.get_object().items() if key[1:] in used}
+    )
+    page_resources = DictionaryObject(resources)
+    page_resources[NameObject("/XObject")] = filtered
+    page[NameObject("/Resources")] = page_resources
+
+
+def redact_pdf_pages(
+    pdf_bytes: bytes,
+    pawls_pages: list[PawlsPagePythonType],
+    page_redactions: list[list[OpenContractsSinglePageAnnotationType]],
+    dpi: int = REDACTION_DPI,
+) -> bytes:
+    """
+    Redact the spans in page_redactions (one list per page) and return the
+    new PDF. A document without spans is returned unchanged.
+
+    Redacted pages are replaced by rasterized copies with an invisible text
+    layer of their remaining tokens. Clean pages keep their content, minus
+    annotations and XObjects only other pages use.
+    """
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    page_count = min(len(reader.pages), len(pawls_pages))
+    redacted_indices = [index for index in range(page_count) if page_redactions[index]]
+    if len(redacted_indices) < sum(1 for spans in page_redactions if spans):
+        logger.warning(
+            f"Redaction spans on pages beyond the {page_count} pages of the PDF "
+            "and its PAWLS layer were ignored"
+        )
+    if not redacted_indices:
+        return pdf_bytes
+
+    subset_writer = PdfWriter()
+    for index in redacted_indices:
+        subset_writer.add_page(reader.pages[index])
+    subset_bytes = io.BytesIO()
+    subset_writer.write(subset_bytes)
+
+    subset_pawls = [pawls_pages[index] for index in redacted_indices]
+    subset_redactions = [page_redactions[index] for index in redacted_indices]
+    images = redact_pdf_to_images(
+        pdf_bytes=subset_bytes.getvalue(),
+        pawls_pages=subset_pawls,
+        page_annotations=subset_redactions,
+        dpi=dpi,
+    )
+    redacted_pdf = io.BytesIO()
+    build_text_redacted_pdf(
+        output_pdf=redacted_pdf,
+        redacted_images=images,
+        pawls_pages=subset_pawls,
+        page_redactions=subset_redactions,
+        dpi=dpi,
+        hide_text=True,
+    )
+    redacted_pages = dict(zip(redacted_indices, PdfReader(redacted_pdf).pages))
+
+    writer = PdfWriter()
+    for index, page in enumerate(reader.pages):
+        if index in redacted_pages:
+            writer.add_page(redacted_pages[index])
+        else:
+            _strip_unused_xobjects(page)
+            writer.add_page(page, excluded_keys=["/Annots"])
+
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def redact_pdfs(
+    jobs: Iterable[tuple], max_workers: int = 1, dpi: int = REDACTION_DPI
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Run redact_pdf_pages over jobs of (key, pdf_bytes, pawls_pages,
+    page_redactions) and yield (key, redacted_pdf_bytes) in job order.
+
+    With more than one job and max_workers > 1 the documents are redacted in
+    a thread pool, with at most JOBS_PER_WORKER jobs per worker in flight.
+    Jobs are only read from the iterable as results are consumed.
+    """
+    jobs = iter(jobs)
+    first_jobs = list(islice(jobs, 2))
+    jobs = chain(first_jobs, jobs)
+
+    if max_workers <= 1 or len(first_jobs) < 2:
+        for key, *args in jobs:
+            yield key, redact_pdf_pages(*args, dpi=dpi)
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="pdf-redaction"
+    ) as pool:
+        pending = deque()
+        for key, *args in jobs:
+            pending.append((key, pool.submit(redact_pdf_pages, *args, dpi=dpi)))
+            if len(pending) >= max_workers * JOBS_PER_WORKER:
+                key, future = pending.popleft()
+                yield key, future.result()
+        while pending:
+            key, future = pending.popleft()
+            yield key, future.result()